@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+# Audio preparation for transcription
+#
+# yap only needs the sound of a recording, but handed a multi-GB 4K video it
+# has to read and demux the whole container. Local videos are therefore first
+# reduced to their audio track: ffmpeg streams it out (-vn, so video packets
+# are never decoded) as 16 kHz mono 16-bit WAV, the format speech models work
+# on, about 115 MB per hour. The extracted audio is kept in the job directory
+# as the job's 'audio' artifact, where the media cache lets a retry or a later
+# run with other settings take it over instead of extracting again. Files
+# that are already audio-only go to yap as they are.
+#
+# Speed profiles trade a little accuracy for throughput: the audio yap hears
+# is played faster with ffmpeg's atempo filter, which keeps the pitch, so an
+# hour of media is transcribed as 40-45 minutes of audio. Run
+# speed_benchmark.py on a few recordings with reference transcripts to see
+# what each profile costs in word error rate.
+
+import os
+
+# Extensions that never carry a video stream
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.aac', '.flac', '.ogg', '.opus', '.aif', '.aiff', '.caf')
+
+SAMPLE_RATE = 16000
+
+# Playback speed of the audio yap transcribes, by profile name
+SPEED_PROFILES = {
+    'accurate': 1.0,
+    'fast': 1.3,
+    'fastest': 1.5,
+}
+DEFAULT_SPEED_PROFILE = 'accurate'
+
+
+def is_audio_file(path):
+    return str(path).lower().endswith(AUDIO_EXTENSIONS)
+
+
+def video_streams_command(path):
+    """ffprobe command listing a file's video streams, one line each (cover art included)"""
+    return ['ffprobe', '-v', 'error', '-select_streams', 'v',
+            '-show_entries', 'stream=index:stream_disposition=attached_pic', '-of', 'csv=p=0', str(path)]
+
+
+def has_video(probe_output):
+    """Whether ffprobe's stream list has real video; cover art in audio files does not count"""
+    for line in probe_output.splitlines():
+        fields = line.strip().split(',')
+        if fields[0] and fields[-1] != '1':
+            return True
+    return False
+
+
+def extract_audio_command(source, target, start=None, end=None):
+    """ffmpeg command streaming the first audio track of source into 16 kHz mono WAV
+
+    start and end (seconds) cut a section; seeking happens on the input, so
+    ffmpeg skips straight to the start instead of decoding up to it.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-y', '-v', 'error']
+    if start:
+        cmd += ['-ss', f"{start:g}"]
+    cmd += ['-i', str(source)]
+    if end is not None:
+        cmd += ['-t', f"{end - (start or 0):g}"]
+    return cmd + ['-map', '0:a:0', '-vn', '-sn', '-dn', '-ac', '1', '-ar', str(SAMPLE_RATE),
+                  '-c:a', 'pcm_s16le', str(target)]
+
+
+def concat_wavs(paths, target):
+    """Join WAV files with the same format into one; raises ValueError if their formats differ"""
+    import wave
+
+    with wave.open(str(paths[0]), 'rb') as first:
+        params = first.getparams()
+    with wave.open(str(target), 'wb') as out:
+        out.setparams(params)
+        for path in paths:
+            with wave.open(str(path), 'rb') as audio:
+                if audio.getparams()[:3] != params[:3]:
+                    raise ValueError(f"{path} has a different audio format")
+                while True:
+                    data = audio.readframes(SAMPLE_RATE * 60)
+                    if not data:
+                        break
+                    out.writeframes(data)
+
+
+def parse_time(text):
+    """Seconds from "90", "1:30" or "1:02:03"; None for empty text. Raises ValueError otherwise"""
+    text = str(text).strip()
+    if not text:
+        return None
+    seconds = 0.0
+    for field in text.split(':'):
+        value = float(field)
+        if value < 0:
+            raise ValueError(f"Negative time: {text}")
+        seconds = seconds * 60 + value
+    return seconds
+
+
+def format_time(seconds):
+    """1:02:03 or 2:05 for a number of seconds"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def section_label(start, end):
+    """Readable name of a section, e.g. 10:00-20:00 or 10:00-end"""
+    return f"{format_time(start)}-{'end' if end is None else format_time(end)}"
+
+
+def extracted_name(source):
+    """Name of the extracted audio inside a job directory"""
+    return os.path.splitext(os.path.basename(str(source)))[0] + ".wav"
+
+
+def profile_speed(profile):
+    """Playback speed of a speed profile; unknown names play at normal speed"""
+    return SPEED_PROFILES.get(profile, 1.0)
+
+
+def speed_up_command(source, target, speed):
+    """ffmpeg command playing source `speed` times faster, pitch preserved, as 16 kHz mono WAV"""
+    return ['ffmpeg', '-nostdin', '-y', '-v', 'error', '-i', str(source), '-map', '0:a:0', '-vn',
+            '-filter:a', f"atempo={speed:g}", '-ac', '1', '-ar', str(SAMPLE_RATE),
+            '-c:a', 'pcm_s16le', str(target)]
@@ -3,15 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def debug_mixed_structure():
     print("=== DEBUGGING MIXED STRUCTURE CASE ===")
     
-    root = tk.Tk()
-    root.withdraw()
-    app = YapGUI(root)
+    app = Pipeline()
     
     mixed_text = """This paragraph has good structure and proper punctuation.
 
@@ -49,8 +46,6 @@ This paragraph is good again."""
     if long_paragraphs:
         print(f"⚠️ Long paragraphs detected at indices: {long_paragraphs}")
         print("This should trigger AI processing for better structure.")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     debug_mixed_structure() 
\ No newline at end of file
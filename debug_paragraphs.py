@@ -3,13 +3,10 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def debug_paragraph_analysis():
-    root = tk.Tk()
-    root.withdraw()
-    app = YapGUI(root)
+    app = Pipeline()
     
     good_text = """This is the first paragraph about artificial intelligence. It introduces the main concept and provides some background information. AI has been developing rapidly in recent years, transforming various industries and sectors.
 
@@ -42,8 +39,6 @@ This final paragraph talks about the future of artificial intelligence. Machine
     
     result = app.has_good_paragraph_structure(good_text)
     print(f"\nFinal result: {result}")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     debug_paragraph_analysis()
\ No newline at end of file
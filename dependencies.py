@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+# External tool probing with an on-disk cache
+#
+# Every tool is resolved on PATH first; tools that are missing are reported
+# without spawning anything. The rest run `--version` concurrently, and the
+# result is cached keyed by the binary's resolved path, mtime and size, so a
+# warm start with unchanged tools spawns no processes at all.
+
+import json
+import os
+import shutil
+
+from exporters import write_text_atomic
+
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser("~/.cache"), "yap_gui")
+DEPENDENCY_CACHE = os.path.join(CACHE_DIR, "dependencies.json")
+
+# (name, show version, install hint)
+DEPENDENCIES = [
+    ('yap', False, None),
+    ('yt-dlp', True, "brew install yt-dlp"),
+    ('llm', True, "brew install llm"),
+    ('uvx', False, "brew install uv"),
+    ('curl', False, "brew install curl"),
+]
+
+PROBE_TIMEOUT = 5
+
+
+def yt_dlp_library_version():
+    from ytdlp_library import library_version
+    return library_version()
+
+
+# Tools that also run in-process from a Python package: name -> installed package version (or None)
+LIBRARY_TOOLS = {'yt-dlp': yt_dlp_library_version}
+
+
+def binary_key(path):
+    """Cache key for a resolved binary; changes when the binary is replaced or upgraded"""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    return f"{real_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def run_probe(path):
+    """Run `<tool> --version`; returns (ok, first line of output)"""
+    import subprocess
+
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return False, ""
+    output = (result.stdout.strip() or result.stderr.strip()).split('\n')[0]
+    return result.returncode == 0, output
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def probe_dependencies(cache_path=DEPENDENCY_CACHE, names=None, refresh=False):
+    """Probe tools concurrently; returns ({name: (state, version)}, processes spawned)
+
+    state is 'ok', 'error' or 'missing'. refresh ignores cached results.
+    """
+    names = names or [name for name, _, _ in DEPENDENCIES]
+    cache = load_cache(cache_path)
+    results = {}
+    pending = {}
+
+    for name in names:
+        # yt-dlp running in-process is reported from its package metadata, without spawning it
+        if name in LIBRARY_TOOLS:
+            version = LIBRARY_TOOLS[name]()
+            if version:
+                results[name] = ('ok', f"{name} {version} (in-process)")
+                continue
+        path = shutil.which(name)
+        if not path:
+            results[name] = ('missing', "")
+            continue
+        try:
+            key = binary_key(path)
+        except OSError:
+            results[name] = ('missing', "")
+            continue
+        cached = cache.get(name)
+        if cached and cached.get('key') == key and not refresh:
+            results[name] = (cached['state'], cached['version'])
+        else:
+            pending[name] = (path, key)
+
+    if pending:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            probes = {name: executor.submit(run_probe, path) for name, (path, _) in pending.items()}
+        for name, future in probes.items():
+            ok, version = future.result()
+            results[name] = ('ok' if ok else 'error', version)
+            cache[name] = {'key': pending[name][1], 'state': results[name][0], 'version': version}
+        try:
+            write_text_atomic(cache_path, json.dumps(cache, indent=2))
+        except OSError:
+            pass
+
+    return results, len(pending)
+
+
+def format_dependency_report(results, api_key_configured):
+    """Human-readable dependency report for the Settings tab"""
+    lines = []
+    for name, show_version, hint in DEPENDENCIES:
+        state, version = results.get(name, ('missing', ""))
+        if state == 'ok':
+            if name == 'curl':
+                lines.append("✅ curl: Available for API requests")
+            else:
+                lines.append(f"✅ {name}: {version if show_version and version else 'Available'}")
+        elif state == 'error':
+            lines.append(f"❌ {name}: {'Not found or error' if name == 'yap' else 'Error'}")
+        else:
+            if name == 'curl':
+                lines.append("❌ curl: Not available (needed for OpenRouter API)")
+            else:
+                lines.append(f"❌ {name}: Not installed")
+            if hint:
+                lines.append(f"   Install with: {hint}")
+
+        # The API key line has always followed uvx in the report
+        if name == 'uvx':
+            if api_key_configured:
+                lines.append("✅ OpenRouter API: Configured for translation")
+            else:
+                lines.append("⚠️  OpenRouter API: Not configured (for translation)")
+                lines.append("   Enter API key in Settings tab")
+
+    lines.append("")
+    lines.append("Installation commands:")
+    lines.append("brew install finnvoor/tools/yap")
+    lines.append("brew install yt-dlp")
+    lines.append("brew install llm")
+    lines.append("brew install uv")
+    lines.append("")
+    lines.append("For translation:")
+    lines.append("• Enter OpenAI API key in Settings tab (recommended)")
+    lines.append("• Ensure curl is available (usually pre-installed)")
+    return "\n".join(lines)
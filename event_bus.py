@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+# Thread-safe event bus between worker threads and the Tk main loop
+#
+# Workers publish typed events for a job; the main loop drains the bus on a
+# fixed tick. Status, progress and partial-result events are coalesced so only
+# the latest one per job (and result key) is applied, which keeps the UI cost
+# per tick flat no matter how many jobs are running or how chatty they are.
+# Terminal events (done, error) are never dropped and go through a bounded
+# queue, so a flood of finishing jobs applies back-pressure to the workers.
+
+import queue
+import threading
+from collections import namedtuple
+
+STATUS = 'status'
+PROGRESS = 'progress'
+PARTIAL = 'partial'
+DONE = 'done'
+ERROR = 'error'
+
+COALESCED_KINDS = (STATUS, PROGRESS, PARTIAL)
+
+Event = namedtuple('Event', ['job', 'kind', 'payload'])
+
+
+class EventBus:
+    """Bounded, coalescing event queue drained by the UI thread"""
+
+    def __init__(self, max_pending=256):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._terminal = queue.Queue(maxsize=max_pending)
+
+    def publish(self, job, kind, payload=None, key=None):
+        """Publish an event from any thread"""
+        if kind in COALESCED_KINDS:
+            with self._lock:
+                # Later updates replace earlier ones that were not drained yet
+                self._latest.pop((job, kind, key), None)
+                self._latest[(job, kind, key)] = Event(job, kind, payload)
+        else:
+            self._terminal.put(Event(job, kind, payload))
+
+    def status(self, job, text):
+        self.publish(job, STATUS, text)
+
+    def progress(self, job, fraction):
+        self.publish(job, PROGRESS, fraction)
+
+    def partial(self, job, key, content):
+        self.publish(job, PARTIAL, (key, content), key=key)
+
+    def done(self, job, *result):
+        self.publish(job, DONE, result)
+
+    def error(self, job, message):
+        self.publish(job, ERROR, message)
+
+    def drain(self, max_terminal=32):
+        """Return pending events: coalesced updates first, then terminal events in order"""
+        with self._lock:
+            events = list(self._latest.values())
+            self._latest.clear()
+
+        for _ in range(max_terminal):
+            try:
+                events.append(self._terminal.get_nowait())
+            except queue.Empty:
+                break
+        return events
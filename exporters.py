@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+# Streaming exporters for transcripts, translations and subtitles
+#
+# Every exporter receives the document piece by piece (paragraphs, then cues)
+# and writes as it goes, so several formats can be produced in a single pass
+# over a document without building any of them in memory. Files are written
+# to a temporary name next to the target and renamed into place when complete.
+
+import json
+import os
+import time
+from contextlib import ExitStack, contextmanager
+
+from subtitles import parse_srt
+from transcript import Transcript
+
+# Lines starting with these are treated as headings in Org output
+ORG_HEADING_PREFIXES = ('🌟', '✨', '🎯', '📝', '🌍', '🔍', '✅', '⚠️', '🚀', '📋', '💾', '📝')
+
+
+def format_timestamp(seconds, separator=','):
+    """Format seconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (VTT)"""
+    total_ms = int(round(max(seconds, 0) * 1000))
+    hours, rest = divmod(total_ms, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    secs, millis = divmod(rest, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+@contextmanager
+def atomic_write(path, encoding='utf-8'):
+    """Open a temporary file next to path and rename it over path on success"""
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_text_atomic(path, content):
+    """Write a string to path atomically"""
+    with atomic_write(path) as f:
+        f.write(content)
+    return path
+
+
+class SrtDocument:
+    """Document view over existing SRT content (e.g. translated subtitles)"""
+
+    def __init__(self, srt_content, language=None):
+        self.cues = parse_srt(srt_content)
+        self.language = language
+
+    def iter_paragraphs(self):
+        for cue in self.cues:
+            yield ' '.join(cue.text.split())
+
+    def iter_cues(self):
+        for cue in self.cues:
+            yield cue.start, cue.end, cue.text
+
+
+class Exporter:
+    """Base exporter; subclasses override the hooks they need"""
+
+    extension = ''
+    uses_paragraphs = False
+    uses_cues = False
+
+    def __init__(self, out, title=None, language=None):
+        self.out = out
+        self.title = title
+        self.language = language
+
+    def begin(self):
+        pass
+
+    def paragraph(self, index, text):
+        pass
+
+    def begin_cues(self):
+        pass
+
+    def cue(self, index, start, end, text):
+        pass
+
+    def end(self):
+        pass
+
+
+class TextExporter(Exporter):
+    extension = 'txt'
+    uses_paragraphs = True
+
+    def paragraph(self, index, text):
+        self.out.write(("\n\n" if index else "") + text)
+
+    def end(self):
+        self.out.write("\n")
+
+
+class MarkdownExporter(Exporter):
+    extension = 'md'
+    uses_paragraphs = True
+
+    def begin(self):
+        if self.title:
+            self.out.write(f"# {self.title}\n\n")
+
+    def paragraph(self, index, text):
+        self.out.write(text + "\n\n")
+
+
+class OrgExporter(Exporter):
+    extension = 'org'
+    uses_paragraphs = True
+
+    def begin(self):
+        self.out.write(f"#+TITLE: {self.title or 'Translation'}\n")
+        self.out.write(f"#+DATE: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.out.write("\n")
+
+    def paragraph(self, index, text):
+        if index:
+            self.line("")
+        for line in text.split('\n'):
+            self.line(line)
+
+    def line(self, line):
+        """Convert one line of plain text to Org mode"""
+        line = line.strip()
+        if not line:
+            self.out.write("\n")
+        # Check if line looks like a title (starts with emoji or is short)
+        elif (line.startswith(ORG_HEADING_PREFIXES) or
+              len(line) < 100 and line.endswith((':', '!', '?'))):
+            # Convert to Org heading
+            self.out.write(f"* {line}\n")
+        elif line.startswith('=') and line.endswith('='):
+            # This is already a separator line, convert to Org separator
+            self.out.write("\n---\n\n")
+        else:
+            # Regular paragraph
+            self.out.write(line + "\n")
+
+
+class SrtExporter(Exporter):
+    extension = 'srt'
+    uses_cues = True
+
+    def cue(self, index, start, end, text):
+        self.out.write(f"{index}\n{format_timestamp(start)} --> {format_timestamp(end)}\n{text}\n\n")
+
+
+class VttExporter(Exporter):
+    extension = 'vtt'
+    uses_cues = True
+
+    def begin(self):
+        self.out.write("WEBVTT\n\n")
+
+    def cue(self, index, start, end, text):
+        self.out.write(f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n{text}\n\n")
+
+
+class JsonExporter(Exporter):
+    extension = 'json'
+    uses_paragraphs = True
+    uses_cues = True
+
+    def begin(self):
+        self.out.write('{"title": %s, "language": %s, "paragraphs": [' % (
+            json.dumps(self.title, ensure_ascii=False), json.dumps(self.language)))
+
+    def paragraph(self, index, text):
+        self.out.write((", " if index else "") + json.dumps(text, ensure_ascii=False))
+
+    def begin_cues(self):
+        self.out.write('], "segments": [')
+
+    def cue(self, index, start, end, text):
+        segment = {"start": round(start, 3), "end": round(end, 3), "text": text}
+        self.out.write((", " if index > 1 else "") + json.dumps(segment, ensure_ascii=False))
+
+    def end(self):
+        self.out.write("]}\n")
+
+
+EXPORTERS = {}
+
+
+def register_exporter(name, exporter_class):
+    """Make an exporter available by format name"""
+    EXPORTERS[name] = exporter_class
+
+
+for _name, _exporter in (('txt', TextExporter), ('markdown', MarkdownExporter),
+                         ('org', OrgExporter), ('srt', SrtExporter),
+                         ('vtt', VttExporter), ('json', JsonExporter)):
+    register_exporter(_name, _exporter)
+
+
+def run_exporters(document, exporters):
+    """Feed one document to several exporters in a single pass"""
+    for exporter in exporters:
+        exporter.begin()
+
+    paragraph_exporters = [e for e in exporters if e.uses_paragraphs]
+    if paragraph_exporters:
+        for index, text in enumerate(document.iter_paragraphs()):
+            for exporter in paragraph_exporters:
+                exporter.paragraph(index, text)
+
+    for exporter in exporters:
+        exporter.begin_cues()
+
+    cue_exporters = [e for e in exporters if e.uses_cues]
+    if cue_exporters:
+        for index, (start, end, text) in enumerate(document.iter_cues(), 1):
+            for exporter in cue_exporters:
+                exporter.cue(index, start, end, text)
+
+    for exporter in exporters:
+        exporter.end()
+
+
+def export_to(document, fmt, out, title=None):
+    """Stream a document in one format to a writable text file object"""
+    document = Transcript.coerce(document) if isinstance(document, str) else document
+    run_exporters(document, [EXPORTERS[fmt](out, title, getattr(document, 'language', None))])
+
+
+def export_document(document, base_path, formats, title=None):
+    """Write a document in all requested formats in one pass; returns {format: path}"""
+    document = Transcript.coerce(document) if isinstance(document, str) else document
+    language = getattr(document, 'language', None)
+    paths = {}
+
+    # Any error discards every partial file; on success all are renamed into place
+    with ExitStack() as stack:
+        exporters = []
+        for fmt in formats:
+            exporter_class = EXPORTERS[fmt]
+            path = f"{base_path}.{exporter_class.extension}"
+            out = stack.enter_context(atomic_write(path))
+            exporters.append(exporter_class(out, title, language))
+            paths[fmt] = path
+
+        run_exporters(document, exporters)
+
+    return paths
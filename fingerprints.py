@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+# Fingerprints of transcribed local files
+#
+# A local file that was transcribed successfully is remembered with its size,
+# mtime and a hash of a few sampled blocks, together with a key of the settings
+# the job ran with and the job directory holding its results. Transcribing it
+# again with the same settings reuses those results instead of running yap.
+#
+# The checks go from cheap to expensive: an unchanged path, size and mtime is
+# a match without reading the file at all (a stat per file, so re-checking a
+# 10,000-file archive takes seconds). A file that was touched, copied or
+# renamed is matched by its size and a hash of sampled blocks. Only once two
+# different files with the same samples have been recorded (a collision) are
+# full hashes computed, and files with those samples are then told apart by
+# their full contents.
+#
+#   python fingerprints.py check ~/Recordings
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+from dependencies import CACHE_DIR
+
+FINGERPRINT_FILE = os.path.join(CACHE_DIR, "fingerprints.db")
+
+# Bytes hashed from the start, middle and end of a file for its sampled hash
+SAMPLE_BLOCK = 65536
+
+# Bytes read at a time for full hashes
+HASH_CHUNK = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sample TEXT NOT NULL,
+    full_hash TEXT,
+    job_dir TEXT NOT NULL,
+    recorded_at REAL,
+    PRIMARY KEY (path, settings)
+);
+CREATE INDEX IF NOT EXISTS fingerprints_sample ON fingerprints(sample, size, settings);
+"""
+
+Fingerprint = namedtuple('Fingerprint', ['path', 'settings', 'size', 'mtime_ns', 'sample', 'full_hash',
+                                         'job_dir', 'recorded_at'])
+
+
+def settings_key(settings):
+    """Short key for the job settings that change a job's results"""
+    import hashlib
+    text = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def whole_file_sampled(size):
+    return size <= 3 * SAMPLE_BLOCK
+
+
+def sample_hash(path, size):
+    """Hash of the size and the first, middle and last blocks; the whole file when it is small"""
+    import hashlib
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        if whole_file_sampled(size):
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2 - SAMPLE_BLOCK // 2, size - SAMPLE_BLOCK):
+                f.seek(offset)
+                digest.update(f.read(SAMPLE_BLOCK))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    import hashlib
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FingerprintIndex:
+    """SQLite index of successfully transcribed files; safe to use from several processes"""
+
+    def __init__(self, path=FINGERPRINT_FILE):
+        self.path = path
+        self.ready = False
+
+    def connect(self):
+        if not self.ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10)
+        if not self.ready:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self.ready = True
+        return db
+
+    def record(self, path, stat, settings, job_dir, sample=None):
+        """Remember a successful run; `stat` is the file's stat from when the job read it"""
+        path = os.path.abspath(path)
+        sample = sample or sample_hash(path, stat.st_size)
+        db = self.connect()
+        try:
+            # For small files the sampled hash already covers every byte
+            full = sample if whole_file_sampled(stat.st_size) else None
+            if full is None and self.collisions(db, path, sample, stat.st_size):
+                # Another file has the same samples: from now on these are told apart by full hashes
+                full = full_hash(path)
+                for other in self.collisions(db, path, sample, stat.st_size):
+                    if other.full_hash is None:
+                        self.fill_full_hash(db, other)
+            with db:
+                db.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (path, settings, stat.st_size, stat.st_mtime_ns, sample, full, job_dir, time.time()))
+        finally:
+            db.close()
+
+    def collisions(self, db, path, sample, size):
+        """Fingerprints of other files with the same size and samples"""
+        return [Fingerprint(*row) for row in db.execute(
+            "SELECT * FROM fingerprints WHERE sample = ? AND size = ? AND path != ?", (sample, size, path))]
+
+    def lookup(self, path, settings, stat=None):
+        """Fingerprint of an earlier run on the same content with the same settings, or None
+
+        Also returns the sampled hash it computed (None if the stat alone matched),
+        so a new run can be recorded without reading the file again.
+        """
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        db = self.connect()
+        try:
+            row = db.execute("SELECT * FROM fingerprints WHERE path = ? AND settings = ?",
+                             (path, settings)).fetchone()
+            if row and (row[2], row[3]) == (stat.st_size, stat.st_mtime_ns):
+                return Fingerprint(*row), None
+
+            sample = sample_hash(path, stat.st_size)
+            candidates = [Fingerprint(*row) for row in db.execute(
+                "SELECT * FROM fingerprints WHERE sample = ? AND size = ? AND settings = ? "
+                "ORDER BY recorded_at DESC", (sample, stat.st_size, settings))]
+            if not candidates:
+                return None, sample
+            # Samples identify the content unless other files are known to share them
+            known_collision = db.execute("SELECT 1 FROM fingerprints WHERE sample = ? AND size = ? "
+                                         "AND full_hash IS NOT NULL LIMIT 1", (sample, stat.st_size)).fetchone()
+            if whole_file_sampled(stat.st_size) or not known_collision:
+                return candidates[0], sample
+
+            # Files known to share these samples: only the full contents tell them apart
+            content = full_hash(path)
+            for candidate in candidates:
+                if candidate.full_hash == content:
+                    return candidate, sample
+            return None, sample
+        finally:
+            db.close()
+
+    def fill_full_hash(self, db, fingerprint):
+        """Full hash of an earlier file, if it is still there unchanged"""
+        try:
+            stat = os.stat(fingerprint.path)
+            if (stat.st_size, stat.st_mtime_ns) != (fingerprint.size, fingerprint.mtime_ns):
+                return None
+            content = full_hash(fingerprint.path)
+        except OSError:
+            return None
+        with db:
+            db.execute("UPDATE fingerprints SET full_hash = ? WHERE path = ?", (content, fingerprint.path))
+        return content
+
+    def unchanged(self, paths):
+        """Paths whose size and mtime match a recorded run (with any settings); a stat per file"""
+        db = self.connect()
+        try:
+            known = {}
+            for path, size, mtime_ns in db.execute("SELECT path, size, mtime_ns FROM fingerprints"):
+                known.setdefault(path, set()).add((size, mtime_ns))
+        finally:
+            db.close()
+        result = []
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) in known.get(path, ()):
+                result.append(path)
+        return result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List which files in a folder were transcribed unchanged before")
+    parser.add_argument('--index', default=FINGERPRINT_FILE, help="fingerprint database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    check = commands.add_parser('check', help="count unchanged and new files")
+    check.add_argument('directory')
+    check.add_argument('-v', '--verbose', action='store_true', help="list the new files")
+    args = parser.parse_args(argv)
+
+    from folder_watch import MEDIA_EXTENSIONS
+
+    start = time.perf_counter()
+    paths = [os.path.join(root, name) for root, _, names in os.walk(args.directory) for name in names
+             if not name.startswith('.') and name.lower().endswith(MEDIA_EXTENSIONS)]
+    unchanged = set(FingerprintIndex(args.index).unchanged(paths))
+    elapsed = time.perf_counter() - start
+    if args.verbose:
+        for path in paths:
+            if os.path.abspath(path) not in unchanged:
+                print(path)
+    print(f"{len(unchanged)} unchanged, {len(paths) - len(unchanged)} new or modified "
+          f"({elapsed:.2f} s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+# Watch-folder ingestion
+#
+# Recordings dropped into a watched folder are transcribed without anyone
+# picking them. The folder is watched with inotify where it is available and
+# polled otherwise; either way a file is only taken once its size and
+# modification time have stopped changing for a few seconds, so files still
+# being copied (often over a network share, which sends no reliable close
+# events) are never picked up half-written. Ready files are queued and fed to
+# the pipeline worker processes, at most one job per process at a time, so
+# throughput grows with the number of cores while the queue stays bounded.
+# Each handled file version (path, size, mtime) is appended to watch_done.jsonl
+# in the output directory, so restarting the watch skips what is already done.
+#
+#   python folder_watch.py ~/Recordings --translate es --workers 8
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+MEDIA_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.mkv', '.webm', '.avi',
+                    '.mp3', '.m4a', '.wav', '.aac', '.flac', '.ogg', '.opus')
+
+# Seconds a file's size and mtime must stay unchanged before it is taken
+SETTLE_SECONDS = 3
+
+# Seconds between scans when polling
+POLL_INTERVAL = 2
+
+# With inotify, seconds between safety rescans (events can be missed on network file systems)
+RESCAN_INTERVAL = 30
+
+# Shortest gap between scans while events keep arriving (e.g. a file being copied)
+MIN_SCAN_INTERVAL = 0.5
+
+DONE_FILE = "watch_done.jsonl"
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+
+def file_key(path, stat):
+    """Identity of one version of a file; a replaced or rewritten file gets a new key"""
+    return f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class Inotify:
+    """Wakes a waiting watcher when files in a directory change (Linux only)"""
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"Cannot watch {directory}")
+
+    def wait(self, timeout, wake_fd):
+        """Wait for file events (or a wake-up); returns True if there were events"""
+        import select
+
+        readable, _, _ = select.select([self.fd, wake_fd], [], [], timeout)
+        if self.fd not in readable:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_inotify(directory):
+    """Inotify for a directory, or None where it is unavailable (macOS, old kernels, limits reached)"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return Inotify(directory)
+    except (OSError, AttributeError) as e:
+        print(f"inotify unavailable, polling {directory}: {e}", file=sys.stderr)
+        return None
+
+
+class FolderWatcher:
+    """Reports media files in a folder once they have finished being written"""
+
+    def __init__(self, directory, settle=SETTLE_SECONDS, poll_interval=POLL_INTERVAL,
+                 extensions=MEDIA_EXTENSIONS, notify=True):
+        self.directory = directory
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.extensions = extensions
+        # Files seen changing: path -> (size, mtime_ns, unchanged since)
+        self.candidates = {}
+        # File versions already reported
+        self.reported = set()
+        self.stopped = threading.Event()
+        self.wake_read, self.wake_write = os.pipe()
+        self.notifier = open_inotify(directory) if notify else None
+
+    @property
+    def backend(self):
+        return "inotify" if self.notifier is not None else "polling"
+
+    def scan(self):
+        """Files that have not changed for `settle` seconds; each file version is reported once"""
+        now = time.monotonic()
+        ready = []
+        present = set()
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError as e:
+            print(f"Cannot scan {self.directory}: {e}", file=sys.stderr)
+            return ready
+        for entry in entries:
+            # Hidden files are typically partial downloads or copies (.name.part, ._name)
+            if entry.name.startswith('.') or not entry.name.lower().endswith(self.extensions):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            present.add(entry.path)
+            key = file_key(entry.path, stat)
+            if key in self.reported:
+                continue
+            previous = self.candidates.get(entry.path)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                self.candidates[entry.path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif stat.st_size > 0 and now - previous[2] >= self.settle:
+                del self.candidates[entry.path]
+                self.reported.add(key)
+                ready.append(entry.path)
+        for path in list(self.candidates):
+            if path not in present:
+                del self.candidates[path]
+        return sorted(ready)
+
+    def wait(self):
+        """Sleep until the next scan is due, or until files change when inotify is available"""
+        if self.notifier is None:
+            self.stopped.wait(self.settle if self.candidates else self.poll_interval)
+            return
+        timeout = self.settle if self.candidates else RESCAN_INTERVAL
+        if self.notifier.wait(timeout, self.wake_read):
+            # Debounce bursts of events from a file being written
+            self.stopped.wait(MIN_SCAN_INTERVAL)
+
+    def run(self, on_ready):
+        """Watch until stop() is called; on_ready(path) is called from this thread"""
+        try:
+            while not self.stopped.is_set():
+                for path in self.scan():
+                    on_ready(path)
+                self.wait()
+        finally:
+            if self.notifier is not None:
+                self.notifier.close()
+            os.close(self.wake_read)
+
+    def stop(self):
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        try:
+            os.write(self.wake_write, b'x')
+        except OSError:
+            pass  # The watch has already ended
+        os.close(self.wake_write)
+
+
+class DoneSet:
+    """File versions handled in watch mode, kept across restarts as JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.statuses = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.statuses[entry['key']] = entry.get('status')
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Line torn by a crash
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, key):
+        return key in self.statuses
+
+    def add(self, key, status, **details):
+        self.statuses[key] = status
+        entry = dict(key=key, status=status, time=time.time(), **details)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # One small O_APPEND write per entry, like the job catalog
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8'))
+        finally:
+            os.close(fd)
+
+
+class WatchIngest:
+    """Queue of ready files fed to at most `limit` running jobs; used from one thread only
+
+    submit(path) starts a job and returns its id; report each job's end with finished().
+    """
+
+    def __init__(self, done, submit, limit):
+        self.done = done
+        self.submit = submit
+        self.limit = max(1, limit)
+        self.queue = deque()
+        # Running jobs: job -> (path, key)
+        self.running = {}
+
+    def add(self, path):
+        """Queue a ready file unless this version of it is done, queued or running"""
+        try:
+            key = file_key(path, os.stat(path))
+        except OSError:
+            return False
+        if key in self.done or any(key == queued for _, queued in self.queue) \
+                or any(key == running for _, running in self.running.values()):
+            return False
+        self.queue.append((path, key))
+        self.pump()
+        return True
+
+    def pump(self):
+        while self.queue and len(self.running) < self.limit:
+            path, key = self.queue.popleft()
+            self.running[self.submit(path)] = (path, key)
+
+    def finished(self, job, status, error=None):
+        """Record a job's outcome and start the next queued file; returns the file's path"""
+        path, key = self.running.pop(job, (None, None))
+        if key is not None:
+            self.done.add(key, status, **({'error': error} if error else {}))
+        self.pump()
+        return path
+
+    def abandon(self):
+        """Forget queued and running files (the watch was stopped); they are retried next time"""
+        jobs = list(self.running)
+        self.queue.clear()
+        self.running.clear()
+        return jobs
+
+
+def main(argv=None):
+    import argparse
+    import itertools
+
+    from event_bus import DONE, ERROR, PARTIAL, EventBus
+    from pipeline_worker import PipelineWorker
+    from settings_store import DEFAULT_SETTINGS, read_settings
+
+    settings = dict(DEFAULT_SETTINGS, **(read_settings() or {}))
+    parser = argparse.ArgumentParser(description="Transcribe media files as they appear in a folder")
+    parser.add_argument('directory')
+    parser.add_argument('--output', default=settings['output_dir'], help="output directory")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="parallel jobs")
+    parser.add_argument('--translate', metavar='LANG', help="also translate into this language")
+    parser.add_argument('--summarize', action='store_true', help="also generate a title and summary")
+    parser.add_argument('--settle', type=float, default=SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is taken")
+    parser.add_argument('--poll', action='store_true', help="poll even where inotify is available")
+    args = parser.parse_args(argv)
+
+    config = {'summarize': args.summarize, 'translate': bool(args.translate),
+              'target_lang': args.translate or settings['local_target_lang'], 'output_dir': args.output,
+              'model': settings['model'], 'translation_workers': settings['translation_workers'],
+              'translation_memory_entries': settings['translation_memory_entries']}
+    os.makedirs(args.output, exist_ok=True)
+    events = EventBus()
+    worker = PipelineWorker(events, processes=args.workers)
+    job_ids = itertools.count(1)
+
+    def submit(path):
+        job = next(job_ids)
+        print(f"Transcribing {path}", flush=True)
+        worker.submit(job, 'run_local_transcription', dict(config, file_path=path))
+        return job
+
+    ingest = WatchIngest(DoneSet(os.path.join(args.output, DONE_FILE)), submit, worker.process_count)
+    watcher = FolderWatcher(args.directory, settle=args.settle, notify=not args.poll)
+    # Job 0 carries the watcher's findings over to this thread; the path is the coalescing key
+    threading.Thread(target=watcher.run, args=(lambda path: events.partial(0, path, path),),
+                     daemon=True).start()
+    print(f"Watching {args.directory} ({watcher.backend}, {ingest.limit} parallel job(s)); Ctrl-C to stop",
+          file=sys.stderr)
+    try:
+        while True:
+            for event in events.drain():
+                if event.job == 0 and event.kind == PARTIAL:
+                    ingest.add(event.payload[1])
+                elif event.kind == DONE:
+                    print(f"Done: {ingest.finished(event.job, 'done')}", flush=True)
+                elif event.kind == ERROR:
+                    print(f"Failed: {ingest.finished(event.job, 'failed', str(event.payload))}: {event.payload}",
+                          flush=True)
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        for job in ingest.abandon():
+            worker.cancel(job)
+        worker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
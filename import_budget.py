@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# Import-time budget for the headless modules
+#
+# Each module is imported in a fresh interpreter with `-X importtime`; the
+# cumulative time of the module itself is compared with its budget in
+# import_budget.json, and modules that must stay out of the headless path
+# (tkinter, multiprocessing, ...) are checked as well. Exits non-zero when a
+# budget is exceeded. Sources are byte-compiled first, so a stale .pyc does not
+# count as import time.
+#
+#   python3 import_budget.py                  # check against the budget
+#   python3 import_budget.py --write-report   # also refresh docs/IMPORT_TIME_REPORT.md
+
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BUDGET_FILE = os.path.join(ROOT, "import_budget.json")
+REPORT_FILE = os.path.join(ROOT, "docs", "IMPORT_TIME_REPORT.md")
+
+
+def measure_import(module, runs=5):
+    """Import a module in fresh interpreters; returns (median ms, imported module names, slowest imports)"""
+    totals = []
+    imported = set()
+    slowest = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+        # Only the module's own subtree counts, not interpreter startup (site, encodings)
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            # "import time:  <self us> | <cumulative us> | <indented name>"
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = len(name) - len(name.lstrip())
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+            if depth == 1:
+                # A top-level import finished; keep it only if it is the module itself
+                if name.strip() == module:
+                    break
+                rows = []
+
+        imported.update(name for name, _, _ in rows)
+        totals.append(rows[-1][2] / 1000)
+        slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:8]
+
+    return statistics.median(totals), imported, slowest
+
+
+def check_budget(budget_file=BUDGET_FILE, runs=5):
+    """Measure every budgeted module; returns (ok, report lines)"""
+    with open(budget_file, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+
+    # Measure loading cached bytecode, not compiling a source edited since its last .pyc
+    # (which is what every import does under PYTHONDONTWRITEBYTECODE)
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)
+
+    ok = True
+    lines = []
+    for module, limits in budget['modules'].items():
+        median_ms, imported, slowest = measure_import(module, runs)
+        forbidden = sorted(name for name in limits.get('forbid', []) if name in imported)
+        within = median_ms <= limits['max_ms'] and not forbidden
+        ok = ok and within
+
+        lines.append(f"{'✅' if within else '❌'} {module}: {median_ms:.1f} ms (budget {limits['max_ms']} ms)")
+        if forbidden:
+            lines.append(f"   imports forbidden modules: {', '.join(forbidden)}")
+        lines.append("   slowest imports (self time): " +
+                     ', '.join(f"{name} {self_us / 1000:.1f} ms" for name, self_us, _ in slowest))
+    return ok, lines
+
+
+def write_report(lines, path=REPORT_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Import-Time Report\n\n")
+        f.write("Generated by `python3 import_budget.py --write-report` "
+                f"on {time.strftime('%Y-%m-%d')} with Python {sys.version.split()[0]}.\n")
+        f.write("Times are the median cumulative `-X importtime` of each module in a fresh interpreter.\n")
+        f.write("Budgets live in `import_budget.json`.\n\n```\n")
+        f.write("\n".join(lines))
+        f.write("\n```\n")
+
+
+def main():
+    ok, lines = check_budget()
+    print("\n".join(lines))
+    if '--write-report' in sys.argv:
+        write_report(lines)
+        print(f"Report written to {REPORT_FILE}")
+    if not ok:
+        print("❌ Import-time budget exceeded")
+        sys.exit(1)
+    print("✅ Import-time budget met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+# Per-job artifact directories
+#
+# Every job gets its own directory under <output_dir>/jobs/<YYYY-MM>/, so jobs
+# never collide on file names and no code has to glob through the whole
+# history. The directory holds the job's artifacts and a manifest.json that
+# lists them together with stage timings, cache keys and source metadata.
+# Finished jobs are also appended, one JSON line each, to catalog.jsonl in the
+# output directory; listing recent jobs reads only the end of that file.
+
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+from exporters import write_text_atomic
+
+JOBS_DIR = "jobs"
+MANIFEST_FILE = "manifest.json"
+CATALOG_FILE = "catalog.jsonl"
+MANIFEST_VERSION = 1
+
+# Bytes read at a time when reading the catalog backwards
+CATALOG_BLOCK = 8192
+
+
+def slugify(name, max_length=40):
+    """Readable, filesystem-safe fragment of a title, URL id or file name"""
+    slug = re.sub(r'[^\w-]+', '-', name or "").strip('-_')
+    return slug[:max_length].strip('-_') or "job"
+
+
+def append_catalog(output_dir, entry):
+    """Append one entry to the catalog; a single small O_APPEND write, so concurrent jobs never interleave"""
+    line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+    fd = os.open(os.path.join(output_dir, CATALOG_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def read_catalog(output_dir, limit=None):
+    """Catalog entries, newest first; with a limit only the end of the file is read"""
+    try:
+        f = open(os.path.join(output_dir, CATALOG_FILE), 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0 and (limit is None or data.count(b'\n') <= limit):
+            step = min(CATALOG_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+
+    lines = data.split(b'\n')
+    if position > 0:
+        lines = lines[1:]  # Starts mid-line
+    entries = []
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue  # Line torn by a crash
+        if limit is not None and len(entries) >= limit:
+            break
+    return entries
+
+
+def load_manifest(job_dir):
+    with open(os.path.join(job_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(job_dir, manifest):
+    write_text_atomic(os.path.join(job_dir, MANIFEST_FILE), json.dumps(manifest, indent=2, ensure_ascii=False))
+
+
+class JobRecord:
+    """A job's directory and manifest"""
+
+    def __init__(self, output_dir, kind, name, source=None):
+        created = time.time()
+        self.output_dir = output_dir
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(created))}-{slugify(name)}-{os.urandom(3).hex()}"
+        self.relative_dir = os.path.join(JOBS_DIR, time.strftime('%Y-%m', time.localtime(created)), self.id)
+        self.directory = os.path.join(output_dir, self.relative_dir)
+        os.makedirs(self.directory)
+        self.manifest = {
+            'version': MANIFEST_VERSION,
+            'id': self.id,
+            'kind': kind,
+            'status': 'running',
+            'created': created,
+            'source': dict(source or {}),
+            'artifacts': {},
+            'timings': {},
+            'cache_keys': {},
+        }
+        self.save()
+
+    def path(self, name):
+        """Path for an artifact inside the job directory"""
+        return os.path.join(self.directory, name)
+
+    def add_artifact(self, role, path):
+        """Record an artifact (relative to the job directory) under a role such as 'transcript'"""
+        if path:
+            self.manifest['artifacts'][role] = os.path.relpath(path, self.directory)
+
+    def add_artifacts(self, paths):
+        for role, path in paths.items():
+            self.add_artifact(role, path)
+
+    def remove_artifact(self, role):
+        self.manifest['artifacts'].pop(role, None)
+
+    def set_cache_key(self, name, value):
+        self.manifest['cache_keys'][name] = value
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage into the manifest"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings = self.manifest['timings']
+            timings[name] = round(timings.get(name, 0) + time.perf_counter() - start, 3)
+
+    def save(self):
+        save_manifest(self.directory, self.manifest)
+
+    def finish(self, status='done', title=None, error=None):
+        """Write the final manifest and list the job in the catalog"""
+        self.manifest['status'] = status
+        self.manifest['finished'] = time.time()
+        if title:
+            self.manifest['title'] = title
+        if error:
+            self.manifest['error'] = error
+        self.save()
+        append_catalog(self.output_dir, {
+            'id': self.id,
+            'dir': self.relative_dir,
+            'kind': self.manifest['kind'],
+            'status': status,
+            'title': title,
+            'created': self.manifest['created'],
+            'finished': self.manifest['finished'],
+        })
+
+    def discard(self):
+        """Remove the directory of a job that was cancelled; it never reaches the catalog"""
+        import shutil
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+
+# Media cache: a disk budget for kept audio and intermediates
+#
+# Audio kept by jobs, downloaded media and intermediate chunks are treated as
+# a cache spread over the job directories, not as permanent output; the
+# transcripts, translations and exports next to them are never touched. When
+# the cached files outgrow the budget, the least recently used ones are removed
+# (the job's manifest notes it) until usage fits again. Pinned jobs are never
+# evicted. A new job for a source that is still cached takes its file over
+# instead of downloading it again, which also makes it the most recently used.
+# Kept audio can be recompressed to a speech-grade codec, roughly twenty times
+# smaller than the 16-bit WAV that yt-dlp writes.
+#
+# The cached files are listed in a small index next to the catalog, so a new
+# job does not read the manifest of every job in history: the index only reads
+# the catalog lines appended since it last looked (jobs finished since), and
+# claiming, evicting and pinning update it as they change the manifests.
+#
+#   python media_cache.py usage ~/Downloads/yap_output
+#   python media_cache.py pin ~/Downloads/yap_output/jobs/2026-10/<job>
+
+import fcntl
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from exporters import write_text_atomic
+from job_store import CATALOG_FILE, load_manifest, save_manifest
+from process_control import output_size
+
+# Manifest artifact roles that belong to the cache
+RETAINED_ROLES = ('audio', 'media', 'chunks')
+
+DEFAULT_BUDGET_MB = 2048
+
+# Hit and miss counts, kept in the output directory next to the catalog
+STATS_FILE = "media_cache.json"
+LOCK_FILE = ".media_cache.lock"
+# Cached files by job directory, and how much of the catalog has been read into it
+INDEX_FILE = "media_cache_index.json"
+
+# Extension and ffmpeg arguments for recompressing kept audio (mono, 16 kHz)
+CODECS = {
+    'aac': ('.m4a', ['-c:a', 'aac', '-b:a', '32k']),
+    'opus': ('.opus', ['-c:a', 'libopus', '-b:a', '24k', '-application', 'voip']),
+}
+
+CacheEntry = namedtuple('CacheEntry', ['job_dir', 'role', 'path', 'size', 'last_used', 'pinned', 'source'])
+
+Usage = namedtuple('Usage', ['bytes', 'pinned_bytes', 'entries', 'budget', 'hits', 'misses'])
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_usage(usage):
+    text = f"{format_size(usage.bytes)} of {format_size(usage.budget)} in {usage.entries} file(s)"
+    if usage.pinned_bytes:
+        text += f", {format_size(usage.pinned_bytes)} pinned"
+    lookups = usage.hits + usage.misses
+    if lookups:
+        text += f"; {usage.hits / lookups:.0%} of {lookups} lookup(s) reused a cached file"
+    return text
+
+
+def recompress_command(path, codec):
+    """ffmpeg command and target path for recompressing audio with one of CODECS"""
+    extension, arguments = CODECS[codec]
+    target = os.path.splitext(str(path))[0] + extension
+    return ['ffmpeg', '-nostdin', '-y', '-v', 'error', '-i', str(path),
+            '-vn', '-ac', '1', '-ar', '16000', *arguments, target], target
+
+
+def remove_path(path):
+    if os.path.isdir(path):
+        import shutil
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+class MediaCache:
+    """Cached files of the finished jobs in an output directory; safe to use from several processes"""
+
+    def __init__(self, output_dir, budget_mb=DEFAULT_BUDGET_MB):
+        self.output_dir = output_dir
+        self.budget = int(budget_mb * 1024 * 1024)
+
+    @contextmanager
+    def locked(self):
+        """Serialize changes with other worker processes"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def job_files(self, relative):
+        """Index record of a job's cached files, from its manifest; None if it has none"""
+        job_dir = os.path.join(self.output_dir, relative)
+        try:
+            manifest = load_manifest(job_dir)
+        except (OSError, ValueError):
+            return None
+        files = {}
+        for role in RETAINED_ROLES:
+            name = manifest.get('artifacts', {}).get(role)
+            if name and os.path.exists(os.path.join(job_dir, name)):
+                files[role] = [name, output_size(os.path.join(job_dir, name))]
+        if not files:
+            return None
+        return {'files': files, 'pinned': bool(manifest.get('pinned')),
+                'last_used': manifest.get('last_used') or manifest.get('finished') or manifest.get('created', 0),
+                'source': manifest.get('cache_keys', {}).get('source')}
+
+    def load_index(self):
+        """The index, with the jobs finished since it was saved added; call with the lock held"""
+        try:
+            with open(os.path.join(self.output_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            index['catalog_size'] = int(index['catalog_size'])
+            index['jobs'] = dict(index['jobs'])
+        except (OSError, ValueError, KeyError, TypeError):
+            index = {'catalog_size': 0, 'jobs': {}}
+        try:
+            size = os.path.getsize(os.path.join(self.output_dir, CATALOG_FILE))
+        except OSError:
+            size = 0
+        if size < index['catalog_size']:
+            # The catalog was replaced: start over
+            index = {'catalog_size': 0, 'jobs': {}}
+        if size > index['catalog_size']:
+            with open(os.path.join(self.output_dir, CATALOG_FILE), 'rb') as f:
+                f.seek(index['catalog_size'])
+                data = f.read(size - index['catalog_size'])
+            # A line still being appended is read next time
+            data = data[:data.rfind(b'\n') + 1]
+            for line in data.splitlines():
+                try:
+                    relative = json.loads(line).get('dir')
+                except (ValueError, AttributeError):
+                    continue
+                if not relative:
+                    continue
+                files = self.job_files(relative)
+                if files is None:
+                    index['jobs'].pop(relative, None)
+                else:
+                    index['jobs'][relative] = files
+            index['catalog_size'] += len(data)
+            self.save_index(index)
+        return index
+
+    def save_index(self, index):
+        write_text_atomic(os.path.join(self.output_dir, INDEX_FILE), json.dumps(index))
+
+    def index_entries(self, index):
+        """Cached files in an index that still exist, least recently used first"""
+        entries = []
+        for relative, job in index['jobs'].items():
+            job_dir = os.path.join(self.output_dir, relative)
+            for role, (name, size) in job['files'].items():
+                path = os.path.join(job_dir, name)
+                if os.path.exists(path):
+                    entries.append(CacheEntry(job_dir, role, path, size, job['last_used'], job['pinned'],
+                                              job['source']))
+        entries.sort(key=lambda entry: entry.last_used)
+        return entries
+
+    def entries(self):
+        """Cached files of finished (or failed) jobs, least recently used first
+
+        Running jobs are not in the catalog yet, so their files are never evicted.
+        """
+        with self.locked():
+            return self.index_entries(self.load_index())
+
+    def read_stats(self):
+        try:
+            with open(os.path.join(self.output_dir, STATS_FILE), 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        return {'hits': stats.get('hits', 0), 'misses': stats.get('misses', 0)}
+
+    def count(self, outcome):
+        stats = self.read_stats()
+        stats[outcome] += 1
+        write_text_atomic(os.path.join(self.output_dir, STATS_FILE), json.dumps(stats))
+
+    def forget(self, entry, reason, index):
+        """Drop a cached file from its job's manifest, noting why, and from the index"""
+        manifest = load_manifest(entry.job_dir)
+        manifest['artifacts'].pop(entry.role, None)
+        manifest.setdefault('evicted', {})[entry.role] = {'at': time.time(), 'reason': reason}
+        save_manifest(entry.job_dir, manifest)
+        relative = os.path.relpath(entry.job_dir, self.output_dir)
+        job = index['jobs'].get(relative)
+        if job is not None:
+            job['files'].pop(entry.role, None)
+            if not job['files']:
+                del index['jobs'][relative]
+
+    def claim(self, source, role, record):
+        """Move the cached file for a source into a new job's directory; None if there is none
+
+        Files of pinned jobs are copied instead, so the pinned job keeps its own.
+        """
+        if not source:
+            return None
+        with self.locked():
+            index = self.load_index()
+            for entry in reversed(self.index_entries(index)):
+                if entry.source != source or entry.role != role or os.path.isdir(entry.path):
+                    continue
+                target = record.path(os.path.basename(entry.path))
+                try:
+                    if entry.pinned:
+                        import shutil
+                        shutil.copyfile(entry.path, target)
+                    else:
+                        os.replace(entry.path, target)
+                        self.forget(entry, f"reused by {record.id}", index)
+                        self.save_index(index)
+                except OSError as e:
+                    print(f"Could not reuse cached {role} {entry.path}: {e}", file=sys.stderr)
+                    continue
+                self.count('hits')
+                return target
+            self.count('misses')
+        return None
+
+    def evict(self, budget=None):
+        """Remove the least recently used unpinned files until the cache fits its budget
+
+        Returns the evicted entries.
+        """
+        budget = self.budget if budget is None else budget
+        evicted = []
+        with self.locked():
+            index = self.load_index()
+            entries = self.index_entries(index)
+            total = sum(entry.size for entry in entries)
+            for entry in entries:
+                if total <= budget:
+                    break
+                if entry.pinned:
+                    continue
+                try:
+                    remove_path(entry.path)
+                    self.forget(entry, "evicted", index)
+                except (OSError, ValueError) as e:
+                    print(f"Could not evict {entry.path}: {e}", file=sys.stderr)
+                    continue
+                total -= entry.size
+                evicted.append(entry)
+            if evicted:
+                self.save_index(index)
+        return evicted
+
+    def usage(self):
+        entries = self.entries()
+        stats = self.read_stats()
+        return Usage(sum(entry.size for entry in entries),
+                     sum(entry.size for entry in entries if entry.pinned),
+                     len(entries), self.budget, stats['hits'], stats['misses'])
+
+    def pin(self, job_dir, pinned=True):
+        """Keep (or stop keeping) a job's cached files regardless of the budget"""
+        with self.locked():
+            manifest = load_manifest(job_dir)
+            if pinned:
+                manifest['pinned'] = True
+            else:
+                manifest.pop('pinned', None)
+            save_manifest(job_dir, manifest)
+            index = self.load_index()
+            job = index['jobs'].get(os.path.relpath(job_dir, self.output_dir))
+            if job is not None:
+                job['pinned'] = pinned
+                self.save_index(index)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show and trim the cached media of finished jobs")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MB, help="cache budget in MB")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('usage', "show how much the cache holds"),
+                            ('evict', "remove least recently used files until the cache fits its budget")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('directory', nargs='?', default=os.path.expanduser("~/Downloads/yap_output"))
+    for name, help_text in (('pin', "never evict a job's files"), ('unpin', "let a job's files be evicted")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('job_dir')
+    args = parser.parse_args(argv)
+
+    if args.command in ('pin', 'unpin'):
+        job_dir = os.path.abspath(args.job_dir)
+        # Job directories are <output_dir>/jobs/<YYYY-MM>/<id>
+        MediaCache(os.path.dirname(os.path.dirname(os.path.dirname(job_dir)))).pin(job_dir, args.command == 'pin')
+        return 0
+
+    cache = MediaCache(args.directory, args.budget)
+    if args.command == 'evict':
+        evicted = cache.evict()
+        print(f"Evicted {len(evicted)} file(s), {format_size(sum(entry.size for entry in evicted))}")
+    print(format_usage(cache.usage()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1632 @@
+#!/usr/bin/env python3
+
+# Transcription, translation and summary pipeline
+#
+# Everything here is free of Tk so it can run in the GUI process or in the
+# pipeline worker processes (see pipeline_worker.py). Jobs report through an
+# events object with the EventBus interface (status/progress/partial/done/error).
+
+import json
+import os
+import sys
+import threading
+
+from subtitles import Cue, SubtitleTranslator, TranslationMemory, format_srt
+from transcript import Transcript, split_title_and_paragraphs
+from transcript_store import TRANSCRIPT_EXTENSION, save_transcript
+from exporters import SrtDocument, export_document, write_text_atomic
+from settings_store import DEFAULT_SETTINGS, load_api_key
+from process_control import Cancelled, CancelToken, output_size, run_process
+from job_store import JobRecord, load_manifest
+
+DEFAULT_MODEL = DEFAULT_SETTINGS['model']
+
+# Stall windows: external tools are stopped only after this many seconds without progress.
+# yt-dlp prints progress lines and grows its files steadily, but converting a long
+# download to WAV is quiet for a while, so the window grows with the video's length when known
+DOWNLOAD_STALL = 60
+DOWNLOAD_STALL_PER_MEDIA_SECOND = 0.02
+# yap may print nothing until it is done, so its window grows with the length of the media
+TRANSCRIBE_STALL = 60
+TRANSCRIBE_STALL_PER_MEDIA_SECOND = 0.5
+TRANSCRIBE_STALL_UNKNOWN_LENGTH = 600
+# translate-shell answers each chunk in one go; allow more time for bigger chunks
+TRANSLATE_STALL = 10
+TRANSLATE_STALL_PER_CHAR = 0.005
+# OpenRouter responses are streamed, so tokens (or keep-alive comments) arrive continuously
+API_STALL = 30
+
+TRANSLATION_FRAMEWORK = '/System/Library/Frameworks/Translation.framework'
+
+
+
+def has_objc():
+    import importlib.util
+    return importlib.util.find_spec('objc') is not None
+
+
+# Cheap availability check; the framework itself is loaded on first use
+APPLE_TRANSLATION_AVAILABLE = os.path.isdir(TRANSLATION_FRAMEWORK) and has_objc()
+
+_translation_framework_loaded = None
+_translation_framework_lock = threading.Lock()
+
+
+def load_translation_framework():
+    """Load Apple's Translation framework once; returns True if it is usable"""
+    global _translation_framework_loaded
+    with _translation_framework_lock:
+        if _translation_framework_loaded is None:
+            _translation_framework_loaded = False
+            if APPLE_TRANSLATION_AVAILABLE:
+                try:
+                    import objc
+                    from Foundation import NSBundle
+                    
+                    # Load the Translation framework
+                    if NSBundle.bundleWithPath_(TRANSLATION_FRAMEWORK):
+                        objc.loadBundle('Translation', globals(), bundle_path=TRANSLATION_FRAMEWORK)
+                        _translation_framework_loaded = True
+                except Exception as e:
+                    print(f"Could not load Translation framework: {e}", file=sys.stderr)
+        return _translation_framework_loaded
+
+
+# Languages offered in the UI (Apple Live Translation)
+APPLE_LANGUAGES = [
+    "en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh", "zh-TW", "ru", "ar",
+    "nl", "pl", "tr", "th", "vi", "hi", "id", "ms", "sv", "da", "no", "fi",
+    "cs", "sk", "hu", "ro", "bg", "hr", "sl", "et", "lv", "lt", "el", "he",
+    "fa", "ur", "bn", "ta", "te", "mr", "gu", "kn", "ml", "pa", "si", "my",
+    "km", "lo", "ka", "am", "sw", "zu", "af", "is", "mt", "cy", "ga", "eu",
+    "ca", "gl", "sq", "mk", "sr", "bs", "me", "mn", "ky", "uz", "kk", "tg",
+    "tk", "az", "hy", "ne", "dz", "bo", "ug", "ps", "sd", "ks"
+]
+
+LANGUAGE_NAMES = {
+    "en": "English", "es": "Spanish", "fr": "French", "de": "German", "it": "Italian",
+    "pt": "Portuguese", "ja": "Japanese", "ko": "Korean", "zh": "Chinese (Simplified)",
+    "zh-TW": "Chinese (Traditional)", "ru": "Russian", "ar": "Arabic", "nl": "Dutch",
+    "pl": "Polish", "tr": "Turkish", "th": "Thai", "vi": "Vietnamese", "hi": "Hindi",
+    "id": "Indonesian", "ms": "Malay", "sv": "Swedish", "da": "Danish", "no": "Norwegian",
+    "fi": "Finnish", "cs": "Czech", "sk": "Slovak", "hu": "Hungarian", "ro": "Romanian",
+    "bg": "Bulgarian", "hr": "Croatian", "sl": "Slovenian", "et": "Estonian", "lv": "Latvian",
+    "lt": "Lithuanian", "el": "Greek", "he": "Hebrew", "fa": "Persian", "ur": "Urdu",
+    "bn": "Bengali", "ta": "Tamil", "te": "Telugu", "mr": "Marathi", "gu": "Gujarati",
+    "kn": "Kannada", "ml": "Malayalam", "pa": "Punjabi", "si": "Sinhala", "my": "Burmese",
+    "km": "Khmer", "lo": "Lao", "ka": "Georgian", "am": "Amharic", "sw": "Swahili",
+    "zu": "Zulu", "af": "Afrikaans", "is": "Icelandic", "mt": "Maltese", "cy": "Welsh",
+    "ga": "Irish", "eu": "Basque", "ca": "Catalan", "gl": "Galician", "sq": "Albanian",
+    "mk": "Macedonian", "sr": "Serbian", "bs": "Bosnian", "me": "Montenegrin",
+    "mn": "Mongolian", "ky": "Kyrgyz", "uz": "Uzbek", "kk": "Kazakh", "tg": "Tajik",
+    "tk": "Turkmen", "az": "Azerbaijani", "hy": "Armenian", "ne": "Nepali", "dz": "Dzongkha",
+    "bo": "Tibetan", "ug": "Uyghur", "ps": "Pashto", "sd": "Sindhi", "ks": "Kashmiri"
+}
+
+APPLE_LANGUAGE_CODES = {
+    "en": "en-US", "es": "es-ES", "fr": "fr-FR", "de": "de-DE", "it": "it-IT",
+    "pt": "pt-PT", "ja": "ja-JP", "ko": "ko-KR", "zh": "zh-CN", "zh-TW": "zh-TW",
+    "ru": "ru-RU", "ar": "ar-SA", "nl": "nl-NL", "pl": "pl-PL", "tr": "tr-TR",
+    "th": "th-TH", "vi": "vi-VN", "hi": "hi-IN", "id": "id-ID", "ms": "ms-MY",
+    "sv": "sv-SE", "da": "da-DK", "no": "no-NO", "fi": "fi-FI", "cs": "cs-CZ",
+    "sk": "sk-SK", "hu": "hu-HU", "ro": "ro-RO", "bg": "bg-BG", "hr": "hr-HR",
+    "sl": "sl-SI", "et": "et-EE", "lv": "lv-LV", "lt": "lt-LT", "el": "el-GR",
+    "he": "he-IL", "fa": "fa-IR", "ur": "ur-PK", "bn": "bn-BD", "ta": "ta-IN",
+    "te": "te-IN", "mr": "mr-IN", "gu": "gu-IN", "kn": "kn-IN", "ml": "ml-IN",
+    "pa": "pa-IN", "si": "si-LK", "my": "my-MM", "km": "km-KH", "lo": "lo-LA",
+    "ka": "ka-GE", "am": "am-ET", "sw": "sw-TZ", "zu": "zu-ZA", "af": "af-ZA",
+    "is": "is-IS", "mt": "mt-MT", "cy": "cy-GB", "ga": "ga-IE", "eu": "eu-ES",
+    "ca": "ca-ES", "gl": "gl-ES", "sq": "sq-AL", "mk": "mk-MK", "sr": "sr-RS",
+    "bs": "bs-BA", "me": "me-ME", "mn": "mn-MN", "ky": "ky-KG", "uz": "uz-UZ",
+    "kk": "kk-KZ", "tg": "tg-TJ", "tk": "tk-TM", "az": "az-AZ", "hy": "hy-AM",
+    "ne": "ne-NP", "dz": "dz-BT", "bo": "bo-CN", "ug": "ug-CN", "ps": "ps-AF",
+    "sd": "sd-PK", "ks": "ks-IN"
+}
+
+def download_stall(duration):
+    """No-progress window for yt-dlp on a video of the given length (None when unknown)"""
+    if duration is None:
+        return DOWNLOAD_STALL
+    return DOWNLOAD_STALL + duration * DOWNLOAD_STALL_PER_MEDIA_SECOND
+
+
+def transcription_stall(duration):
+    """No-progress window for yap on media of the given length (None when unknown)"""
+    if duration is None:
+        return TRANSCRIBE_STALL_UNKNOWN_LENGTH
+    return TRANSCRIBE_STALL + duration * TRANSCRIBE_STALL_PER_MEDIA_SECOND
+
+
+def read_completion(output):
+    """OpenRouter chat completion response, from a server-sent event stream or plain JSON"""
+    
+    if not output.lstrip().startswith(('data:', ':')):
+        # Errors raised before the stream starts come back as a single JSON body
+        return json.loads(output)
+    
+    pieces = []
+    for line in output.splitlines():
+        if not line.startswith('data:'):
+            continue  # Blank separators and ": OPENROUTER PROCESSING" keep-alives
+        data = line[5:].strip()
+        if data == '[DONE]':
+            break
+        event = json.loads(data)
+        if 'error' in event:
+            return event
+        for choice in event.get('choices', []):
+            pieces.append((choice.get('delta') or {}).get('content') or '')
+    return {'choices': [{'message': {'content': ''.join(pieces)}}]}
+
+
+def get_language_name(code):
+    """Get language name from code"""
+    return LANGUAGE_NAMES.get(code, code)
+
+
+def get_apple_lang_code(code):
+    """Get Apple language code from short code"""
+    return APPLE_LANGUAGE_CODES.get(code, code)
+
+
+class JobFailed(Exception):
+    """A job step failed; the message is reported as the job's error"""
+
+
+class Pipeline:
+    """Processing pipeline for one process; settings are plain values, never Tk variables"""
+    
+    def __init__(self, events=None, api_key=None, model=DEFAULT_MODEL, export_formats=None):
+        self.events = events
+        # Without an explicit key, use the one saved in the settings store
+        self.api_key = api_key if api_key is not None else load_api_key()
+        self.model = model
+        self.export_formats = export_formats if export_formats is not None else ['srt', 'vtt', 'json']
+        self.translation_workers = DEFAULT_SETTINGS['translation_workers']
+        
+        # Translation memory shared by all subtitle translations handled by this pipeline
+        self.translation_memory = TranslationMemory(DEFAULT_SETTINGS['translation_memory_entries'])
+        
+        # Search index finished jobs are added to (None: the default location)
+        self.index_path = None
+        
+        # Fingerprints of transcribed local files (None: the default location)
+        self.fingerprint_path = None
+        
+        # Disk budget for kept audio and intermediates, and the codec kept audio is recompressed to
+        self.media_cache_mb = DEFAULT_SETTINGS['media_cache_mb']
+        self.media_codec = DEFAULT_SETTINGS['media_codec']
+        
+        # Cut silence out of the audio before yap runs (needs NumPy)
+        self.trim_silence = DEFAULT_SETTINGS['trim_silence']
+        
+        # Speed profile: how much faster than real time the audio is played to yap
+        self.speed_profile = DEFAULT_SETTINGS['speed_profile']
+        
+        # Online videos longer than this are rejected before downloading (0: no limit)
+        self.max_video_minutes = DEFAULT_SETTINGS['max_video_minutes']
+        
+        # Run yt-dlp in-process when its package is installed; the instances live as long as this pipeline
+        self.ytdlp_library = DEFAULT_SETTINGS['ytdlp_library']
+        self.yt_dlp = None
+        
+        # Path of translate-shell's `trans`, looked up once (False when it is not installed)
+        self.trans_path = None
+        
+        # Cancellation tokens by job (created early if a job is cancelled before it starts);
+        # the token of the job a thread is working on is kept thread-local
+        self.cancel_tokens = {}
+        self.cancel_lock = threading.Lock()
+        self.local = threading.local()
+    
+    def apply_settings(self, config):
+        """Take the settings snapshotted with a job"""
+        self.api_key = config.get('api_key', self.api_key)
+        self.model = config.get('model', self.model)
+        self.export_formats = config.get('export_formats', self.export_formats)
+        self.translation_workers = config.get('translation_workers', self.translation_workers)
+        self.translation_memory.max_entries = config.get('translation_memory_entries',
+                                                         self.translation_memory.max_entries)
+        self.index_path = config.get('index_path', self.index_path)
+        self.fingerprint_path = config.get('fingerprint_path', self.fingerprint_path)
+        self.media_cache_mb = config.get('media_cache_mb', self.media_cache_mb)
+        self.media_codec = config.get('media_codec', self.media_codec)
+        self.trim_silence = config.get('trim_silence', self.trim_silence)
+        self.speed_profile = config.get('speed_profile', self.speed_profile)
+        self.max_video_minutes = config.get('max_video_minutes', self.max_video_minutes)
+        self.ytdlp_library = config.get('ytdlp_library', self.ytdlp_library)
+    
+    def cancel(self, job):
+        """Cancel a job: its running tools are stopped and it ends at its next check"""
+        with self.cancel_lock:
+            token = self.cancel_tokens.setdefault(job, CancelToken())
+        token.cancel()
+    
+    def begin_job(self, job):
+        with self.cancel_lock:
+            token = self.cancel_tokens.setdefault(job, CancelToken())
+        self.local.token = token
+        return token
+    
+    def end_job(self, job):
+        with self.cancel_lock:
+            self.cancel_tokens.pop(job, None)
+        self.local.token = None
+    
+    def cancel_token(self):
+        return getattr(self.local, 'token', None)
+    
+    def check_cancelled(self):
+        """Raise Cancelled if the current thread's job has been cancelled"""
+        token = self.cancel_token()
+        if token is not None:
+            token.check()
+    
+    def run_process(self, cmd, input=None, timeout=None, stall_timeout=None, progress=None):
+        """Run an external tool so that cancelling the current job stops it"""
+        return run_process(cmd, self.cancel_token(), input=input, timeout=timeout,
+                           stall_timeout=stall_timeout, progress=progress)
+    
+    def media_duration(self, path):
+        """Length of an audio or video file in seconds, or None if it cannot be determined"""
+        import subprocess
+        
+        if str(path).lower().endswith('.wav'):
+            import wave
+            try:
+                with wave.open(str(path), 'rb') as audio:
+                    return audio.getnframes() / audio.getframerate()
+            except (OSError, EOFError, wave.Error, ZeroDivisionError):
+                pass
+        try:
+            result = self.run_process(['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                                       '-of', 'default=noprint_wrappers=1:nokey=1', str(path)], timeout=10)
+            return float(result.stdout.strip())
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            return None
+    
+    def get_api_key(self):
+        return os.environ.get('OPENROUTER_API_KEY') or self.api_key
+    
+    def get_translation_model(self):
+        return self.model or DEFAULT_MODEL
+    
+    def translate_text_versions(self, job, config):
+        """Text tab job: a plain translation and an enhanced article-style translation"""
+        self.begin_job(job)
+        try:
+            text = config['text']
+            source_lang = config['source_lang']
+            target_lang = config['target_lang']
+            
+            # Share one document between both translations so it is analyzed once
+            document = Transcript(text, language=source_lang)
+            
+            # Generate normal translation (without title/emojis)
+            if config['use_apple']:
+                # Use Apple Live Translation for normal translation
+                normal_result = self.translate_with_apple_live_translation(document, source_lang, target_lang)
+                if normal_result.startswith("⚠️"):
+                    normal_result = self.translate_with_local_tool_fallback(document, source_lang, target_lang)
+            else:
+                # For AI-only, use the same translation method but without enhancement
+                normal_result = self.translate_with_title_and_paragraphs(document, source_lang, target_lang)
+                # Remove title and formatting for normal translation
+                if not normal_result.startswith("⚠️"):
+                    lines = normal_result.split('\n')
+                    if len(lines) > 2:
+                        # Skip the title (first line) and return only the content
+                        normal_result = '\n'.join(lines[2:]).strip()
+            
+            self.check_cancelled()
+            
+            # Generate enhanced translation (with title and emojis)
+            if config['enhance_paragraphs']:
+                enhanced_result = self.translate_locally_then_enhance(document, source_lang, target_lang)
+            else:
+                enhanced_result = self.translate_with_title_and_paragraphs(document, source_lang, target_lang)
+            
+            self.check_cancelled()
+            self.events.done(job, normal_result, enhanced_result)
+            
+        except Cancelled:
+            self.events.error(job, "Cancelled")
+        except Exception as e:
+            self.events.error(job, f"Translation error: {str(e)}")
+        finally:
+            self.end_job(job)
+    
+    def get_platform_from_url(self, url):
+        """Detect the platform from the URL"""
+        url_lower = url.lower()
+        if any(domain in url_lower for domain in ['youtube.com', 'youtu.be']):
+            return 'YouTube'
+        elif any(domain in url_lower for domain in ['facebook.com', 'fb.com']):
+            return 'Facebook'
+        elif any(domain in url_lower for domain in ['vimeo.com']):
+            return 'Vimeo'
+        else:
+            return 'Unknown'
+    
+    def run_online_video_transcription(self, job, config):
+        import subprocess
+        from pathlib import Path
+        from audio_prep import section_label
+        from video_metadata import safe_filename
+        from media_cache import MediaCache
+        
+        url = config['url']
+        platform = self.get_platform_from_url(url)
+        self.begin_job(job)
+        record = None
+        try:
+            summarize = config['summarize']
+            keep_audio = config['keep_audio']
+            
+            # Title and length first: they name the job and size it before anything is downloaded
+            info = self.video_info(job, url, config)
+            time_range = self.time_range(config)
+            duration = self.check_video_length(info, time_range)
+            name = safe_filename(info.title) if info is not None and info.title else None
+            
+            # Everything this job writes goes into its own directory
+            record = JobRecord(config['output_dir'], 'online', name or self.job_name_from_url(url), source={
+                'url': url, 'platform': platform, 'translate': config['translate'],
+                'target_lang': config['target_lang'], 'summarize': summarize})
+            if info is not None:
+                record.manifest['source'].update(title=info.title, duration=info.duration)
+            sections = self.job_sections(config, info.duration if info is not None else None)
+            # A time range is a source of its own: its audio is cached apart from the whole video's
+            source_key = url
+            if time_range is not None:
+                record.manifest['source']['time_range'] = list(time_range)
+                source_key = f"{url}#t={section_label(*time_range)}"
+            record.set_cache_key('source', source_key)
+            
+            # Audio kept by an earlier job for this URL is reused instead of downloading again
+            cache = MediaCache(config['output_dir'], self.media_cache_mb)
+            cached_audio = cache.claim(source_key, 'audio', record)
+            if cached_audio is not None:
+                audio_file = Path(cached_audio)
+                self.events.status(job, "Reusing audio kept from an earlier job...")
+                record.add_artifact('audio', audio_file)
+            elif len(sections) == 1:
+                # Step 1: Download and transcribe with separate commands for cleaner output
+                if time_range is None:
+                    self.events.status(job, f"Downloading {platform} video and extracting audio...")
+                else:
+                    self.events.status(job, f"Downloading {section_label(*time_range)} of the {platform} video...")
+                with record.stage('download'):
+                    downloaded = self.download_audio(record, url, platform, time_range, duration=duration,
+                                                     progress=lambda fraction: self.events.progress(job, fraction))
+                
+                # Move the finished download into the job directory, named after the video's title
+                audio_file = Path(record.path(f"{name}{downloaded.suffix}" if name else downloaded.name))
+                os.replace(downloaded, audio_file)
+                # Listed right away, so the media cache also accounts for the audio of jobs that fail later
+                record.add_artifact('audio', audio_file)
+            else:
+                audio_file = None  # A preview section first, downloaded with the rest below
+            
+            # Step 2: Transcribe the audio, section by section when a preview comes first
+            raw_parts = []
+            parts = []
+            part_files = []
+            for index, (start, end) in enumerate(sections):
+                part = f"part{index + 1}" if len(sections) > 1 else ""
+                if audio_file is None:
+                    self.events.status(job, f"Downloading {section_label(start, end)} of the {platform} video...")
+                    with record.stage('download'):
+                        part_file = self.download_audio(record, url, platform, (start, end), part,
+                                                        self.section_length(start, end, info),
+                                                        lambda fraction: self.events.progress(job, fraction))
+                    part_files.append(part_file)
+                elif part:
+                    part_file = self.cut_audio(job, record, audio_file, start - sections[0][0],
+                                               None if end is None else end - sections[0][0], part)
+                else:
+                    part_file = audio_file
+                status = f"Transcribing {section_label(start, end)}..." if part else "Transcribing audio..."
+                raw, formatted = self.transcribe_audio(job, record, part_file, part_file.with_suffix('.txt'), status,
+                                                       f"{platform} transcription failed", offset=start, part=part)
+                raw_parts.append(raw)
+                parts.append(formatted)
+                if part and index == 0:
+                    self.publish_preview(job, record, raw, formatted, config)
+                    if self.section_ended_early(part_file, start, end):
+                        break
+            
+            if audio_file is None:
+                # Sections downloaded one by one are kept joined, like a whole download
+                audio_file = Path(record.path(f"{name}.wav" if name else part_files[0].name))
+                if keep_audio:
+                    from audio_prep import concat_wavs
+                    try:
+                        concat_wavs(part_files, audio_file)
+                        record.add_artifact('audio', audio_file)
+                    except (OSError, ValueError, EOFError) as e:
+                        print(f"Failed to keep the downloaded sections: {e}", file=sys.stderr)
+            
+            # The transcription of all sections, next to the audio
+            output_file = audio_file.with_suffix('.txt')
+            transcription_text = '\n\n'.join(raw.text for raw in raw_parts if raw.text)
+            if part_file != audio_file:
+                write_text_atomic(str(output_file), transcription_text)
+            record.add_artifact('text', output_file)
+            
+            # Clean up audio file if not keeping it; kept audio belongs to the media cache
+            if not keep_audio:
+                try:
+                    os.unlink(audio_file)
+                except:
+                    pass
+                record.remove_artifact('audio')
+            elif self.media_codec and audio_file.suffix.lower() == '.wav':
+                self.events.status(job, "Compressing kept audio...")
+                with record.stage('recompress'):
+                    self.recompress_audio(record, audio_file)
+            
+            # One transcript document per job; every stage reuses its spans and analyses
+            # For online videos, assume source language is English (most common)
+            transcript = Transcript(transcription_text, language="en")
+            formatted_transcription = parts[0] if len(parts) == 1 else Transcript.joined(parts, language="en")
+            
+            # Prepare results dictionary
+            results = {
+                'original': formatted_transcription.text,
+                'original_srt': self.create_srt_from_text(formatted_transcription)
+            }
+            record.add_artifact('transcript', self.store_transcript(formatted_transcription, output_file))
+            
+            # Generate translation if requested
+            if config['translate'] and transcription_text:
+                self.check_cancelled()
+                self.events.status(job, "Translating text...")
+                target_lang = config['target_lang']
+                # For online videos, assume source language is English (most common)
+                source_lang = "en"
+                with record.stage('translate'):
+                    translation = self.translate_text(formatted_transcription, source_lang, target_lang)
+                    results['translation'] = translation
+                    results['translated_srt'] = self.translate_srt_cues(results['original_srt'], source_lang, target_lang)
+            
+            # Generate summary if requested  
+            if summarize and transcription_text:
+                self.check_cancelled()
+                self.events.status(job, "Generating title and summary...")
+                with record.stage('summarize'):
+                    title, summary = self.generate_title_and_summary(transcript)
+                results['summary'] = f"{title}\n{summary}"
+            
+            # Write the requested formats straight from the results
+            self.check_cancelled()
+            with record.stage('export'):
+                record.add_artifacts(self.export_job_artifacts(results, formatted_transcription, output_file,
+                                                               config['target_lang']))
+                self.index_job(output_file, results, "en", config['target_lang'], url=url)
+            record.finish(title=self.job_title(results, info.title if info is not None and info.title
+                                                        else audio_file.stem))
+            self.trim_media_cache(cache)
+            
+            self.events.done(job, results)
+            
+        except Cancelled:
+            if record is not None:
+                record.discard()
+            self.events.error(job, "Cancelled")
+        except subprocess.TimeoutExpired as e:
+            self.fail_job(job, record, f"{platform} operation stalled (no progress for {e.timeout:.0f} s)")
+        except JobFailed as e:
+            self.fail_job(job, record, str(e))
+        except Exception as e:
+            self.fail_job(job, record, f"{platform} error: {str(e)}")
+        finally:
+            if record is not None:
+                import shutil
+                shutil.rmtree(record.path('.partial'), ignore_errors=True)
+            self.end_job(job)
+    
+    def run_local_transcription(self, job, config):
+        import subprocess
+        from pathlib import Path
+        from audio_prep import section_label
+        from media_cache import MediaCache
+        
+        file_path = config['file_path']
+        self.begin_job(job)
+        record = None
+        try:
+            summarize = config['summarize']
+            
+            # A file transcribed before with the same settings reuses that run's results
+            from fingerprints import FINGERPRINT_FILE, FingerprintIndex, settings_key
+            fingerprints = FingerprintIndex(self.fingerprint_path or FINGERPRINT_FILE)
+            run_settings = settings_key(self.local_job_settings(config))
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stat = None
+            previous, sample = self.previous_run(fingerprints, file_path, run_settings, stat)
+            if previous is not None:
+                self.events.status(job, "Unchanged since it was last transcribed; reusing those results")
+                self.events.done(job, *previous)
+                return
+            
+            # Everything this job writes goes into its own directory
+            record = JobRecord(config['output_dir'], 'local', Path(file_path).stem, source={
+                'file_path': file_path, 'translate': config['translate'],
+                'target_lang': config['target_lang'], 'summarize': summarize})
+            time_range = self.time_range(config)
+            if time_range is not None:
+                record.manifest['source']['time_range'] = list(time_range)
+            if stat is not None:
+                record.manifest['source'].update(size=stat.st_size, mtime=stat.st_mtime)
+                # Audio cut to a time range is cached apart from the whole file's
+                source_key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+                if time_range is not None:
+                    source_key += f"#t={section_label(*time_range)}"
+                record.set_cache_key('source', source_key)
+                if sample:
+                    record.set_cache_key('sample', sample)
+            
+            # yap gets just the audio track, not the whole video container
+            cache = MediaCache(config['output_dir'], self.media_cache_mb)
+            sections = self.job_sections(config)
+            audio_path = file_path
+            if len(sections) == 1 and stat is not None:
+                with record.stage('extract'):
+                    audio_path = self.prepare_audio(job, record, file_path, cache, decode=self.trim_silence,
+                                                    section=time_range)
+            
+            # Transcribe, section by section when a preview comes first; yap writes to a file for clean results
+            output_file = record.path(f"{Path(file_path).stem}_transcription.txt")
+            raw_parts = []
+            parts = []
+            part_output = output_file
+            for index, (start, end) in enumerate(sections):
+                part = f"part{index + 1}" if len(sections) > 1 else ""
+                if part:
+                    with record.stage('extract'):
+                        audio_path = self.cut_audio(job, record, file_path, start, end, part)
+                    part_output = audio_path.with_suffix('.txt')
+                status = f"Transcribing {section_label(start, end)}..." if part else "Transcribing audio..."
+                raw, formatted = self.transcribe_audio(job, record, audio_path, part_output, status,
+                                                       "Transcription failed", offset=start, part=part)
+                raw_parts.append(raw)
+                parts.append(formatted)
+                if part and index == 0:
+                    self.publish_preview(job, record, raw, formatted, config)
+                    if self.section_ended_early(audio_path, start, end):
+                        break
+            
+            transcription_text = '\n\n'.join(raw.text for raw in raw_parts if raw.text)
+            if part_output != output_file:
+                write_text_atomic(output_file, transcription_text)
+            if os.path.exists(output_file):
+                record.add_artifact('text', output_file)
+            transcription_text = transcription_text or "Transcription completed. Check output directory."
+            
+            # Process additional features
+            if not transcription_text.startswith("Transcription completed"):
+                # One transcript document per job; every stage reuses its spans and analyses
+                # For local videos, assume source language is English (most common)
+                transcript = Transcript(transcription_text, language="en")
+                formatted_transcription = parts[0] if len(parts) == 1 else Transcript.joined(parts, language="en")
+                
+                # Prepare results dictionary
+                results = {
+                    'original': formatted_transcription.text,
+                    'original_srt': self.create_srt_from_text(formatted_transcription)
+                }
+                record.add_artifact('transcript', self.store_transcript(formatted_transcription, output_file))
+                
+                # Generate translation if requested
+                if config['translate'] and transcription_text:
+                    self.check_cancelled()
+                    self.events.status(job, "Translating text...")
+                    target_lang = config['target_lang']
+                    # For local videos, assume source language is English (most common)
+                    source_lang = "en"
+                    with record.stage('translate'):
+                        translation = self.translate_text(formatted_transcription, source_lang, target_lang)
+                        results['translation'] = translation
+                        results['translated_srt'] = self.translate_srt_cues(results['original_srt'], source_lang, target_lang)
+                
+                # Generate summary if requested
+                if summarize and transcription_text:
+                    self.check_cancelled()
+                    self.events.status(job, "Generating title and summary...")
+                    with record.stage('summarize'):
+                        title, summary = self.generate_title_and_summary(transcript)
+                    results['summary'] = f"{title}\n{summary}"
+                
+                # Write the requested formats straight from the results
+                self.check_cancelled()
+                with record.stage('export'):
+                    record.add_artifacts(self.export_job_artifacts(results, formatted_transcription, output_file,
+                                                                   config['target_lang']))
+                    self.index_job(output_file, results, "en", config['target_lang'])
+                    record.add_artifact('results', self.save_results(record, results))
+            else:
+                results = {'original': transcription_text}
+            record.finish(title=self.job_title(results, Path(file_path).stem))
+            if 'results' in record.manifest['artifacts'] and stat is not None:
+                self.remember_run(fingerprints, file_path, stat, run_settings, record.directory, sample)
+            if 'audio' in record.manifest['artifacts']:
+                self.trim_media_cache(cache)
+            
+            self.events.done(job, results, output_file)
+            
+        except Cancelled:
+            if record is not None:
+                record.discard()
+            self.events.error(job, "Cancelled")
+        except subprocess.TimeoutExpired as e:
+            self.fail_job(job, record, f"Transcription stalled (no progress for {e.timeout:.0f} s)")
+        except JobFailed as e:
+            self.fail_job(job, record, str(e))
+        except Exception as e:
+            self.fail_job(job, record, str(e))
+        finally:
+            if record is not None:
+                import shutil
+                shutil.rmtree(record.path('.partial'), ignore_errors=True)
+            self.end_job(job)
+    
+    def prepare_audio(self, job, record, file_path, cache, decode=False, section=None):
+        """Audio track of a local file as 16 kHz mono WAV in the job directory, or the file itself
+        
+        Audio-only files are used as they are, unless decode asks for WAV (silence
+        trimming reads samples). So is a video when ffmpeg is missing or fails,
+        leaving yap to read the container as before. A section (start, end) is
+        always cut out, and failing to cut it fails the job.
+        """
+        import subprocess
+        from pathlib import Path
+        from audio_prep import extracted_name, has_video, is_audio_file, section_label, video_streams_command
+        
+        decode = (decode and not str(file_path).lower().endswith('.wav')) or section is not None
+        if is_audio_file(file_path) and not decode:
+            return file_path
+        
+        # A retry, or a run with other settings, takes over the audio extracted before
+        cached = cache.claim(record.manifest['cache_keys'].get('source'), 'audio', record)
+        if cached is not None:
+            self.events.status(job, "Reusing audio extracted by an earlier run...")
+            record.add_artifact('audio', cached)
+            return Path(cached)
+        
+        try:
+            probe = None if decode else self.run_process(video_streams_command(file_path), timeout=10)
+            if probe is not None and probe.returncode == 0 and not has_video(probe.stdout):
+                return file_path
+        except (OSError, subprocess.TimeoutExpired):
+            pass  # Without ffprobe, extraction is still worth trying
+        
+        if section is None:
+            self.events.status(job, "Extracting audio...")
+        else:
+            self.events.status(job, f"Cutting out {section_label(*section)}...")
+        staging_dir = record.path('.partial')
+        os.makedirs(staging_dir, exist_ok=True)
+        partial = os.path.join(staging_dir, extracted_name(file_path))
+        failed = self.extract_audio(file_path, partial, section)
+        if failed and section is not None:
+            raise JobFailed(f"Cutting out {section_label(*section)} failed: {failed}")
+        if failed:
+            print(f"Audio extraction failed, transcribing {file_path} directly: {failed}", file=sys.stderr)
+            return file_path
+        
+        audio_file = record.path(extracted_name(file_path))
+        os.replace(partial, audio_file)
+        record.add_artifact('audio', audio_file)
+        return Path(audio_file)
+    
+    def extract_audio(self, source, target, section=None):
+        """Write the audio (of a section) of source to target as 16 kHz mono WAV; returns an error or None"""
+        import subprocess
+        from audio_prep import extract_audio_command
+        
+        try:
+            result = self.run_process(extract_audio_command(source, target, *(section or ())),
+                                      stall_timeout=DOWNLOAD_STALL, progress=lambda: output_size(target))
+            failed = result.returncode != 0 and (result.stderr.strip() or "ffmpeg failed")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            failed = str(e) or "ffmpeg stalled"
+        if not failed and not os.path.exists(target):
+            failed = "ffmpeg wrote no audio"
+        return failed or None
+    
+    def cut_audio(self, job, record, source, start, end, part):
+        """A section of a media file as WAV in the job's staging directory, for one part of a job"""
+        from pathlib import Path
+        from audio_prep import extracted_name, section_label
+        
+        self.events.status(job, f"Cutting out {section_label(start, end)}...")
+        staging_dir = os.path.join(record.path('.partial'), part)
+        os.makedirs(staging_dir, exist_ok=True)
+        target = Path(staging_dir) / extracted_name(source)
+        failed = self.extract_audio(source, target, (start, end))
+        if failed:
+            raise JobFailed(f"Cutting out {section_label(start, end)} failed: {failed}")
+        return target
+    
+    def download_audio(self, record, url, platform, section=None, part="", duration=None, progress=None):
+        """Download the audio of a video, or of a section (start, end) of it, as WAV into the staging directory
+        
+        duration is the length of what is downloaded, when known; long downloads get a longer stall window.
+        progress(fraction) is told how far an in-process download has come.
+        """
+        from pathlib import Path
+        
+        # Use only the video ID as the filename to avoid "filename too long" errors
+        # yt-dlp downloads into a staging directory, so partial downloads never mix with finished files
+        staging_dir = os.path.join(record.path('.partial'), part)
+        os.makedirs(staging_dir, exist_ok=True)
+        
+        library = self.yt_dlp_library()
+        if library is not None:
+            def hook(downloaded, total):
+                # Called by yt-dlp as data arrives: the place to stop a cancelled download
+                self.check_cancelled()
+                if progress is not None and total:
+                    progress(min(1.0, downloaded / total))
+            
+            try:
+                library.download_audio(url, staging_dir, section, hook)
+                audio_files = list(Path(staging_dir).glob("*.wav"))
+                if audio_files:
+                    return max(audio_files, key=os.path.getctime)
+                print(f"yt-dlp library wrote no audio for {url}, running the command", file=sys.stderr)
+            except Exception as e:
+                print(f"yt-dlp library download failed, running the command: {e}", file=sys.stderr)
+            import shutil
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            os.makedirs(staging_dir, exist_ok=True)
+        
+        download_cmd = ['yt-dlp', url, '-x', '--audio-format', 'wav', '--newline']
+        if section is not None:
+            start, end = section
+            # Only the requested section is fetched (yt-dlp cuts it with ffmpeg while downloading)
+            download_cmd += ['--download-sections', f"*{start:g}-{'inf' if end is None else f'{end:g}'}"]
+        download_cmd += ['--output', f'{staging_dir}/%(id)s.%(ext)s']
+        
+        # Progress: yt-dlp's progress lines and the growing files in the staging directory
+        result = self.run_process(download_cmd, stall_timeout=download_stall(duration),
+                                  progress=lambda: output_size(staging_dir))
+        if result.returncode != 0:
+            raise JobFailed(f"{platform} download failed: {result.stderr}")
+        
+        # Find the downloaded audio file
+        audio_files = list(Path(staging_dir).glob("*.wav"))
+        if not audio_files:
+            raise JobFailed(f"No audio file found after {platform} download")
+        return max(audio_files, key=os.path.getctime)
+    
+    def transcribe_audio(self, job, record, audio_path, output_file, status, failure, offset=0.0, part=""):
+        """Run yap on audio, silence trimmed and sped up as set; returns the transcript and its formatted version
+        
+        The formatted version carries its cue times in original media time, with
+        `offset` the media time the audio starts at. Raises JobFailed when yap fails.
+        """
+        speech_path, time_map = self.trim_audio_silence(job, record, audio_path, part)
+        yap_path, speed = self.speed_up_audio(job, record, speech_path)
+        
+        self.events.status(job, status)
+        with record.stage('transcribe'):
+            stall = transcription_stall(self.media_duration(yap_path))
+            result = self.run_process(['yap', str(yap_path), '-o', str(output_file)], stall_timeout=stall,
+                                      progress=lambda: output_size(output_file))
+        
+        if result.returncode != 0:
+            # If output file wasn't created, try to get error from stderr
+            error_msg = result.stderr.strip() or result.stdout.strip() or "Unknown transcription error"
+            raise JobFailed(f"{failure}: {error_msg}")
+        
+        # Read the clean transcription from the output file, or fall back to stdout
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                transcription_text = f.read().strip()
+        except OSError:
+            transcription_text = result.stdout.strip()
+        
+        # For videos, assume source language is English (most common)
+        transcript = Transcript(transcription_text, language="en")
+        return transcript, self.original_timing(transcript.formatted, time_map, speed, offset)
+    
+    def time_range(self, config):
+        """(start, end) seconds a job is limited to, or None for all of the media; end None runs to the end"""
+        start, end = config.get('time_range') or (None, None)
+        if not start and end is None:
+            return None
+        start = float(start or 0)
+        if end is not None and end <= start:
+            raise JobFailed("The time range ends before it starts")
+        return start, None if end is None else float(end)
+    
+    def job_sections(self, config, duration=None):
+        """(start, end) sections of the media a job transcribes in turn
+        
+        With preview-first, the first preview_minutes come as a section of their
+        own, so their transcript and summary are out before the rest is done.
+        Media known (duration) to end within the preview is one section.
+        """
+        start, end = self.time_range(config) or (0.0, None)
+        stop = end if end is not None else duration
+        preview = (config.get('preview_minutes') or 0) * 60
+        if preview and (stop is None or start + preview < stop):
+            return [(start, start + preview), (start + preview, end)]
+        return [(start, end)]
+    
+    def section_length(self, start, end, info):
+        """Seconds of media in a section, or None when the video's length is unknown and the section runs to its end"""
+        if end is None:
+            end = info.duration if info is not None else None
+        return None if end is None else max(0.0, end - start)
+    
+    def video_info(self, job, url, config):
+        """Metadata of an online video: prefetched with the job, else looked up now; None when unavailable"""
+        from video_metadata import VideoInfo, fetch_metadata
+        
+        if config.get('metadata'):
+            return VideoInfo(**config['metadata'])
+        self.events.status(job, "Reading video details...")
+        return fetch_metadata(url, self.run_process, self.yt_dlp_library())
+    
+    def yt_dlp_library(self):
+        """This process's in-process yt-dlp, or None to run the command (setting off or package missing)"""
+        if not self.ytdlp_library:
+            return None
+        if self.yt_dlp is None:
+            from ytdlp_library import YtDlpLibrary, has_yt_dlp
+            self.yt_dlp = YtDlpLibrary() if has_yt_dlp() else False
+        return self.yt_dlp or None
+    
+    def check_video_length(self, info, time_range):
+        """Seconds of video a job downloads (None when unknown); raises JobFailed when over the length limit"""
+        from audio_prep import format_time
+        
+        start, end = time_range or (0.0, None)
+        length = self.section_length(start, end, info)
+        if length is not None and self.max_video_minutes and length > self.max_video_minutes * 60:
+            raise JobFailed(f"Video too long: {format_time(length)} to transcribe, "
+                            f"the limit is {self.max_video_minutes} minutes")
+        return length
+    
+    def prefetch_metadata(self, job, config):
+        """Metadata job: {url: VideoInfo as a dict, or None} for config['urls'], looked up in parallel"""
+        from video_metadata import prefetch_metadata
+        
+        token = self.begin_job(job)
+        
+        # Lookups run on pool threads, which must see this job's token
+        def run(cmd, **kwargs):
+            self.local.token = token
+            return self.run_process(cmd, **kwargs)
+        
+        try:
+            infos = prefetch_metadata(config['urls'], run, library=self.yt_dlp_library())
+            self.events.done(job, {url: info._asdict() if info is not None else None for url, info in infos.items()})
+        except Cancelled:
+            self.events.error(job, "Cancelled")
+        finally:
+            self.end_job(job)
+    
+    def section_ended_early(self, audio_path, start, end):
+        """Whether the media ended inside a section, leaving nothing after it"""
+        duration = self.media_duration(audio_path)
+        return duration is not None and end is not None and duration < end - start - 1
+    
+    def publish_preview(self, job, record, transcript, formatted, config):
+        """Results for the first section, shown while the rest is transcribed"""
+        preview = {'original': formatted.text, 'original_srt': self.create_srt_from_text(formatted)}
+        if config['summarize'] and transcript.text:
+            self.check_cancelled()
+            self.events.status(job, "Summarizing the preview...")
+            with record.stage('preview'):
+                title, summary = self.generate_title_and_summary(transcript)
+            preview['summary'] = f"{title}\n{summary}"
+        self.events.partial(job, 'preview', preview)
+    
+    def trim_audio_silence(self, job, record, audio_path, part=""):
+        """Audio with its silences cut, for yap, and the TimeMap back to the original
+        
+        Returns the audio unchanged (and no map) when trimming is off, NumPy is
+        missing, the audio is not WAV or there is too little silence to matter.
+        """
+        from vad import has_numpy
+        
+        if not self.trim_silence or not str(audio_path).lower().endswith('.wav'):
+            return audio_path, None
+        if not has_numpy():
+            print("Silence trimming needs NumPy (pip install numpy); transcribing all audio", file=sys.stderr)
+            return audio_path, None
+        
+        import wave
+        from vad import trim_silence
+        
+        self.check_cancelled()
+        self.events.status(job, "Detecting speech...")
+        staging_dir = record.path('.partial')
+        os.makedirs(staging_dir, exist_ok=True)
+        speech_path = os.path.join(staging_dir, "speech.wav")
+        try:
+            with record.stage('vad'):
+                time_map = trim_silence(audio_path, speech_path)
+        except (OSError, ValueError, EOFError, MemoryError, wave.Error) as e:
+            print(f"Silence trimming failed, transcribing all audio: {e}", file=sys.stderr)
+            return audio_path, None
+        if time_map is None:
+            return audio_path, None
+        
+        # The map stays with the job, so its cue times can be traced back
+        role = f"time_map_{part}" if part else 'time_map'
+        map_file = record.path(f"{role}.json")
+        time_map.save(map_file)
+        record.add_artifact(role, map_file)
+        self.events.status(job, f"Skipping {time_map.removed:.0f} s of silence "
+                                f"({time_map.removed / time_map.duration:.0%} of the audio)")
+        return speech_path, time_map
+    
+    def speed_up_audio(self, job, record, audio_path):
+        """Audio played at the speed profile's speed, for yap, and that speed
+        
+        Returns the audio unchanged at speed 1.0 for the accurate profile, or
+        when ffmpeg is missing or fails.
+        """
+        import subprocess
+        from audio_prep import profile_speed, speed_up_command
+        
+        speed = profile_speed(self.speed_profile)
+        if speed == 1.0:
+            return audio_path, 1.0
+        
+        self.check_cancelled()
+        self.events.status(job, f"Speeding audio up {speed:g}x...")
+        staging_dir = record.path('.partial')
+        os.makedirs(staging_dir, exist_ok=True)
+        fast_path = os.path.join(staging_dir, "fast.wav")
+        try:
+            with record.stage('speed'):
+                result = self.run_process(speed_up_command(audio_path, fast_path, speed),
+                                          stall_timeout=DOWNLOAD_STALL, progress=lambda: output_size(fast_path))
+            failed = result.returncode != 0 and (result.stderr.strip() or "ffmpeg failed")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            failed = str(e) or "ffmpeg stalled"
+        if failed or not os.path.exists(fast_path):
+            print(f"Speeding audio up failed, transcribing at normal speed: {failed}", file=sys.stderr)
+            return audio_path, 1.0
+        record.manifest['speed'] = speed
+        return fast_path, speed
+    
+    def original_timing(self, transcript, time_map, speed=1.0, offset=0.0):
+        """Transcript with its cue times moved from the audio yap heard back to the original media
+        
+        Recognizer timings are in sped-up time and are scaled back first; estimated
+        timings already assume a natural speaking pace. Then silence cut out is put
+        back, and offset added for audio that starts later in the media.
+        """
+        if speed != 1.0 and transcript.has_timings:
+            transcript = transcript.retimed(lambda start, end: (start * speed, end * speed))
+        if time_map is not None:
+            transcript = transcript.retimed(time_map.span)
+        if offset:
+            transcript = transcript.retimed(lambda start, end: (start + offset, end + offset))
+        return transcript
+    
+    def local_job_settings(self, config):
+        """The settings that change a local job's results; a run is reused only when all match"""
+        settings = {'output_dir': os.path.abspath(config['output_dir']), 'export_formats': self.export_formats,
+                    'summarize': config['summarize'], 'translate': config['translate']}
+        if config['translate']:
+            settings['target_lang'] = config['target_lang']
+        if config['translate'] or config['summarize']:
+            settings['model'] = self.model
+        if self.trim_silence:
+            settings['trim_silence'] = True
+        if self.speed_profile != DEFAULT_SETTINGS['speed_profile']:
+            settings['speed_profile'] = self.speed_profile
+        time_range = self.time_range(config)
+        if time_range is not None:
+            settings['time_range'] = list(time_range)
+        return settings
+    
+    def previous_run(self, fingerprints, file_path, settings, stat):
+        """(results, output_file) of an earlier successful run on the same file and settings, or None
+        
+        Also returns the sampled hash computed on the way, for recording this run.
+        """
+        if stat is None:
+            return None, None
+        try:
+            fingerprint, sample = fingerprints.lookup(file_path, settings, stat)
+            if fingerprint is None:
+                return None, sample
+            manifest = load_manifest(fingerprint.job_dir)
+            artifacts = manifest['artifacts']
+            if manifest.get('status') != 'done' or 'results' not in artifacts or 'text' not in artifacts:
+                return None, sample
+            with open(os.path.join(fingerprint.job_dir, artifacts['results']), 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            return (results, os.path.join(fingerprint.job_dir, artifacts['text'])), sample
+        except Exception as e:
+            # Missing or damaged earlier results just mean transcribing again
+            print(f"Not reusing an earlier run of {file_path}: {e}", file=sys.stderr)
+            return None, None
+    
+    def save_results(self, record, results):
+        """Keep a job's results, so an unchanged file can reuse them without running again"""
+        try:
+            return write_text_atomic(record.path('results.json'), json.dumps(results, ensure_ascii=False))
+        except OSError as e:
+            print(f"Failed to save job results: {e}", file=sys.stderr)
+            return None
+    
+    def remember_run(self, fingerprints, file_path, stat, settings, job_dir, sample):
+        try:
+            fingerprints.record(file_path, stat, settings, job_dir, sample)
+        except Exception as e:
+            print(f"Failed to record fingerprint of {file_path}: {e}", file=sys.stderr)
+    
+    def job_name_from_url(self, url):
+        """Short name for a job directory: the video id where the URL has one"""
+        from urllib.parse import parse_qs, urlparse
+        
+        parsed = urlparse(url)
+        video_id = parse_qs(parsed.query).get('v', [None])[0]
+        return video_id or parsed.path.rstrip('/').rsplit('/', 1)[-1] or parsed.netloc
+    
+    def job_title(self, results, fallback):
+        """Title shown for a finished job: the generated title, else a file or video name"""
+        summary = results.get('summary') or ""
+        if summary and not summary.startswith("⚠️"):
+            return summary.split('\n', 1)[0].strip() or fallback
+        return fallback
+    
+    def fail_job(self, job, record, message):
+        """Report a failed job; its directory stays, marked as failed in its manifest and the catalog"""
+        if record is not None:
+            try:
+                record.finish('failed', error=message)
+            except OSError as e:
+                print(f"Failed to record job failure: {e}", file=sys.stderr)
+        self.events.error(job, message)
+    
+    def recompress_audio(self, record, audio_file):
+        """Replace kept WAV audio with a speech-grade encoding; the WAV stays if that fails"""
+        import subprocess
+        from media_cache import recompress_command
+        
+        cmd, target = recompress_command(audio_file, self.media_codec)
+        try:
+            result = self.run_process(cmd, stall_timeout=DOWNLOAD_STALL, progress=lambda: output_size(target))
+            failed = result.returncode != 0 and result.stderr.strip()
+        except (OSError, subprocess.TimeoutExpired) as e:
+            failed = str(e) or "timed out"
+        if failed:
+            print(f"Failed to recompress {audio_file}: {failed}", file=sys.stderr)
+            if os.path.exists(target):
+                os.unlink(target)
+            return audio_file
+        os.unlink(audio_file)
+        record.add_artifact('audio', target)
+        return target
+    
+    def trim_media_cache(self, cache):
+        """Evict least recently used media once a job has finished; never fails the job"""
+        try:
+            evicted = cache.evict()
+            if evicted:
+                print(f"Media cache: evicted {len(evicted)} file(s) to stay within "
+                      f"{self.media_cache_mb} MB", file=sys.stderr)
+        except (OSError, ValueError) as e:
+            print(f"Failed to trim media cache: {e}", file=sys.stderr)
+    
+    def store_transcript(self, transcript, output_file):
+        """Save the compact transcript container next to the plain text output"""
+        try:
+            return save_transcript(os.path.splitext(output_file)[0] + TRANSCRIPT_EXTENSION, transcript)
+        except Exception as e:
+            print(f"Failed to save compact transcript: {e}", file=sys.stderr)
+            return None
+    
+    def export_job_artifacts(self, results, transcript, output_file, target_lang=None):
+        """Write the configured export formats for a job straight from its results"""
+        base_path = os.path.splitext(output_file)[0]
+        try:
+            paths = export_document(transcript, base_path, self.export_formats)
+            
+            # Translated subtitles in every requested subtitle format
+            subtitle_formats = [fmt for fmt in self.export_formats if fmt in ('srt', 'vtt')]
+            translated_srt = results.get('translated_srt', '')
+            if subtitle_formats and translated_srt[:1].isdigit():
+                translated = export_document(SrtDocument(translated_srt, target_lang),
+                                             f"{base_path}.{target_lang}", subtitle_formats)
+                paths.update({f"translated_{fmt}": path for fmt, path in translated.items()})
+            return paths
+        except Exception as e:
+            print(f"Failed to export job artifacts: {e}", file=sys.stderr)
+            return {}
+    
+    def index_job(self, output_file, results, source_lang, target_lang=None, url=None):
+        """Add a finished job to the search index; indexing problems never fail the job"""
+        try:
+            from transcript_index import INDEX_FILE, TranscriptIndex, job_rows
+            
+            title = self.job_title(results, None)
+            languages = [source_lang] + ([target_lang] if 'translation' in results and target_lang else [])
+            language_text = ' '.join(f"{code} {get_language_name(code)}" for code in languages)
+            rows = job_rows(results, title=title, url=url, languages=language_text)
+            TranscriptIndex(self.index_path or INDEX_FILE).add_document(
+                str(output_file), rows, title=title, url=url, source_lang=source_lang,
+                target_lang=target_lang if 'translation' in results else None)
+        except Exception as e:
+            print(f"Failed to index job: {e}", file=sys.stderr)
+    
+    def format_text_in_paragraphs(self, text):
+        """Format text into readable paragraphs"""
+        if not text:
+            return text
+        return Transcript.coerce(text).formatted.text
+    
+    def create_srt_from_text(self, text, is_translation=False):
+        """Convert text to SRT subtitle format"""
+        document = Transcript.coerce(text)
+        if not document.text or document.startswith("⚠️"):
+            return "No content available for SRT generation"
+        
+        if is_translation and "TITLE:" in document.text:
+            # Extract just the translation part
+            translation_lines = []
+            found_translation = False
+            for line in document.text.split('\n'):
+                if line.startswith("TRANSLATION:"):
+                    found_translation = True
+                elif found_translation and line.strip() and not line.startswith("="):
+                    translation_lines.append(line.strip())
+            if translation_lines:
+                document = Transcript(' '.join(translation_lines), language=document.language)
+        
+        # Segments carry real timings when known, otherwise 4 seconds per sentence
+        cues = [Cue(i + 1, segment.start_time, segment.end_time, document.slice(segment))
+                for i, segment in enumerate(document.segments)]
+        
+        if not cues:
+            return "No suitable content for SRT generation"
+        
+        return format_srt(cues)
+    
+    def generate_title_and_summary(self, text):
+        """Generate title with emojis and article-style summary using OpenRouter API"""
+        try:
+            api_key = self.get_api_key()
+            
+            if not api_key:
+                return "⚠️ OpenRouter API key required for AI summaries.\n\nPlease enter your API key in Settings tab."
+            
+            model = self.get_translation_model()
+            
+            # Generate article-style summary with title and content
+            article_payload = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system", 
+                        "content": """You are an expert content writer specializing in creating engaging article summaries. Create a concise article (maximum 200 words) with:
+
+1. Create a catchy, relevant title with 2-3 emojis based on the transcript content
+2. Write a concise summary in 2-3 clear paragraphs:
+   - Focus on the main points and key information
+   - Use engaging, natural prose
+   - Keep the total word count to a maximum of 200 words
+   - Make the content informative and easy to read
+   - Preserve important details and technical terms
+3. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "SUMMARY:", "ARTICLE:", etc.
+
+Return ONLY the content in this format:
+🌍 Your Actual Title Here 🌎
+
+[First paragraph - main topic or introduction]
+
+[Second paragraph - key points or details]
+
+[Third paragraph - additional information or conclusion if needed]
+
+IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]"""
+                    },
+                    {
+                        "role": "user", 
+                        "content": str(text)
+                    }
+                ],
+                "max_tokens": 600,
+                "temperature": 0.2
+            }
+            
+            result = self.make_openrouter_request(article_payload)
+            
+            if result.startswith("⚠️"):
+                return "⚠️ API Error", result
+            
+            # Parse the result to extract title and summary (no labels expected)
+            title, summary_lines = split_title_and_paragraphs(result)
+            
+            if title and summary_lines:
+                summary_text = '\n\n'.join(summary_lines)
+                return title, summary_text
+            else:
+                # Fallback: just return the result as-is if parsing fails
+                return "Summary", result
+                
+        except Exception as e:
+            return "Summary Error", f"Summary error: {str(e)}"
+    
+    def make_openrouter_request(self, payload):
+        """Make a request to OpenRouter API"""
+        import subprocess
+        import tempfile
+        
+        try:
+            api_key = self.get_api_key()
+            
+            # Write payload to temporary file; the response is streamed so progress can be watched
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+                json.dump(dict(payload, stream=True), f)
+                payload_file = f.name
+            
+            try:
+                # Use curl to make the request to OpenRouter
+                curl_cmd = [
+                    'curl', '-s', '-N', '-X', 'POST',
+                    'https://openrouter.ai/api/v1/chat/completions',
+                    '-H', f'Authorization: Bearer {api_key}',
+                    '-H', 'Content-Type: application/json',
+                    '-H', 'HTTP-Referer: https://github.com/yap-gui',
+                    '-H', 'X-Title: Yap GUI AI Summary',
+                    '-d', f'@{payload_file}'
+                ]
+                
+                result = self.run_process(curl_cmd, stall_timeout=API_STALL)
+                
+                if result.returncode == 0:
+                    response_data = read_completion(result.stdout)
+                    
+                    if 'choices' in response_data and len(response_data['choices']) > 0:
+                        return response_data['choices'][0]['message']['content'].strip()
+                    elif 'error' in response_data:
+                        error_msg = response_data['error'].get('message', 'Unknown API error')
+                        return f"⚠️ OpenRouter API Error: {error_msg}"
+                    else:
+                        return "⚠️ Unexpected API response format"
+                else:
+                    return f"⚠️ API request failed: {result.stderr}"
+                    
+            finally:
+                # Clean up temp file
+                try:
+                    os.unlink(payload_file)
+                except:
+                    pass
+                    
+        except json.JSONDecodeError as e:
+            return f"⚠️ Invalid API response: {str(e)}"
+        except subprocess.TimeoutExpired as e:
+            return f"⚠️ API request stalled (no response for {e.timeout:.0f} s)"
+        except Exception as e:
+            return f"⚠️ API error: {str(e)}"
+    
+    def has_good_paragraph_structure(self, text):
+        """Analyze if text already has good paragraph structure"""
+        return Transcript.coerce(text).has_good_structure
+    
+    def translate_locally_then_enhance(self, text, source_lang, target_lang):
+        """Hybrid approach: Preserve good paragraphs or create smart ones with AI"""
+        try:
+            # Step 1: Analyze paragraph structure (cached on the transcript)
+            text = Transcript.coerce(text, language=source_lang)
+            has_good_paragraphs = self.has_good_paragraph_structure(text)
+            
+            if has_good_paragraphs:
+                # Good structure exists - use local translation + minimal enhancement
+                local_translation = self.translate_with_apple_live_translation(text, source_lang, target_lang)
+                
+                if local_translation.startswith("⚠️"):
+                    # If local translation fails, fallback to full OpenRouter translation
+                    return self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
+                
+                # Use OpenRouter only for title generation and formatting
+                return self.enhance_translation_with_openrouter(local_translation, target_lang)
+            
+            else:
+                # Poor structure - use full OpenRouter for smart paragraph creation
+                print("Poor paragraph structure detected, using AI for smart paragraphs", file=sys.stderr)
+                return self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
+            
+        except Exception as e:
+            return f"⚠️ Translation error: {str(e)}"
+    
+    def translate_with_apple_live_translation(self, text, source_lang, target_lang):
+        """Use Apple's native Live Translation framework"""
+        try:
+            if not load_translation_framework():
+                return self.translate_with_local_tool_fallback(text, source_lang, target_lang)
+            
+            # Try to use Apple's Translation framework
+            try:
+                # Import Translation framework classes
+                from Translation import _LTTranslator
+                
+                # Create translator instance
+                translator = _LTTranslator.alloc().init()
+                
+                # Get Apple language codes
+                source_code = get_apple_lang_code(source_lang)
+                target_code = get_apple_lang_code(target_lang)
+                
+                # Translate paragraph by paragraph to preserve structure
+                translated_chunks = []
+                
+                for paragraph in Transcript.coerce(text).iter_paragraphs():
+                    self.check_cancelled()
+                    # Translate with Apple's framework
+                    translated = translator.translateText_fromLocale_toLocale_(
+                        paragraph, source_code, target_code)
+                    
+                    if translated:
+                        translated_chunks.append(str(translated))
+                    else:
+                        translated_chunks.append(paragraph)
+                
+                # Combine translated paragraphs
+                full_translation = '\n\n'.join(translated_chunks)
+                return full_translation
+                
+            except Exception as e:
+                print(f"Apple Translation error: {e}", file=sys.stderr)
+                return self.translate_with_local_tool_fallback(text, source_lang, target_lang)
+                
+        except Exception as e:
+            return f"⚠️ Apple Translation error: {str(e)}"
+    
+    def translate_shell(self):
+        """Path of translate-shell's `trans`, or None; found once per pipeline without running it"""
+        if self.trans_path is None:
+            import shutil
+            
+            # Apps started from Finder do not get Homebrew's directory on their PATH
+            homebrew = '/opt/homebrew/bin/trans'
+            self.trans_path = shutil.which('trans') or (homebrew if os.access(homebrew, os.X_OK) else False)
+        return self.trans_path or None
+    
+    def translate_with_local_tool_fallback(self, text, source_lang, target_lang):
+        """Fallback to translate-shell when Apple Translation is not available"""
+        import subprocess
+        
+        try:
+            trans = self.translate_shell()
+            if trans is None:
+                return "⚠️ translate-shell not available. Install with: brew install translate-shell"
+            
+            # Language mapping for translate-shell
+            translate_lang_codes = {
+                "en": "en", "es": "es", "fr": "fr", "de": "de", "it": "it",
+                "pt": "pt", "ja": "ja", "ko": "ko", 
+                "zh": "zh", "ru": "ru", "ar": "ar"
+            }
+            
+            target_code = translate_lang_codes.get(target_lang, target_lang)
+            
+            # Paragraph-sized chunks, long paragraphs split at sentence boundaries
+            max_chunk_size = 4000  # Conservative limit for command line
+            chunks = list(Transcript.coerce(text).chunks(max_chunk_size))
+            
+            # Translate each chunk
+            translated_chunks = []
+            for i, chunk in enumerate(chunks):
+                try:
+                    # Use translate-shell command with auto-detection for source language
+                    if target_code == 'en':
+                        # When translating TO English, auto-detect source language
+                        cmd = [trans, '-b', f':{target_code}']
+                    else:
+                        # When translating FROM English, specify English as source
+                        cmd = [trans, '-b', f'en:{target_code}']
+                    result = self.run_process(cmd, input=chunk,
+                                              stall_timeout=TRANSLATE_STALL + len(chunk) * TRANSLATE_STALL_PER_CHAR)
+                    
+                    if result.returncode == 0 and result.stdout.strip():
+                        translated_chunks.append(result.stdout.strip())
+                    else:
+                        return f"⚠️ Local translation failed for chunk {i+1}: {result.stderr}"
+                        
+                except subprocess.TimeoutExpired:
+                    return f"⚠️ Translation stalled for chunk {i+1}"
+                except Exception as e:
+                    return f"⚠️ Translation error for chunk {i+1}: {str(e)}"
+            
+            # Combine all translated chunks preserving paragraph structure
+            full_translation = '\n\n'.join(translated_chunks)
+            return full_translation
+            
+        except Exception as e:
+            return f"⚠️ Local translation error: {str(e)}"
+    
+    def enhance_translation_with_openrouter(self, translated_text, target_lang):
+        """Use OpenRouter only for title generation and paragraph formatting of already-translated text"""
+        try:
+            api_key = self.get_api_key()
+            
+            if not api_key:
+                # Return the translation without enhancement if no API key
+                return translated_text
+            
+            # Get language name
+            target_lang_name = get_language_name(target_lang)
+            model = self.get_translation_model()
+            
+            # Enhanced prompt for creating an article with title, emojis, and prose paragraphs (max 200 words)
+            enhancement_prompt = f"""You are an expert content writer and editor specializing in creating engaging articles. The text below is ALREADY translated to {target_lang_name}.
+
+Your task is to create a concise article (maximum 200 words) with:
+1. Create a catchy, relevant title with 2-3 emojis based on the content (in {target_lang_name})
+2. Write the content in clear, engaging prose with well-structured paragraphs:
+   - Break the content into 2-4 coherent paragraphs
+   - Each paragraph should focus on a specific aspect or theme
+   - Use smooth transitions between paragraphs
+   - Write in a natural, flowing style that's easy to read
+   - Maintain the key information and main points from the original
+3. DO NOT retranslate - only restructure and enhance the existing translation
+4. Keep the total word count to a maximum of 200 words
+5. Preserve important details, names, numbers, and technical terms
+6. Make the content engaging and informative while being concise
+7. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "ARTICLE:", "TRANSLATION:", "SUMMARY:", etc.
+
+Return ONLY the content in this format:
+🌍 Your Actual Title Here 🌎
+
+[First paragraph - introduction or main topic, engaging opening]
+
+[Second paragraph - supporting details or development of ideas]
+
+[Third paragraph - additional points or conclusion if needed]
+
+IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]".
+
+Here is the already-translated text to create an article from:"""
+            
+            payload = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system", 
+                        "content": enhancement_prompt
+                    },
+                    {
+                        "role": "user", 
+                        "content": translated_text
+                    }
+                ],
+                "max_tokens": 2500,
+                "temperature": 0.3
+            }
+            
+            result = self.make_openrouter_request(payload)
+            
+            # Parse the result to extract title and formatted text
+            if result.startswith("⚠️"):
+                # Return local translation if enhancement fails
+                return translated_text
+            
+            # Extract title and article content (no labels expected)
+            title, article_lines = split_title_and_paragraphs(result)
+            
+            if title and article_lines:
+                article_text = '\n\n'.join(article_lines)
+                # Return just the title and content without any labels
+                return f"{title}\n\n{article_text}"
+            else:
+                # Fallback: return the local translation without any labels
+                return translated_text
+                
+        except Exception:
+            # Return local translation if enhancement fails
+            return translated_text
+    
+    def translate_with_title_and_paragraphs(self, text, source_lang, target_lang):
+        """Translate text with title generation and paragraph formatting using OpenRouter API (fallback method)"""
+        try:
+            api_key = self.get_api_key()
+            
+            if not api_key:
+                return "⚠️ OpenRouter API key required.\n\nPlease enter your API key in Settings tab or set OPENROUTER_API_KEY environment variable.\n\nGet a key at: https://openrouter.ai/keys"
+            
+            # Get language names
+            source_lang_name = get_language_name(source_lang)
+            target_lang_name = get_language_name(target_lang)
+            model = self.get_translation_model()
+            
+            # Enhanced prompt for creating an article with translation, title, and emojis (max 200 words)
+            enhanced_prompt = f"""You are a professional translator and expert content writer specializing in creating engaging articles. Please:
+
+1. Create a catchy, relevant title with 2-3 emojis based on the content (in {target_lang_name})
+2. Translate the entire text from {source_lang_name} to {target_lang_name} with high accuracy and natural flow
+3. Create a concise article (maximum 200 words) with clear, engaging prose:
+   - Break the content into 2-4 coherent paragraphs
+   - Each paragraph should focus on a specific aspect or theme
+   - Use smooth transitions between paragraphs
+   - Write in a natural, flowing style that's easy to read
+   - Maintain the key information and main points from the original
+4. Keep the total word count to a maximum of 200 words
+5. Preserve important details, names, numbers, and technical terms
+6. Make the content engaging and informative while being concise
+7. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "ARTICLE:", "TRANSLATION:", "SUMMARY:", etc.
+
+Return ONLY the content in this format:
+🌍 Your Actual Title Here 🌎
+
+[First paragraph - introduction or main topic, engaging opening]
+
+[Second paragraph - supporting details or development of ideas]
+
+[Third paragraph - additional points or conclusion if needed]
+
+IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]".
+
+Here is the text to translate and create an article from:"""
+            
+            payload = {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "system", 
+                        "content": enhanced_prompt
+                    },
+                    {
+                        "role": "user", 
+                        "content": str(text)
+                    }
+                ],
+                "max_tokens": 2500,
+                "temperature": 0.2  # Slightly higher for more creative titles
+            }
+            
+            result = self.make_openrouter_request(payload)
+            
+            # Parse the result to extract title and translation
+            if result.startswith("⚠️"):
+                return result
+            
+            # Extract title and article from formatted response (no labels expected)
+            title, article_lines = split_title_and_paragraphs(result)
+            
+            if title and article_lines:
+                article_text = '\n\n'.join(article_lines)
+                return f"{title}\n\n{article_text}"
+            else:
+                # Fallback: just return the result as-is if parsing fails
+                return result
+                    
+        except Exception as e:
+            return f"⚠️ Translation error: {str(e)}"
+    
+    def translate_srt_cues(self, srt_content, source_lang, target_lang):
+        """Translate subtitles cue by cue, keeping the original cue count and timings"""
+        if not srt_content or not srt_content[0].isdigit():
+            # No cues were generated for the original (e.g. "No content available...")
+            return srt_content
+        
+        # Cue windows are translated on pool threads, which must see this job's token
+        token = self.cancel_token()
+        
+        def translate(text, source, target):
+            self.local.token = token
+            return self.translate_with_apple_live_translation(text, source, target)
+        
+        translator = SubtitleTranslator(translate,
+                                        memory=self.translation_memory,
+                                        max_workers=self.translation_workers)
+        return translator.translate_srt(srt_content, source_lang, target_lang)
+    
+    def translate_text(self, text, source_lang, target_lang):
+        """Main translation method - uses local macOS translation then OpenRouter for enhancement"""
+        return self.translate_locally_then_enhance(text, source_lang, target_lang)
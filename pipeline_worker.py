@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+# Pipeline worker processes
+#
+# The GUI is a thin client: jobs are sent to a small pool of worker processes
+# over a multiprocessing queue and run there with their own Pipeline, so text
+# processing never competes with the Tk main loop for the GIL and a crash in
+# the pipeline cannot take the window down. Workers report through the same
+# events interface as the in-process EventBus. Large results are written to
+# spool files and only their paths cross the process boundary; a listener
+# thread in the GUI process reads them back and forwards everything to the bus.
+#
+# Jobs wait in the GUI process and each worker process is handed one when it
+# is free, so a process that finishes early takes the next job instead of
+# idling while jobs queue behind a long one elsewhere, and jobs start in the
+# order they were submitted (e.g. shortest video first).
+#
+# Cancelling a job sends its id over the process's control queue; a thread in
+# the worker cancels the job's token, which stops the tools it is running. A
+# job cancelled while still waiting never reaches a process. A process that
+# does not finish a cancelled job in time after it started is replaced, and a
+# job handed to it that had not started yet goes back to the front of the queue.
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+from event_bus import STATUS, PROGRESS, PARTIAL, DONE, ERROR
+from exporters import write_text_atomic
+from pipeline import Pipeline
+
+# Strings at least this long are handed back through spool files
+SPOOL_MIN_CHARS = 65536
+
+# Jobs a worker process can run (Pipeline methods taking (job, config))
+JOB_METHODS = ('run_online_video_transcription', 'run_local_transcription', 'translate_text_versions',
+               'prefetch_metadata')
+
+# Seconds a cancelled job gets to stop before its worker process is restarted
+CANCEL_TIMEOUT = 10
+# Seconds between checks for dead worker processes and stuck cancelled jobs
+REAP_INTERVAL = 0.5
+
+# Reply a worker process sends when it begins a job; kept from the event bus
+STARTED = 'started'
+
+SpooledText = namedtuple('SpooledText', ['path'])
+
+
+def spool(value, spool_dir, prefix):
+    """Replace large strings in a result (also inside tuples and dicts) with spool files"""
+    counter = itertools.count()
+
+    def convert(item):
+        if isinstance(item, str) and len(item) >= SPOOL_MIN_CHARS:
+            path = os.path.join(spool_dir, f"{prefix}-{next(counter)}.txt")
+            return SpooledText(write_text_atomic(path, item))
+        if isinstance(item, dict):
+            return {key: convert(v) for key, v in item.items()}
+        if isinstance(item, (tuple, list)):
+            return type(item)(convert(v) for v in item)
+        return item
+
+    return convert(value)
+
+
+def unspool(value):
+    """Read spooled strings back and remove their files"""
+    if isinstance(value, SpooledText):
+        with open(value.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        try:
+            os.unlink(value.path)
+        except OSError:
+            pass
+        return content
+    if isinstance(value, dict):
+        return {key: unspool(v) for key, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(unspool(v) for v in value)
+    return value
+
+
+class QueuePublisher:
+    """EventBus interface inside a worker process; events go to the reply queue"""
+
+    def __init__(self, replies, spool_dir):
+        self.replies = replies
+        self.spool_dir = spool_dir
+
+    def publish(self, job, kind, payload=None, key=None):
+        if kind in (DONE, PARTIAL):
+            payload = spool(payload, self.spool_dir, f"job{job}-{os.getpid()}-{kind}")
+        self.replies.put((job, kind, payload, key))
+
+    def status(self, job, text):
+        self.publish(job, STATUS, text)
+
+    def progress(self, job, fraction):
+        self.publish(job, PROGRESS, fraction)
+
+    def partial(self, job, key, content):
+        self.publish(job, PARTIAL, (key, content), key=key)
+
+    def done(self, job, *result):
+        self.publish(job, DONE, result)
+
+    def error(self, job, message):
+        self.publish(job, ERROR, message)
+
+
+def receive_cancels(controls, pipeline):
+    """Worker process thread: cancel jobs while the main thread is busy running one"""
+    while True:
+        job = controls.get()
+        if job is None:
+            break
+        pipeline.cancel(job)
+
+
+def worker_main(requests, replies, spool_dir, controls=None):
+    """Worker process loop: run jobs until a None request arrives"""
+    events = QueuePublisher(replies, spool_dir)
+    pipeline = Pipeline(events)
+    if controls is not None:
+        threading.Thread(target=receive_cancels, args=(controls, pipeline), daemon=True).start()
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        job, method, config = request
+        token = pipeline.cancel_tokens.get(job)
+        if token is not None and token.cancelled:
+            pipeline.end_job(job)
+            events.error(job, "Cancelled")
+            continue
+        events.publish(job, STARTED)
+        try:
+            pipeline.apply_settings(config)
+            getattr(pipeline, method)(job, config)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            events.error(job, f"Pipeline error: {str(e)}")
+
+
+class PipelineWorker:
+    """Client side of the worker pool; forwards worker events to an EventBus"""
+
+    def __init__(self, events, processes=None, spool_dir=None):
+        self.events = events
+        self.process_count = processes or max(1, min(4, (os.cpu_count() or 2) - 1))
+        # A spool directory made here is removed on close; one passed in belongs to the caller
+        self.own_spool_dir = spool_dir is None
+        if spool_dir is None:
+            import tempfile
+            spool_dir = tempfile.mkdtemp(prefix='yap_spool_')
+        self.spool_dir = spool_dir
+        self.context = None
+        self.replies = None
+        # One request queue per process, so a dead process never strands a shared queue lock
+        self.processes = []
+        self.queues = []
+        self.controls = []
+        # Jobs waiting for a free process, as (job, method, config), in the order they run
+        self.pending = deque()
+        # Job -> process running it, and the request it was handed
+        self.assigned = {}
+        self.requests = {}
+        # Jobs put back once after their process died; a job that may have killed it is not retried twice
+        self.requeued = set()
+        # Jobs a worker process has begun
+        self.started = set()
+        # Cancelled jobs still assigned to a worker process, with the time they must have stopped by
+        # (None while the job is still queued: it is skipped without taking the process down)
+        self.cancelling = {}
+        # In-process pipeline used while worker processes are unavailable
+        self.fallback = None
+        self.lock = threading.Lock()
+        self.listener = None
+        self.closed = False
+
+    def start(self):
+        """Start the pool on first use; returns False if processes are unavailable"""
+        with self.lock:
+            if self.processes:
+                return True
+            try:
+                # multiprocessing is only imported once the first job is submitted
+                import multiprocessing
+                self.context = multiprocessing.get_context('spawn')
+                self.replies = self.context.Queue()
+                for index in range(self.process_count):
+                    self.queues.append(self.context.Queue())
+                    self.controls.append(self.context.Queue())
+                    self.processes.append(self.spawn(index))
+            except (OSError, ImportError) as e:
+                print(f"Pipeline worker processes unavailable, running in-process: {e}", file=sys.stderr)
+                self.processes = []
+                self.queues = []
+                self.controls = []
+                return False
+            self.listener = threading.Thread(target=self.listen, daemon=True)
+            self.listener.start()
+            return True
+
+    def spawn(self, index):
+        process = self.context.Process(target=worker_main, daemon=True,
+                                       args=(self.queues[index], self.replies, self.spool_dir,
+                                             self.controls[index]))
+        process.start()
+        return process
+
+    def submit(self, job, method, config, fallback=None):
+        """Run a pipeline job in a worker process (or in-process on fallback when unavailable)
+
+        Jobs start in the order they are submitted, each as soon as a process is free.
+        """
+        if method not in JOB_METHODS:
+            raise ValueError(f"Unknown pipeline job: {method}")
+        if self.start():
+            with self.lock:
+                self.pending.append((job, method, config))
+                self.dispatch()
+        elif fallback is not None:
+            self.fallback = fallback
+            fallback.apply_settings(config)
+            threading.Thread(target=getattr(fallback, method), args=(job, config), daemon=True).start()
+        else:
+            self.events.error(job, "Pipeline worker unavailable")
+
+    def dispatch(self):
+        """Hand waiting jobs to free processes; called with the lock held"""
+        busy = set(self.assigned.values())
+        for index, process in enumerate(self.processes):
+            if not self.pending:
+                break
+            if index in busy or not process.is_alive():
+                continue
+            request = self.pending.popleft()
+            self.assigned[request[0]] = index
+            self.requests[request[0]] = request
+            self.queues[index].put(request)
+
+    def cancel(self, job):
+        """Stop a job; its worker process takes the next job as soon as the job has ended"""
+        with self.lock:
+            index = self.assigned.get(job)
+            if index is not None:
+                self.controls[index].put(job)
+                self.cancelling[job] = time.monotonic() + CANCEL_TIMEOUT if job in self.started else None
+                return
+            waiting = [request for request in self.pending if request[0] == job]
+            for request in waiting:
+                self.pending.remove(request)
+        if waiting:
+            self.events.error(job, "Cancelled")
+        elif self.fallback is not None:
+            self.fallback.cancel(job)
+
+    def listen(self):
+        """Forward worker replies to the event bus and recover from crashed workers"""
+        last_reap = time.monotonic()
+        while not self.closed:
+            # Reaped on a timer, so a steady stream of replies cannot hold off crash recovery
+            if time.monotonic() - last_reap >= REAP_INTERVAL:
+                self.reap()
+                last_reap = time.monotonic()
+            try:
+                job, kind, payload, key = self.replies.get(timeout=REAP_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            if kind == STARTED:
+                with self.lock:
+                    self.started.add(job)
+                    if job in self.cancelling:
+                        self.cancelling[job] = time.monotonic() + CANCEL_TIMEOUT
+                continue
+            if kind in (DONE, ERROR):
+                with self.lock:
+                    self.assigned.pop(job, None)
+                    self.requests.pop(job, None)
+                    self.requeued.discard(job)
+                    self.started.discard(job)
+                    self.cancelling.pop(job, None)
+                    self.dispatch()
+            try:
+                self.events.publish(job, kind, unspool(payload), key=key)
+            except OSError as e:
+                self.events.error(job, f"Could not read job results: {e}")
+
+    def reap(self):
+        """Replace worker processes that died; their job fails if it had started, otherwise it runs next"""
+        # Published once the lock is released: the bus may block while its queue is full
+        failures = []
+        with self.lock:
+            now = time.monotonic()
+            for job, deadline in list(self.cancelling.items()):
+                # A cancelled job that is stuck (e.g. inside a framework call) costs its process
+                if deadline is not None and now >= deadline and job in self.assigned:
+                    self.processes[self.assigned[job]].terminate()
+                    self.cancelling[job] = now + CANCEL_TIMEOUT
+            for index, process in enumerate(self.processes):
+                if process.is_alive() or self.closed:
+                    continue
+                for job, assigned_index in list(self.assigned.items()):
+                    if assigned_index != index:
+                        continue
+                    del self.assigned[job]
+                    request = self.requests.pop(job, None)
+                    if job in self.cancelling:
+                        del self.cancelling[job]
+                        self.started.discard(job)
+                        failures.append((job, "Cancelled"))
+                    elif job in self.started or job in self.requeued or request is None:
+                        self.started.discard(job)
+                        self.requeued.discard(job)
+                        failures.append((job, f"Pipeline worker crashed (exit code {process.exitcode})"))
+                    else:
+                        # Handed over but never begun: it goes first to the next free process
+                        self.requeued.add(job)
+                        self.pending.appendleft(request)
+                self.queues[index] = self.context.Queue()
+                self.controls[index] = self.context.Queue()
+                self.processes[index] = self.spawn(index)
+            self.dispatch()
+        for job, message in failures:
+            self.events.error(job, message)
+
+    def close(self, timeout=2):
+        """Stop the worker processes and remove the spool directory this pool made"""
+        self.closed = True
+        with self.lock:
+            for requests in self.queues:
+                requests.put(None)
+            for controls in self.controls:
+                controls.put(None)
+            for process in self.processes:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+            self.processes = []
+            self.queues = []
+            self.controls = []
+            self.pending.clear()
+        if self.own_spool_dir:
+            import shutil
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
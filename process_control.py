@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+# Cancellable subprocesses
+#
+# Every external tool a job runs (yt-dlp, yap, trans, curl) is started through
+# run_process in its own process group and tracked by the job's CancelToken.
+# Cancelling the token terminates the running tools right away and kills them
+# if they do not exit within a short grace period; the job itself stops at its
+# next cancellation check, cleans up and frees its worker. subprocess itself
+# is only imported once the first tool runs.
+#
+# Instead of a fixed wall-clock timeout, a tool can be given a stall window:
+# it is stopped only when it has shown no progress (new output, or a change
+# in a caller-supplied probe such as the size of the file it writes) for that
+# long, so a hung tool is freed quickly while a long but busy one runs on.
+
+import os
+import signal
+import threading
+import time
+
+# How often a waiting job looks at its token (seconds)
+POLL_INTERVAL = 0.2
+
+# Time between SIGTERM and SIGKILL (seconds)
+TERMINATE_GRACE = 2
+
+
+class Cancelled(BaseException):
+    """Raised inside a job when it has been cancelled
+
+    Derived from BaseException so the many `except Exception` fallbacks in the
+    pipeline do not swallow it and carry on with the next stage.
+    """
+
+
+class CancelToken:
+    """Cancellation flag for one job, plus the processes it is currently running"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.processes = set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        """Cancel the job; running processes get SIGTERM immediately (never blocks)"""
+        with self.lock:
+            self.event.set()
+            processes = list(self.processes)
+        for process in processes:
+            signal_group(process, signal.SIGTERM)
+
+    def check(self):
+        if self.event.is_set():
+            raise Cancelled()
+
+    def track(self, process):
+        with self.lock:
+            self.processes.add(process)
+
+    def untrack(self, process):
+        with self.lock:
+            self.processes.discard(process)
+
+
+def signal_group(process, sig):
+    """Signal a process and everything it started (e.g. the ffmpeg run by yt-dlp)"""
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, sig)
+    except (AttributeError, OSError):
+        try:
+            process.send_signal(sig)
+        except OSError:
+            pass
+
+
+def stop_process(process, grace=TERMINATE_GRACE):
+    """Terminate a process group, then kill it if it has not exited after the grace period"""
+    import subprocess
+    signal_group(process, signal.SIGTERM)
+    try:
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        signal_group(process, signal.SIGKILL)
+        process.wait()
+
+
+def output_size(path):
+    """Bytes in a file, or in all files of a directory; a progress probe for tools writing to disk"""
+    try:
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+        total = 0
+        for entry in os.scandir(path):
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+    except OSError:
+        return 0
+
+
+def read_output(stream, chunks, activity):
+    """Reader thread: collect a pipe's output as it arrives and note when it last did"""
+    while True:
+        data = stream.read1(65536)
+        if not data:
+            break
+        chunks.append(data)
+        activity[0] = time.monotonic()
+
+
+def write_input(stream, data):
+    try:
+        stream.write(data)
+        stream.close()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def decode_output(chunks):
+    # Same result as text=True: universal newlines, so yt-dlp's \r progress lines split too
+    text = b''.join(chunks).decode('utf-8', errors='replace')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def run_process(cmd, token=None, input=None, timeout=None, stall_timeout=None, progress=None):
+    """subprocess.run(cmd, capture_output=True, text=True) that stops when the token is cancelled
+
+    stall_timeout stops the tool after that many seconds without progress:
+    output on stdout/stderr, or a change in the value returned by `progress()`.
+    timeout is an absolute limit, meant for quick probes. Raises Cancelled when
+    the token is cancelled and subprocess.TimeoutExpired (with the window that
+    ran out as its timeout) otherwise; in both cases the process group is
+    stopped first.
+    """
+    import subprocess
+
+    if token is not None:
+        token.check()
+
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               start_new_session=True)
+    if token is not None:
+        token.track(process)
+    stdout, stderr = [], []
+    activity = [time.monotonic()]
+    threads = [threading.Thread(target=read_output, args=(process.stdout, stdout, activity), daemon=True),
+               threading.Thread(target=read_output, args=(process.stderr, stderr, activity), daemon=True)]
+    if input is not None:
+        threads.append(threading.Thread(target=write_input, args=(process.stdin, input.encode('utf-8')),
+                                        daemon=True))
+    for thread in threads:
+        thread.start()
+    try:
+        deadline = time.monotonic() + timeout if timeout else None
+        last_progress = activity[0]
+        last_value = progress() if progress else None
+        while True:
+            try:
+                process.wait(POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if token is not None and token.cancelled:
+                stop_process(process)
+                raise Cancelled()
+            now = time.monotonic()
+            if progress is not None:
+                value = progress()
+                if value != last_value:
+                    last_value = value
+                    last_progress = now
+            last_progress = max(last_progress, activity[0])
+            if stall_timeout and now - last_progress >= stall_timeout:
+                stop_process(process)
+                raise subprocess.TimeoutExpired(cmd, stall_timeout)
+            if deadline is not None and now >= deadline:
+                stop_process(process)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+    finally:
+        if token is not None:
+            token.untrack(process)
+
+    # Output still in the pipes; a tool's stray background child must not hold us up
+    for thread in threads:
+        thread.join(TERMINATE_GRACE)
+    if token is not None:
+        # The tool may have been stopped by the token just before it finished
+        token.check()
+    return subprocess.CompletedProcess(cmd, process.returncode, decode_output(stdout), decode_output(stderr))
@@ -2,79 +2,33 @@
 
 import os
 import sys
-import time
-import signal
 import subprocess
-import psutil
-
-def find_running_instances():
-    """Find any running instances of yap_gui.py"""
-    running_instances = []
-    
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            cmdline = proc.info['cmdline']
-            if cmdline and any('yap_gui.py' in arg for arg in cmdline if arg):
-                running_instances.append(proc)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    
-    return running_instances
-
-def close_instances(instances):
-    """Gracefully close running instances"""
-    if not instances:
-        print("✅ No running instances found")
-        return
-    
-    print(f"⚠️  Found {len(instances)} running instance(s)")
-    print("🔄 Closing existing instance(s)...")
-    
-    for proc in instances:
-        try:
-            print(f"   Stopping process {proc.pid}...")
-            
-            # Try graceful termination first
-            proc.terminate()
-            
-            # Wait for graceful shutdown
-            try:
-                proc.wait(timeout=3)
-                print(f"   ✅ Process {proc.pid} closed gracefully")
-            except psutil.TimeoutExpired:
-                # Force kill if still running
-                print(f"   ⚡ Force stopping process {proc.pid}...")
-                proc.kill()
-                proc.wait()
-                print(f"   ✅ Process {proc.pid} force closed")
-                
-        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-            print(f"   ⚠️  Could not close process {proc.pid}: {e}")
-    
-    print("✅ Existing instances closed")
-    time.sleep(2)
 
 def main():
-    """Main launcher function"""
-    print("🔍 Checking for running Whisper Killer instances...")
-    
-    # Find running instances
-    running_instances = find_running_instances()
-    
-    # Close existing instances
-    close_instances(running_instances)
+    """Main launcher function
+
+    Arguments (URLs, video files, text files or text) are passed on to yap_gui.py.
+    If Whisper Killer is already running it takes them over and this launch exits
+    right away, so running jobs are never interrupted.
+    """
+    # A running instance takes the launch over; no Python process is started for the GUI
+    from single_instance import hand_over
+    handed_over = hand_over(sys.argv[1:])
+    if handed_over is not None:
+        sys.exit(handed_over)
     
     print("🚀 Starting Whisper Killer...")
     print("")
     
     try:
-        # Start the application
-        result = subprocess.run([sys.executable, 'yap_gui.py'], 
-                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        # Start the application (or forward to the running one); relative
+        # file arguments stay relative to the current directory
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'yap_gui.py')
+        result = subprocess.run([sys.executable, app_path] + sys.argv[1:])
         
         if result.returncode == 0:
             print("")
-            print("✅ Whisper Killer started successfully")
+            print("✅ Whisper Killer finished successfully")
         else:
             print("")
             print(f"❌ Whisper Killer exited with code {result.returncode}")
@@ -89,4 +43,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,50 +1,23 @@
 #!/bin/bash
 
 # Whisper Killer Launcher Script
-# Detects and closes any running instances before starting a new one
-
-echo "🔍 Checking for running Whisper Killer instances..."
-
-# Find any running Python processes with yap_gui.py
-RUNNING_PIDS=$(pgrep -f "python.*yap_gui.py")
-
-if [ ! -z "$RUNNING_PIDS" ]; then
-    echo "⚠️  Found running instance(s): $RUNNING_PIDS"
-    echo "🔄 Closing existing instance(s)..."
-    
-    # Kill the running processes
-    for pid in $RUNNING_PIDS; do
-        echo "   Stopping process $pid..."
-        kill $pid 2>/dev/null
-        
-        # Wait a moment for graceful shutdown
-        sleep 1
-        
-        # Force kill if still running
-        if kill -0 $pid 2>/dev/null; then
-            echo "   Force stopping process $pid..."
-            kill -9 $pid 2>/dev/null
-        fi
-    done
-    
-    echo "✅ Existing instances closed"
-    sleep 2
-else
-    echo "✅ No running instances found"
-fi
+# If Whisper Killer is already running, the URLs, files or text given here are
+# handed to it and this launch exits right away; running jobs keep going.
+#
+#   ./run_yap_gui.sh [URL | video file | text file | text] ...
 
 echo "🚀 Starting Whisper Killer..."
 echo ""
 
-# Start the application
-python3 yap_gui.py
+# Start the application (or forward to the running one)
+python3 "$(dirname "$0")/yap_gui.py" "$@"
 
 # Check if the app started successfully
 if [ $? -eq 0 ]; then
     echo ""
-    echo "✅ Whisper Killer started successfully"
+    echo "✅ Whisper Killer finished successfully"
 else
     echo ""
     echo "❌ Failed to start Whisper Killer"
     exit 1
-fi
\ No newline at end of file
+fi
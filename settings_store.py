@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# Settings store
+#
+# All user settings live in one JSON file in the local config directory, not
+# in the output directory (which may be slow network storage). The file is
+# read once into an in-memory snapshot. Changes update the snapshot and a
+# background thread writes it back atomically once they have settled, so a
+# burst of changes costs a single write and the UI thread never waits on disk.
+
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from exporters import write_text_atomic
+
+CONFIG_DIR = os.path.join(os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser("~/.config"), "yap_gui")
+SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
+
+DEFAULT_OUTPUT_DIR = os.path.expanduser("~/Downloads/yap_output")
+
+DEFAULT_SETTINGS = {
+    'text_source_lang': "en",
+    'text_target_lang': "es",
+    'youtube_target_lang': "es",
+    'local_target_lang': "es",
+    'model': "anthropic/claude-3-haiku",
+    'output_dir': DEFAULT_OUTPUT_DIR,
+    'encrypted_api_key': "",
+    # Pipeline worker processes; 0 picks a count from the number of CPUs
+    'worker_processes': 0,
+    # Subtitle context windows translated concurrently per job
+    'translation_workers': 4,
+    # Translated segments kept in each pipeline's translation memory
+    'translation_memory_entries': 5000,
+    # Disk budget for kept audio and intermediates (MB), evicted least recently used first
+    'media_cache_mb': 2048,
+    # Codec kept audio is recompressed to ("", "aac" or "opus")
+    'media_codec': "",
+    # Cut silence out of audio before transcription (needs NumPy)
+    'trim_silence': False,
+    # Speed profile for transcription ("accurate", "fast" or "fastest", see audio_prep.py)
+    'speed_profile': "accurate",
+    # Minutes transcribed and summarized first in preview-first jobs
+    'preview_minutes': 5,
+    # Online videos longer than this many minutes are rejected before downloading (0: no limit)
+    'max_video_minutes': 0,
+    # Run yt-dlp in the worker processes when the yt_dlp package is installed (else the yt-dlp command)
+    'ytdlp_library': True,
+    # Folder whose new media files are transcribed in watch mode
+    'watch_folder': "",
+}
+
+# Seconds without changes before the snapshot is written
+SAVE_DELAY = 0.5
+
+
+def machine_key():
+    """Machine-specific encryption key (consistent on this machine, safe for GitHub)"""
+    import platform
+    machine_info = f"{platform.node()}-{platform.system()}-{os.path.expanduser('~')}"
+    return hashlib.sha256(machine_info.encode()).hexdigest()[:32]
+
+
+def encrypt_text(text, key=None):
+    """Simple XOR encryption (sufficient for API key storage)"""
+    if not text:
+        return ""
+    key = key or machine_key()
+    encrypted = ''.join(chr(ord(char) ^ ord(key[i % len(key)])) for i, char in enumerate(text))
+    # Base64 encode to make it safe for storage
+    return base64.b64encode(encrypted.encode()).decode()
+
+
+def decrypt_text(encrypted_text, key=None):
+    """Decrypt XOR encrypted text; returns "" if it cannot be decrypted"""
+    if not encrypted_text:
+        return ""
+    key = key or machine_key()
+    try:
+        encrypted = base64.b64decode(encrypted_text).decode()
+    except ValueError:
+        return ""
+    return ''.join(chr(ord(char) ^ ord(key[i % len(key)])) for i, char in enumerate(encrypted))
+
+
+def read_settings(path=SETTINGS_FILE):
+    """Stored settings, or None if there is no settings file yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Failed to read settings: {e}", file=sys.stderr)
+        return {}
+    return stored if isinstance(stored, dict) else {}
+
+
+def read_legacy_settings(output_dir):
+    """Settings kept in the output directory by earlier versions (.yap_language_prefs, .yap_config)"""
+    settings = {}
+    try:
+        with open(os.path.join(output_dir, '.yap_language_prefs'), 'r') as f:
+            prefs = json.load(f)
+        settings.update({key: value for key, value in prefs.items() if key in DEFAULT_SETTINGS})
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        with open(os.path.join(output_dir, '.yap_config'), 'r') as f:
+            settings['encrypted_api_key'] = f.read().strip()
+    except OSError:
+        pass
+    return settings
+
+
+def load_api_key(path=SETTINGS_FILE):
+    """Stored OpenRouter API key, for code that runs without the GUI"""
+    return decrypt_text((read_settings(path) or {}).get('encrypted_api_key', ""))
+
+
+class SettingsStore:
+    """In-memory settings snapshot with debounced, atomic background writes"""
+
+    def __init__(self, path=SETTINGS_FILE, save_delay=SAVE_DELAY, legacy_dir=DEFAULT_OUTPUT_DIR):
+        self.path = path
+        self.save_delay = save_delay
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.version = 0
+        self.saved_version = 0
+        self.changed_at = None
+        self.writer = None
+        self.writes = 0
+
+        self.snapshot = dict(DEFAULT_SETTINGS)
+        stored = read_settings(path)
+        if stored is None and legacy_dir:
+            # First start with the store: take over the files kept in the output directory
+            self.update(**read_legacy_settings(legacy_dir))
+        else:
+            self.snapshot.update(stored or {})
+
+    def get(self, key):
+        return self.snapshot.get(key, DEFAULT_SETTINGS.get(key))
+
+    def update(self, **changes):
+        """Change settings; the file is written in the background once changes settle"""
+        with self.condition:
+            changes = {key: value for key, value in changes.items() if self.snapshot.get(key) != value}
+            if not changes:
+                return False
+            self.snapshot.update(changes)
+            self.version += 1
+            self.changed_at = time.monotonic()
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.run_writer, daemon=True)
+                self.writer.start()
+            self.condition.notify()
+        return True
+
+    def api_key(self):
+        return decrypt_text(self.get('encrypted_api_key'))
+
+    def set_api_key(self, api_key):
+        return self.update(encrypted_api_key=encrypt_text(api_key))
+
+    def run_writer(self):
+        while True:
+            with self.condition:
+                while self.changed_at is None:
+                    self.condition.wait()
+                # Coalesce: wait until no change has come in for save_delay seconds
+                remaining = self.changed_at + self.save_delay - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                data, version = self.serialize()
+            self.write(data, version)
+
+    def flush(self):
+        """Write pending changes now (e.g. when the app closes)"""
+        with self.condition:
+            if self.changed_at is None:
+                return
+            data, version = self.serialize()
+        self.write(data, version)
+
+    def serialize(self):
+        self.changed_at = None
+        return json.dumps(self.snapshot, indent=2), self.version
+
+    def write(self, data, version):
+        with self.write_lock:
+            # A newer snapshot may already be on disk (flush racing the writer)
+            if version <= self.saved_version:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                write_text_atomic(self.path, data)
+                self.saved_version = version
+                self.writes += 1
+            except OSError as e:
+                print(f"Failed to save settings: {e}", file=sys.stderr)
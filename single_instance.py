@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# Single-instance server
+#
+# The first instance listens on a local Unix socket. Later launches connect,
+# hand over their launch items (URLs, files, text) as one JSON request and
+# exit; the running instance queues them as jobs, so launching is instant and
+# work in progress is never interrupted. A launch without arguments asks the
+# running instance to bring its window to the front. Launches hand over before
+# tkinter or the pipeline is imported, so this module only imports the
+# standard library. The socket is only accessible to the current user.
+
+import json
+import os
+import socket
+import threading
+from urllib.parse import urlparse
+
+# dependencies.CACHE_DIR, without importing dependencies on the hand-over path
+SOCKET_PATH = os.path.join(os.environ.get('XDG_RUNTIME_DIR')
+                           or os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser("~/.cache"),
+                                           "yap_gui"),
+                           "yap_gui.sock")
+
+CONNECT_TIMEOUT = 2
+REQUEST_TIMEOUT = 5
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+# Launch arguments that are files with these extensions are translated as text
+# (besides transcripts, see launch_items)
+TEXT_FILE_EXTENSIONS = ('.txt', '.md')
+
+
+def launch_items(args, cwd=None):
+    """Turn command-line arguments into launch items: URLs, video files, text files or text"""
+    items = []
+    for arg in args:
+        path = os.path.abspath(os.path.join(cwd or os.getcwd(), os.path.expanduser(arg)))
+        if urlparse(arg).scheme in ('http', 'https'):
+            items.append(('url', arg))
+        elif os.path.isfile(path):
+            from transcript_store import TRANSCRIPT_EXTENSION
+            text = path.lower().endswith(TEXT_FILE_EXTENSIONS + (TRANSCRIPT_EXTENSION,))
+            items.append(('text_file' if text else 'video', path))
+        elif arg.strip():
+            items.append(('text', arg))
+    return items
+
+
+def read_all(conn, limit=MAX_REQUEST_BYTES):
+    """Read from a socket until the peer closes its side"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise ValueError("Request too large")
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def forward(items, path=SOCKET_PATH, timeout=CONNECT_TIMEOUT, raise_window=False):
+    """Send launch items to a running instance; returns its reply, or None if no instance is running
+
+    With raise_window the instance is asked to bring its window to the front
+    even when there are no items.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    request = {'items': items}
+    if raise_window:
+        request['raise'] = True
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(path)
+            conn.sendall(json.dumps(request).encode('utf-8'))
+            conn.shutdown(socket.SHUT_WR)
+            return json.loads(read_all(conn).decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def hand_over(args, path=SOCKET_PATH):
+    """Give this launch to a running instance; returns the exit code, or None if no instance is running
+
+    A launch without items brings the running instance's window to the front.
+    """
+    import sys
+
+    items = launch_items(args)
+    reply = forward(items, path, raise_window=not items)
+    if reply is None:
+        return None
+    if not reply.get('ok'):
+        print(f"Running instance rejected the launch: {reply.get('error')}", file=sys.stderr)
+        return 1
+    if items:
+        print(f"Whisper Killer is already running; queued {reply.get('queued', 0)} item(s) there", file=sys.stderr)
+    else:
+        print("Whisper Killer is already running; brought its window to the front", file=sys.stderr)
+    return 0
+
+
+class InstanceServer:
+    """Accepts forwarded launches; on_request(items) is called on the server thread
+
+    Launches without items that ask for the window call on_request([]).
+    """
+
+    def __init__(self, on_request, path=SOCKET_PATH):
+        self.on_request = on_request
+        self.path = path
+        self.sock = None
+        self.thread = None
+        self.closed = False
+
+    def start(self):
+        """Listen for later launches; returns False if another instance already does"""
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.path)
+        except OSError:
+            # A live instance answers on the socket; otherwise it is left over from a crash
+            if forward([], self.path) is not None:
+                sock.close()
+                return False
+            try:
+                os.unlink(self.path)
+                sock.bind(self.path)
+            except OSError:
+                sock.close()
+                return False
+
+        os.chmod(self.path, 0o600)
+        sock.listen(8)
+        # Wake up regularly so close() does not depend on accept() being interrupted
+        sock.settimeout(0.5)
+        self.sock = sock
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        return True
+
+    def serve(self):
+        while not self.closed:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with conn:
+                self.handle(conn)
+
+    def handle(self, conn):
+        conn.settimeout(REQUEST_TIMEOUT)
+        try:
+            request = json.loads(read_all(conn).decode('utf-8'))
+            items = [tuple(item) for item in request.get('items', [])]
+            wanted = items or request.get('raise')
+            reply = {'ok': True, 'queued': self.on_request(items) if wanted else 0}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            reply = {'ok': False, 'error': str(e)}
+        try:
+            conn.sendall(json.dumps(reply).encode('utf-8'))
+        except OSError:
+            pass
+
+    def close(self):
+        """Stop listening and remove the socket"""
+        self.closed = True
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
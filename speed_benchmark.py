@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# Speed profile benchmark
+#
+# Transcribes recordings with each speed profile and compares the results to
+# reference transcripts: the realtime factor (seconds of processing per second
+# of media, lower is faster), the CPU time spent per hour of media, and the word
+# error rate against the reference. Speeding up happens exactly as in a job
+# (audio_prep.speed_up_command); its time counts towards the profile's cost.
+#
+#   python3 speed_benchmark.py talk.wav talk.txt lecture.mp4 lecture.txt
+#   python3 speed_benchmark.py talk.wav talk.txt --profiles accurate fast --json results.json
+
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+from audio_prep import SPEED_PROFILES, speed_up_command
+
+WORD_RE = re.compile(r"[\w']+")
+
+
+def words(text):
+    """Lowercase words without punctuation, as compared for the word error rate"""
+    return WORD_RE.findall(text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """(substitutions + deletions + insertions) / reference words, by word-level edit distance"""
+    reference, hypothesis = words(reference), words(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def child_cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_tool(cmd):
+    """Run a tool to completion; returns (wall seconds, CPU seconds)"""
+    from process_control import run_process
+
+    wall, cpu = time.perf_counter(), child_cpu_seconds()
+    result = run_process(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"{cmd[0]} failed: {result.stderr.strip() or result.stdout.strip()}")
+    return time.perf_counter() - wall, child_cpu_seconds() - cpu
+
+
+def benchmark(media, reference, profile, work_dir, duration):
+    """Transcribe media with one speed profile; returns its measurements"""
+    speed = SPEED_PROFILES[profile]
+    wall = cpu = 0.0
+    audio = media
+    if speed != 1.0:
+        audio = os.path.join(work_dir, f"{profile}.wav")
+        wall, cpu = run_tool(speed_up_command(media, audio, speed))
+    output = os.path.join(work_dir, f"{profile}.txt")
+    yap_wall, yap_cpu = run_tool(['yap', str(audio), '-o', output])
+    with open(output, 'r', encoding='utf-8') as f:
+        hypothesis = f.read()
+    wall, cpu = wall + yap_wall, cpu + yap_cpu
+    return {'media': media, 'profile': profile, 'speed': speed, 'duration': duration,
+            'wall': round(wall, 3), 'cpu': round(cpu, 3), 'rtf': round(wall / duration, 4),
+            'cpu_per_hour': round(cpu / duration * 3600, 1), 'wer': round(word_error_rate(reference, hypothesis), 4)}
+
+
+def summarize(results):
+    """Totals per profile over all recordings, in profile order"""
+    totals = {}
+    for result in results:
+        total = totals.setdefault(result['profile'], {'profile': result['profile'], 'speed': result['speed'],
+                                                      'duration': 0.0, 'wall': 0.0, 'cpu': 0.0, 'errors': 0.0})
+        total['duration'] += result['duration']
+        total['wall'] += result['wall']
+        total['cpu'] += result['cpu']
+        total['errors'] += result['wer'] * result['duration']
+    return [dict(total, rtf=total['wall'] / total['duration'], cpu_per_hour=total['cpu'] / total['duration'] * 3600,
+                 wer=total['errors'] / total['duration']) for total in totals.values()]
+
+
+def format_table(summary):
+    lines = [f"{'profile':<10} {'speed':>6} {'RTF':>7} {'CPU s/h':>9} {'WER':>7}"]
+    for row in summary:
+        lines.append(f"{row['profile']:<10} {row['speed']:>5g}x {row['rtf']:>7.3f} {row['cpu_per_hour']:>9.0f} "
+                     f"{row['wer']:>7.1%}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure realtime factor and word error rate of each speed profile")
+    parser.add_argument('pairs', nargs='+', metavar='MEDIA REFERENCE',
+                        help="recordings, each followed by its reference transcript (plain text)")
+    parser.add_argument('--profiles', nargs='+', choices=list(SPEED_PROFILES), default=list(SPEED_PROFILES))
+    parser.add_argument('--json', help="also write every measurement to this file")
+    args = parser.parse_args(argv)
+    if len(args.pairs) % 2:
+        parser.error("every recording needs a reference transcript")
+
+    from pipeline import Pipeline
+
+    pipeline = Pipeline(api_key="")
+    results = []
+    for media, reference_path in zip(args.pairs[::2], args.pairs[1::2]):
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            reference = f.read()
+        duration = pipeline.media_duration(media)
+        if not duration:
+            print(f"Skipping {media}: unknown duration", file=sys.stderr)
+            continue
+        with tempfile.TemporaryDirectory() as work_dir:
+            for profile in args.profiles:
+                result = benchmark(media, reference, profile, work_dir, duration)
+                print(f"{os.path.basename(media)} {profile}: RTF {result['rtf']:.3f}, WER {result['wer']:.1%}",
+                      file=sys.stderr)
+                results.append(result)
+
+    if not results:
+        return 1
+    print(format_table(summarize(results)))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
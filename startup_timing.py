@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Startup timing report
+#
+# The GUI marks each startup phase; the report is printed to stderr and
+# appended to a JSON-lines log so cold and warm start regressions show up.
+# Run this module directly to summarize the log:
+#
+#   python3 startup_timing.py
+
+import json
+import os
+import sys
+import time
+
+from dependencies import CACHE_DIR
+
+STARTUP_LOG = os.path.join(CACHE_DIR, "startup.jsonl")
+
+# Import of this module is the reference point for all phases
+STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Records elapsed milliseconds since process start for named phases"""
+
+    def __init__(self, log_path=STARTUP_LOG):
+        self.log_path = log_path
+        self.marks = []
+        self.info = {}
+
+    def mark(self, phase):
+        self.marks.append((phase, round((time.perf_counter() - STARTED) * 1000, 1)))
+
+    def note(self, **info):
+        """Attach facts about this start (e.g. dependency probes spawned)"""
+        self.info.update(info)
+
+    def report(self):
+        """Print the phases and append them to the startup log"""
+        phases = ', '.join(f"{phase} {ms:.0f} ms" for phase, ms in self.marks)
+        print(f"Startup timing: {phases}", file=sys.stderr)
+
+        record = {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'phases': dict(self.marks)}
+        record.update(self.info)
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+        return record
+
+
+def summarize(log_path=STARTUP_LOG, last=20):
+    """Median time per phase over recent cold and warm starts"""
+    import statistics
+
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return "No startup timings recorded yet"
+
+    lines = []
+    for label, cold in (("Cold starts", True), ("Warm starts", False)):
+        # A start is cold when dependency probes had to spawn processes
+        group = [r for r in records if bool(r.get('probes_spawned')) == cold][-last:]
+        if not group:
+            continue
+        lines.append(f"{label} ({len(group)}):")
+        phases = []
+        for record in group:
+            for phase in record['phases']:
+                if phase not in phases:
+                    phases.append(phase)
+        for phase in phases:
+            values = [r['phases'][phase] for r in group if phase in r['phases']]
+            lines.append(f"  {phase:<24} median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+    return "\n".join(lines) or "No startup timings recorded yet"
+
+
+if __name__ == "__main__":
+    print(summarize())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+# Subtitle cue helpers and cue-aligned subtitle translation
+# Cues are translated in small context windows through the regular translation
+# engines and mapped back one-to-one onto the original cue timings.
+
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+Cue = namedtuple('Cue', ['index', 'start', 'end', 'text'])
+
+SRT_TIME_RE = re.compile(
+    r'(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})')
+WINDOW_MARKER_RE = re.compile(r'^\s*\[(\d+)\]\s*(.*)$')
+
+# Common subtitle guidelines: two lines of 42 characters, 17 characters per second
+MAX_LINE_CHARS = 42
+MAX_LINES = 2
+MAX_CHARS_PER_SECOND = 17
+MIN_CUE_GAP = 0.05
+
+
+def parse_srt_time(hours, minutes, seconds, millis):
+    """Convert SRT timestamp parts to seconds"""
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000.0
+
+
+def format_srt_time(seconds):
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm)"""
+    total_ms = int(round(max(seconds, 0) * 1000))
+    hours, rest = divmod(total_ms, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    secs, millis = divmod(rest, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def parse_srt(srt_text):
+    """Parse SRT content into a list of cues"""
+    cues = []
+    if not srt_text:
+        return cues
+
+    for block in re.split(r'\n\s*\n', srt_text.strip()):
+        lines = block.strip().split('\n')
+        # Find the timing line; the index line before it is optional
+        for i, line in enumerate(lines):
+            match = SRT_TIME_RE.search(line)
+            if match:
+                start = parse_srt_time(*match.groups()[:4])
+                end = parse_srt_time(*match.groups()[4:])
+                text = '\n'.join(l.strip() for l in lines[i + 1:] if l.strip())
+                if text:
+                    cues.append(Cue(len(cues) + 1, start, end, text))
+                break
+
+    return cues
+
+
+def format_srt(cues):
+    """Format cues as SRT content"""
+    blocks = []
+    for i, cue in enumerate(cues, 1):
+        blocks.append(f"{i}\n{format_srt_time(cue.start)} --> {format_srt_time(cue.end)}\n{cue.text}")
+    return '\n\n'.join(blocks)
+
+
+def wrap_cue_text(text, max_line_chars=MAX_LINE_CHARS):
+    """Re-wrap cue text into balanced lines within the line length limit"""
+    words = text.split()
+    if not words:
+        return ""
+
+    flat = ' '.join(words)
+    if len(flat) <= max_line_chars:
+        return flat
+
+    # Use as few lines as possible, then balance their lengths; long cues
+    # get extra lines rather than losing text
+    line_count = max(MAX_LINES, -(-len(flat) // max_line_chars))
+    target = -(-len(flat) // line_count)
+
+    lines = []
+    current = []
+    current_len = 0
+    for word in words:
+        extra = len(word) + (1 if current else 0)
+        if current and (current_len + extra > max_line_chars or
+                        (current_len >= target and len(lines) < line_count - 1)):
+            lines.append(' '.join(current))
+            current = [word]
+            current_len = len(word)
+        else:
+            current.append(word)
+            current_len += extra
+    if current:
+        lines.append(' '.join(current))
+
+    return '\n'.join(lines)
+
+
+def fit_reading_speed(cues, max_cps=MAX_CHARS_PER_SECOND, min_gap=MIN_CUE_GAP):
+    """Extend cue end times into following gaps when text exceeds the reading speed"""
+    fitted = []
+    for i, cue in enumerate(cues):
+        chars = len(cue.text.replace('\n', ' '))
+        needed = chars / float(max_cps)
+        end = cue.end
+        if end - cue.start < needed:
+            limit = cues[i + 1].start - min_gap if i + 1 < len(cues) else cue.start + needed
+            end = max(end, min(cue.start + needed, limit))
+        fitted.append(cue._replace(end=end))
+    return fitted
+
+
+class TranslationMemory:
+    """Thread-safe LRU cache of translated segments keyed by language pair and text"""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source_lang, target_lang, text):
+        key = (source_lang, target_lang, text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, source_lang, target_lang, text, translation):
+        key = (source_lang, target_lang, text)
+        with self._lock:
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SubtitleTranslator:
+    """Translate subtitle cues in context windows and map them back onto the original timings"""
+
+    def __init__(self, translate_fn, memory=None, window_size=8, max_workers=4,
+                 max_line_chars=MAX_LINE_CHARS, max_cps=MAX_CHARS_PER_SECOND):
+        # translate_fn(text, source_lang, target_lang) returns the translation or a "⚠️" error string
+        self.translate_fn = translate_fn
+        self.memory = memory if memory is not None else TranslationMemory()
+        self.window_size = window_size
+        self.max_workers = max_workers
+        self.max_line_chars = max_line_chars
+        self.max_cps = max_cps
+
+    def translate_srt(self, srt_text, source_lang, target_lang):
+        """Translate SRT content, keeping cue count and timings"""
+        cues = parse_srt(srt_text)
+        if not cues:
+            return "No content available for SRT generation"
+        return format_srt(self.translate_cues(cues, source_lang, target_lang))
+
+    def translate_cues(self, cues, source_lang, target_lang):
+        """Translate a list of cues one-to-one"""
+        texts = [' '.join(cue.text.split()) for cue in cues]
+        translations = [self.memory.get(source_lang, target_lang, text) for text in texts]
+
+        # Only cues missing from translation memory are sent to the engines
+        pending = [i for i, t in enumerate(translations) if t is None]
+        windows = [pending[i:i + self.window_size]
+                   for i in range(0, len(pending), self.window_size)]
+
+        if windows:
+            # Imported here to keep the module cheap to import
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = max(1, min(self.max_workers, len(windows)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                window_results = pool.map(
+                    lambda window: self.translate_window([texts[i] for i in window],
+                                                         source_lang, target_lang),
+                    windows)
+                for window, results in zip(windows, window_results):
+                    for i, translated in zip(window, results):
+                        translations[i] = translated
+
+        translated_cues = []
+        for cue, text, translated in zip(cues, texts, translations):
+            if translated is None:
+                translated = text
+            translated_cues.append(cue._replace(
+                text=wrap_cue_text(translated, self.max_line_chars)))
+
+        return fit_reading_speed(translated_cues, self.max_cps)
+
+    def translate_window(self, texts, source_lang, target_lang):
+        """Translate one context window of cue texts, returning one translation per cue"""
+        # Number each cue so the engine output can be mapped back line by line
+        window_text = '\n'.join(f"[{i + 1}] {text}" for i, text in enumerate(texts))
+        result = self.translate_fn(window_text, source_lang, target_lang)
+
+        mapped = self.split_window_result(result, len(texts))
+        if mapped is None:
+            # Markers were lost or merged: translate the cues of this window one by one
+            mapped = []
+            for text in texts:
+                single = self.translate_fn(text, source_lang, target_lang)
+                mapped.append(None if self.is_error(single) else ' '.join(single.split()))
+
+        for text, translated in zip(texts, mapped):
+            if translated:
+                self.memory.put(source_lang, target_lang, text, translated)
+        return mapped
+
+    def split_window_result(self, result, expected):
+        """Map numbered engine output back to cues, or None if the markers do not line up"""
+        if self.is_error(result):
+            return None
+
+        parts = {}
+        current = None
+        for line in result.split('\n'):
+            match = WINDOW_MARKER_RE.match(line)
+            if match:
+                current = int(match.group(1))
+                parts[current] = [match.group(2).strip()]
+            elif current is not None and line.strip():
+                parts[current].append(line.strip())
+
+        if sorted(parts) != list(range(1, expected + 1)):
+            return None
+        return [' '.join(parts[i]).strip() or None for i in range(1, expected + 1)]
+
+    def is_error(self, result):
+        return not result or result.startswith("⚠️")
@@ -3,18 +3,13 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI, APPLE_TRANSLATION_AVAILABLE
-import tkinter as tk
+from pipeline import Pipeline, APPLE_TRANSLATION_AVAILABLE
 
 def test_apple_translation():
     print("Testing Apple Live Translation...")
     print(f"Apple Translation Available: {APPLE_TRANSLATION_AVAILABLE}")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test text
     test_text = """Hello, this is a test of Apple's Live Translation system. 
@@ -40,8 +35,6 @@ And this is a third paragraph to ensure the translation maintains proper structu
         print(f"Fallback result: {fallback_result}")
     else:
         print("Apple Live Translation successful!")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_apple_translation()
\ No newline at end of file
@@ -7,23 +7,18 @@ Test script to verify the enhanced translation article feature
 import sys
 import os
 
-# Add the current directory to the path so we can import yap_gui
+# Add the current directory to the path so we can import the pipeline
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_article_enhancement():
     """Test the enhanced translation article feature"""
     print("🧪 Testing Enhanced Translation Article Feature")
     print("=" * 55)
     
-    # Create a minimal root window for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    # Create YapGUI instance
-    app = YapGUI(root)
+    # Headless pipeline, no window needed
+    app = Pipeline()
     
     # Test text for translation
     test_text = """Artificial intelligence has revolutionized the way we interact with technology. From virtual assistants like Siri and Alexa to advanced machine learning algorithms that power recommendation systems, AI is becoming increasingly integrated into our daily lives. The technology has made significant strides in natural language processing, computer vision, and robotics, enabling computers to understand and respond to human input in more natural ways than ever before.
@@ -91,9 +86,6 @@ However, the rapid advancement of AI technology also raises important questions
     
     print()
     print("🎉 Article enhancement test completed!")
-    
-    # Clean up
-    root.destroy()
 
 if __name__ == "__main__":
     test_article_enhancement() 
\ No newline at end of file
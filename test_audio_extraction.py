@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Test script for extracting 16 kHz mono audio from local videos before transcription
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from audio_prep import extract_audio_command, has_video, is_audio_file
+from event_bus import EventBus, DONE, ERROR
+from job_store import load_manifest, read_catalog
+from pipeline import Pipeline
+
+# ffprobe reports a video stream for files with "video" in their name;
+# ffmpeg writes one second of 16 kHz mono silence and logs its runs
+FAKE_FFPROBE = '''#!/bin/sh
+for last; do :; done
+case "$last" in *video*) echo "0,0";; esac
+'''
+
+FAKE_FFMPEG = '''#!/usr/bin/env python3
+import sys, wave
+with open(sys.argv[0] + ".runs", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+with wave.open(sys.argv[-1], "wb") as out:
+    out.setnchannels(1)
+    out.setsampwidth(2)
+    out.setframerate(16000)
+    out.writeframes(b"\\0\\0" * 16000)
+'''
+
+
+def wait_for_terminal(bus, job, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def read_lines(path):
+    try:
+        with open(path) as f:
+            return f.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+
+def test_audio_extraction():
+    print("=== TESTING AUDIO EXTRACTION ===")
+
+    # Test 1: Stream detection and the extraction command
+    ok = has_video("0,0\n") and not has_video("1,1\n") and not has_video("")
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Video streams told apart from cover art")
+    cmd = extract_audio_command("talk.mp4", "talk.wav")
+    ok = '-vn' in cmd and cmd[cmd.index('-ac') + 1] == '1' and cmd[cmd.index('-ar') + 1] == '16000'
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Extracts the audio track only, 16 kHz mono")
+    print(f"{'✅ PASS' if is_audio_file('memo.M4A') and not is_audio_file('talk.mov') else '❌ FAIL'} - Audio files recognised")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        yap_log = os.path.join(temp_dir, 'yap.log')
+        fail_flag = os.path.join(temp_dir, 'fail')
+        tools = {
+            'ffprobe': FAKE_FFPROBE,
+            'ffmpeg': FAKE_FFMPEG,
+            'yap': f'#!/bin/sh\necho "$1" >> {yap_log}\n'
+                   f'if [ -e {fail_flag} ]; then echo "decoder error" >&2; exit 1; fi\n'
+                   'echo "A short talk." > "$3"\n',
+        }
+        for name, script in tools.items():
+            with open(os.path.join(bin_dir, name), 'w') as f:
+                f.write(script)
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+        ffmpeg_runs = os.path.join(bin_dir, 'ffmpeg.runs')
+
+        output_dir = os.path.join(temp_dir, 'out')
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        config = {'summarize': False, 'translate': False, 'target_lang': "es", 'output_dir': output_dir,
+                  'index_path': os.path.join(temp_dir, 'index.db'),
+                  'fingerprint_path': os.path.join(temp_dir, 'fingerprints.db')}
+        pipeline.apply_settings(config)
+
+        def transcribe(job, name, **changes):
+            path = os.path.join(temp_dir, name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(name.encode() * 1000)
+            pipeline.run_local_transcription(job, dict(config, file_path=path, **changes))
+            return wait_for_terminal(bus, job)
+
+        # Test 2: A video is transcribed from its extracted audio
+        event = transcribe(1, 'video talk.mp4')
+        manifest = load_manifest(os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir']))
+        ok = (event is not None and event.kind == DONE and read_lines(yap_log)[-1].endswith('video talk.wav')
+              and manifest['artifacts'].get('audio') == 'video talk.wav' and 'extract' in manifest['timings'])
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - yap got the extracted audio: {read_lines(yap_log)[-1:]}")
+        job_dir = os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir'])
+        print(f"{'✅ PASS' if not os.path.exists(os.path.join(job_dir, '.partial')) else '❌ FAIL'} - Scratch files removed")
+
+        # Test 3: Audio-only files skip extraction
+        runs = len(read_lines(ffmpeg_runs))
+        transcribe(2, 'voice memo.m4a')
+        transcribe(3, 'podcast.mkv')  # A container whose only streams are audio
+        ok = len(read_lines(ffmpeg_runs)) == runs and read_lines(yap_log)[-1].endswith('podcast.mkv')
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Audio-only files transcribed without extraction")
+
+        # Test 4: A retry reuses the audio extracted by the failed run
+        with open(fail_flag, 'w'):
+            pass
+        event = transcribe(4, 'video lecture.mov')
+        print(f"{'✅ PASS' if event is not None and event.kind == ERROR else '❌ FAIL'} - First attempt failed")
+        os.unlink(fail_flag)
+        runs = len(read_lines(ffmpeg_runs))
+        event = transcribe(5, 'video lecture.mov')
+        ok = event is not None and event.kind == DONE and len(read_lines(ffmpeg_runs)) == runs
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Retry reused the extracted audio")
+
+        # Test 5: Without a working ffmpeg the video goes to yap directly
+        with open(os.path.join(bin_dir, 'ffmpeg'), 'w') as f:
+            f.write('#!/bin/sh\necho "Unknown encoder" >&2\nexit 1\n')
+        event = transcribe(6, 'video interview.mp4')
+        ok = event is not None and event.kind == DONE and read_lines(yap_log)[-1].endswith('video interview.mp4')
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Falls back to the original file")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_audio_extraction()
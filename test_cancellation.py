@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+Test script for cancelling jobs and the tools they run
+"""
+
+import sys
+import os
+import time
+import shutil
+import subprocess
+import tempfile
+import threading
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR
+from pipeline import Pipeline
+import pipeline_worker
+from pipeline_worker import PipelineWorker
+from process_control import Cancelled, CancelToken, run_process
+
+
+def wait_for_terminal(bus, job, timeout=30, finished={}):
+    """Final event of a job; those of other jobs drained meanwhile are kept for later"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.kind in (DONE, ERROR):
+                finished[event.job] = event
+        if job in finished:
+            return finished.pop(job)
+        time.sleep(0.05)
+    return None
+
+
+def cancel_later(cancel, delay=0.5):
+    timer = threading.Timer(delay, cancel)
+    timer.start()
+    return timer
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    # Zombies of this test's children count as gone
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != 'Z'
+    except OSError:
+        return True
+
+
+def test_cancellation():
+    print("=== TESTING JOB CANCELLATION ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        # Test 1: Finished tools behave like subprocess.run
+        result = run_process(['sh', '-c', 'cat; echo err >&2'], CancelToken(), input="hello")
+        ok = result.returncode == 0 and result.stdout == "hello" and result.stderr.strip() == "err"
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Output and exit code returned")
+
+        # Test 2: Cancelling stops the tool and everything it started
+        pid_file = os.path.join(temp_dir, 'child.pid')
+        token = CancelToken()
+        cancel_later(token.cancel)
+        start = time.monotonic()
+        try:
+            run_process(['sh', '-c', f'sleep 30 & echo $! > {pid_file}; wait'], token)
+            cancelled = False
+        except Cancelled:
+            cancelled = True
+        elapsed = time.monotonic() - start
+        print(f"{'✅ PASS' if cancelled and elapsed < 3 else '❌ FAIL'} - Cancelled after {elapsed:.2f}s")
+        with open(pid_file) as f:
+            child = int(f.read())
+        time.sleep(0.2)
+        print(f"{'✅ PASS' if not pid_alive(child) else '❌ FAIL'} - Child process stopped too")
+
+        # Test 3: A tool that ignores SIGTERM is killed after the grace period
+        token = CancelToken()
+        cancel_later(token.cancel, 0.2)
+        start = time.monotonic()
+        try:
+            run_process(['sh', '-c', 'trap "" TERM; sleep 30'], token)
+        except Cancelled:
+            pass
+        elapsed = time.monotonic() - start
+        print(f"{'✅ PASS' if elapsed < 5 else '❌ FAIL'} - Stubborn tool killed after {elapsed:.2f}s")
+
+        # Test 4: Timeouts still raise TimeoutExpired
+        try:
+            run_process(['sleep', '30'], CancelToken(), timeout=0.5)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            timed_out = True
+        print(f"{'✅ PASS' if timed_out else '❌ FAIL'} - Timeout enforced")
+
+        # A fake yap that writes part of its output and then hangs
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/bin/sh\n'
+                    'case "$1" in *fast*) echo "Quick transcript." > "$3"; exit 0;; esac\n'
+                    'case "$1" in *slow*) sleep 3; echo "Slow transcript." > "$3"; exit 0;; esac\n'
+                    'echo "partial" > "$3"\n'
+                    'sleep 30\n')
+        os.chmod(os.path.join(bin_dir, 'yap'), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+        output_dir = os.path.join(temp_dir, 'out')
+        os.makedirs(output_dir)
+        config = {'file_path': os.path.join(temp_dir, 'talk.mp4'), 'summarize': False,
+                  'translate': False, 'target_lang': "es", 'output_dir': output_dir,
+                  'index_path': os.path.join(temp_dir, 'index.db')}
+
+        # Test 5: A cancelled in-process job reports it and removes its partial output
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        cancel_later(lambda: pipeline.cancel(1))
+        pipeline.run_local_transcription(1, config)
+        event = wait_for_terminal(bus, 1, timeout=5)
+        ok = event is not None and event.kind == ERROR and event.payload == "Cancelled"
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Job reports cancellation: {event.payload if event else None}")
+        leftovers = [name for _, _, names in os.walk(output_dir) for name in names]
+        print(f"{'✅ PASS' if not leftovers else '❌ FAIL'} - Partial output removed: {leftovers}")
+        print(f"{'✅ PASS' if not pipeline.cancel_tokens else '❌ FAIL'} - Token released")
+
+        # Test 6: A job cancelled before it starts never runs its tools
+        pipeline.cancel(2)
+        start = time.monotonic()
+        pipeline.run_local_transcription(2, config)
+        event = wait_for_terminal(bus, 2, timeout=5)
+        ok = event is not None and event.payload == "Cancelled" and time.monotonic() - start < 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Job cancelled before starting")
+
+        # Test 7: Cancelling in a worker process frees it for the next job
+        worker = PipelineWorker(bus, processes=1, spool_dir=temp_dir)
+        worker.submit(3, 'run_local_transcription', config)
+        fast = dict(config, file_path=os.path.join(temp_dir, 'fast.mp4'))
+        worker.submit(4, 'run_local_transcription', fast)
+        time.sleep(2)
+        start = time.monotonic()
+        worker.cancel(3)
+        event = wait_for_terminal(bus, 3, timeout=10)
+        ok = event is not None and event.payload == "Cancelled"
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Worker job cancelled after {time.monotonic() - start:.2f}s")
+        event = wait_for_terminal(bus, 4, timeout=10)
+        ok = event is not None and event.kind == DONE and event.payload[0]['original'] == "Quick transcript."
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Queued job ran on the freed worker")
+        print(f"{'✅ PASS' if not worker.assigned and not worker.cancelling else '❌ FAIL'} - Worker slot released")
+
+        # Test 8: Cancelling a queued job leaves the job running ahead of it alone
+        old_timeout = pipeline_worker.CANCEL_TIMEOUT
+        pipeline_worker.CANCEL_TIMEOUT = 1
+        try:
+            pid = worker.processes[0].pid
+            worker.submit(5, 'run_local_transcription', dict(config, file_path=os.path.join(temp_dir, 'slow.mp4')))
+            worker.submit(6, 'run_local_transcription', fast)
+            time.sleep(1)
+            worker.cancel(6)
+            event = wait_for_terminal(bus, 5, timeout=10)
+            ok = event is not None and event.kind == DONE and event.payload[0]['original'] == "Slow transcript."
+            print(f"{'✅ PASS' if ok else '❌ FAIL'} - Running job finished: {event.payload[0]['original'] if ok else event}")
+            event = wait_for_terminal(bus, 6, timeout=10)
+            ok = event is not None and event.payload == "Cancelled" and worker.processes[0].pid == pid
+            print(f"{'✅ PASS' if ok else '❌ FAIL'} - Queued job skipped without restarting the worker")
+        finally:
+            pipeline_worker.CANCEL_TIMEOUT = old_timeout
+        worker.close()
+
+        # Test 9: Jobs queued behind a long one run on whichever process is free, in order
+        worker = PipelineWorker(bus, processes=2, spool_dir=temp_dir)
+        worker.submit(7, 'run_local_transcription', dict(config, file_path=os.path.join(temp_dir, 'slow.mp4')))
+        for job in (8, 9, 10):
+            worker.submit(job, 'run_local_transcription', fast)
+        order = []
+        deadline = time.time() + 30
+        while len(order) < 4 and time.time() < deadline:
+            order += [event.job for event in bus.drain() if event.kind in (DONE, ERROR)]
+            time.sleep(0.05)
+        ok = order == [8, 9, 10, 7]
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Free process took the queued jobs: finished {order}")
+        worker.close()
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_cancellation()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Test script for concurrent, cached dependency probing
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from dependencies import probe_dependencies, format_dependency_report
+
+SLEEP = shutil.which('sleep')
+
+
+def make_tool(directory, name, delay):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write(f"#!/bin/sh\n{SLEEP} {delay}\necho '{name} 1.0'\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+def test_dependency_cache():
+    print("=== TESTING DEPENDENCY PROBE CACHE ===")
+
+    temp_dir = tempfile.mkdtemp()
+    original_path = os.environ.get('PATH', '')
+    try:
+        for name in ('yap', 'yt-dlp', 'llm'):
+            make_tool(temp_dir, name, 0.3)
+        os.environ['PATH'] = temp_dir
+        cache_path = os.path.join(temp_dir, "cache", "dependencies.json")
+
+        # Test 1: Cold start probes concurrently
+        start = time.time()
+        results, spawned = probe_dependencies(cache_path)
+        elapsed = time.time() - start
+        print(f"Cold: {spawned} probes in {elapsed:.2f}s")
+        print(f"{'✅ PASS' if spawned == 3 and elapsed < 0.8 else '❌ FAIL'} - Probes run concurrently")
+        print(f"{'✅ PASS' if results['curl'][0] == 'missing' else '❌ FAIL'} - Missing tool reported without spawning")
+
+        # Test 2: Warm start spawns nothing
+        results, spawned = probe_dependencies(cache_path)
+        print(f"{'✅ PASS' if spawned == 0 and results['yt-dlp'] == ('ok', 'yt-dlp 1.0') else '❌ FAIL'} - Warm start uses cache")
+
+        # Test 3: An upgraded binary is probed again
+        time.sleep(0.01)
+        make_tool(temp_dir, 'llm', 0)
+        results, spawned = probe_dependencies(cache_path)
+        print(f"{'✅ PASS' if spawned == 1 else '❌ FAIL'} - Changed binary re-probed ({spawned})")
+
+        report = format_dependency_report(results, api_key_configured=False)
+        print(f"{'✅ PASS' if '✅ yt-dlp: yt-dlp 1.0' in report and 'OpenRouter API: Not configured' in report else '❌ FAIL'} - Report")
+    finally:
+        os.environ['PATH'] = original_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_dependency_cache()
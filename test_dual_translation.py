@@ -3,17 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_dual_translation():
     print("=== TESTING DUAL TRANSLATION OUTPUT ===")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test text
     test_text = """Artificial intelligence has revolutionized the way we interact with technology. From simple chatbots to complex neural networks, AI systems are becoming increasingly sophisticated and capable of performing tasks that were once thought to be exclusively human.
@@ -66,8 +61,6 @@ Machine learning, a subset of AI, has been particularly transformative. Deep lea
     print("✅ Both outputs generated simultaneously")
     print("✅ Independent copy and save functionality for each output")
     print("✅ Clear function clears both outputs")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_dual_translation() 
\ No newline at end of file
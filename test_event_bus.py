@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the batched worker-to-UI event bus
+"""
+
+import sys
+import threading
+sys.path.append('.')
+
+from event_bus import EventBus, STATUS, PROGRESS, PARTIAL, DONE, ERROR
+
+
+def test_event_bus():
+    print("=== TESTING UI EVENT BUS ===")
+
+    bus = EventBus(max_pending=8)
+
+    # Test 1: Chatty updates are coalesced to the latest one per job
+    for i in range(1000):
+        bus.status(1, f"Step {i}")
+        bus.progress(1, i / 1000)
+    bus.status(2, "Other job")
+    events = bus.drain()
+    statuses = [e for e in events if e.kind == STATUS]
+    print(f"{'✅ PASS' if len(events) == 3 else '❌ FAIL'} - 2001 updates drained as {len(events)} events")
+    print(f"{'✅ PASS' if statuses[0].payload == 'Step 999' else '❌ FAIL'} - Latest status kept")
+    progress = [e.payload for e in events if e.kind == PROGRESS]
+    print(f"{'✅ PASS' if progress == [0.999] else '❌ FAIL'} - Latest progress kept: {progress}")
+
+    # Test 2: Partial results are coalesced per key
+    bus.partial(1, 'summary', "old")
+    bus.partial(1, 'translation', "hola")
+    bus.partial(1, 'summary', "new")
+    partials = {e.payload[0]: e.payload[1] for e in bus.drain() if e.kind == PARTIAL}
+    print(f"{'✅ PASS' if partials == {'summary': 'new', 'translation': 'hola'} else '❌ FAIL'} - Partials per key")
+
+    # Test 3: Terminal events are never coalesced and keep their order
+    bus.done(1, {'text': 'a'}, "out.txt")
+    bus.error(2, "failed")
+    events = bus.drain()
+    kinds = [e.kind for e in events]
+    print(f"{'✅ PASS' if kinds == [DONE, ERROR] and events[0].payload[1] == 'out.txt' else '❌ FAIL'} - Terminal events in order")
+
+    # Test 4: Terminal queue is bounded; workers block until the UI drains
+    finished = threading.Event()
+
+    def flood():
+        for job in range(20):
+            bus.done(job)
+        finished.set()
+
+    threading.Thread(target=flood, daemon=True).start()
+    blocked = not finished.wait(0.2)
+    received = []
+    while len(received) < 20:
+        received.extend(bus.drain(max_terminal=4))
+        finished.wait(0.01)
+    print(f"{'✅ PASS' if blocked else '❌ FAIL'} - Back-pressure on a full queue")
+    print(f"{'✅ PASS' if [e.job for e in received] == list(range(20)) else '❌ FAIL'} - All terminal events delivered")
+
+
+if __name__ == "__main__":
+    test_event_bus()
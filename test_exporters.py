@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the streaming exporter framework
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append('.')
+
+from transcript import Transcript
+from exporters import export_document, SrtDocument, EXPORTERS
+
+
+class CountingTranscript(Transcript):
+    """Transcript that counts how often it is iterated"""
+
+    passes = 0
+
+    def iter_paragraphs(self):
+        CountingTranscript.passes += 1
+        return super().iter_paragraphs()
+
+
+class FailingTranscript(Transcript):
+    """Transcript whose cue iteration fails half way through"""
+
+    def iter_cues(self):
+        yield 0.0, 4.0, "First cue"
+        raise RuntimeError("pipeline failure")
+
+
+def test_exporters():
+    print("=== TESTING STREAMING EXPORTERS ===")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        transcript = CountingTranscript(
+            "Welcome to the show. Today we talk about exporters.\n\nThey stream every format at once.",
+            language="en")
+        base_path = os.path.join(temp_dir, "job")
+
+        # Test 1: All formats in one pass over the document
+        paths = export_document(transcript, base_path, list(EXPORTERS), title="Exporters")
+        print(f"Written: {sorted(os.path.basename(p) for p in paths.values())}")
+        print(f"{'✅ PASS' if len(paths) == len(EXPORTERS) else '❌ FAIL'} - Every format written")
+        print(f"{'✅ PASS' if CountingTranscript.passes == 1 else '❌ FAIL'} - Single pass over paragraphs ({CountingTranscript.passes})")
+
+        # Test 2: Output contents
+        with open(paths['json'], encoding='utf-8') as f:
+            data = json.load(f)
+        print(f"{'✅ PASS' if len(data['segments']) == 3 and data['title'] == 'Exporters' else '❌ FAIL'} - JSON is valid and complete")
+        with open(paths['vtt'], encoding='utf-8') as f:
+            print(f"{'✅ PASS' if f.read().startswith('WEBVTT') else '❌ FAIL'} - VTT header")
+        with open(paths['org'], encoding='utf-8') as f:
+            print(f"{'✅ PASS' if f.read().startswith('#+TITLE: Exporters') else '❌ FAIL'} - Org header")
+
+        # Test 3: Translated subtitles exported from SRT content
+        srt = "1\n00:00:00,000 --> 00:00:04,000\nHola a todos.\n\n2\n00:00:04,000 --> 00:00:08,000\nBienvenidos."
+        translated = export_document(SrtDocument(srt, "es"), base_path + ".es", ['vtt'])
+        with open(translated['vtt'], encoding='utf-8') as f:
+            print(f"{'✅ PASS' if '00:00:04.000 --> 00:00:08.000' in f.read() else '❌ FAIL'} - Translated VTT")
+
+        # Test 4: Failures leave neither partial files nor temp files behind
+        failed_base = os.path.join(temp_dir, "failed")
+        try:
+            export_document(FailingTranscript("Some text."), failed_base, ['srt', 'txt'])
+            print("❌ FAIL - Expected an error")
+        except RuntimeError:
+            leftovers = [name for name in os.listdir(temp_dir) if name.startswith(('failed', '.'))]
+            print(f"{'✅ PASS' if not leftovers else '❌ FAIL'} - No partial files after failure: {leftovers}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_exporters()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+Test script for skipping unchanged local files through fingerprints
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR
+from fingerprints import SAMPLE_BLOCK, FingerprintIndex, sample_hash, settings_key
+from pipeline import Pipeline
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def wait_for_terminal(bus, job, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def test_fingerprints():
+    print("=== TESTING FINGERPRINT SKIP INDEX ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        index = FingerprintIndex(os.path.join(temp_dir, 'fingerprints.db'))
+        settings = settings_key({'translate': False})
+        size = 10 * SAMPLE_BLOCK
+        content = bytes(range(256)) * (size // 256)
+        original = os.path.join(temp_dir, 'talk.mp4')
+        write(original, content)
+        index.record(original, os.stat(original), settings, '/jobs/talk')
+
+        # Test 1: An unchanged file matches on its stat alone, without reading it
+        fingerprint, sample = index.lookup(original, settings)
+        ok = fingerprint is not None and fingerprint.job_dir == '/jobs/talk' and sample is None
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Unchanged file matched by size and mtime")
+
+        # Test 2: A touched or copied file is matched by its content
+        os.utime(original, (time.time() + 10, time.time() + 10))
+        fingerprint, _ = index.lookup(original, settings)
+        print(f"{'✅ PASS' if fingerprint is not None else '❌ FAIL'} - Touched file matched by content")
+        copy = os.path.join(temp_dir, 'copy of talk.mp4')
+        shutil.copyfile(original, copy)
+        fingerprint, _ = index.lookup(copy, settings)
+        print(f"{'✅ PASS' if fingerprint is not None else '❌ FAIL'} - Copied file matched by content")
+
+        # Test 3: Files that differ only between the sampled blocks are told apart by full hashes
+        changed = bytearray(content)
+        changed[SAMPLE_BLOCK + 10] ^= 0xFF
+        other = os.path.join(temp_dir, 'edited talk.mp4')
+        write(other, bytes(changed))
+        same_sample = sample_hash(other, size) == sample_hash(copy, size)
+        index.record(copy, os.stat(copy), settings, '/jobs/copy')
+        index.record(other, os.stat(other), settings, '/jobs/edited')
+        renamed = os.path.join(temp_dir, 'renamed edit.mp4')
+        shutil.copyfile(other, renamed)
+        fingerprint, _ = index.lookup(renamed, settings)
+        ok = same_sample and fingerprint is not None and fingerprint.job_dir == '/jobs/edited'
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Sample collision resolved by full hash")
+        shutil.copyfile(copy, renamed)
+        fingerprint, _ = index.lookup(renamed, settings)
+        ok = fingerprint is not None and fingerprint.job_dir == '/jobs/copy'
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Colliding original still found")
+
+        # Test 4: Different settings never match
+        fingerprint, _ = index.lookup(original, settings_key({'translate': True}))
+        print(f"{'✅ PASS' if fingerprint is None else '❌ FAIL'} - Other settings not reused")
+
+        # Test 5: Checking 10,000 files takes a stat each
+        archive = os.path.join(temp_dir, 'archive')
+        os.makedirs(archive)
+        paths = []
+        for n in range(10000):
+            paths.append(os.path.join(archive, f"rec{n:05d}.m4a"))
+            write(paths[-1], b'x')
+        db = index.connect()
+        with db:
+            db.executemany("INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           [(path, settings, 1, os.stat(path).st_mtime_ns, 's', 's', '/jobs', 0) for path in paths])
+        db.close()
+        start = time.perf_counter()
+        unchanged = index.unchanged(paths)
+        elapsed = time.perf_counter() - start
+        ok = len(unchanged) == 10000 and elapsed < 5
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - 10,000 files checked in {elapsed:.2f}s")
+
+        # A fake yap that counts its runs
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        runs = os.path.join(temp_dir, 'runs')
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write(f'#!/bin/sh\necho x >> {runs}\necho "A talk about fingerprints." > "$3"\n')
+        os.chmod(os.path.join(bin_dir, 'yap'), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+
+        def run_count():
+            with open(runs) as f:
+                return len(f.readlines())
+
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        config = {'file_path': original, 'summarize': False, 'translate': False, 'target_lang': "es",
+                  'output_dir': os.path.join(temp_dir, 'out'), 'index_path': os.path.join(temp_dir, 'index.db'),
+                  'fingerprint_path': os.path.join(temp_dir, 'jobs.db')}
+        pipeline.apply_settings(config)
+
+        # Test 6: Transcribing an unchanged file again reuses the earlier results
+        pipeline.run_local_transcription(1, config)
+        first = wait_for_terminal(bus, 1)
+        pipeline.run_local_transcription(2, config)
+        second = wait_for_terminal(bus, 2)
+        ok = (first is not None and second is not None and second.kind == DONE and run_count() == 1
+              and second.payload == first.payload)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Second run reused the results ({run_count()} yap run(s))")
+
+        # Test 7: Changed settings or a changed file run yap again
+        pipeline.export_formats = ['srt']
+        pipeline.run_local_transcription(3, config)
+        wait_for_terminal(bus, 3)
+        print(f"{'✅ PASS' if run_count() == 2 else '❌ FAIL'} - Changed settings transcribed again")
+        write(original, content + b'more')
+        pipeline.run_local_transcription(4, config)
+        wait_for_terminal(bus, 4)
+        print(f"{'✅ PASS' if run_count() == 3 else '❌ FAIL'} - Changed file transcribed again")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_fingerprints()
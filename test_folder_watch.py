@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Test script for watch-folder ingestion
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR, PARTIAL
+from folder_watch import DoneSet, FolderWatcher, WatchIngest, file_key
+from pipeline_worker import PipelineWorker
+
+
+def write(path, data=b'\0' * 1000):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def scan_until(watcher, timeout):
+    found = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not found:
+        found = watcher.scan()
+        time.sleep(0.1)
+    return found
+
+
+def test_folder_watch():
+    print("=== TESTING WATCH-FOLDER INGESTION ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        folder = os.path.join(temp_dir, 'inbox')
+        os.makedirs(folder)
+
+        # Test 1: A file still being written is not taken until it settles
+        watcher = FolderWatcher(folder, settle=0.5, notify=False)
+        recording = os.path.join(folder, 'meeting.mp4')
+        early = []
+        for _ in range(8):
+            write(recording)
+            early += watcher.scan()
+            time.sleep(0.1)
+        print(f"{'✅ PASS' if not early else '❌ FAIL'} - Growing file not taken: {early}")
+        found = scan_until(watcher, 2)
+        print(f"{'✅ PASS' if found == [recording] else '❌ FAIL'} - Settled file taken: {found}")
+        print(f"{'✅ PASS' if not scan_until(watcher, 1) else '❌ FAIL'} - Each file version reported once")
+
+        # Test 2: Hidden, partial and non-media files are ignored
+        write(os.path.join(folder, '.meeting2.mp4.part'))
+        write(os.path.join(folder, 'notes.txt'))
+        print(f"{'✅ PASS' if not scan_until(watcher, 1.5) else '❌ FAIL'} - Non-media and hidden files ignored")
+
+        # Test 3: inotify wakes the watcher as soon as a file appears (Linux)
+        watcher = FolderWatcher(folder, settle=0.3)
+        if sys.platform.startswith('linux'):
+            print(f"{'✅ PASS' if watcher.backend == 'inotify' else '❌ FAIL'} - Backend: {watcher.backend}")
+        ready = []
+        thread = threading.Thread(target=watcher.run, args=(ready.append,), daemon=True)
+        thread.start()
+        time.sleep(0.5)
+        ready.clear()  # Files already present
+        start = time.monotonic()
+        write(os.path.join(folder, 'call.m4a'))
+        while not ready and time.monotonic() - start < 5:
+            time.sleep(0.05)
+        elapsed = time.monotonic() - start
+        print(f"{'✅ PASS' if ready and elapsed < 3 else '❌ FAIL'} - New file found after {elapsed:.2f}s")
+        watcher.stop()
+        thread.join(2)
+        print(f"{'✅ PASS' if not thread.is_alive() else '❌ FAIL'} - Watcher stops promptly")
+
+        # Test 4: The done set survives restarts and torn lines
+        done_path = os.path.join(temp_dir, 'watch_done.jsonl')
+        done = DoneSet(done_path)
+        key = file_key(recording, os.stat(recording))
+        done.add(key, 'done')
+        with open(done_path, 'a') as f:
+            f.write('{"key": "torn')
+        print(f"{'✅ PASS' if key in DoneSet(done_path) else '❌ FAIL'} - Done set persisted")
+
+        # Test 5: At most `limit` jobs run; finishing one starts the next
+        submitted = []
+        ingest = WatchIngest(DoneSet(os.path.join(temp_dir, 'bounded.jsonl')),
+                             lambda path: submitted.append(path) or len(submitted), limit=2)
+        files = []
+        for n in range(5):
+            files.append(os.path.join(folder, f"clip{n}.wav"))
+            write(files[-1])
+            ingest.add(files[-1])
+        ingest.add(files[0])
+        ok = len(ingest.running) == 2 and len(ingest.queue) == 3
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Bounded: {len(ingest.running)} running, {len(ingest.queue)} queued")
+        ingest.finished(1, 'done')
+        print(f"{'✅ PASS' if len(ingest.running) == 2 and len(submitted) == 3 else '❌ FAIL'} - Next file started")
+        print(f"{'✅ PASS' if not ingest.add(files[0]) else '❌ FAIL'} - Done file not queued again")
+        time.sleep(0.01)
+        write(files[0])
+        print(f"{'✅ PASS' if ingest.add(files[0]) else '❌ FAIL'} - Rewritten file queued again")
+
+        # Test 6: Files dropped in a folder are transcribed in parallel worker processes
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/bin/sh\nsleep 1\necho "Transcript of $(basename "$1")." > "$3"\n')
+        os.chmod(os.path.join(bin_dir, 'yap'), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+
+        drop = os.path.join(temp_dir, 'drop')
+        output_dir = os.path.join(temp_dir, 'out')
+        os.makedirs(drop)
+        os.makedirs(output_dir)
+        bus = EventBus()
+        worker = PipelineWorker(bus, processes=3, spool_dir=temp_dir)
+        config = {'summarize': False, 'translate': False, 'target_lang': "es", 'output_dir': output_dir,
+                  'index_path': os.path.join(temp_dir, 'index.db'),
+                  'fingerprint_path': os.path.join(temp_dir, 'fingerprints.db')}
+        job_ids = iter(range(1, 100))
+
+        def submit(path):
+            job = next(job_ids)
+            worker.submit(job, 'run_local_transcription', dict(config, file_path=path))
+            return job
+
+        done_path = os.path.join(output_dir, 'watch_done.jsonl')
+        ingest = WatchIngest(DoneSet(done_path), submit, worker.process_count)
+        watcher = FolderWatcher(drop, settle=0.3)
+        threading.Thread(target=watcher.run, args=(lambda path: bus.partial(0, path, path),), daemon=True).start()
+        for n in range(6):
+            write(os.path.join(drop, f"recording{n}.mov"))
+        start = time.monotonic()
+        finished = []
+        peak = 0
+        while len(finished) < 6 and time.monotonic() - start < 60:
+            for event in bus.drain():
+                if event.job == 0 and event.kind == PARTIAL:
+                    ingest.add(event.payload[1])
+                elif event.kind in (DONE, ERROR):
+                    finished.append((ingest.finished(event.job, 'done' if event.kind == DONE else 'failed'),
+                                     event.kind))
+            peak = max(peak, len(ingest.running))
+            time.sleep(0.05)
+        elapsed = time.monotonic() - start
+        watcher.stop()
+        worker.close()
+        ok = len(finished) == 6 and all(kind == DONE for _, kind in finished)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - {len(finished)} dropped files transcribed in {elapsed:.1f}s")
+        print(f"{'✅ PASS' if peak == 3 else '❌ FAIL'} - Ran {peak} jobs at once on 3 workers")
+        restarted = DoneSet(done_path)
+        ok = all(file_key(path, os.stat(path)) in restarted for path, _ in finished)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Finished files remembered for the next start")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_folder_watch()
@@ -3,17 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_hybrid_paragraph_detection():
     print("Testing Hybrid Paragraph Detection...")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test 1: Good paragraph structure
     good_text = """This is the first paragraph about artificial intelligence. It introduces the main concept and provides some background information. AI has been developing rapidly in recent years, transforming various industries and sectors.
@@ -45,8 +40,6 @@ This final paragraph talks about the future of artificial intelligence. Machine
     print("\nTesting translation with poor structure...")
     result_poor = app.translate_locally_then_enhance(poor_text[:200] + "...", "es")
     print(f"Poor structure result: {'Uses AI Paragraphs' if not result_poor.startswith('⚠️') else 'Error'}")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_hybrid_paragraph_detection()
\ No newline at end of file
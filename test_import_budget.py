@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the headless import-time budget
+"""
+
+import sys
+import subprocess
+sys.path.append('.')
+
+from import_budget import check_budget
+
+
+def test_import_budget():
+    print("=== TESTING IMPORT-TIME BUDGET ===")
+
+    # Test 1: The headless pipeline does not need tkinter at all
+    result = subprocess.run([sys.executable, '-c',
+                             "import sys; sys.modules['tkinter'] = None; "
+                             "from pipeline import Pipeline; print(Pipeline().format_text_in_paragraphs('Hi there.'))"],
+                            capture_output=True, text=True)
+    print(f"{'✅ PASS' if result.returncode == 0 else '❌ FAIL'} - Pipeline importable without tkinter {result.stderr.strip()}")
+
+    # Test 2: Every budgeted module stays within budget
+    ok, lines = check_budget(runs=3)
+    print("\n".join(lines))
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Import-time budget")
+
+
+if __name__ == "__main__":
+    test_import_budget()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Test script for per-job artifact directories, manifests and the job catalog
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import multiprocessing
+sys.path.append('.')
+
+from event_bus import EventBus, DONE
+from job_store import (CATALOG_FILE, JobRecord, append_catalog, load_manifest,
+                       read_catalog, slugify)
+from pipeline import Pipeline
+
+
+def append_many(output_dir, worker, count):
+    for n in range(count):
+        append_catalog(output_dir, {'id': f"{worker}-{n}", 'title': "x" * 200})
+
+
+def test_job_store():
+    print("=== TESTING JOB DIRECTORIES AND CATALOG ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        # Test 1: Each job gets its own directory and manifest
+        first = JobRecord(temp_dir, 'local', "My Talk (final).mp4", source={'file_path': "/tmp/talk.mp4"})
+        second = JobRecord(temp_dir, 'local', "My Talk (final).mp4")
+        ok = first.directory != second.directory and os.path.isdir(first.directory)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Same name, separate directories: {first.relative_dir}")
+        print(f"{'✅ PASS' if slugify('My Talk (final).mp4') == 'My-Talk-final-mp4' else '❌ FAIL'} - Readable directory names")
+        print(f"{'✅ PASS' if load_manifest(first.directory)['status'] == 'running' else '❌ FAIL'} - Manifest written at start")
+
+        # Test 2: Artifacts, timings and cache keys end up in the manifest and the catalog
+        with open(first.path('talk.txt'), 'w') as f:
+            f.write("Hello")
+        first.add_artifact('text', first.path('talk.txt'))
+        first.set_cache_key('source', "123:456")
+        with first.stage('transcribe'):
+            time.sleep(0.05)
+        first.finish(title="My Talk")
+        manifest = load_manifest(first.directory)
+        ok = (manifest['artifacts'] == {'text': 'talk.txt'} and manifest['timings']['transcribe'] >= 0.05
+              and manifest['cache_keys']['source'] == "123:456" and manifest['status'] == 'done')
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Manifest lists artifacts, timings and cache keys")
+        second.discard()
+        print(f"{'✅ PASS' if not os.path.exists(second.directory) else '❌ FAIL'} - Cancelled job directory removed")
+        entries = read_catalog(temp_dir)
+        ok = len(entries) == 1 and entries[0]['id'] == first.id and entries[0]['dir'] == first.relative_dir
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Finished job listed in the catalog")
+
+        # Test 3: Recent jobs come from the end of a long catalog, newest first
+        for n in range(20000):
+            append_catalog(temp_dir, {'id': f"job{n}", 'title': f"Job {n}"})
+        with open(os.path.join(temp_dir, CATALOG_FILE), 'ab') as f:
+            f.write(b'{"id": "torn')
+        start = time.perf_counter()
+        recent = read_catalog(temp_dir, limit=5)
+        elapsed = (time.perf_counter() - start) * 1000
+        ok = [entry['id'] for entry in recent] == [f"job{n}" for n in range(19999, 19994, -1)]
+        print(f"{'✅ PASS' if ok and elapsed < 5 else '❌ FAIL'} - 5 recent of 20,000 jobs in {elapsed:.2f} ms (torn line skipped)")
+
+        # Test 4: Concurrent processes append whole lines
+        catalog_dir = os.path.join(temp_dir, 'concurrent')
+        os.makedirs(catalog_dir)
+        processes = [multiprocessing.Process(target=append_many, args=(catalog_dir, worker, 300))
+                     for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        with open(os.path.join(catalog_dir, CATALOG_FILE), 'r') as f:
+            lines = f.read().splitlines()
+        ok = len(lines) == 1200 and all(json.loads(line)['title'] == "x" * 200 for line in lines)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - {len(lines)} lines from 4 processes, none interleaved")
+
+        # Test 5: Pipeline jobs write into their own directory
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/bin/sh\necho "This is the first sentence of the talk. And here is another one." > "$3"\n')
+        os.chmod(os.path.join(bin_dir, 'yap'), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+        output_dir = os.path.join(temp_dir, 'out')
+        os.makedirs(output_dir)
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        pipeline.index_path = os.path.join(temp_dir, 'index.db')
+        config = {'file_path': os.path.join(temp_dir, 'talk.mp4'), 'summarize': False, 'translate': False,
+                  'target_lang': "es", 'output_dir': output_dir}
+        pipeline.run_local_transcription(1, config)
+        pipeline.run_local_transcription(2, config)
+        done = [event for event in bus.drain() if event.kind == DONE]
+        recent = read_catalog(output_dir)
+        ok = len(done) == 2 and len(recent) == 2 and recent[0]['dir'] != recent[1]['dir']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Two runs of the same file, two job directories")
+        manifest = load_manifest(os.path.join(output_dir, recent[0]['dir']))
+        ok = {'text', 'transcript', 'srt'} <= set(manifest['artifacts']) and 'transcribe' in manifest['timings']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Job manifest: {sorted(manifest['artifacts'])}, {sorted(manifest['timings'])}")
+        print(f"{'✅ PASS' if manifest['source']['file_path'] == config['file_path'] else '❌ FAIL'} - Source metadata recorded")
+        ok = sorted(os.listdir(output_dir)) == sorted(['jobs', CATALOG_FILE])
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Nothing written loose into the output directory")
+
+        # Test 6: A failed job is kept and marked failed
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/bin/sh\necho "unsupported file" >&2\nexit 1\n')
+        pipeline.run_local_transcription(3, config)
+        latest = read_catalog(output_dir, limit=1)[0]
+        ok = latest['status'] == 'failed' and 'unsupported file' in load_manifest(os.path.join(output_dir, latest['dir']))['error']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Failed job recorded with its error")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_job_store()
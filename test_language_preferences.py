@@ -5,9 +5,11 @@ import os
 import json
 import tempfile
 import shutil
+import time
 sys.path.append('.')
 
 from yap_gui import YapGUI
+from settings_store import SettingsStore
 import tkinter as tk
 
 def test_language_preferences():
@@ -15,18 +17,15 @@ def test_language_preferences():
     
     # Create a temporary directory for testing
     temp_dir = tempfile.mkdtemp()
-    original_output_dir = None
     
     try:
         # Create a mock GUI instance for testing
         root = tk.Tk()
         root.withdraw()  # Hide the window
         
-        app = YapGUI(root)
-        
-        # Store original output directory and set temporary one
-        original_output_dir = app.output_dir
-        app.output_dir = temp_dir
+        # Settings go to a store in the temporary directory
+        settings_file = os.path.join(temp_dir, 'settings.json')
+        app = YapGUI(root, settings=SettingsStore(settings_file, save_delay=0.1, legacy_dir=None))
         
         print(f"Using temporary directory: {temp_dir}")
         
@@ -45,8 +44,9 @@ def test_language_preferences():
         # Test 2: Save preferences
         print("\n--- Test 2: Saving Preferences ---")
         app.save_language_preferences()
+        app.settings.flush()
         
-        prefs_file = os.path.join(temp_dir, '.yap_language_prefs')
+        prefs_file = settings_file
         if os.path.exists(prefs_file):
             print(f"✅ Preferences file created: {prefs_file}")
             with open(prefs_file, 'r') as f:
@@ -60,47 +60,12 @@ def test_language_preferences():
         print("\n--- Test 3: Creating New Instance to Test Loading ---")
         root.destroy()
         
-        # Create a new instance with the correct output directory
+        # Create a new instance with the same settings file
         root2 = tk.Tk()
         root2.withdraw()
         
-        # Temporarily modify the output directory before creating the instance
-        import yap_gui
-        original_output_dir = yap_gui.YapGUI.__init__.__defaults__
-        
-        # Create a custom init that uses our temp directory
-        def custom_init(self, root):
-            self.root = root
-            self.root.title("Whisper Killer - YouTube & Video Transcription Tool")
-            self.root.geometry("900x800")
-            
-            # Variables
-            self.current_operation = None
-            self.output_dir = temp_dir  # Use our temp directory
-            os.makedirs(self.output_dir, exist_ok=True)
-            
-            # Encryption key based on machine-specific info (safe for GitHub)
-            self.encryption_key = self.generate_machine_key()
-            
-            print("Setting up UI...", file=sys.stderr)
-            self.setup_ui()
-            print("Loading language preferences...", file=sys.stderr)
-            self.load_language_preferences()
-            print("Checking dependencies...", file=sys.stderr)
-            self.check_dependencies()
-            print("Loading API key...", file=sys.stderr)
-            self.load_encrypted_api_key()
-            print("Whisper Killer initialization complete", file=sys.stderr)
-        
-        # Replace the init method temporarily
-        original_init = yap_gui.YapGUI.__init__
-        yap_gui.YapGUI.__init__ = custom_init
-        
-        try:
-            app2 = yap_gui.YapGUI(root2)
-        finally:
-            # Restore original init
-            yap_gui.YapGUI.__init__ = original_init
+        # The new instance reads the same settings file once at startup
+        app2 = YapGUI(root2, settings=SettingsStore(settings_file, save_delay=0.1, legacy_dir=None))
         
         print(f"New instance Text Source: {app2.text_source_lang.get()}")
         print(f"New instance Text Target: {app2.text_target_lang.get()}")
@@ -144,7 +109,8 @@ def test_language_preferences():
         print("\n--- Test 6: Testing Automatic Save on Change ---")
         app2.text_source_lang.set("zh")
         
-        # Check if preferences file was updated
+        # Check if preferences file was updated (writes are debounced and done in the background)
+        time.sleep(0.5)
         with open(prefs_file, 'r') as f:
             updated_prefs = json.load(f)
             if updated_prefs['text_source_lang'] == 'zh':
@@ -158,7 +124,7 @@ def test_language_preferences():
             print("✅ Automatic saving on language change working")
             print("✅ Preferences persist across app restarts")
             print("✅ Support for all translation tabs (Text, YouTube, Local)")
-            print("✅ JSON-based preference storage")
+            print("✅ JSON-based settings store in the local config directory")
             print("✅ Error handling for missing preference files")
         else:
             print("❌ Some language preferences failed to persist correctly")
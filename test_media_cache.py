@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the size-bounded media cache (kept audio and intermediates)
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR
+from job_store import JobRecord, load_manifest
+from media_cache import MediaCache, format_usage
+from pipeline import Pipeline
+
+
+def finished_job(output_dir, name, source, size, pinned=False):
+    """A finished job with a transcript and `size` bytes of kept audio"""
+    record = JobRecord(output_dir, 'online', name, source={'url': source})
+    record.set_cache_key('source', source)
+    with open(record.path(f"{name}.wav"), 'wb') as f:
+        f.write(b'\0' * size)
+    with open(record.path(f"{name}.txt"), 'w') as f:
+        f.write("Transcript")
+    record.add_artifact('audio', record.path(f"{name}.wav"))
+    record.add_artifact('text', record.path(f"{name}.txt"))
+    if pinned:
+        record.manifest['pinned'] = True
+    record.finish(title=name)
+    time.sleep(0.01)  # Distinct finish times
+    return record
+
+
+def wait_for_done(bus, job, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def test_media_cache():
+    print("=== TESTING MEDIA CACHE ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        output_dir = os.path.join(temp_dir, 'out')
+        os.makedirs(output_dir)
+        mb = 1024 * 1024
+        oldest = finished_job(output_dir, 'oldest', 'https://a', mb)
+        pinned = finished_job(output_dir, 'pinned', 'https://b', mb, pinned=True)
+        middle = finished_job(output_dir, 'middle', 'https://c', mb)
+        newest = finished_job(output_dir, 'newest', 'https://d', mb)
+
+        # Test 1: Usage covers every cached file of finished jobs
+        cache = MediaCache(output_dir, budget_mb=2.5)
+        usage = cache.usage()
+        ok = usage.bytes == 4 * mb and usage.pinned_bytes == mb and usage.entries == 4
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Usage reported: {format_usage(usage)}")
+
+        # Test 2: Least recently used, unpinned files go first until the budget fits
+        evicted = [os.path.basename(entry.job_dir) for entry in cache.evict()]
+        ok = len(evicted) == 2 and evicted[0] == oldest.id and evicted[1] == middle.id
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Evicted least recently used: {len(evicted)} file(s)")
+        remaining = cache.usage()
+        print(f"{'✅ PASS' if remaining.bytes <= cache.budget else '❌ FAIL'} - Within budget afterwards")
+        ok = os.path.exists(pinned.path('pinned.wav')) and os.path.exists(newest.path('newest.wav'))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Pinned and recent audio kept")
+
+        # Test 3: Eviction only removes cached media and notes it in the manifest
+        manifest = load_manifest(oldest.directory)
+        ok = ('audio' not in manifest['artifacts'] and manifest['evicted']['audio']['reason'] == "evicted"
+              and os.path.exists(oldest.path('oldest.txt')))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Transcript kept, eviction recorded")
+
+        # Test 4: A new job for a cached source takes the file over
+        record = JobRecord(output_dir, 'online', 'again', source={'url': 'https://d'})
+        claimed = cache.claim('https://d', 'audio', record)
+        ok = (claimed is not None and os.path.exists(claimed) and not os.path.exists(newest.path('newest.wav'))
+              and 'audio' not in load_manifest(newest.directory)['artifacts'])
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Cached audio moved to the new job")
+        record.discard()
+
+        # Test 5: Pinned files are copied, so the pinned job keeps its own
+        record = JobRecord(output_dir, 'online', 'copy', source={'url': 'https://b'})
+        claimed = cache.claim('https://b', 'audio', record)
+        ok = claimed is not None and os.path.exists(claimed) and os.path.exists(pinned.path('pinned.wav'))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Pinned audio copied")
+        record.discard()
+        missed = cache.claim('https://unknown', 'audio', JobRecord(output_dir, 'online', 'miss'))
+        usage = cache.usage()
+        ok = missed is None and usage.hits == 2 and usage.misses == 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Hits and misses counted ({usage.hits}/{usage.misses})")
+
+        # Test 6: Unpinning makes a job evictable again
+        cache.pin(pinned.directory, False)
+        evicted = cache.evict(budget=0)
+        print(f"{'✅ PASS' if any(e.job_dir == pinned.directory for e in evicted) else '❌ FAIL'} - Unpinned audio evicted")
+
+        # Fake tools: yt-dlp describes the video and counts its downloads, ffmpeg "compresses" by copying a few bytes
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        downloads = os.path.join(temp_dir, 'downloads')
+        tools = {
+            'yt-dlp': '#!/bin/sh\n'
+                      'if [ "$1" = --dump-single-json ]; then echo \'{"id": "vid", "title": "A video", "duration": 3}\'; exit; fi\n'
+                      f'echo x >> {downloads}\n'
+                      'for last; do :; done\n'
+                      'out=$(echo "$last" | sed "s/%(id)s/vid/; s/%(ext)s/wav/")\n'
+                      'head -c 100000 /dev/zero > "$out"\n',
+            'yap': '#!/bin/sh\necho "Hello from the video." > "$3"\n',
+            'ffmpeg': '#!/bin/sh\nfor last; do :; done\nhead -c 5000 /dev/zero > "$last"\n',
+        }
+        for name, script in tools.items():
+            with open(os.path.join(bin_dir, name), 'w') as f:
+                f.write(script)
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        config = {'url': "https://www.youtube.com/watch?v=vid", 'summarize': False, 'translate': False,
+                  'target_lang': "es", 'keep_audio': True, 'output_dir': output_dir,
+                  'index_path': os.path.join(temp_dir, 'index.db'), 'media_codec': "aac"}
+        pipeline.apply_settings(config)
+
+        # Test 7: Kept audio is recompressed and listed in the manifest
+        pipeline.run_online_video_transcription(1, config)
+        event = wait_for_done(bus, 1)
+        job_dir = MediaCache(output_dir).entries()[-1].job_dir
+        audio = load_manifest(job_dir)['artifacts'].get('audio', "")
+        ok = event is not None and event.kind == DONE and audio.endswith('.m4a') and not os.path.exists(
+            os.path.join(job_dir, 'A video.wav'))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Kept audio recompressed: {audio}")
+
+        # Test 8: The same URL again reuses the kept audio instead of downloading
+        pipeline.run_online_video_transcription(2, config)
+        event = wait_for_done(bus, 2)
+        with open(downloads) as f:
+            count = len(f.readlines())
+        ok = event is not None and event.kind == DONE and count == 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Second run reused the audio ({count} download(s))")
+
+        # Test 9: Without "Keep audio" nothing is left for the cache
+        pipeline.run_online_video_transcription(3, dict(config, url="https://vimeo.com/42", keep_audio=False))
+        event = wait_for_done(bus, 3)
+        latest = MediaCache(output_dir).entries()
+        ok = event is not None and event.kind == DONE and all('42' not in entry.source for entry in latest)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Audio not kept when unchecked")
+
+        # Test 10: Lookups read only the manifests of jobs finished since the index was last brought up to date
+        import media_cache
+        read = []
+        original_load = media_cache.load_manifest
+        media_cache.load_manifest = lambda job_dir: read.append(job_dir) or original_load(job_dir)
+        try:
+            for n in range(20):
+                finished_job(output_dir, f'history{n}', f'https://h{n}', 1000)
+            cache = MediaCache(output_dir)
+            cache.usage()
+            read.clear()
+            latest = finished_job(output_dir, 'latest', 'https://latest', 1000)
+            record = JobRecord(output_dir, 'online', 'reuse', source={'url': 'https://latest'})
+            claimed = cache.claim('https://latest', 'audio', record)
+            ok = claimed is not None and set(read) == {latest.directory}
+            print(f"{'✅ PASS' if ok else '❌ FAIL'} - Claim read {len(read)} manifest(s) with 20+ jobs in history")
+        finally:
+            media_cache.load_manifest = original_load
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_media_cache()
@@ -3,17 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_paragraph_algorithm():
     print("=== COMPREHENSIVE PARAGRAPH ALGORITHM TEST ===")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test cases with expected results
     test_cases = [
@@ -123,8 +118,6 @@ Finally, the algorithm makes a decision about the translation approach. If the s
         print("🎉 All tests passed! The algorithm is working correctly.")
     else:
         print("⚠️ Some tests failed. Algorithm may need further adjustment.")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_paragraph_algorithm() 
\ No newline at end of file
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""
+Test script for running pipeline jobs in worker processes
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR
+from pipeline_worker import PipelineWorker, SpooledText, spool, unspool, SPOOL_MIN_CHARS
+
+
+def wait_for_terminal(bus, job, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def test_pipeline_worker():
+    print("=== TESTING PIPELINE WORKER PROCESSES ===")
+
+    spool_dir = tempfile.mkdtemp()
+    try:
+        # Test 1: Large strings cross the process boundary as spool files
+        big = "Una frase larga. " * (SPOOL_MIN_CHARS // 10)
+        spooled = spool(({'original': big, 'summary': "short"}, "out.txt"), spool_dir, "job1")
+        print(f"{'✅ PASS' if isinstance(spooled[0]['original'], SpooledText) else '❌ FAIL'} - Large result spooled")
+        print(f"{'✅ PASS' if spooled[0]['summary'] == 'short' else '❌ FAIL'} - Small result inline")
+        restored = unspool(spooled)
+        print(f"{'✅ PASS' if restored[0]['original'] == big and not os.listdir(spool_dir) else '❌ FAIL'} - Unspooled and cleaned up")
+
+        # Test 2: A job runs in a worker process and reports back through the bus
+        os.environ.pop('OPENROUTER_API_KEY', None)
+        bus = EventBus()
+        worker = PipelineWorker(bus, processes=1, spool_dir=spool_dir)
+        config = {'text': "Hello world.", 'source_lang': "en", 'target_lang': "es",
+                  'use_apple': False, 'enhance_paragraphs': False, 'api_key': ""}
+        worker.submit(1, 'translate_text_versions', config)
+        event = wait_for_terminal(bus, 1)
+        ok = event is not None and event.kind == DONE and event.payload[0].startswith("⚠️ OpenRouter API key required")
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Job result from worker process")
+
+        # Test 3: A crashed worker fails only the job it was running and is replaced
+        pid = worker.processes[0].pid
+        worker.assigned[2] = 0
+        worker.started.add(2)
+        worker.submit(5, 'translate_text_versions', config)
+        worker.processes[0].kill()
+        event = wait_for_terminal(bus, 2)
+        print(f"{'✅ PASS' if event is not None and event.kind == ERROR else '❌ FAIL'} - Crash reported: {event.payload if event else None}")
+        event = wait_for_terminal(bus, 5)
+        print(f"{'✅ PASS' if event is not None and event.kind == DONE else '❌ FAIL'} - Waiting job ran after the crash")
+
+        # Test 4: A job handed to a process that died before starting it runs on the replacement
+        with worker.lock:
+            worker.assigned[4] = 0
+            worker.requests[4] = (4, 'translate_text_versions', config)
+            worker.processes[0].kill()
+        event = wait_for_terminal(bus, 4)
+        print(f"{'✅ PASS' if event is not None and event.kind == DONE else '❌ FAIL'} - Unstarted job resubmitted")
+
+        worker.submit(3, 'translate_text_versions', config)
+        event = wait_for_terminal(bus, 3)
+        print(f"{'✅ PASS' if event is not None and event.kind == DONE else '❌ FAIL'} - Jobs run after respawn")
+        print(f"{'✅ PASS' if worker.processes[0].pid != pid else '❌ FAIL'} - Worker respawned")
+        worker.close()
+        print(f"{'✅ PASS' if os.path.isdir(spool_dir) else '❌ FAIL'} - Caller's spool directory kept")
+
+        # Test 5: A spool directory the pool made is removed on close
+        worker = PipelineWorker(bus, processes=1)
+        own_dir = worker.spool_dir
+        worker.close()
+        print(f"{'✅ PASS' if not os.path.exists(own_dir) else '❌ FAIL'} - Own spool directory removed")
+    finally:
+        shutil.rmtree(spool_dir)
+
+
+if __name__ == "__main__":
+    test_pipeline_worker()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the debounced settings store
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append('.')
+
+from settings_store import SettingsStore, encrypt_text, load_api_key
+
+
+def test_settings_store():
+    print("=== TESTING SETTINGS STORE ===")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "config", "settings.json")
+        legacy_dir = os.path.join(temp_dir, "output")
+        os.makedirs(legacy_dir)
+        with open(os.path.join(legacy_dir, '.yap_language_prefs'), 'w') as f:
+            json.dump({'text_source_lang': 'fr', 'youtube_target_lang': 'ja'}, f)
+        with open(os.path.join(legacy_dir, '.yap_config'), 'w') as f:
+            f.write(encrypt_text("sk-or-test"))
+
+        # Test 1: Settings from the output directory are taken over on first start
+        store = SettingsStore(path, save_delay=0.2, legacy_dir=legacy_dir)
+        print(f"{'✅ PASS' if store.get('text_source_lang') == 'fr' and store.get('youtube_target_lang') == 'ja' else '❌ FAIL'} - Legacy language preferences migrated")
+        print(f"{'✅ PASS' if store.api_key() == 'sk-or-test' else '❌ FAIL'} - Legacy API key migrated")
+        print(f"{'✅ PASS' if store.get('local_target_lang') == 'es' and store.get('translation_workers') == 4 else '❌ FAIL'} - Defaults for the rest")
+        store.flush()
+
+        # Test 2: A burst of changes is coalesced into one write, off the calling thread
+        writes = store.writes
+        start = time.time()
+        for lang in ('de', 'it', 'pt', 'nl', 'ko'):
+            store.update(text_target_lang=lang)
+        elapsed = time.time() - start
+        print(f"{'✅ PASS' if elapsed < 0.05 else '❌ FAIL'} - Updates return immediately ({elapsed * 1000:.1f} ms)")
+        print(f"{'✅ PASS' if store.writes == writes else '❌ FAIL'} - Nothing written during the burst")
+        time.sleep(0.6)
+        with open(path, 'r') as f:
+            saved = json.load(f)
+        print(f"{'✅ PASS' if store.writes == writes + 1 and saved['text_target_lang'] == 'ko' else '❌ FAIL'} - One write with the latest value ({store.writes - writes})")
+
+        # Test 3: Unchanged values are not written again
+        print(f"{'✅ PASS' if not store.update(text_target_lang='ko') else '❌ FAIL'} - No-op update ignored")
+
+        # Test 4: Concurrent updates all end up in the file
+        threads = [threading.Thread(target=store.update, kwargs={f'custom_{i}': i}) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        with open(path, 'r') as f:
+            saved = json.load(f)
+        print(f"{'✅ PASS' if all(saved.get(f'custom_{i}') == i for i in range(20)) else '❌ FAIL'} - Concurrent updates saved")
+        print(f"{'✅ PASS' if not [n for n in os.listdir(os.path.dirname(path)) if n != 'settings.json'] else '❌ FAIL'} - No temporary files left")
+
+        # Test 5: A new store reads the snapshot once; headless code gets the key
+        reread = SettingsStore(path, legacy_dir=legacy_dir)
+        print(f"{'✅ PASS' if reread.get('text_target_lang') == 'ko' and reread.get('text_source_lang') == 'fr' else '❌ FAIL'} - Snapshot read at startup")
+        print(f"{'✅ PASS' if load_api_key(path) == 'sk-or-test' else '❌ FAIL'} - API key available without the GUI")
+
+        # Test 6: A corrupt file falls back to defaults
+        with open(path, 'w') as f:
+            f.write("{not json")
+        broken = SettingsStore(path, legacy_dir=legacy_dir)
+        print(f"{'✅ PASS' if broken.get('text_source_lang') == 'en' else '❌ FAIL'} - Corrupt settings fall back to defaults")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_settings_store()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""
+Test script for voice-activity-based silence trimming before transcription
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import wave
+sys.path.append('.')
+
+import numpy as np
+
+from event_bus import EventBus, DONE, ERROR
+from job_store import load_manifest, read_catalog
+from pipeline import Pipeline
+from subtitles import parse_srt
+from vad import TimeMap, speech_spans, trim_silence
+
+RATE = 16000
+
+
+def speech(seconds, rate=RATE):
+    """Speech-like sound: voiced harmonics in the speech band, modulated at a syllable rate"""
+    t = np.arange(int(seconds * rate)) / rate
+    voice = sum(np.sin(2 * np.pi * f * t) for f in (220, 440, 880, 1320, 2200)) / 5
+    return 0.3 * voice * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+
+
+def silence(seconds, rate=RATE, seed=0):
+    return np.random.default_rng(seed).normal(0, 0.0003, int(seconds * rate))
+
+
+def hum(seconds, rate=RATE):
+    t = np.arange(int(seconds * rate)) / rate
+    return 0.1 * np.sin(2 * np.pi * 50 * t)
+
+
+def write_wav(path, samples, rate=RATE, channels=1):
+    data = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    if channels > 1:
+        data = np.repeat(data, channels)
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(data.tobytes())
+
+
+def wav_seconds(path):
+    with wave.open(path, 'rb') as audio:
+        return audio.getnframes() / audio.getframerate()
+
+
+def close(a, b, tolerance=0.35):
+    return abs(a - b) <= tolerance
+
+
+def wait_for_terminal(bus, job, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def test_silence_trimming():
+    print("=== TESTING SILENCE TRIMMING ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        # Speech 0-3 s, silence 3-13 s, speech 13-17 s (with a 0.5 s pause at 15), hum 17-22 s, speech 22-24 s
+        lecture = os.path.join(temp_dir, 'lecture.wav')
+        write_wav(lecture, np.concatenate([speech(3), silence(10), speech(2), silence(0.5, seed=1), speech(1.5),
+                                           hum(5), speech(2)]))
+
+        # Test 1: Speech is found; silence and hum are not
+        spans, duration = speech_spans(lecture)
+        ok = (len(spans) == 3 and close(spans[0][0], 0) and close(spans[0][1], 3.25) and close(spans[1][0], 12.75)
+              and close(spans[1][1], 17.25) and close(spans[2][0], 21.75) and close(spans[2][1], 24))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Speech spans: {spans}")
+        print(f"{'✅ PASS' if len(spans) == 3 else '❌ FAIL'} - Short pause kept, silence and hum cut")
+
+        # Test 2: The trimmed audio holds only the speech
+        trimmed = os.path.join(temp_dir, 'speech.wav')
+        time_map = trim_silence(lecture, trimmed)
+        ok = time_map is not None and close(wav_seconds(trimmed), time_map.kept, 0.01) and close(time_map.kept, 10.25)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Trimmed {duration:.1f} s to {wav_seconds(trimmed):.2f} s")
+
+        # Test 3: Times map back to the original, ends before a cut
+        time_map = TimeMap([(0, 3), (13, 17), (22, 24)], 24)
+        ok = (time_map.to_original(1) == 1 and time_map.to_original(3) == 13 and time_map.to_original(4.5) == 14.5
+              and time_map.to_original(3, end=True) == 3 and time_map.to_original(8, end=True) == 23)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Time map: 3 s -> {time_map.to_original(3)}, end 3 s -> {time_map.to_original(3, end=True)}")
+        map_file = os.path.join(temp_dir, 'time_map.json')
+        time_map.save(map_file)
+        print(f"{'✅ PASS' if TimeMap.load(map_file).span(2, 5) == (2, 15) else '❌ FAIL'} - Time map saved and loaded")
+
+        # Test 4: Stereo 44.1 kHz audio, and audio with little silence is left alone
+        stereo = os.path.join(temp_dir, 'stereo.wav')
+        write_wav(stereo, np.concatenate([speech(2, 44100), silence(4, 44100), speech(2, 44100)]), 44100, 2)
+        spans, _ = speech_spans(stereo)
+        print(f"{'✅ PASS' if len(spans) == 2 else '❌ FAIL'} - Stereo 44.1 kHz spans: {spans}")
+        talk = os.path.join(temp_dir, 'talk.wav')
+        write_wav(talk, speech(20))
+        print(f"{'✅ PASS' if trim_silence(talk, trimmed) is None else '❌ FAIL'} - Continuous speech not trimmed")
+
+        # Test 5: Detection is far faster than real time
+        hour = os.path.join(temp_dir, 'long.wav')
+        write_wav(hour, np.tile(np.concatenate([speech(20), silence(10)]), 20))
+        start = time.perf_counter()
+        spans, duration = speech_spans(hour)
+        elapsed = time.perf_counter() - start
+        kept = TimeMap(spans, duration).kept
+        ok = len(spans) == 20 and elapsed < duration / 20
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - {duration / 60:.0f} min analysed in {elapsed:.2f}s, "
+              f"{1 - kept / duration:.0%} of the audio cut")
+
+        # Test 6: A local job transcribes the trimmed audio with cue times in original media time
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        yap_log = os.path.join(temp_dir, 'yap.log')
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/usr/bin/env python3\nimport sys, wave\n'
+                    f'with wave.open(sys.argv[1]) as a, open({yap_log!r}, "a") as log:\n'
+                    '    log.write(str(a.getnframes() / a.getframerate()) + "\\n")\n'
+                    'open(sys.argv[3], "w").write("This is the first sentence of the talk. Here comes the second one. "\n'
+                    '                             "Then a third sentence follows. And finally the fourth sentence.")\n')
+        os.chmod(os.path.join(bin_dir, 'yap'), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+
+        output_dir = os.path.join(temp_dir, 'out')
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        config = {'file_path': lecture, 'summarize': False, 'translate': False, 'target_lang': "es",
+                  'output_dir': output_dir, 'index_path': os.path.join(temp_dir, 'index.db'),
+                  'fingerprint_path': os.path.join(temp_dir, 'fingerprints.db'), 'trim_silence': True}
+        pipeline.apply_settings(config)
+        pipeline.run_local_transcription(1, config)
+        event = wait_for_terminal(bus, 1)
+        with open(yap_log) as f:
+            heard = float(f.read().split()[-1])
+        print(f"{'✅ PASS' if event is not None and event.kind == DONE and heard < 11 else '❌ FAIL'} - yap heard {heard:.2f} s of 24 s")
+        starts = [cue.start for cue in parse_srt(event.payload[0]['original_srt'])]
+        ok = len(starts) == 4 and starts[0] == 0 and 13 < starts[1] < 17 and starts[3] > 22
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Cue starts in original time: {starts}")
+        manifest = load_manifest(os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir']))
+        ok = 'time_map' in manifest['artifacts'] and 'vad' in manifest['timings']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Time map kept with the job")
+
+        # Test 7: With trimming off, yap hears everything
+        config['trim_silence'] = False
+        pipeline.apply_settings(config)
+        pipeline.run_local_transcription(2, config)
+        wait_for_terminal(bus, 2)
+        with open(yap_log) as f:
+            heard = float(f.read().split()[-1])
+        print(f"{'✅ PASS' if close(heard, 24, 0.01) else '❌ FAIL'} - Trimming off: yap heard {heard:.2f} s")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_silence_trimming()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Test script for forwarding launches to the running instance
+"""
+
+import sys
+import os
+import socket
+import shutil
+import tempfile
+import threading
+sys.path.append('.')
+
+from single_instance import InstanceServer, forward, hand_over, launch_items
+
+
+def test_single_instance():
+    print("=== TESTING SINGLE-INSTANCE FORWARDING ===")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "yap_gui.sock")
+    received = []
+    calls = 0
+
+    def on_request(items):
+        nonlocal calls
+        calls += 1
+        received.extend(items)
+        return len(items)
+
+    server = InstanceServer(on_request, path)
+    try:
+        # Test 1: Nothing is running yet
+        print(f"{'✅ PASS' if forward([('url', 'https://youtu.be/x')], path) is None else '❌ FAIL'} - No instance, no reply")
+
+        # Test 2: A second launch hands its items over
+        print(f"{'✅ PASS' if server.start() else '❌ FAIL'} - First instance listens")
+        reply = forward([('url', 'https://youtu.be/x'), ('text', 'Hola mundo')], path)
+        print(f"{'✅ PASS' if reply == {'ok': True, 'queued': 2} else '❌ FAIL'} - Reply: {reply}")
+        print(f"{'✅ PASS' if received == [('url', 'https://youtu.be/x'), ('text', 'Hola mundo')] else '❌ FAIL'} - Items received in order")
+        print(f"{'✅ PASS' if oct(os.stat(path).st_mode & 0o777) == oct(0o600) else '❌ FAIL'} - Socket private to the user")
+
+        # Test 3: Large text arrives intact
+        text = "palabra " * 200000
+        reply = forward([('text', text)], path)
+        print(f"{'✅ PASS' if reply and reply['ok'] and received[-1] == ('text', text) else '❌ FAIL'} - Large text forwarded")
+
+        # Test 4: Concurrent launches all get through
+        threads = [threading.Thread(target=forward, args=([('text', f"item {i}")], path)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"{'✅ PASS' if len(received) == 13 else '❌ FAIL'} - Concurrent launches ({len(received) - 3}/10)")
+        calls = 0
+
+        # Test 5: A launch without arguments brings the window to the front; probes do not
+        received.clear()
+        code = hand_over([], path)
+        forward([], path)
+        print(f"{'✅ PASS' if code == 0 and received == [] and calls == 1 else '❌ FAIL'} - Window raised once ({calls} call(s))")
+
+        # Test 6: A second server does not take over a live instance
+        other = InstanceServer(lambda items: 0, path)
+        print(f"{'✅ PASS' if not other.start() else '❌ FAIL'} - Live instance keeps the socket")
+
+        # Test 7: A stale socket from a crashed instance is replaced
+        server.close()
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        print(f"{'✅ PASS' if forward([], path) is None else '❌ FAIL'} - Stale socket does not answer")
+        server = InstanceServer(lambda items: len(items), path)
+        print(f"{'✅ PASS' if server.start() and forward([], path) == {'ok': True, 'queued': 0} else '❌ FAIL'} - Stale socket replaced")
+    finally:
+        server.close()
+        shutil.rmtree(temp_dir)
+
+    # Test 8: Command-line arguments become launch items
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for name in ('clip.mp4', 'notes.txt', 'talk.yapt'):
+            open(os.path.join(temp_dir, name), 'w').close()
+        items = launch_items(['https://vimeo.com/1', 'clip.mp4', 'notes.txt', 'talk.yapt', 'Bonjour'], cwd=temp_dir)
+        expected = [('url', 'https://vimeo.com/1'), ('video', os.path.join(temp_dir, 'clip.mp4')),
+                    ('text_file', os.path.join(temp_dir, 'notes.txt')),
+                    ('text_file', os.path.join(temp_dir, 'talk.yapt')), ('text', 'Bonjour')]
+        print(f"{'✅ PASS' if items == expected else '❌ FAIL'} - Launch items: {items}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_single_instance()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Test script for speed profiles: sped-up transcription, timestamp rescaling and the benchmark
+"""
+
+import sys
+import os
+import io
+import time
+import shutil
+import tempfile
+import wave
+from contextlib import redirect_stdout, redirect_stderr
+sys.path.append('.')
+
+from audio_prep import SPEED_PROFILES, speed_up_command
+from event_bus import EventBus, DONE, ERROR
+from job_store import load_manifest, read_catalog
+from pipeline import Pipeline
+from speed_benchmark import main as benchmark_main, word_error_rate
+from transcript import Segment, Transcript
+from vad import TimeMap
+
+# ffmpeg copies WAV audio, shortened by the atempo factor
+FAKE_FFMPEG = '''#!/usr/bin/env python3
+import sys, wave
+args = sys.argv[1:]
+speed = 1.0
+for arg in args:
+    if arg.startswith("atempo="):
+        speed = float(arg[7:])
+with wave.open(args[args.index("-i") + 1]) as source, wave.open(args[-1], "wb") as out:
+    out.setparams(source.getparams())
+    out.writeframes(source.readframes(int(source.getnframes() / speed)))
+'''
+
+# yap takes 0.05 s per second of audio and misses a word on audio faster than 1.4x
+FAKE_YAP = '''#!/usr/bin/env python3
+import sys, time, wave
+with wave.open(sys.argv[1]) as audio:
+    seconds = audio.getnframes() / audio.getframerate()
+time.sleep(0.05 * seconds)
+text = "The quick brown fox jumps over the lazy dog. It was a sunny day in the park."
+if seconds < 10 / 1.4:
+    text = text.replace("lazy ", "")
+open(sys.argv[3], "w").write(text)
+'''
+
+
+def write_wav(path, seconds, rate=16000):
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(b'\0\0' * int(seconds * rate))
+
+
+def wait_for_terminal(bus, job, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def test_speed_profiles():
+    print("=== TESTING SPEED PROFILES ===")
+
+    # Test 1: Profiles and the pitch-preserving speed-up command
+    cmd = speed_up_command("talk.wav", "fast.wav", SPEED_PROFILES['fast'])
+    ok = 'atempo=1.3' in cmd and cmd[cmd.index('-ar') + 1] == '16000'
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Speed-up command: {cmd[cmd.index('-filter:a') + 1]}")
+
+    # Test 2: Word error rate ignores case and punctuation
+    reference = "The quick brown fox jumps over the lazy dog."
+    ok = (word_error_rate(reference, "the quick brown fox, jumps over the lazy dog") == 0
+          and word_error_rate(reference, "The quick brown fox jumps over the dog.") == 1 / 9
+          and word_error_rate(reference, "A quick brown fox jumps over the lazy old dog") == 2 / 9)
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Word error rate")
+
+    # Test 3: Recognizer timings are rescaled to original time, through the silence map too
+    pipeline = Pipeline(api_key="")
+    timed = Transcript("First part. Second part.", [Segment(0, 11, 0.0, 2.0, "en"), Segment(12, 24, 2.0, 4.0, "en")])
+    rescaled = [(s.start_time, s.end_time) for s in pipeline.original_timing(timed, None, 1.5).segments]
+    print(f"{'✅ PASS' if rescaled == [(0.0, 3.0), (3.0, 6.0)] else '❌ FAIL'} - Timings rescaled: {rescaled}")
+    mapped = [(s.start_time, s.end_time)
+              for s in pipeline.original_timing(timed, TimeMap([(0, 3), (10, 20)], 20), 1.5).segments]
+    print(f"{'✅ PASS' if mapped == [(0.0, 3.0), (10.0, 13.0)] else '❌ FAIL'} - Rescaled, then mapped past silence: {mapped}")
+    estimated = Transcript("This sentence is long enough. So is this second one.")
+    kept = [s.start_time for s in pipeline.original_timing(estimated, None, 1.5).segments]
+    print(f"{'✅ PASS' if kept == [0, 4] else '❌ FAIL'} - Estimated timings already at natural pace: {kept}")
+
+    temp_dir = tempfile.mkdtemp()
+    old_path = os.environ.get('PATH', '')
+    try:
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        for name, script in (('ffmpeg', FAKE_FFMPEG), ('yap', FAKE_YAP)):
+            with open(os.path.join(bin_dir, name), 'w') as f:
+                f.write(script)
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+
+        talk = os.path.join(temp_dir, 'talk.wav')
+        write_wav(talk, 10)
+        output_dir = os.path.join(temp_dir, 'out')
+        bus = EventBus()
+        config = {'file_path': talk, 'summarize': False, 'translate': False, 'target_lang': "es",
+                  'output_dir': output_dir, 'index_path': os.path.join(temp_dir, 'index.db'),
+                  'fingerprint_path': os.path.join(temp_dir, 'fingerprints.db'), 'speed_profile': 'fastest'}
+        pipeline = Pipeline(bus, api_key="")
+        pipeline.apply_settings(config)
+
+        # Test 4: A job with a fast profile transcribes sped-up audio
+        pipeline.run_local_transcription(1, config)
+        event = wait_for_terminal(bus, 1)
+        manifest = load_manifest(os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir']))
+        transcribe = manifest['timings'].get('transcribe', 99)
+        ok = event is not None and event.kind == DONE and manifest.get('speed') == 1.5 and 'speed' in manifest['timings']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Transcribed at 1.5x in {transcribe:.2f}s")
+
+        # Test 5: The profile is part of the settings a reused run must match
+        fastest = pipeline.local_job_settings(config)
+        pipeline.apply_settings(dict(config, speed_profile='accurate'))
+        accurate = pipeline.local_job_settings(config)
+        ok = fastest != accurate and 'speed_profile' not in accurate
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Speed profile part of the run settings")
+
+        # Test 6: The benchmark reports realtime factor and word error rate per profile
+        reference = os.path.join(temp_dir, 'talk.ref.txt')
+        with open(reference, 'w') as f:
+            f.write("The quick brown fox jumps over the lazy dog. It was a sunny day in the park.")
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            status = benchmark_main([talk, reference, '--json', os.path.join(temp_dir, 'bench.json')])
+        rows = {line.split()[0]: line.split() for line in output.getvalue().splitlines()[1:]}
+        print(output.getvalue())
+        ok = (status == 0 and set(rows) == set(SPEED_PROFILES) and rows['accurate'][-1] == '0.0%'
+              and rows['fastest'][-1] != '0.0%' and float(rows['fastest'][2]) < float(rows['accurate'][2]))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Benchmark table per profile")
+    finally:
+        os.environ['PATH'] = old_path
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_speed_profiles()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the progress-based stall watchdog on external tools
+"""
+
+import sys
+import os
+import time
+import wave
+import shutil
+import subprocess
+import tempfile
+sys.path.append('.')
+
+from process_control import CancelToken, output_size, run_process
+from pipeline import Pipeline, read_completion, transcription_stall, TRANSCRIBE_STALL_UNKNOWN_LENGTH
+
+
+def test_stall_watchdog():
+    print("=== TESTING STALL WATCHDOG ===")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        # Test 1: A slow tool that keeps printing runs past its stall window
+        start = time.monotonic()
+        result = run_process(['sh', '-c', 'for i in 1 2 3 4 5 6; do echo $i; sleep 0.4; done'],
+                             CancelToken(), stall_timeout=1)
+        elapsed = time.monotonic() - start
+        ok = result.returncode == 0 and result.stdout.split() == list("123456") and elapsed > 2
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Busy tool ran {elapsed:.1f}s with a 1s stall window")
+
+        # Test 2: A silent, hung tool is stopped once the window runs out
+        start = time.monotonic()
+        try:
+            run_process(['sleep', '30'], CancelToken(), stall_timeout=1)
+            stalled = None
+        except subprocess.TimeoutExpired as e:
+            stalled = e.timeout
+        elapsed = time.monotonic() - start
+        print(f"{'✅ PASS' if stalled == 1 and elapsed < 3 else '❌ FAIL'} - Hung tool stopped after {elapsed:.1f}s")
+
+        # Test 3: A growing output file counts as progress for a tool that prints nothing
+        target = os.path.join(temp_dir, 'growing.txt')
+        start = time.monotonic()
+        result = run_process(['sh', '-c', f'for i in 1 2 3 4 5 6; do echo $i >> {target}; sleep 0.4; done'],
+                             CancelToken(), stall_timeout=1, progress=lambda: output_size(target))
+        ok = result.returncode == 0 and output_size(target) == 12
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - File growth kept a silent tool alive ({time.monotonic() - start:.1f}s)")
+        print(f"{'✅ PASS' if output_size(temp_dir) == 12 and output_size(target + '.missing') == 0 else '❌ FAIL'} - Directory and missing file sizes")
+
+        # Test 4: Transcription windows grow with the length of the media
+        short, long = transcription_stall(60), transcription_stall(3 * 3600)
+        ok = short < long and transcription_stall(None) == TRANSCRIBE_STALL_UNKNOWN_LENGTH
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Stall window {short:.0f}s for 1 min, {long:.0f}s for 3 h")
+
+        audio_path = os.path.join(temp_dir, 'clip.wav')
+        with wave.open(audio_path, 'wb') as audio:
+            audio.setnchannels(1)
+            audio.setsampwidth(2)
+            audio.setframerate(16000)
+            audio.writeframes(b'\0\0' * 16000 * 3)
+        duration = Pipeline(api_key="").media_duration(audio_path)
+        print(f"{'✅ PASS' if duration == 3 else '❌ FAIL'} - WAV duration read without ffprobe: {duration}")
+
+        # Test 5: Streamed API responses are put back together
+        stream = (': OPENROUTER PROCESSING\n\n'
+                  'data: {"choices": [{"delta": {"content": "Hola"}}]}\n\n'
+                  'data: {"choices": [{"delta": {"content": " mundo"}}]}\n\n'
+                  'data: [DONE]\n')
+        response = read_completion(stream)
+        print(f"{'✅ PASS' if response['choices'][0]['message']['content'] == 'Hola mundo' else '❌ FAIL'} - Streamed tokens joined")
+        response = read_completion('data: {"error": {"message": "Rate limited"}}\n')
+        print(f"{'✅ PASS' if response['error']['message'] == 'Rate limited' else '❌ FAIL'} - Error inside the stream")
+        response = read_completion('{"error": {"message": "No auth"}}')
+        print(f"{'✅ PASS' if response['error']['message'] == 'No auth' else '❌ FAIL'} - Plain JSON error body")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_stall_watchdog()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+Test script for cue-aligned subtitle translation
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+sys.path.append('.')
+
+from subtitles import SubtitleTranslator, TranslationMemory, parse_srt, format_srt, wrap_cue_text
+
+SAMPLE_SRT = """1
+00:00:00,000 --> 00:00:04,000
+Hello and welcome to this video about artificial intelligence.
+
+2
+00:00:04,000 --> 00:00:08,000
+Today we are going to talk about machine learning.
+
+3
+00:00:08,000 --> 00:00:12,000
+Let's get started with the basics.
+
+4
+00:00:12,000 --> 00:00:13,000
+This cue is far too long to be read comfortably in just one single second of screen time."""
+
+
+def fake_engine(calls):
+    """Fake translation engine that upper-cases text and records each call"""
+    lock = threading.Lock()
+
+    def translate(text, source_lang, target_lang):
+        with lock:
+            calls.append(text)
+        return text.upper()
+    return translate
+
+
+def test_subtitle_translation():
+    print("=== TESTING CUE-ALIGNED SUBTITLE TRANSLATION ===")
+
+    # Test 1: Parsing and formatting round-trip
+    cues = parse_srt(SAMPLE_SRT)
+    print(f"Parsed cues: {len(cues)}")
+    print(f"{'✅ PASS' if len(cues) == 4 else '❌ FAIL'} - Cue count")
+    print(f"{'✅ PASS' if parse_srt(format_srt(cues)) == cues else '❌ FAIL'} - SRT round-trip")
+
+    # Test 2: One-to-one translation with original timings
+    calls = []
+    memory = TranslationMemory()
+    translator = SubtitleTranslator(fake_engine(calls), memory=memory, window_size=2)
+    translated = translator.translate_cues(cues, "en", "es")
+
+    same_count = len(translated) == len(cues)
+    same_starts = all(t.start == c.start for t, c in zip(translated, cues))
+    print(f"{'✅ PASS' if same_count and same_starts else '❌ FAIL'} - Cue count and start times preserved")
+    print(f"{'✅ PASS' if len(calls) == 2 else '❌ FAIL'} - Batched into {len(calls)} engine calls (expected 2)")
+    print(f"{'✅ PASS' if translated[0].text.startswith('HELLO') else '❌ FAIL'} - First cue translated")
+
+    # Test 3: Reading speed and line wrapping
+    long_cue = translated[3]
+    lines = long_cue.text.split('\n')
+    print(f"{'✅ PASS' if all(len(l) <= 42 for l in lines) else '❌ FAIL'} - Lines wrapped to 42 characters: {lines}")
+    print(f"{'✅ PASS' if long_cue.end > cues[3].end else '❌ FAIL'} - Last cue extended for reading speed")
+    print(f"{'✅ PASS' if wrap_cue_text('Short line') == 'Short line' else '❌ FAIL'} - Short lines untouched")
+
+    # Test 4: Translation memory avoids repeated engine calls
+    calls.clear()
+    translator.translate_cues(cues, "en", "es")
+    print(f"{'✅ PASS' if not calls else '❌ FAIL'} - Second run served from translation memory ({memory.hits} hits)")
+
+    # Test 5: Engines that lose the cue markers fall back to per-cue translation
+    def merging_engine(text, source_lang, target_lang):
+        return ' '.join(line.split('] ', 1)[-1] for line in text.split('\n')).upper()
+
+    fallback = SubtitleTranslator(merging_engine, window_size=4).translate_cues(cues, "en", "fr")
+    print(f"{'✅ PASS' if len(fallback) == 4 and fallback[2].text.startswith('LET') else '❌ FAIL'} - Per-cue fallback keeps alignment")
+
+    # Test 6: translate-shell is found on the PATH once per pipeline, not run to check it
+    from pipeline import Pipeline
+
+    temp_dir = tempfile.mkdtemp()
+    old_environ = dict(os.environ)
+    try:
+        log = os.path.join(temp_dir, 'trans.log')
+        with open(os.path.join(temp_dir, 'trans'), 'w') as f:
+            f.write(f'#!/bin/sh\necho "$*" >> {log}\ntr a-z A-Z\n')
+        os.chmod(os.path.join(temp_dir, 'trans'), 0o755)
+        os.environ['PATH'] = temp_dir + os.pathsep + old_environ.get('PATH', '')
+        pipeline = Pipeline(api_key="")
+        translator = SubtitleTranslator(pipeline.translate_with_local_tool_fallback, window_size=4)
+        translated = translator.translate_cues(cues, "en", "es")
+        with open(log) as f:
+            calls = f.read().splitlines()
+        ok = (translated[0].text.startswith("HELLO") and pipeline.trans_path == os.path.join(temp_dir, 'trans')
+              and not any('--version' in call for call in calls))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - translate-shell from PATH, {len(calls)} process(es) for {len(cues)} cues")
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_subtitle_translation()
@@ -3,17 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_text_translation():
     print("=== TESTING TEXT TRANSLATION FEATURE ===")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test text
     test_text = """This is a test paragraph about artificial intelligence. It introduces the main concept and provides some background information. AI has been developing rapidly in recent years, transforming various industries and sectors.
@@ -69,8 +64,6 @@ This final paragraph talks about the future of artificial intelligence. Machine
     print("✅ Full AI translation fallback")
     print("✅ Save translation to file functionality")
     print("✅ Copy to clipboard functionality")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_text_translation() 
\ No newline at end of file
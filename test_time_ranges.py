@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+"""
+Test script for time-range and preview-first transcription
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import wave
+sys.path.append('.')
+
+from audio_prep import extract_audio_command, format_time, parse_time, section_label
+from event_bus import EventBus, DONE, ERROR, PARTIAL
+from job_store import load_manifest, read_catalog
+from pipeline import Pipeline
+from subtitles import parse_srt
+
+# ffmpeg cuts WAV audio to -ss/-t
+FAKE_FFMPEG = '''#!/usr/bin/env python3
+import sys, wave
+args = sys.argv[1:]
+start = float(args[args.index("-ss") + 1]) if "-ss" in args else 0.0
+length = float(args[args.index("-t") + 1]) if "-t" in args else None
+with wave.open(args[args.index("-i") + 1]) as source, wave.open(args[-1], "wb") as out:
+    out.setparams(source.getparams())
+    rate = source.getframerate()
+    source.setpos(min(source.getnframes(), int(start * rate)))
+    out.writeframes(source.readframes(source.getnframes() if length is None else int(length * rate)))
+'''
+
+# yt-dlp "downloads" the talk in $FAKE_MEDIA, only the requested section, and logs its arguments
+FAKE_YTDLP = '''#!/usr/bin/env python3
+import os, sys, wave
+args = sys.argv[1:]
+with open(os.environ["FAKE_LOG"], "a") as log:
+    log.write(" ".join(args) + "\\n")
+if "--dump-single-json" in args:
+    sys.exit(1)
+start, end = 0.0, None
+if "--download-sections" in args:
+    start, end = args[args.index("--download-sections") + 1].lstrip("*").split("-")
+    start, end = float(start), None if end == "inf" else float(end)
+target = args[args.index("--output") + 1].replace("%(id)s", "talk").replace("%(ext)s", "wav")
+with wave.open(os.environ["FAKE_MEDIA"]) as source, wave.open(target, "wb") as out:
+    out.setparams(source.getparams())
+    rate = source.getframerate()
+    source.setpos(min(source.getnframes(), int(start * rate)))
+    out.writeframes(source.readframes(source.getnframes() if end is None else int((end - start) * rate)))
+'''
+
+# yap says how long the audio it heard was, and logs it
+FAKE_YAP = '''#!/usr/bin/env python3
+import os, sys, wave
+with wave.open(sys.argv[1]) as audio:
+    seconds = audio.getnframes() / audio.getframerate()
+with open(os.environ["FAKE_LOG"], "a") as log:
+    log.write(f"yap {seconds:g}\\n")
+open(sys.argv[3], "w").write(f"This audio lasts {seconds:g} seconds in all. It ends with a second sentence.")
+'''
+
+RATE = 1000
+
+
+def write_wav(path, seconds):
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(RATE)
+        out.writeframes(b'\0\0' * int(seconds * RATE))
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def wait_for_events(bus, job, timeout=20):
+    """All events of a job up to its DONE or ERROR"""
+    events = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job:
+                events.append(event)
+                if event.kind in (DONE, ERROR):
+                    return events
+        time.sleep(0.05)
+    return events
+
+
+def test_time_ranges():
+    print("=== TESTING TIME RANGES AND PREVIEW-FIRST ===")
+
+    # Test 1: Times are read and written as h:mm:ss
+    ok = (parse_time("90") == 90 and parse_time("1:30") == 90 and parse_time("1:02:03") == 3723
+          and parse_time(" ") is None and format_time(3723) == "1:02:03" and format_time(125) == "2:05")
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Times parsed and formatted")
+    try:
+        parse_time("ten")
+        print("❌ FAIL - Unreadable time rejected")
+    except ValueError:
+        print("✅ PASS - Unreadable time rejected")
+    print(f"{'✅ PASS' if section_label(600, None) == '10:00-end' else '❌ FAIL'} - Section label: {section_label(600, None)}")
+
+    # Test 2: ffmpeg seeks before the input and stops after the section's length
+    cmd = extract_audio_command("talk.mp4", "talk.wav", 60, 90)
+    ok = cmd.index('-ss') < cmd.index('-i') < cmd.index('-t') and cmd[cmd.index('-t') + 1] == '30'
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Section cut command: {' '.join(cmd)}")
+
+    # Test 3: Preview-first splits off the first minutes, unless the range is shorter
+    pipeline = Pipeline(api_key="")
+    ok = (pipeline.job_sections({'preview_minutes': 5}) == [(0.0, 300), (300, None)]
+          and pipeline.job_sections({'time_range': [60, 200], 'preview_minutes': 5}) == [(60.0, 200.0)]
+          and pipeline.job_sections({'time_range': [60, None]}) == [(60.0, None)])
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Job sections")
+
+    temp_dir = tempfile.mkdtemp()
+    old_environ = dict(os.environ)
+    try:
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        for name, script in (('ffmpeg', FAKE_FFMPEG), ('yt-dlp', FAKE_YTDLP), ('yap', FAKE_YAP)):
+            with open(os.path.join(bin_dir, name), 'w') as f:
+                f.write(script)
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        log = os.path.join(temp_dir, 'tools.log')
+        talk = os.path.join(temp_dir, 'talk.wav')
+        write_wav(talk, 480)
+        os.environ.update(PATH=bin_dir + os.pathsep + old_environ.get('PATH', ''), FAKE_LOG=log, FAKE_MEDIA=talk)
+
+        output_dir = os.path.join(temp_dir, 'out')
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        local = {'file_path': talk, 'summarize': False, 'translate': False, 'target_lang': "es",
+                 'output_dir': output_dir, 'index_path': os.path.join(temp_dir, 'index.db'),
+                 'fingerprint_path': os.path.join(temp_dir, 'fingerprints.db')}
+
+        # Test 4: A local time range is cut out, and its cues are in media time
+        config = dict(local, time_range=[60, 120])
+        pipeline.apply_settings(config)
+        pipeline.run_local_transcription(1, config)
+        event = wait_for_events(bus, 1)[-1]
+        starts = [cue.start for cue in parse_srt(event.payload[0]['original_srt'])] if event.kind == DONE else []
+        ok = read_log(log)[-1:] == ['yap 60'] and starts and starts[0] == 60
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Range 1:00-2:00 transcribed, cues from {starts[:1]}")
+        manifest = load_manifest(os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir']))
+        ok = manifest['source'].get('time_range') == [60.0, 120.0] and '#t=1:00-2:00' in manifest['cache_keys']['source']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Range recorded and part of the source key")
+
+        # Test 5: Preview-first publishes the first minutes before the merged results
+        config = dict(local, preview_minutes=5)
+        pipeline.apply_settings(config)
+        pipeline.run_local_transcription(2, config)
+        events = wait_for_events(bus, 2)
+        kinds = [event.kind for event in events if event.kind in (PARTIAL, DONE)]
+        preview = next((event.payload[1] for event in events if event.kind == PARTIAL), {})
+        ok = kinds == [PARTIAL, DONE] and "lasts 300 seconds" in preview.get('original', "")
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Preview of the first 5 minutes before the rest: {kinds}")
+        results = events[-1].payload[0] if events and events[-1].kind == DONE else {}
+        starts = [cue.start for cue in parse_srt(results.get('original_srt', ""))]
+        ok = ("lasts 300 seconds" in results.get('original', "") and "lasts 180 seconds" in results.get('original', "")
+              and starts[-2:] and starts[-2] >= 300)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Final results merged, second part cues from {starts[-2:-1]}")
+
+        # Test 6: Media shorter than the preview is not transcribed twice
+        short = os.path.join(temp_dir, 'short.wav')
+        write_wav(short, 120)
+        config = dict(local, file_path=short, preview_minutes=5)
+        transcribed = len(read_log(log))
+        pipeline.run_local_transcription(3, config)
+        events = wait_for_events(bus, 3)
+        ok = events and events[-1].kind == DONE and read_log(log)[transcribed:] == ['yap 120']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Short media transcribed once: {read_log(log)[transcribed:]}")
+
+        # Test 7: Online ranges download only the section, a preview section first
+        online = {'url': "https://www.youtube.com/watch?v=abc123", 'summarize': False, 'translate': False,
+                  'target_lang': "es", 'keep_audio': True, 'output_dir': output_dir,
+                  'time_range': [120, None], 'preview_minutes': 2}
+        pipeline.apply_settings(online)
+        logged = len(read_log(log))
+        pipeline.run_online_video_transcription(4, online)
+        events = wait_for_events(bus, 4)
+        downloads = [line for line in read_log(log)[logged:] if '--output' in line]
+        sections = [line.split('--download-sections ')[1].split()[0] for line in downloads]
+        ok = events and events[-1].kind == DONE and sections == ['*120-240', '*240-inf']
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Sections downloaded: {sections}")
+        manifest = load_manifest(os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir']))
+        audio = os.path.join(output_dir, read_catalog(output_dir, limit=1)[0]['dir'],
+                             os.path.basename(manifest['artifacts'].get('audio', 'missing')))
+        with wave.open(audio) as kept:
+            seconds = kept.getnframes() / kept.getframerate()
+        ok = seconds == 360 and manifest['cache_keys']['source'].endswith('#t=2:00-end')
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Sections kept as one {seconds:g} s file, cached as the range")
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_time_ranges()
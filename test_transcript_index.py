@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the full-text search index over finished jobs
+"""
+
+import sys
+import os
+import io
+import time
+import shutil
+import tempfile
+import contextlib
+sys.path.append('.')
+
+from pipeline import Pipeline
+from transcript import Transcript
+from transcript_store import save_transcript
+from job_store import JobRecord
+from transcript_index import Row, TranscriptIndex, fts_query, main
+
+SRT = """1
+00:00:01,000 --> 00:00:04,000
+Welcome to the lecture on renewable energy.
+
+2
+00:01:23,500 --> 00:01:27,000
+Solar panels convert sunlight into electricity.
+"""
+
+TRANSLATED_SRT = """1
+00:00:01,000 --> 00:00:04,000
+Bienvenidos a la clase sobre energía renovable.
+
+2
+00:01:23,500 --> 00:01:27,000
+Los paneles solares convierten la luz del sol en electricidad.
+"""
+
+
+def test_transcript_index():
+    print("=== TESTING TRANSCRIPT SEARCH INDEX ===")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        index_path = os.path.join(temp_dir, 'index.db')
+        index = TranscriptIndex(index_path)
+        pipeline = Pipeline(api_key="")
+        pipeline.index_path = index_path
+        results = {
+            'original': "Welcome to the lecture on renewable energy.\n\nSolar panels convert sunlight into electricity.",
+            'original_srt': SRT,
+            'translation': "Bienvenidos a la clase sobre energía renovable.",
+            'translated_srt': TRANSLATED_SRT,
+            'summary': "Energy Lecture\nAn introduction to solar power."
+        }
+        output_file = os.path.join(temp_dir, 'abc123.txt')
+
+        # Test 1: Finished jobs are indexed with timestamps
+        pipeline.index_job(output_file, results, "en", "es", url="https://youtu.be/abc123")
+        hits = index.search("sunlight")
+        ok = len(hits) == 1 and hits[0].field == 'original' and hits[0].start == 83.5 and hits[0].path == output_file
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Transcript segment found with its timestamp")
+        print(f"{'✅ PASS' if hits and hits[0].title == 'Energy Lecture' else '❌ FAIL'} - Title taken from the summary")
+
+        # Test 2: Translations, summaries, titles, URLs and languages are searchable
+        checks = [("paneles solares", 'translation'), ("energia", 'translation'), ("introduction", 'summary'),
+                  ("Energy Lecture", 'title'), ("abc123", 'url'), ("Spanish", 'language')]
+        for query, field in checks:
+            fields = {hit.field for hit in index.search(query)}
+            print(f"{'✅ PASS' if field in fields else '❌ FAIL'} - '{query}' matches the {field}: {sorted(fields)}")
+        print(f"{'✅ PASS' if index.search('elec') else '❌ FAIL'} - Last word matches as a prefix")
+        print(f"{'✅ PASS' if not index.search('sunlight', field='summary') else '❌ FAIL'} - Field filter")
+        print(f"{'✅ PASS' if index.search('sunlight', language='es') and not index.search('sunlight', language='fr') else '❌ FAIL'} - Language filter")
+
+        # Test 3: Odd user input never reaches FTS5 as syntax
+        query = fts_query('"solar" AND (panels')
+        ok = query == '"solar" "AND" "panels"*'
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Query quoted: {query}")
+        print(f"{'✅ PASS' if index.search('*** ((') == [] else '❌ FAIL'} - Punctuation-only query")
+
+        # Test 4: Processing the job again replaces its rows
+        pipeline.index_job(output_file, dict(results, summary="Wind Lecture\nTurbines."), "en", "es")
+        ok = not index.search("introduction") and index.search("turbines") and index.document_count() == 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Re-indexed job replaces its old entry")
+
+        # Test 5: The context of a hit comes back in order
+        hit = index.search("sunlight")[0]
+        rows = index.field_rows(hit.document, hit.field)
+        print(f"{'✅ PASS' if len(rows) == 2 and rows[hit.position].text.startswith('Solar') else '❌ FAIL'} - Hit shown in context")
+
+        # Test 6: Existing transcripts can be indexed; fully indexed jobs are left alone
+        save_transcript(os.path.join(temp_dir, 'old_talk.yapt'), Transcript("The committee approved the budget."))
+        save_transcript(os.path.join(temp_dir, 'abc123.yapt'), Transcript("Welcome to the lecture."))
+        count = index.reindex_directory(temp_dir)
+        ok = count == 1 and index.search("committee") and index.search("turbines")
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Reindexed {count} older transcript(s)")
+
+        # Test 7: Jobs in the output directory's jobs/ tree are found through the catalog
+        record = JobRecord(temp_dir, 'online', "Harbour tour", source={'url': "https://youtu.be/harbour"})
+        record.add_artifact('transcript', save_transcript(record.path('harbour.yapt'),
+                                                          Transcript("The ferry leaves at noon.")))
+        record.add_artifact('text', record.path('harbour.txt'))
+        record.finish(title="Harbour tour")
+        count = index.reindex_directory(temp_dir)
+        hits = index.search("ferry")
+        ok = count == 1 and hits and hits[0].path == record.path('harbour.txt') and index.search("harbour", field='title')
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Reindexed {count} job(s) from the jobs/ tree")
+        print(f"{'✅ PASS' if index.reindex_directory(temp_dir) == 0 else '❌ FAIL'} - Indexed jobs are not added twice")
+
+        # Test 8: Headless search command
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            status = main(['--index', index_path, 'search', 'solar', 'panels'])
+        ok = status == 0 and f"{output_file}:00:01:23" in output.getvalue() and "«Solar»" in output.getvalue()
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Command line prints path:timestamp and snippet")
+
+        # Test 9: Thousands of transcripts are still searched in milliseconds
+        for n in range(2000):
+            rows = [Row('original', f"Segment {i} of talk {n} about topic{n % 50} and more words", i * 4.0, i * 4.0 + 4)
+                    for i in range(20)]
+            if n == 1234:
+                rows.append(Row('original', "The needle in the haystack", 99.0, 103.0))
+            index.add_document(os.path.join(temp_dir, f"talk{n}.txt"), rows)
+        start = time.perf_counter()
+        hits = index.search("haystack needle")
+        elapsed = (time.perf_counter() - start) * 1000
+        ok = len(hits) == 1 and hits[0].path.endswith("talk1234.txt") and elapsed < 50
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - One match among 40,000 segments in {elapsed:.1f} ms")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_transcript_index()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the shared Transcript document model
+"""
+
+import sys
+sys.path.append('.')
+
+from transcript import Transcript, split_title_and_paragraphs
+
+
+def test_transcript_model():
+    print("=== TESTING TRANSCRIPT DOCUMENT MODEL ===")
+
+    text = """Hello and welcome to the show. Today we discuss version 3.5 of the app! Are you ready?
+
+This second paragraph explains the new features in detail. It has two sentences."""
+
+    transcript = Transcript(text, language="en")
+
+    # Test 1: Paragraph and sentence spans
+    paragraphs = list(transcript.iter_paragraphs())
+    sentences = list(transcript.iter_sentences())
+    print(f"Paragraphs: {len(paragraphs)}")
+    print(f"Sentences: {sentences}")
+    print(f"{'✅ PASS' if len(paragraphs) == 2 else '❌ FAIL'} - Paragraph spans")
+    print(f"{'✅ PASS' if len(sentences) == 5 else '❌ FAIL'} - Sentence spans (decimals are not sentence ends)")
+    print(f"{'✅ PASS' if all(transcript.slice(s) == t for s, t in zip(transcript.sentences, sentences)) else '❌ FAIL'} - Spans are offsets into one buffer")
+
+    # Test 2: Analyses are computed once and cached
+    first = transcript.paragraph_word_counts
+    print(f"Word counts: {first}, total {transcript.word_count}, ~{transcript.token_estimate} tokens")
+    print(f"{'✅ PASS' if transcript.paragraph_word_counts is first else '❌ FAIL'} - Word counts cached")
+    print(f"{'✅ PASS' if transcript.formatted is transcript.formatted else '❌ FAIL'} - Formatted document cached")
+
+    # Test 3: Estimated segments when no timings are known
+    segments = transcript.segments
+    print(f"{'✅ PASS' if not transcript.has_timings and segments[1].start_time == 4 else '❌ FAIL'} - Estimated 4 second segments")
+
+    # Test 4: Chunking for command-line translators
+    chunks = list(transcript.chunks(60))
+    print(f"Chunks: {chunks}")
+    print(f"{'✅ PASS' if all(len(c) <= 60 for c in chunks) else '❌ FAIL'} - Chunks respect the size limit")
+
+    # Test 5: Article parsing shared by summaries and enhanced translations
+    title, body = split_title_and_paragraphs("\n🌍 A Title 🌎\n\nFirst paragraph.\n\nSecond paragraph.")
+    print(f"{'✅ PASS' if title == '🌍 A Title 🌎' and len(body) == 2 else '❌ FAIL'} - Title and paragraphs parsed")
+
+
+if __name__ == "__main__":
+    test_transcript_model()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the compact memory-mapped transcript format
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+sys.path.append('.')
+
+from transcript import Transcript
+from transcript_store import save_transcript, open_transcript
+from exporters import export_to
+
+
+def test_transcript_store():
+    print("=== TESTING COMPACT TRANSCRIPT FORMAT ===")
+
+    # Roughly the size of a five hour transcript
+    sentences = [f"Esta es la frase número {i}, con acentos y eñes." for i in range(50000)]
+    paragraphs = [' '.join(sentences[i:i + 3]) for i in range(0, len(sentences), 3)]
+    transcript = Transcript('\n\n'.join(paragraphs), language="es")
+
+    temp_dir = tempfile.mkdtemp()
+    path = os.path.join(temp_dir, "long_transcript.yapt")
+
+    try:
+        # Test 1: Save
+        save_transcript(path, transcript)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Saved {len(transcript.segments)} segments ({size_mb:.1f} MB)")
+
+        # Test 2: Open is constant time (memory-mapped, nothing decoded yet)
+        start = time.time()
+        mapped = open_transcript(path)
+        elapsed_ms = (time.time() - start) * 1000
+        print(f"{'✅ PASS' if elapsed_ms < 50 else '❌ FAIL'} - Opened in {elapsed_ms:.2f} ms")
+        print(f"{'✅ PASS' if mapped.segment_count == len(transcript.segments) else '❌ FAIL'} - Segment table size")
+        print(f"{'✅ PASS' if mapped.language == 'es' else '❌ FAIL'} - Language table")
+
+        # Test 3: Random access to a single segment
+        start_time, end_time, text, language = mapped.segment(1234)
+        print(f"Segment 1234: {start_time}-{end_time}s {text}")
+        print(f"{'✅ PASS' if text == sentences[1234] else '❌ FAIL'} - Segment text from UTF-8 offsets")
+
+        # Test 4: Streaming exporters
+        for fmt in ('txt', 'srt', 'vtt', 'org'):
+            output = io.StringIO()
+            export_to(mapped, fmt, output)
+            print(f"✅ {fmt}: {len(output.getvalue())} characters streamed")
+
+        # Test 5: Round-trip back into a Transcript
+        restored = mapped.to_transcript()
+        same = restored.text == transcript.text and restored.segments[-1] == transcript.segments[-1]
+        print(f"{'✅ PASS' if same else '❌ FAIL'} - Round-trip to Transcript")
+
+        mapped.close()
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+        os.rmdir(temp_dir)
+
+
+if __name__ == "__main__":
+    test_transcript_store()
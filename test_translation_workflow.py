@@ -3,17 +3,12 @@
 import sys
 sys.path.append('.')
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_translation_workflow():
     print("=== TRANSLATION WORKFLOW TEST ===")
     
-    # Create a mock GUI instance for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    app = YapGUI(root)
+    app = Pipeline()
     
     # Test cases for different content types
     test_cases = [
@@ -78,8 +73,6 @@ This paragraph is good again.""",
     print("✅ Uses full AI for poorly structured content")
     print("✅ Provides better paragraph creation with enhanced prompts")
     print("✅ Maintains translation accuracy while improving readability")
-    
-    root.destroy()
 
 if __name__ == "__main__":
     test_translation_workflow() 
\ No newline at end of file
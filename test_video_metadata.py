@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the online video metadata prefetch and shortest-job-first ordering
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from event_bus import EventBus, DONE, ERROR
+from job_store import load_manifest, read_catalog
+from pipeline import DOWNLOAD_STALL, Pipeline, download_stall
+from video_metadata import parse_metadata, prefetch_metadata, safe_filename, shortest_first
+
+# yt-dlp describes videos from $FAKE_VIDEOS (video id -> title and duration) after a short
+# pause, and "downloads" a second of silence; every call is logged
+FAKE_YTDLP = '''#!/usr/bin/env python3
+import json, os, sys, time, wave
+args = sys.argv[1:]
+with open(os.environ["FAKE_LOG"], "a") as log:
+    log.write(" ".join(args) + "\\n")
+video_id = [arg for arg in args if arg.startswith("http")][0].rsplit("=", 1)[-1]
+if "--dump-single-json" in args:
+    time.sleep(0.3)
+    videos = json.loads(os.environ["FAKE_VIDEOS"])
+    if video_id not in videos:
+        sys.exit("ERROR: Video unavailable")
+    title, duration = videos[video_id]
+    print(json.dumps({"id": video_id, "title": title, "duration": duration, "subtitles": {"fr": [], "en": []},
+                      "formats": [{"format_id": "139", "ext": "m4a", "acodec": "mp4a", "vcodec": "none", "abr": 48},
+                                  {"format_id": "251", "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 128},
+                                  {"format_id": "18", "ext": "mp4", "acodec": "mp4a", "vcodec": "avc1"}]}))
+    sys.exit()
+target = args[args.index("--output") + 1].replace("%(id)s", video_id).replace("%(ext)s", "wav")
+with wave.open(target, "wb") as out:
+    out.setnchannels(1)
+    out.setsampwidth(2)
+    out.setframerate(16000)
+    out.writeframes(bytes(32000))
+'''
+
+FAKE_YAP = '#!/bin/sh\necho "Hello from the video, this is a test." > "$3"\n'
+
+VIDEOS = {'short': ["Quick tip: fix it/now?", 95], 'long': ["A three hour lecture", 10800],
+          'mid': ["Interview", 1800], 'clip': ["Clip", 120]}
+
+
+def wait_for_terminal(bus, job, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job and event.kind in (DONE, ERROR):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_video_metadata():
+    print("=== TESTING VIDEO METADATA PREFETCH ===")
+
+    # Test 1: yt-dlp's JSON gives title, duration, captions and audio formats (best first)
+    data = {'id': "abc", 'title': "Talk", 'duration': 600, 'subtitles': {'fr': [], 'de': []},
+            'automatic_captions': {'en': []},
+            'formats': [{'format_id': "139", 'ext': "m4a", 'acodec': "mp4a", 'vcodec': "none", 'abr': 48},
+                        {'format_id': "251", 'ext': "webm", 'acodec': "opus", 'vcodec': "none", 'abr': 128},
+                        {'format_id': "18", 'ext': "mp4", 'acodec': "mp4a", 'vcodec': "avc1", 'abr': 96}]}
+    info = parse_metadata("https://youtu.be/abc", data)
+    ok = (info.title == "Talk" and info.duration == 600 and info.captions == ['de', 'fr']
+          and [f[0] for f in info.audio_formats] == ['251', '139'] and info.filesize == 128 * 125 * 600)
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Metadata parsed: {info.captions}, {info.audio_formats}, {info.filesize} bytes")
+
+    # Test 2: Titles become safe file names
+    ok = (safe_filename('Quick tip: fix it/now?') == "Quick tip fix itnow" and safe_filename("  ..  ") == "video"
+          and len(safe_filename("word " * 40)) <= 100)
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Safe file names: {safe_filename('Quick tip: fix it/now?')!r}")
+
+    # Test 3: Shortest first; unknown lengths last, in their order
+    infos = {'a': {'duration': 300}, 'b': None, 'c': {'duration': 60}, 'd': {'duration': None}, 'e': {'duration': 90}}
+    order = shortest_first(['a', 'b', 'c', 'd', 'e'], infos)
+    print(f"{'✅ PASS' if order == ['c', 'e', 'a', 'b', 'd'] else '❌ FAIL'} - Shortest first: {order}")
+
+    # Test 4: Download stall windows grow with the video's length
+    ok = download_stall(None) == DOWNLOAD_STALL and download_stall(10800) > download_stall(600) > DOWNLOAD_STALL
+    print(f"{'✅ PASS' if ok else '❌ FAIL'} - Download stall window: {download_stall(600):.0f} s for 10 min, "
+          f"{download_stall(10800):.0f} s for 3 h")
+
+    temp_dir = tempfile.mkdtemp()
+    old_environ = dict(os.environ)
+    try:
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        for name, script in (('yt-dlp', FAKE_YTDLP), ('yap', FAKE_YAP)):
+            with open(os.path.join(bin_dir, name), 'w') as f:
+                f.write(script)
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        log = os.path.join(temp_dir, 'yt-dlp.log')
+        os.environ.update(PATH=bin_dir + os.pathsep + old_environ.get('PATH', ''), FAKE_LOG=log,
+                          FAKE_VIDEOS=json.dumps(VIDEOS))
+        urls = [f"https://www.youtube.com/watch?v={video_id}" for video_id in ('long', 'missing', 'short', 'mid')]
+
+        # Test 5: Queued URLs are looked up in parallel; unavailable ones come back as None
+        start = time.perf_counter()
+        infos = prefetch_metadata(urls)
+        elapsed = time.perf_counter() - start
+        ok = infos[urls[1]] is None and infos[urls[0]].duration == 10800 and elapsed < 0.3 * len(urls)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - {len(urls)} URLs looked up in {elapsed:.2f}s")
+        order = [url.rsplit('=', 1)[-1] for url in shortest_first(urls, infos)]
+        print(f"{'✅ PASS' if order == ['short', 'mid', 'long', 'missing'] else '❌ FAIL'} - Queue order: {order}")
+
+        # Test 6: The metadata job hands back plain dicts
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        pipeline.prefetch_metadata(1, {'urls': urls[:2]})
+        event = wait_for_terminal(bus, 1)
+        ok = (event is not None and event.kind == DONE and event.payload[0][urls[0]]['title'] == "A three hour lecture"
+              and event.payload[0][urls[1]] is None)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Metadata job results")
+
+        # Test 7: A job is named after the video's title and records its length
+        output_dir = os.path.join(temp_dir, 'out')
+        config = {'url': urls[2], 'summarize': False, 'translate': False, 'target_lang': "es",
+                  'keep_audio': True, 'output_dir': output_dir, 'index_path': os.path.join(temp_dir, 'index.db')}
+        pipeline.apply_settings(config)
+        pipeline.run_online_video_transcription(2, config)
+        event = wait_for_terminal(bus, 2)
+        entry = read_catalog(output_dir, limit=1)[0]
+        manifest = load_manifest(os.path.join(output_dir, entry['dir']))
+        ok = (event is not None and event.kind == DONE and manifest['artifacts'].get('audio') == "Quick tip fix itnow.wav"
+              and manifest['source'].get('duration') == 95 and 'Quick-tip' in entry['dir'])
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Readable names: {entry['dir']}, {manifest['artifacts'].get('audio')}")
+
+        # Test 8: Prefetched metadata is not looked up again
+        calls = len(read_log(log))
+        pipeline.run_online_video_transcription(3, dict(config, metadata=infos[urls[3]]._asdict()))
+        event = wait_for_terminal(bus, 3)
+        lookups = [line for line in read_log(log)[calls:] if '--dump-single-json' in line]
+        ok = event is not None and event.kind == DONE and not lookups
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Prefetched metadata reused")
+
+        # Test 9: Videos over the length limit are rejected before downloading
+        calls = len(read_log(log))
+        config = dict(config, url=urls[0], max_video_minutes=60)
+        pipeline.apply_settings(config)
+        pipeline.run_online_video_transcription(4, config)
+        event = wait_for_terminal(bus, 4)
+        downloads = [line for line in read_log(log)[calls:] if '--output' in line]
+        ok = event is not None and event.kind == ERROR and "too long" in event.payload and not downloads
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Oversized video rejected: {event.payload if event else None}")
+        pipeline.run_online_video_transcription(5, dict(config, time_range=[600, 1800]))
+        event = wait_for_terminal(bus, 5)
+        print(f"{'✅ PASS' if event is not None and event.kind == DONE else '❌ FAIL'} - A range within the limit runs")
+
+        # Test 10: No preview section for a video known to be shorter than the preview
+        config = dict(config, url="https://www.youtube.com/watch?v=clip", preview_minutes=5, max_video_minutes=0)
+        pipeline.apply_settings(config)
+        sections = pipeline.job_sections(config, 120)
+        calls = len(read_log(log))
+        pipeline.run_online_video_transcription(6, config)
+        event = wait_for_terminal(bus, 6)
+        downloads = [line for line in read_log(log)[calls:] if '--output' in line]
+        ok = sections == [(0.0, None)] and event is not None and event.kind == DONE and len(downloads) == 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Short video downloaded in one go: {sections}")
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_video_metadata()
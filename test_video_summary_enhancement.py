@@ -7,23 +7,18 @@ Test script to verify the enhanced video summary article feature
 import sys
 import os
 
-# Add the current directory to the path so we can import yap_gui
+# Add the current directory to the path so we can import the pipeline
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_video_summary_enhancement():
     """Test the enhanced video summary article feature"""
     print("🧪 Testing Enhanced Video Summary Article Feature")
     print("=" * 55)
     
-    # Create a minimal root window for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    # Create YapGUI instance
-    app = YapGUI(root)
+    # Headless pipeline, no window needed
+    app = Pipeline()
     
     # Test transcript text for summary generation
     test_transcript = """Welcome to today's comprehensive guide on artificial intelligence and machine learning. In this video, we'll explore the fundamental concepts that are shaping the future of technology. Artificial intelligence has become an integral part of our daily lives, from the smartphones we use to the cars we drive.
@@ -107,9 +102,6 @@ The video covers practical applications like image recognition, natural language
     
     print()
     print("🎉 Video summary enhancement test completed!")
-    
-    # Clean up
-    root.destroy()
 
 if __name__ == "__main__":
     test_video_summary_enhancement() 
\ No newline at end of file
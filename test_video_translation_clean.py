@@ -7,23 +7,18 @@ Test script to verify clean video translation format without TRADUCCIÓN text
 import sys
 import os
 
-# Add the current directory to the path so we can import yap_gui
+# Add the current directory to the path so we can import the pipeline
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from yap_gui import YapGUI
-import tkinter as tk
+from pipeline import Pipeline
 
 def test_video_translation_clean():
     """Test that video translations have clean format without TRADUCCIÓN text"""
     print("🧪 Testing Clean Video Translation Format")
     print("=" * 45)
     
-    # Create a minimal root window for testing
-    root = tk.Tk()
-    root.withdraw()  # Hide the window
-    
-    # Create YapGUI instance
-    app = YapGUI(root)
+    # Headless pipeline, no window needed
+    app = Pipeline()
     
     # Test text for translation
     test_text = """Artificial intelligence has revolutionized the way we interact with technology. From virtual assistants like Siri and Alexa to advanced machine learning algorithms that power recommendation systems, AI is becoming increasingly integrated into our daily lives.
@@ -129,9 +124,6 @@ However, the rapid advancement of AI technology also raises important questions
     
     print()
     print("🎉 Clean video translation test completed!")
-    
-    # Clean up
-    root.destroy()
 
 if __name__ == "__main__":
     test_video_translation_clean() 
\ No newline at end of file
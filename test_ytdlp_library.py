@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+"""
+Test script for running yt-dlp in-process, with the yt-dlp command as fallback
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append('.')
+
+from dependencies import probe_dependencies
+from event_bus import EventBus, DONE, ERROR, PROGRESS
+from pipeline import Pipeline
+from process_control import Cancelled
+
+# A stand-in yt_dlp package with the API the library backend uses; every call is recorded in CALLS.
+# "broken" videos fail to download, "missing" ones cannot be described.
+FAKE_PACKAGE = '''
+from . import utils
+
+CALLS = []
+
+
+class YoutubeDL:
+    def __init__(self, params=None):
+        self.params = params or {}
+        self.params.setdefault("outtmpl", {"default": "%(title)s [%(id)s].%(ext)s"})
+        self.progress_hooks = []
+        self.post_processors = []
+
+    def add_progress_hook(self, hook):
+        self.progress_hooks.append(hook)
+
+    def add_post_processor(self, pp, when="post_process"):
+        self.post_processors.append(pp)
+
+    def extract_info(self, url, download=False):
+        CALLS.append(('extract', id(self), url))
+        video_id = url.rsplit("=", 1)[-1]
+        if video_id == "missing":
+            raise utils.DownloadError("ERROR: Video unavailable")
+        return {"id": video_id, "title": "Video " + video_id, "duration": 600, "formats": []}
+
+    def sanitize_info(self, info):
+        return dict(info)
+
+    def process_ie_result(self, info, download=True):
+        CALLS.append(('download', id(self), info["id"], self.params.get("download_ranges")))
+        for done in (50, 100):
+            for hook in self.progress_hooks:
+                hook({"status": "downloading", "downloaded_bytes": done, "total_bytes": 100})
+        if info["id"] == "broken":
+            raise utils.DownloadError("ERROR: HTTP Error 403: Forbidden")
+        target = self.params["outtmpl"]["default"].replace("%(id)s", info["id"])
+        for pp in self.post_processors:
+            pp.run(target)
+        return info
+'''
+
+# Converts to WAV as FFmpegExtractAudio would, between its "started" and "finished" hooks
+FAKE_POSTPROCESSOR = '''
+import wave
+from . import CALLS
+
+
+class FFmpegExtractAudioPP:
+    def __init__(self, downloader=None, preferredcodec=None):
+        self.codec = preferredcodec
+        self.hooks = []
+
+    def add_progress_hook(self, hook):
+        self.hooks.append(hook)
+
+    def run(self, target):
+        for hook in self.hooks:
+            hook({"status": "started", "postprocessor": "ExtractAudio"})
+        CALLS.append(('convert', target))
+        with wave.open(target.replace("%(ext)s", self.codec), "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(16000)
+            out.writeframes(bytes(32000))
+        for hook in self.hooks:
+            hook({"status": "finished", "postprocessor": "ExtractAudio"})
+'''
+
+FAKE_UTILS = '''
+class DownloadError(Exception):
+    pass
+
+
+def download_range_func(chapters, ranges):
+    return ("ranges", tuple(ranges))
+'''
+
+# The yt-dlp command logs its calls and describes nothing, so only downloads succeed
+FAKE_COMMAND = '''#!/bin/sh
+echo "$*" >> "$FAKE_LOG"
+[ "$1" = --dump-single-json ] && exit 1
+for last; do :; done
+out=$(echo "$last" | sed "s/%(id)s/vid/; s/%(ext)s/wav/")
+head -c 1000 /dev/zero > "$out"
+'''
+
+
+def wait_for_events(bus, job, timeout=20):
+    events = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event in bus.drain():
+            if event.job == job:
+                events.append(event)
+                if event.kind in (DONE, ERROR):
+                    return events
+        time.sleep(0.05)
+    return events
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_ytdlp_library():
+    print("=== TESTING IN-PROCESS YT-DLP ===")
+
+    temp_dir = tempfile.mkdtemp()
+    old_environ = dict(os.environ)
+    try:
+        package_dir = os.path.join(temp_dir, 'site', 'yt_dlp')
+        os.makedirs(package_dir)
+        for name, source in (('__init__.py', FAKE_PACKAGE), ('utils.py', FAKE_UTILS),
+                             ('postprocessor.py', FAKE_POSTPROCESSOR)):
+            with open(os.path.join(package_dir, name), 'w') as f:
+                f.write(source)
+        dist_dir = os.path.join(temp_dir, 'site', 'yt_dlp-2099.1.1.dist-info')
+        os.makedirs(dist_dir)
+        with open(os.path.join(dist_dir, 'METADATA'), 'w') as f:
+            f.write("Metadata-Version: 2.1\nName: yt-dlp\nVersion: 2099.1.1\n")
+        sys.path.insert(0, os.path.join(temp_dir, 'site'))
+        import yt_dlp
+
+        bin_dir = os.path.join(temp_dir, 'bin')
+        os.makedirs(bin_dir)
+        with open(os.path.join(bin_dir, 'yt-dlp'), 'w') as f:
+            f.write(FAKE_COMMAND)
+        with open(os.path.join(bin_dir, 'yap'), 'w') as f:
+            f.write('#!/bin/sh\necho "Hello from the video, this is a test." > "$3"\n')
+        for name in ('yt-dlp', 'yap'):
+            os.chmod(os.path.join(bin_dir, name), 0o755)
+        log = os.path.join(temp_dir, 'command.log')
+        os.environ.update(PATH=bin_dir + os.pathsep + old_environ.get('PATH', ''), FAKE_LOG=log)
+
+        output_dir = os.path.join(temp_dir, 'out')
+        bus = EventBus()
+        pipeline = Pipeline(bus, api_key="")
+        config = {'url': "https://www.youtube.com/watch?v=first", 'summarize': False, 'translate': False,
+                  'target_lang': "es", 'keep_audio': False, 'output_dir': output_dir,
+                  'index_path': os.path.join(temp_dir, 'index.db')}
+        pipeline.apply_settings(config)
+
+        # Test 1: A job describes and downloads the video in-process, on one instance; the page is read once
+        pipeline.run_online_video_transcription(1, config)
+        events = wait_for_events(bus, 1)
+        calls = [call[0] for call in yt_dlp.CALLS]
+        progress = [event.payload for event in events if event.kind == PROGRESS]
+        ok = (events and events[-1].kind == DONE and calls == ['extract', 'download', 'convert'] and not read_log(log)
+              and yt_dlp.CALLS[0][1] == yt_dlp.CALLS[1][1])
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - No yt-dlp process started: {calls}")
+        print(f"{'✅ PASS' if progress and progress[-1] == 1.0 else '❌ FAIL'} - Progress from hooks: {progress}")
+
+        # Test 2: Later lookups reuse the process's YoutubeDL; sections are passed as download ranges
+        config = dict(config, url="https://www.youtube.com/watch?v=second", time_range=[120, None])
+        pipeline.run_online_video_transcription(2, config)
+        events = wait_for_events(bus, 2)
+        extractors = {call[1] for call in yt_dlp.CALLS if call[0] in ('extract', 'download')}
+        ranges = [call for call in yt_dlp.CALLS if call[0] == 'download'][-1][3]
+        ok = events and events[-1].kind == DONE and len(extractors) == 1 and pipeline.yt_dlp.created == 1
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Shared YoutubeDL instance ({pipeline.yt_dlp.created} created)")
+        print(f"{'✅ PASS' if ranges == ('ranges', ((120.0, float('inf')),)) else '❌ FAIL'} - Section range: {ranges}")
+
+        # Test 3: A failed in-process download falls back to the command
+        config = dict(config, url="https://www.youtube.com/watch?v=broken", time_range=None)
+        pipeline.run_online_video_transcription(3, config)
+        events = wait_for_events(bus, 3)
+        commands = read_log(log)
+        ok = events and events[-1].kind == DONE and len(commands) == 1 and '--output' in commands[0]
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Failed download retried with the command")
+
+        # Test 4: Prefetching many URLs in-process spawns nothing
+        pipeline.prefetch_metadata(4, {'urls': [f"https://www.youtube.com/watch?v=v{n}" for n in range(6)]})
+        events = wait_for_events(bus, 4)
+        infos = events[-1].payload[0] if events and events[-1].kind == DONE else {}
+        ok = len(infos) == 6 and all(info and info['duration'] == 600 for info in infos.values())
+        ok = ok and len(read_log(log)) == 1 and pipeline.yt_dlp.created <= 4
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - 6 URLs described in-process by {pipeline.yt_dlp.created} instance(s)")
+
+        # Test 5: With the setting off, the command does everything
+        config = dict(config, url="https://www.youtube.com/watch?v=fourth", ytdlp_library=False)
+        pipeline.apply_settings(config)
+        before = len(yt_dlp.CALLS)
+        pipeline.run_online_video_transcription(5, config)
+        events = wait_for_events(bus, 5)
+        commands = read_log(log)[1:]
+        ok = (events and events[-1].kind == DONE and len(yt_dlp.CALLS) == before and len(commands) == 2
+              and commands[0].startswith('--dump-single-json'))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Setting off: yt-dlp command used ({len(commands)} calls)")
+
+        # Test 6: The dependency report reads the package's version instead of running yt-dlp --version
+        results, spawned = probe_dependencies(os.path.join(temp_dir, 'deps.json'), names=['yt-dlp'])
+        ok = spawned == 0 and results['yt-dlp'] == ('ok', "yt-dlp 2099.1.1 (in-process)")
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Dependency report: {results['yt-dlp']}")
+
+        # Test 7: A download cancelled once the media is in never starts the conversion; the instance is put back as it was
+        library = pipeline.yt_dlp
+        staging_dir = os.path.join(temp_dir, 'staging')
+        os.makedirs(staging_dir)
+        seen = []
+
+        def cancel_after_download(downloaded, total):
+            # Once all the media is in, the next call is the conversion starting
+            if seen and seen[-1] == total:
+                raise Cancelled()
+            seen.append(downloaded)
+
+        before = len(yt_dlp.CALLS)
+        try:
+            library.download_audio("https://www.youtube.com/watch?v=first", staging_dir, (60, None),
+                                   cancel_after_download)
+            cancelled = False
+        except Cancelled:
+            cancelled = True
+        calls = [call[0] for call in yt_dlp.CALLS[before:]]
+        ok = cancelled and seen == [50, 100] and calls == ['download'] and not os.listdir(staging_dir)
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Cancelled before the conversion: {calls}")
+        params = [ydl.params for ydl in library.idle]
+        ok = (not library.hooks and all(p.get('download_ranges') is None for p in params)
+              and all(p['outtmpl']['default'] == "%(title)s [%(id)s].%(ext)s" for p in params))
+        print(f"{'✅ PASS' if ok else '❌ FAIL'} - Per-download options put back")
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+        sys.path.remove(os.path.join(temp_dir, 'site'))
+        for name in [name for name in sys.modules if name == 'yt_dlp' or name.startswith('yt_dlp.')]:
+            del sys.modules[name]
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_ytdlp_library()
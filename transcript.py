@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+# Shared transcript document model
+# A Transcript holds the text buffer once plus paragraph, sentence and segment
+# spans (character offsets into the buffer). Derived analyses are computed on
+# first use and cached, so every pipeline stage can share one object per job.
+
+import re
+from collections import namedtuple
+from functools import cached_property
+
+# Character offsets into Transcript.text
+Span = namedtuple('Span', ['start', 'end'])
+
+# Timed segment: character offsets, times in seconds and language code
+Segment = namedtuple('Segment', ['start', 'end', 'start_time', 'end_time', 'language'])
+
+PARAGRAPH_BREAK_RE = re.compile(r'\n[ \t]*\n\s*')
+SENTENCE_END_RE = re.compile(r'[.!?]+(?=\s|$)')
+
+# Estimated timing used when no real segment timings are available
+SECONDS_PER_SENTENCE = 4
+MIN_CUE_CHARS = 10
+
+
+def trim_span(text, start, end):
+    """Shrink a span so it does not start or end with whitespace"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return Span(start, end)
+
+
+def split_title_and_paragraphs(text):
+    """Split an AI article response into its title line and non-empty content lines"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    if not lines:
+        return "", []
+
+    # First non-empty line is the title, all subsequent ones are the content
+    return lines[0], lines[1:]
+
+
+class Transcript:
+    """Text buffer with paragraph, sentence and segment spans and cached analyses"""
+
+    def __init__(self, text, segments=None, language=None):
+        self.text = text or ""
+        self.language = language
+        self._segments = list(segments) if segments else None
+
+    @classmethod
+    def coerce(cls, value, language=None):
+        """Return value as a Transcript, wrapping plain strings"""
+        if isinstance(value, Transcript):
+            return value
+        return cls(value, language=language)
+
+    @classmethod
+    def joined(cls, parts, language=None):
+        """One transcript from consecutive parts, a paragraph break apart; segments keep their times"""
+        texts = []
+        segments = []
+        offset = 0
+        for part in parts:
+            if not part.text:
+                continue
+            if texts:
+                offset += 2
+            texts.append(part.text)
+            segments.extend(segment._replace(start=segment.start + offset, end=segment.end + offset)
+                            for segment in part.segments)
+            offset += len(part.text)
+        return cls('\n\n'.join(texts), segments, language)
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        return len(self.text)
+
+    def slice(self, span):
+        """Return the text covered by a span"""
+        return self.text[span.start:span.end]
+
+    def startswith(self, prefix):
+        return self.text.startswith(prefix)
+
+    # Spans
+
+    @cached_property
+    def paragraphs(self):
+        """Paragraph spans, separated by blank lines"""
+        spans = []
+        start = 0
+        for match in PARAGRAPH_BREAK_RE.finditer(self.text):
+            span = trim_span(self.text, start, match.start())
+            if span.end > span.start:
+                spans.append(span)
+            start = match.end()
+        span = trim_span(self.text, start, len(self.text))
+        if span.end > span.start:
+            spans.append(span)
+        return spans
+
+    @cached_property
+    def sentences(self):
+        """Sentence spans ending at . ! or ? followed by whitespace, never crossing paragraphs"""
+        spans = []
+        for paragraph in self.paragraphs:
+            start = paragraph.start
+            for match in SENTENCE_END_RE.finditer(self.text, paragraph.start, paragraph.end):
+                span = trim_span(self.text, start, match.end())
+                if span.end > span.start:
+                    spans.append(span)
+                start = match.end()
+            span = trim_span(self.text, start, paragraph.end)
+            if span.end > span.start:
+                spans.append(span)
+        return spans
+
+    @property
+    def segments(self):
+        """Timed segments; estimated from sentences when no real timings are known"""
+        if self._segments is not None:
+            return self._segments
+        return self.estimated_segments
+
+    @property
+    def has_timings(self):
+        return self._segments is not None
+
+    @cached_property
+    def estimated_segments(self):
+        segments = []
+        for span in self.sentences:
+            if span.end - span.start > MIN_CUE_CHARS:  # Only include substantial sentences
+                start_time = len(segments) * SECONDS_PER_SENTENCE
+                segments.append(Segment(span.start, span.end, start_time,
+                                        start_time + SECONDS_PER_SENTENCE, self.language))
+        return segments
+
+    def iter_paragraphs(self):
+        for span in self.paragraphs:
+            yield self.slice(span)
+
+    def iter_sentences(self):
+        for span in self.sentences:
+            yield self.slice(span)
+
+    def iter_cues(self):
+        """Yield (start_time, end_time, text) for every segment"""
+        for segment in self.segments:
+            yield segment.start_time, segment.end_time, self.slice(segment)
+
+    # Cached analyses
+
+    @cached_property
+    def paragraph_word_counts(self):
+        return [len(self.slice(span).split()) for span in self.paragraphs]
+
+    @cached_property
+    def word_count(self):
+        return len(self.text.split())
+
+    @cached_property
+    def token_estimate(self):
+        """Rough LLM token estimate (about four characters per token)"""
+        return (len(self.text) + 3) // 4
+
+    @cached_property
+    def has_good_structure(self):
+        """Analyze if text already has good paragraph structure"""
+        paragraphs = list(self.iter_paragraphs())
+
+        # Check various indicators of good paragraph structure
+        if len(paragraphs) < 2:
+            return False  # Single block of text
+
+        # Check if paragraphs have reasonable length (not too short or too long)
+        word_counts = self.paragraph_word_counts
+        avg_words = sum(word_counts) / len(word_counts)
+
+        # Good paragraphs: 10-250 words on average (more flexible)
+        if avg_words < 10 or avg_words > 250:
+            return False
+
+        # Check for variety in paragraph lengths (more lenient)
+        min_words, max_words = min(word_counts), max(word_counts)
+        variety_ratio = max_words / min_words if min_words > 0 else 1
+
+        # Check for mixed structure (very short and very long paragraphs)
+        short_paragraphs = sum(1 for count in word_counts if count < 10)
+        long_paragraphs = sum(1 for count in word_counts if count > 40)
+
+        # If we have both very short and very long paragraphs, it's mixed structure
+        if short_paragraphs > 0 and long_paragraphs > 0:
+            return False
+
+        proper_endings = sum(1 for p in paragraphs if p.endswith(('.', '!', '?', ':')))
+
+        # More flexible variety check - allow similar lengths for well-structured content
+        if variety_ratio < 1.1:
+            # Additional check: if paragraphs are very similar in length but have good punctuation
+            return proper_endings / len(paragraphs) >= 0.8
+
+        # Check if paragraphs end with proper punctuation (more lenient)
+        return proper_endings / len(paragraphs) >= 0.5
+
+    # Derived documents
+
+    @cached_property
+    def formatted(self):
+        """Regroup sentences into readable paragraphs of up to three sentences"""
+        if len(self.text.strip()) < 50:
+            return self
+
+        paragraphs = []
+        current = []
+        for sentence in self.iter_sentences():
+            current.append(sentence if sentence[-1] in '.!?' else sentence + '.')
+            # Create new paragraph every 3 sentences or if sentence is long
+            if len(current) >= 3 or len(sentence) > 100:
+                paragraphs.append(' '.join(current))
+                current = []
+        if current:
+            paragraphs.append(' '.join(current))
+
+        return Transcript('\n\n'.join(paragraphs), language=self.language)
+
+    def retimed(self, to_time):
+        """Copy whose segment times are mapped through to_time(start_time, end_time) -> (start, end)"""
+        segments = []
+        for segment in self.segments:
+            start_time, end_time = to_time(segment.start_time, segment.end_time)
+            segments.append(segment._replace(start_time=start_time, end_time=end_time))
+        return Transcript(self.text, segments, self.language)
+
+    def chunks(self, max_chars):
+        """Yield paragraph-sized chunks, splitting long paragraphs at sentence boundaries"""
+        sentences = self.sentences
+        index = 0
+        for paragraph in self.paragraphs:
+            if paragraph.end - paragraph.start <= max_chars:
+                yield self.slice(paragraph)
+                continue
+
+            current = []
+            current_size = 0
+            while index < len(sentences) and sentences[index].start < paragraph.start:
+                index += 1
+            while index < len(sentences) and sentences[index].end <= paragraph.end:
+                sentence = self.slice(sentences[index])
+                index += 1
+                sentence_size = len(sentence) + 1
+                if current_size + sentence_size > max_chars and current:
+                    yield ' '.join(current)
+                    current = [sentence]
+                    current_size = sentence_size
+                else:
+                    current.append(sentence)
+                    current_size += sentence_size
+            if current:
+                yield ' '.join(current)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+# Full-text search index over finished jobs
+#
+# Every job that finishes adds its transcript, translation, summary, title,
+# URL and languages to a SQLite database. Text is stored one subtitle cue (or
+# paragraph) per row together with its timestamps, and an FTS5 table kept in
+# sync by triggers indexes it, so a search returns the matching segment and
+# where it is in the media in milliseconds, however many transcripts there
+# are. A job that is processed again replaces its earlier rows.
+#
+# Jobs missing from the index (e.g. made before it existed, or indexed into
+# another database) are added from the output directory's job catalog: each
+# finished job's manifest names its compact transcript.
+#
+# Search from a terminal without starting the GUI:
+#   python transcript_index.py search "climate policy"
+#   python transcript_index.py reindex ~/Downloads/yap_output
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+from dependencies import CACHE_DIR
+
+INDEX_FILE = os.path.join(CACHE_DIR, "transcripts.db")
+
+# Searchable parts of a job, in display order
+FIELDS = ('title', 'original', 'translation', 'summary', 'url', 'language')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    title TEXT,
+    url TEXT,
+    source_lang TEXT,
+    target_lang TEXT,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    document INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    start_time REAL,
+    end_time REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_document ON segments(document, field, position);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS segments_insert AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_delete AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# One row per searchable piece of text; start/end are None when it has no timestamps
+Row = namedtuple('Row', ['field', 'text', 'start', 'end'])
+
+Hit = namedtuple('Hit', ['segment', 'document', 'path', 'title', 'url', 'source_lang', 'target_lang',
+                         'field', 'position', 'start', 'end', 'snippet'])
+
+
+def fts_query(text):
+    """FTS5 query for plain user input: every word must match, the last one as a prefix"""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def format_timestamp(seconds):
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def text_rows(field, text):
+    """Rows for untimed text, one per paragraph"""
+    return [Row(field, paragraph.strip(), None, None)
+            for paragraph in re.split(r'\n\s*\n', text or "") if paragraph.strip()]
+
+
+def cue_rows(field, srt_text):
+    """Rows for subtitles, one per cue with its timestamps"""
+    from subtitles import parse_srt
+    return [Row(field, cue.text, cue.start, cue.end) for cue in parse_srt(srt_text)]
+
+
+def job_rows(results, title=None, url=None, languages=""):
+    """Rows for a job's results dictionary (as produced by the pipeline)"""
+    rows = []
+    if title:
+        rows.append(Row('title', title, None, None))
+    rows += cue_rows('original', results.get('original_srt', "")) or text_rows('original', results.get('original'))
+    translation = results.get('translation') or ""
+    if not translation.startswith("⚠️"):
+        rows += cue_rows('translation', results.get('translated_srt', "")) or text_rows('translation', translation)
+    summary = results.get('summary') or ""
+    if not summary.startswith("⚠️"):
+        rows += text_rows('summary', summary)
+    if url:
+        rows.append(Row('url', url, None, None))
+    if languages:
+        rows.append(Row('language', languages, None, None))
+    return rows
+
+
+class TranscriptIndex:
+    """SQLite FTS5 index of finished jobs; safe to use from several processes"""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.ready = False
+
+    def connect(self):
+        if not self.ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Worker processes index concurrently; wait for each other's writes
+        db = sqlite3.connect(self.path, timeout=10)
+        if not self.ready:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self.ready = True
+        return db
+
+    def add_document(self, path, rows, title=None, url=None, source_lang=None, target_lang=None):
+        """Index a job's rows under its output path, replacing what was indexed for it before"""
+        db = self.connect()
+        try:
+            with db:
+                existing = db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+                if existing:
+                    db.execute("DELETE FROM segments WHERE document = ?", existing)
+                    db.execute("DELETE FROM documents WHERE id = ?", existing)
+                document = db.execute(
+                    "INSERT INTO documents (path, title, url, source_lang, target_lang, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, title, url, source_lang, target_lang, time.time())).lastrowid
+                positions = {}
+                segments = []
+                for row in rows:
+                    position = positions.get(row.field, 0)
+                    positions[row.field] = position + 1
+                    segments.append((document, row.field, position, row.start, row.end, row.text))
+                db.executemany("INSERT INTO segments (document, field, position, start_time, end_time, text) "
+                               "VALUES (?, ?, ?, ?, ?, ?)", segments)
+            return document
+        finally:
+            db.close()
+
+    def remove_document(self, path):
+        db = self.connect()
+        try:
+            with db:
+                existing = db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+                if existing:
+                    db.execute("DELETE FROM segments WHERE document = ?", existing)
+                    db.execute("DELETE FROM documents WHERE id = ?", existing)
+            return existing is not None
+        finally:
+            db.close()
+
+    def search(self, query, limit=50, field=None, language=None):
+        """Best matching segments for plain user input, as Hit tuples"""
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = ("SELECT segments.id, documents.id, documents.path, documents.title, documents.url, "
+               "documents.source_lang, documents.target_lang, segments.field, segments.position, "
+               "segments.start_time, segments.end_time, snippet(segments_fts, 0, '«', '»', '…', 12) "
+               "FROM segments_fts JOIN segments ON segments.id = segments_fts.rowid "
+               "JOIN documents ON documents.id = segments.document "
+               "WHERE segments_fts MATCH ?")
+        params = [match]
+        if field:
+            sql += " AND segments.field = ?"
+            params.append(field)
+        if language:
+            sql += " AND (documents.source_lang = ? OR documents.target_lang = ?)"
+            params += [language, language]
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        db = self.connect()
+        try:
+            return [Hit(*row) for row in db.execute(sql, params)]
+        finally:
+            db.close()
+
+    def field_rows(self, document, field):
+        """All rows of one field of a document, in order (to show a hit in context)"""
+        db = self.connect()
+        try:
+            return [Row(field, text, start, end) for text, start, end in db.execute(
+                "SELECT text, start_time, end_time FROM segments WHERE document = ? AND field = ? ORDER BY position",
+                (document, field))]
+        finally:
+            db.close()
+
+    def document_count(self):
+        db = self.connect()
+        try:
+            return db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        finally:
+            db.close()
+
+    def indexed_paths(self):
+        db = self.connect()
+        try:
+            return {path for path, in db.execute("SELECT path FROM documents")}
+        finally:
+            db.close()
+
+    def reindex_directory(self, directory):
+        """Index the compact transcripts in an output directory that are not indexed yet
+
+        Finished jobs are found through the directory's catalog and manifests
+        (jobs/<YYYY-MM>/<id>/); transcripts in the top level of the directory,
+        from before jobs had their own directories, are included. Only the
+        transcript, title and URL are known for these; jobs indexed when they
+        finished keep their full entry.
+        """
+        from job_store import load_manifest, read_catalog
+        from transcript_store import TRANSCRIPT_EXTENSION
+
+        # (transcript, text output the job is indexed under, title, url)
+        found = []
+        seen = set()
+        for entry in read_catalog(directory):
+            if entry.get('status') != 'done' or entry.get('dir') in seen:
+                continue
+            seen.add(entry.get('dir'))
+            job_dir = os.path.join(directory, entry['dir'])
+            try:
+                manifest = load_manifest(job_dir)
+            except (OSError, ValueError) as e:
+                print(f"Skipping {entry['dir']}: {e}", file=sys.stderr)
+                continue
+            artifacts = manifest.get('artifacts', {})
+            if 'transcript' not in artifacts:
+                continue
+            transcript = os.path.join(job_dir, artifacts['transcript'])
+            text = os.path.join(job_dir, artifacts['text']) if 'text' in artifacts else \
+                os.path.splitext(transcript)[0] + '.txt'
+            found.append((transcript, text, manifest.get('title'), manifest.get('source', {}).get('url')))
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(TRANSCRIPT_EXTENSION):
+                    base = os.path.join(directory, name[:-len(TRANSCRIPT_EXTENSION)])
+                    found.append((base + TRANSCRIPT_EXTENSION, base + '.txt', None, None))
+
+        indexed = self.indexed_paths()
+        count = 0
+        for transcript_path, text_path, title, url in found:
+            # Jobs index under their text output, so a later run of the same job replaces this
+            if text_path in indexed:
+                continue
+            if self.add_transcript(transcript_path, text_path, title, url):
+                indexed.add(text_path)
+                count += 1
+        return count
+
+    def add_transcript(self, transcript_path, path, title=None, url=None):
+        """Index a compact transcript under path; returns False if it cannot be read"""
+        from transcript_store import open_transcript
+
+        try:
+            with open_transcript(transcript_path) as transcript:
+                rows = [Row('original', text, start, end) for start, end, text in transcript.iter_cues()]
+                language = transcript.language or None
+        except (OSError, ValueError) as e:
+            print(f"Skipping {transcript_path}: {e}", file=sys.stderr)
+            return False
+        if title:
+            rows.insert(0, Row('title', title, None, None))
+        if url:
+            rows.append(Row('url', url, None, None))
+        self.add_document(path, rows, title=title, url=url, source_lang=language)
+        return True
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search transcripts, translations and summaries")
+    parser.add_argument('--index', default=INDEX_FILE, help="index database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    search = commands.add_parser('search', help="find matching segments")
+    search.add_argument('query', nargs='+')
+    search.add_argument('-n', '--limit', type=int, default=20)
+    search.add_argument('--field', choices=FIELDS)
+    search.add_argument('--lang', help="only jobs with this source or target language")
+    reindex = commands.add_parser('reindex', help="index the finished jobs of an output directory (its jobs/ tree "
+                                                  "and any older top-level transcripts)")
+    reindex.add_argument('directory', nargs='?', default=os.path.expanduser("~/Downloads/yap_output"))
+    args = parser.parse_args(argv)
+
+    index = TranscriptIndex(args.index)
+    if args.command == 'reindex':
+        print(f"Indexed {index.reindex_directory(args.directory)} transcript(s)")
+        return 0
+
+    start = time.perf_counter()
+    hits = index.search(' '.join(args.query), limit=args.limit, field=args.field, language=args.lang)
+    elapsed = (time.perf_counter() - start) * 1000
+    for hit in hits:
+        # path:timestamp points straight at the matching segment
+        print(f"{hit.path}:{format_timestamp(hit.start)}  [{hit.field}]  {hit.title or ''}".rstrip())
+        print(f"    {hit.snippet}")
+    print(f"{len(hits)} match(es) in {elapsed:.1f} ms", file=sys.stderr)
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
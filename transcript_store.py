@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+# Compact on-disk transcript container (.yapt)
+#
+# Layout (little-endian, every section aligned to 8 bytes):
+#   header        magic, version, segment/paragraph counts, section sizes
+#   segments      start times (f64), end times (f64), byte starts (u32),
+#                 byte ends (u32), language ids (u16)
+#   paragraphs    byte starts (u32), byte ends (u32)
+#   languages     newline separated language codes (UTF-8)
+#   text          the transcript as a single UTF-8 buffer
+#
+# Readers map the file with mmap and view the tables in place, so opening a
+# transcript is constant time and only the pages that are touched get loaded.
+# The exporters module streams txt/srt/vtt/org/json output straight from it.
+
+import mmap
+import os
+import struct
+from array import array
+
+from transcript import Segment, Transcript
+
+MAGIC = b'YAPT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')
+TRANSCRIPT_EXTENSION = '.yapt'
+
+
+def align(size):
+    return (size + 7) & ~7
+
+
+def char_to_byte_offsets(text, offsets):
+    """Map character offsets into text to byte offsets into its UTF-8 encoding"""
+    mapping = {}
+    position = 0
+    byte_position = 0
+    for offset in sorted(set(offsets)):
+        byte_position += len(text[position:offset].encode('utf-8'))
+        position = offset
+        mapping[offset] = byte_position
+    return mapping
+
+
+def save_transcript(path, transcript):
+    """Write a Transcript to a .yapt container atomically"""
+    import tempfile
+
+    transcript = Transcript.coerce(transcript)
+    text = transcript.text
+    segments = transcript.segments
+    paragraphs = transcript.paragraphs
+
+    offsets = [s.start for s in segments] + [s.end for s in segments]
+    offsets += [p.start for p in paragraphs] + [p.end for p in paragraphs]
+    byte_offsets = char_to_byte_offsets(text, offsets)
+
+    languages = []
+    language_ids = array('H')
+    for segment in segments:
+        language = segment.language or transcript.language or ""
+        if language not in languages:
+            languages.append(language)
+        language_ids.append(languages.index(language))
+
+    tables = [
+        array('d', [s.start_time for s in segments]),
+        array('d', [s.end_time for s in segments]),
+        array('I', [byte_offsets[s.start] for s in segments]),
+        array('I', [byte_offsets[s.end] for s in segments]),
+        language_ids,
+        array('I', [byte_offsets[p.start] for p in paragraphs]),
+        array('I', [byte_offsets[p.end] for p in paragraphs]),
+    ]
+    language_bytes = '\n'.join(languages).encode('utf-8')
+    text_bytes = text.encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(segments), len(paragraphs),
+                                len(language_bytes), len(text_bytes)))
+            f.write(b'\0' * (align(HEADER.size) - HEADER.size))
+            for table in tables:
+                data = table.tobytes()
+                f.write(data)
+                f.write(b'\0' * (align(len(data)) - len(data)))
+            f.write(language_bytes)
+            f.write(b'\0' * (align(len(language_bytes)) - len(language_bytes)))
+            f.write(text_bytes)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    return path
+
+
+class MappedTranscript:
+    """Read-only, memory-mapped view of a .yapt transcript container"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not a transcript file: {path}")
+
+        magic, version, _, segment_count, paragraph_count, language_size, text_size = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a transcript file: {path}")
+
+        self.segment_count = segment_count
+        self.paragraph_count = paragraph_count
+        view = memoryview(self._map)
+        position = align(HEADER.size)
+
+        def table(typecode, count):
+            nonlocal position
+            size = count * array(typecode).itemsize
+            section = view[position:position + size].cast(typecode)
+            position += align(size)
+            return section
+
+        self._start_times = table('d', segment_count)
+        self._end_times = table('d', segment_count)
+        self._segment_starts = table('I', segment_count)
+        self._segment_ends = table('I', segment_count)
+        self._language_ids = table('H', segment_count)
+        self._paragraph_starts = table('I', paragraph_count)
+        self._paragraph_ends = table('I', paragraph_count)
+
+        languages = bytes(view[position:position + language_size]).decode('utf-8')
+        self.languages = languages.split('\n') if language_size else [""]
+        position += align(language_size)
+
+        self._text = view[position:position + text_size]
+        self.text_size = text_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # Release memoryviews before closing the map
+        for name in ('_start_times', '_end_times', '_segment_starts', '_segment_ends',
+                     '_language_ids', '_paragraph_starts', '_paragraph_ends', '_text'):
+            section = self.__dict__.pop(name, None)
+            if section is not None:
+                section.release()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    @property
+    def language(self):
+        return self.languages[self._language_ids[0]] if self.segment_count else self.languages[0]
+
+    def decode(self, start, end):
+        return bytes(self._text[start:end]).decode('utf-8')
+
+    @property
+    def text(self):
+        """Full transcript text (decodes the whole buffer)"""
+        return self.decode(0, self.text_size)
+
+    def segment(self, index):
+        """Return (start_time, end_time, text, language) for one segment"""
+        return (self._start_times[index], self._end_times[index],
+                self.decode(self._segment_starts[index], self._segment_ends[index]),
+                self.languages[self._language_ids[index]])
+
+    def iter_cues(self):
+        """Yield (start_time, end_time, text) for every segment"""
+        for i in range(self.segment_count):
+            yield (self._start_times[i], self._end_times[i],
+                   self.decode(self._segment_starts[i], self._segment_ends[i]))
+
+    def iter_paragraphs(self):
+        for i in range(self.paragraph_count):
+            yield self.decode(self._paragraph_starts[i], self._paragraph_ends[i])
+
+    def to_transcript(self):
+        """Load the container back into a Transcript (e.g. for re-translation)"""
+        text = self.text
+        # Byte offsets are converted back to character offsets by decoding
+        # the gaps between them once, in order
+        positions = sorted(set(self._segment_starts) | set(self._segment_ends))
+        char_offsets = {}
+        char_position = 0
+        byte_position = 0
+        for offset in positions:
+            char_position += len(self.decode(byte_position, offset))
+            byte_position = offset
+            char_offsets[offset] = char_position
+        segments = [Segment(char_offsets[self._segment_starts[i]], char_offsets[self._segment_ends[i]],
+                            self._start_times[i], self._end_times[i],
+                            self.languages[self._language_ids[i]] or None)
+                    for i in range(self.segment_count)]
+        return Transcript(text, segments=segments, language=self.language or None)
+
+
+def open_transcript(path):
+    return MappedTranscript(path)
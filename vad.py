@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+# Voice activity detection and silence trimming
+#
+# Lectures, podcasts and meetings often carry minutes of silence, room tone or
+# hum that yap would still spend time on. Before transcription the audio is
+# scanned in 30 ms frames: a frame is speech when it is loud enough relative
+# to the recording's own noise floor and most of its energy lies in the speech
+# band (300-3400 Hz), which rules out rumble, hum and hiss. Features for all
+# frames of a block are computed at once with NumPy, a block of audio at a
+# time, so memory stays flat for long recordings.
+#
+# Only gaps of at least a second are cut, and speech keeps some padding on
+# either side. The kept spans are written out as one shorter WAV, and a
+# TimeMap translates times in the trimmed audio back to the original media,
+# so cues land where the words are actually spoken.
+#
+#   python vad.py lecture.wav        # prints the speech spans and the saving
+
+import bisect
+import importlib.util
+import json
+import sys
+import wave
+
+FRAME_SECONDS = 0.03
+# Seconds of audio analysed at a time
+BLOCK_SECONDS = 60
+
+SPEECH_BAND = (300, 3400)
+# Share of a frame's energy that must lie in the speech band
+MIN_BAND_RATIO = 0.5
+# Speech is this far above the noise floor (10th percentile of frame energy)...
+NOISE_MARGIN_DB = 12
+# ...but never needs to be closer than this to the loud parts (90th percentile)
+DYNAMIC_RANGE_DB = 25
+# Anything quieter is silence, however quiet the recording
+ABSOLUTE_FLOOR_DB = -60
+
+# Silence shorter than this is kept; speech keeps this much audio around it
+MIN_GAP_SECONDS = 1.0
+PAD_SECONDS = 0.25
+# Trimming that saves less than this share of the audio is not worth a second file
+MIN_SAVING = 0.05
+
+
+def has_numpy():
+    """Whether NumPy is installed; checked without importing it"""
+    return importlib.util.find_spec('numpy') is not None
+
+
+def frame_features(samples, rate, frame_length):
+    """Energy (dBFS) and speech-band energy ratio of each whole frame in a float32 block"""
+    import numpy as np
+
+    frames = samples[:len(samples) // frame_length * frame_length].reshape(-1, frame_length)
+    if not len(frames):
+        return np.empty(0), np.empty(0)
+    energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame_length, 1 / rate)
+    band = (freqs >= SPEECH_BAND[0]) & (freqs <= SPEECH_BAND[1])
+    ratio = power[:, band].sum(axis=1) / (power.sum(axis=1) + 1e-10)
+    return energy, ratio
+
+
+def read_features(path):
+    """Frame features of a 16-bit PCM WAV file, one block at a time; returns (energy, ratio, frame seconds, duration)"""
+    import numpy as np
+
+    with wave.open(str(path), 'rb') as audio:
+        if audio.getsampwidth() != 2:
+            raise ValueError(f"{audio.getsampwidth() * 8}-bit audio is not supported")
+        rate, channels = audio.getframerate(), audio.getnchannels()
+        frame_length = max(1, int(rate * FRAME_SECONDS))
+        block = frame_length * max(1, int(BLOCK_SECONDS / FRAME_SECONDS))
+        energies, ratios = [], []
+        while True:
+            data = audio.readframes(block)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+            if channels > 1:
+                samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+            energy, ratio = frame_features(samples, rate, frame_length)
+            energies.append(energy)
+            ratios.append(ratio)
+        duration = audio.getnframes() / rate
+    if not energies:
+        return np.empty(0), np.empty(0), frame_length / rate, duration
+    return np.concatenate(energies), np.concatenate(ratios), frame_length / rate, duration
+
+
+def speech_mask(energy, ratio):
+    """Frames that hold speech, padded and with short gaps filled"""
+    import numpy as np
+
+    if not len(energy):
+        return np.zeros(0, dtype=bool)
+    floor, loud = np.percentile(energy, [10, 90])
+    threshold = max(ABSOLUTE_FLOOR_DB, min(floor + NOISE_MARGIN_DB, loud - DYNAMIC_RANGE_DB))
+    speech = (energy > threshold) & (ratio >= MIN_BAND_RATIO)
+
+    pad = int(round(PAD_SECONDS / FRAME_SECONDS))
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode='same') > 0
+
+    # Fill gaps too short to be worth cutting
+    min_gap = int(round(MIN_GAP_SECONDS / FRAME_SECONDS))
+    edges = np.diff(np.concatenate(([1], speech.astype(np.int8), [1])))
+    for start, end in zip(np.flatnonzero(edges == -1), np.flatnonzero(edges == 1)):
+        if end - start < min_gap:
+            speech[start:end] = True
+    return speech
+
+
+def speech_spans(path):
+    """(start, end) seconds of the speech in a WAV file, and its duration"""
+    import numpy as np
+
+    energy, ratio, frame_seconds, duration = read_features(path)
+    speech = speech_mask(energy, ratio)
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    spans = []
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        # The last partial frame belongs to whatever ends the recording
+        end_time = duration if end == len(speech) else min(duration, end * frame_seconds)
+        spans.append((round(float(start * frame_seconds), 3), round(float(end_time), 3)))
+    return spans, duration
+
+
+class TimeMap:
+    """Maps times in trimmed audio back to the original media"""
+
+    def __init__(self, spans, duration):
+        # Kept spans of the original, in order; each starts in the trimmed audio where the previous one ended
+        self.spans = [tuple(span) for span in spans]
+        self.duration = duration
+        self.starts = []
+        position = 0.0
+        for start, end in self.spans:
+            self.starts.append(position)
+            position += end - start
+        self.kept = position
+
+    @property
+    def removed(self):
+        return self.duration - self.kept
+
+    def to_original(self, seconds, end=False):
+        """Original time of a point in the trimmed audio; ends at a cut stay before the cut"""
+        if not self.spans:
+            return seconds
+        find = bisect.bisect_left if end else bisect.bisect_right
+        index = max(0, find(self.starts, seconds) - 1)
+        start, stop = self.spans[index]
+        original = start + seconds - self.starts[index]
+        return min(original, stop) if index < len(self.spans) - 1 else original
+
+    def span(self, start, end):
+        """Original (start, end) of a span of the trimmed audio"""
+        return self.to_original(start), max(self.to_original(start), self.to_original(end, end=True))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'duration': self.duration, 'spans': self.spans}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['spans'], data['duration'])
+
+
+def write_spans(source, target, spans):
+    """Write the given spans of a WAV file, back to back, as a new WAV file"""
+    with wave.open(str(source), 'rb') as audio, wave.open(str(target), 'wb') as out:
+        out.setparams(audio.getparams())
+        rate = audio.getframerate()
+        chunk = rate * BLOCK_SECONDS
+        for start, end in spans:
+            audio.setpos(min(audio.getnframes(), int(start * rate)))
+            remaining = int(end * rate) - int(start * rate)
+            while remaining > 0:
+                data = audio.readframes(min(chunk, remaining))
+                if not data:
+                    break
+                out.writeframes(data)
+                remaining -= min(chunk, remaining)
+
+
+def trim_silence(source, target):
+    """Write the speech of a WAV file to target; returns its TimeMap, or None when trimming saves too little"""
+    spans, duration = speech_spans(source)
+    time_map = TimeMap(spans, duration)
+    if not spans or time_map.removed < duration * MIN_SAVING:
+        return None
+    write_spans(source, target, spans)
+    return time_map
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the speech spans voice activity detection finds in a WAV file")
+    parser.add_argument('wav')
+    args = parser.parse_args(argv)
+
+    spans, duration = speech_spans(args.wav)
+    for start, end in spans:
+        print(f"{start:10.2f} {end:10.2f}")
+    kept = TimeMap(spans, duration).kept
+    print(f"{len(spans)} speech spans, {kept:.1f} of {duration:.1f} s kept "
+          f"({1 - kept / duration if duration else 0:.0%} silence)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+# Online video metadata
+#
+# Nothing about an online video used to be known until it was downloaded.
+# `yt-dlp -J` reads the video page without fetching any media and answers in a
+# second or two with the title, duration, captions and audio formats. Jobs use
+# it to name their files after the title, to size their download timeouts, to
+# skip a preview section that would cover the whole video, and to reject videos
+# over the length limit before downloading anything. URLs queued together are
+# looked up in parallel and run shortest first, which lowers the mean wait
+# across a mixed queue.
+#
+#   python video_metadata.py URL...      # prints duration and title, shortest first
+
+import json
+import re
+import sys
+from collections import namedtuple
+
+# Seconds yt-dlp gets to describe one video
+METADATA_TIMEOUT = 30
+# URLs looked up at once
+PREFETCH_WORKERS = 4
+
+# captions: languages with subtitles made by people (automatic captions exist for most videos)
+VideoInfo = namedtuple('VideoInfo', ['url', 'id', 'title', 'duration', 'filesize', 'captions', 'audio_formats'])
+
+
+def metadata_command(url):
+    return ['yt-dlp', '--dump-single-json', '--no-playlist', '--no-warnings', url]
+
+
+def audio_only(data):
+    return [f for f in data.get('formats') or []
+            if f.get('acodec') not in (None, 'none') and f.get('vcodec') in (None, 'none')]
+
+
+def audio_formats(data):
+    """Audio-only formats as (format id, extension, kbit/s), best first"""
+    formats = [(f.get('format_id'), f.get('ext'), f.get('abr') or f.get('tbr') or 0) for f in audio_only(data)]
+    return sorted(formats, key=lambda f: f[2], reverse=True)
+
+
+def audio_size(data, duration):
+    """Bytes of the best audio download, from the listed size or estimated from its bitrate"""
+    formats = audio_only(data)
+    if not formats:
+        return data.get('filesize') or data.get('filesize_approx')
+    best = max(formats, key=lambda f: f.get('abr') or 0)
+    size = best.get('filesize') or best.get('filesize_approx')
+    if not size and best.get('abr') and duration:
+        size = int(best['abr'] * 125 * duration)
+    return size
+
+
+def parse_metadata(url, data):
+    """VideoInfo from yt-dlp's JSON description of a video"""
+    duration = data.get('duration')
+    return VideoInfo(url, data.get('id'), data.get('title') or data.get('fulltitle'),
+                     float(duration) if duration else None, audio_size(data, duration),
+                     sorted(data.get('subtitles') or {}), audio_formats(data))
+
+
+def fetch_metadata(url, run=None, library=None):
+    """VideoInfo of one video, or None when yt-dlp cannot describe it
+
+    With a library (ytdlp_library.YtDlpLibrary) the video is described
+    in-process, and the command only runs when that fails. `run` runs the
+    command (a pipeline's run_process, so cancelling the job stops yt-dlp);
+    Cancelled propagates, every other failure is reported and returns None.
+    """
+    import subprocess
+
+    if library is not None:
+        try:
+            return parse_metadata(url, library.extract_info(url))
+        except Exception as e:
+            print(f"yt-dlp library could not describe {url}, running the command: {e}", file=sys.stderr)
+    if run is None:
+        from process_control import run_process as run
+    try:
+        result = run(metadata_command(url), timeout=METADATA_TIMEOUT)
+        if result.returncode != 0:
+            raise ValueError(result.stderr.strip() or "yt-dlp failed")
+        return parse_metadata(url, json.loads(result.stdout))
+    except (OSError, ValueError, AttributeError, subprocess.TimeoutExpired) as e:
+        print(f"Could not read the details of {url}: {e}", file=sys.stderr)
+        return None
+
+
+def prefetch_metadata(urls, run=None, workers=PREFETCH_WORKERS, library=None):
+    """{url: VideoInfo or None} for all urls, looked up in parallel"""
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+        return dict(zip(urls, executor.map(lambda url: fetch_metadata(url, run, library), urls)))
+
+
+def shortest_first(items, infos, key=None):
+    """Items ordered by the duration of their video, shortest first; unknown durations keep their order, last
+
+    infos maps an item's URL (key(item), the item itself by default) to its
+    VideoInfo, or to the VideoInfo as a dict.
+    """
+    def duration(item):
+        info = infos.get(key(item) if key else item)
+        if isinstance(info, dict):
+            info = info.get('duration')
+        elif info is not None:
+            info = info.duration
+        return (0, info) if info else (1, 0)
+
+    return sorted(items, key=duration)
+
+
+def safe_filename(title, max_length=100):
+    """Create a safe filename from video title"""
+    # Remove or replace problematic characters
+    safe_title = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', title or "")
+
+    # Replace multiple spaces with single space
+    safe_title = re.sub(r'\s+', ' ', safe_title)
+
+    # Remove leading/trailing spaces and dots
+    safe_title = safe_title.strip(' .')
+
+    # Truncate if too long (leave room for extension)
+    if len(safe_title) > max_length:
+        safe_title = safe_title[:max_length].strip()
+        # Try to break at a word boundary
+        if ' ' in safe_title:
+            safe_title = safe_title.rsplit(' ', 1)[0]
+
+    # If still empty or too short, use a default name
+    if not safe_title or len(safe_title) < 3:
+        safe_title = "video"
+
+    return safe_title
+
+
+def main(argv=None):
+    import argparse
+    from audio_prep import format_time
+
+    parser = argparse.ArgumentParser(description="Show the duration and title of online videos, shortest first")
+    parser.add_argument('urls', nargs='+', metavar='URL')
+    args = parser.parse_args(argv)
+
+    from ytdlp_library import YtDlpLibrary, has_yt_dlp
+
+    infos = prefetch_metadata(args.urls, library=YtDlpLibrary() if has_yt_dlp() else None)
+    for url in shortest_first(args.urls, infos):
+        info = infos[url]
+        if info is None:
+            print(f"{'?':>8}  {url}")
+        else:
+            duration = format_time(info.duration) if info.duration else "?"
+            print(f"{duration:>8}  {info.title or url}")
+    return 0 if any(infos.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
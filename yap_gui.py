@@ -1,58 +1,101 @@
 #!/usr/bin/env python3
 
+from startup_timing import StartupTimer
+import sys
+
+if __name__ == "__main__":
+    # A running instance takes this launch over before tkinter and the pipeline are imported
+    from single_instance import hand_over
+    handed_over = hand_over(sys.argv[1:])
+    if handed_over is not None:
+        sys.exit(handed_over)
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
-import subprocess
 import os
-import tempfile
-import json
-import time
-from pathlib import Path
+import io
 from urllib.parse import urlparse
-import base64
-import hashlib
-import sys
 import traceback
+import itertools
+from collections import deque
+
+from transcript import Transcript
+from transcript_store import TRANSCRIPT_EXTENSION, open_transcript
+from event_bus import EventBus, STATUS, PROGRESS, PARTIAL, DONE, ERROR
+from exporters import OrgExporter, atomic_write, export_to, write_text_atomic
+from pipeline import (APPLE_LANGUAGES, DEFAULT_MODEL, Pipeline, get_apple_lang_code,
+                      get_language_name)
+from pipeline_worker import PipelineWorker
+from dependencies import format_dependency_report, probe_dependencies
+from single_instance import InstanceServer, launch_items
+from audio_prep import SPEED_PROFILES, parse_time
+from media_cache import MediaCache, format_usage
+from folder_watch import DONE_FILE as WATCH_DONE_FILE, DoneSet, FolderWatcher, WatchIngest
+from settings_store import SettingsStore, decrypt_text, encrypt_text, machine_key
 
-# Try to import Apple's Translation framework
-try:
-    import objc
-    from Foundation import NSBundle
-    
-    # Load the Translation framework
-    translation_bundle = NSBundle.bundleWithPath_('/System/Library/Frameworks/Translation.framework')
-    if translation_bundle:
-        objc.loadBundle('Translation', globals(), bundle_path='/System/Library/Frameworks/Translation.framework')
-        APPLE_TRANSLATION_AVAILABLE = True
-    else:
-        APPLE_TRANSLATION_AVAILABLE = False
-except ImportError:
-    APPLE_TRANSLATION_AVAILABLE = False
+# Large results are rendered into output widgets in chunks of this many characters per
+# event-loop tick. Huge documents are paged in ("load more"): this many characters up
+# front and as many again each time the user scrolls near the end. Loaded pages stay in
+# the widget, so what is kept grows with how far the user has scrolled, not with the
+# document
+OUTPUT_CHUNK_CHARS = 32768
+OUTPUT_WINDOW_CHARS = 524288
+
+# Worker events are applied to the UI on this fixed tick (milliseconds)
+UI_TICK_MS = 50
 
 class YapGUI:
-    def __init__(self, root):
+    def __init__(self, root, startup_timer=None, settings=None):
         try:
             self.root = root
+            self.startup_timer = startup_timer
             self.root.title("Whisper Killer - YouTube & Video Transcription Tool")
             self.root.geometry("900x800")
             
+            # Settings are read once here; changes are saved in the background
+            self.settings = settings if settings is not None else SettingsStore()
+            
             # Variables
             self.current_operation = None
-            self.output_dir = os.path.expanduser("~/Downloads/yap_output")
+            self.output_dir = self.settings.get('output_dir')
             os.makedirs(self.output_dir, exist_ok=True)
             
+            # Result documents behind the output widgets, and formats written for every job
+            self.output_documents = {}
+            self.output_renders = {}
+            self.export_formats = ['srt', 'vtt', 'json']
+            
+            # Workers publish job events here; the main loop drains them on a fixed tick
+            self.events = EventBus()
+            self.job_handlers = {}
+            self.job_ids = itertools.count(1)
+            # Running job of each tab ('yt', 'local', 'text'), for its Cancel button
+            self.tab_jobs = {}
+            
+            # Launch items (URLs, files, text) waiting for their tab to be free
+            self.pending_inputs = deque()
+            # Title, duration etc. of launched URLs by URL (VideoInfo as a dict, None when unavailable)
+            self.video_metadata = {}
+            # Metadata lookups still running; queued URLs wait for them so they start shortest first
+            self.metadata_lookups = 0
+            
+            # Pipeline jobs run in worker processes; the GUI only sends configs and shows results
+            self.worker = PipelineWorker(self.events, processes=self.settings.get('worker_processes') or None)
+            
             # Encryption key based on machine-specific info (safe for GitHub)
             self.encryption_key = self.generate_machine_key()
             
             print("Setting up UI...", file=sys.stderr)
             self.setup_ui()
-            print("Loading language preferences...", file=sys.stderr)
-            self.load_language_preferences()
+            self.mark_startup("ui built")
+            self.root.bind('<Map>', self.on_root_mapped, add='+')
+            self.root.after(UI_TICK_MS, self.drain_ui_events)
             print("Checking dependencies...", file=sys.stderr)
             self.check_dependencies()
             print("Loading API key...", file=sys.stderr)
             self.load_encrypted_api_key()
+            self.mark_startup("init complete")
             print("Whisper Killer initialization complete", file=sys.stderr)
             
         except Exception as e:
@@ -61,6 +104,12 @@ class YapGUI:
             raise
         
     def setup_ui(self):
+        # Pages are built the first time they are selected; their widgets only
+        # exist from then on, while the state they show lives in setup_variables
+        self.lazy_tabs = {}
+        self.output_widgets = {}
+        self.setup_variables()
+        
         # Main title
         title_frame = ttk.Frame(self.root)
         title_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
@@ -74,25 +123,177 @@ class YapGUI:
         subtitle.pack(pady=(0, 10))
         
         # Create notebook for tabs
-        notebook = ttk.Notebook(self.root)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.youtube_tab = self.add_lazy_tab(self.notebook, "📺 Online Videos", self.setup_youtube_tab)
+        self.local_video_tab = self.add_lazy_tab(self.notebook, "🎬 Local Video", self.setup_local_video_tab)
+        self.text_translation_tab = self.add_lazy_tab(self.notebook, "📝 Text Translation",
+                                                      self.setup_text_translation_tab)
+        self.search_tab = self.add_lazy_tab(self.notebook, "🔎 Search", self.setup_search_tab)
+        self.settings_tab = self.add_lazy_tab(self.notebook, "⚙️ Settings", self.setup_settings_tab)
+        
+        # Only the page shown first is built now
+        self.watch_lazy_tabs(self.notebook)
+    
+    def setup_variables(self):
+        """Create the state behind every tab, whether or not the tab has been built yet"""
+        # Language codes for every language combobox, computed once
+        self.language_codes = self.get_apple_language_list()
+        
+        # Online videos
+        self.youtube_url_var = tk.StringVar()
+        self.yt_summarize_var = tk.BooleanVar(value=True)
+        self.yt_translate_var = tk.BooleanVar(value=True)
+        self.yt_keep_audio_var = tk.BooleanVar(value=True)
+        self.yt_target_lang = tk.StringVar(value=self.settings.get('youtube_target_lang'))
+        self.yt_lang_label = tk.StringVar(value=self.get_language_name(self.yt_target_lang.get()))
+        self.yt_status_var = tk.StringVar(value="Ready")
+        self.yt_range_start_var = tk.StringVar()
+        self.yt_range_end_var = tk.StringVar()
+        self.yt_preview_var = tk.BooleanVar(value=False)
+        
+        # Update label when language changes
+        def update_lang_label(*args):
+            self.yt_lang_label.set(self.get_language_name(self.yt_target_lang.get()))
+            self.save_language_preferences()  # Save preferences when changed
+        self.yt_target_lang.trace_add('write', update_lang_label)
+        
+        # Text translation
+        self.text_source_lang = tk.StringVar(value=self.settings.get('text_source_lang'))
+        self.text_source_lang_label = tk.StringVar(value=self.get_language_name(self.text_source_lang.get()))
+        self.text_target_lang = tk.StringVar(value=self.settings.get('text_target_lang'))
+        self.text_target_lang_label = tk.StringVar(value=self.get_language_name(self.text_target_lang.get()))
+        self.text_use_apple_var = tk.BooleanVar(value=True)
+        self.text_enhance_paragraphs_var = tk.BooleanVar(value=True)
+        self.text_status_var = tk.StringVar(value="Ready to translate")
+        
+        # Update labels when languages change
+        def update_text_source_lang_label(*args):
+            self.text_source_lang_label.set(self.get_language_name(self.text_source_lang.get()))
+            self.save_language_preferences()  # Save preferences when changed
+        self.text_source_lang.trace_add('write', update_text_source_lang_label)
+        
+        def update_text_target_lang_label(*args):
+            self.text_target_lang_label.set(self.get_language_name(self.text_target_lang.get()))
+            self.save_language_preferences()  # Save preferences when changed
+        self.text_target_lang.trace_add('write', update_text_target_lang_label)
+        
+        # Local video
+        self.local_file_var = tk.StringVar()
+        self.local_summarize_var = tk.BooleanVar(value=True)
+        self.local_translate_var = tk.BooleanVar(value=True)
+        self.local_target_lang = tk.StringVar(value=self.settings.get('local_target_lang'))
+        self.local_lang_label = tk.StringVar(value=self.get_language_name(self.local_target_lang.get()))
+        self.local_status_var = tk.StringVar(value="Ready")
+        self.local_range_start_var = tk.StringVar()
+        self.local_range_end_var = tk.StringVar()
+        self.local_preview_var = tk.BooleanVar(value=False)
+        
+        # Minutes transcribed (and summarized) first in preview-first jobs, shared by both video tabs
+        self.preview_minutes_var = tk.IntVar(value=self.settings.get('preview_minutes'))
+        def update_preview_minutes(*args):
+            try:
+                self.settings.update(preview_minutes=max(1, self.preview_minutes_var.get()))
+            except tk.TclError:
+                pass  # Spinbox being edited
+        self.preview_minutes_var.trace_add('write', update_preview_minutes)
+        
+        # Watch folder: files dropped there are transcribed with the options above
+        self.watch_folder_var = tk.StringVar(value=self.settings.get('watch_folder'))
+        self.watch_status_var = tk.StringVar(value="Not watching")
+        self.folder_watcher = None
+        self.watch_ingest = None
+        self.watch_job = None
+        self.watch_counts = {'done': 0, 'failed': 0}
         
-        # YouTube Tab
-        self.setup_youtube_tab(notebook)
+        # Update label when language changes
+        def update_local_lang_label(*args):
+            self.local_lang_label.set(self.get_language_name(self.local_target_lang.get()))
+            self.save_language_preferences()  # Save preferences when changed
+        self.local_target_lang.trace_add('write', update_local_lang_label)
+        
+        # Settings; try to get the API key from the environment variable
+        self.openrouter_api_key = tk.StringVar(value=os.environ.get('OPENROUTER_API_KEY', ''))
         
-        # Local Video Tab
-        self.setup_local_video_tab(notebook)
+        # Plain copy of the key that worker threads can read safely
+        self.api_key_value = self.openrouter_api_key.get().strip()
+        def update_api_key_value(*args):
+            self.api_key_value = self.openrouter_api_key.get().strip()
+        self.openrouter_api_key.trace_add('write', update_api_key_value)
         
-        # Text Translation Tab
-        self.setup_text_translation_tab(notebook)
+        self.translation_model = tk.StringVar(value=self.settings.get('model'))
         
-        # Settings Tab
-        self.setup_settings_tab(notebook)
+        # Plain copy of the model that worker threads can read safely
+        self.model_value = self.translation_model.get()
+        def update_model_value(*args):
+            self.model_value = self.translation_model.get()
+            self.settings.update(model=self.model_value)
+        self.translation_model.trace_add('write', update_model_value)
         
-    def setup_youtube_tab(self, notebook):
-        youtube_frame = ttk.Frame(notebook)
-        notebook.add(youtube_frame, text="📺 Online Videos")
+        self.output_dir_var = tk.StringVar(value=self.output_dir)
         
+        # Media cache budget and codec for kept audio
+        self.media_cache_mb_var = tk.IntVar(value=self.settings.get('media_cache_mb'))
+        self.media_codec_var = tk.StringVar(value=self.settings.get('media_codec') or "off")
+        self.media_cache_usage_var = tk.StringVar(value="")
+        def update_media_cache_settings(*args):
+            try:
+                budget = max(0, self.media_cache_mb_var.get())
+            except tk.TclError:
+                return  # Spinbox being edited
+            codec = self.media_codec_var.get()
+            self.settings.update(media_cache_mb=budget, media_codec="" if codec == "off" else codec)
+        self.media_cache_mb_var.trace_add('write', update_media_cache_settings)
+        self.media_codec_var.trace_add('write', update_media_cache_settings)
+        
+        # Silence trimming before transcription
+        self.trim_silence_var = tk.BooleanVar(value=self.settings.get('trim_silence'))
+        self.trim_silence_var.trace_add('write', lambda *args: self.settings.update(
+            trim_silence=self.trim_silence_var.get()))
+        
+        # Speed profile for transcription
+        self.speed_profile_var = tk.StringVar(value=self.settings.get('speed_profile'))
+        self.speed_profile_var.trace_add('write', lambda *args: self.settings.update(
+            speed_profile=self.speed_profile_var.get()))
+        
+        # Longest online video accepted (minutes, 0 for no limit)
+        self.max_video_minutes_var = tk.IntVar(value=self.settings.get('max_video_minutes'))
+        def update_max_video_minutes(*args):
+            try:
+                self.settings.update(max_video_minutes=max(0, self.max_video_minutes_var.get()))
+            except tk.TclError:
+                pass  # Spinbox being edited
+        self.max_video_minutes_var.trace_add('write', update_max_video_minutes)
+        
+        # Search tab
+        self.search_query_var = tk.StringVar()
+        self.search_field_var = tk.StringVar(value="all")
+        self.search_status_var = tk.StringVar(value="Type to search all transcripts, translations and summaries")
+        self.search_hits = {}
+        self.search_after = None
+        
+        # Latest dependency report, shown once the Settings tab is built
+        self.deps_report = ""
+    
+    def add_lazy_tab(self, notebook, text, build):
+        """Add a notebook page whose contents are built the first time it is selected"""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        self.lazy_tabs[str(frame)] = lambda: build(frame)
+        return frame
+    
+    def watch_lazy_tabs(self, notebook):
+        """Build the pages of a notebook as they are selected, starting with the current one"""
+        notebook.bind('<<NotebookTabChanged>>', lambda e: self.build_tab(notebook.select()), add='+')
+        self.build_tab(notebook.select())
+    
+    def build_tab(self, tab):
+        build = self.lazy_tabs.pop(str(tab), None)
+        if build is not None:
+            build()
+    
+    def setup_youtube_tab(self, youtube_frame):
         main_frame = ttk.Frame(youtube_frame, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -102,7 +303,6 @@ class YapGUI:
         
         ttk.Label(url_frame, text="Video URL:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.youtube_url_var = tk.StringVar()
         url_entry = ttk.Entry(url_frame, textvariable=self.youtube_url_var, width=60)
         url_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
         
@@ -117,41 +317,32 @@ class YapGUI:
         opts_frame = ttk.Frame(options_frame)
         opts_frame.pack(fill=tk.X)
         
-        self.yt_summarize_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(opts_frame, text="Generate AI Summary", 
                        variable=self.yt_summarize_var).pack(side=tk.LEFT, padx=(0, 15))
         
-        self.yt_translate_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(opts_frame, text="Translate text", 
                        variable=self.yt_translate_var).pack(side=tk.LEFT, padx=(0, 15))
         
-        self.yt_keep_audio_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(opts_frame, text="Keep audio", 
                        variable=self.yt_keep_audio_var).pack(side=tk.LEFT)
         
+        self.add_section_options(options_frame, self.yt_range_start_var, self.yt_range_end_var, self.yt_preview_var)
+        
         # Translation options
         translate_frame = ttk.Frame(options_frame)
         translate_frame.pack(fill=tk.X, pady=(10, 0))
         
         ttk.Label(translate_frame, text="Translate to:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.yt_target_lang = tk.StringVar(value="es")
         lang_combo = ttk.Combobox(translate_frame, textvariable=self.yt_target_lang, 
-                                 values=self.get_apple_language_list(),
+                                 values=self.language_codes,
                                  width=8, state="readonly")
         lang_combo.pack(side=tk.LEFT, padx=(0, 10))
         
         # Language label
-        self.yt_lang_label = tk.StringVar(value=self.get_language_name("es"))
         ttk.Label(translate_frame, textvariable=self.yt_lang_label, 
                  font=("Arial", 9)).pack(side=tk.LEFT)
         
-        # Update label when language changes
-        def update_lang_label(*args):
-            self.yt_lang_label.set(self.get_language_name(self.yt_target_lang.get()))
-            self.save_language_preferences()  # Save preferences when changed
-        self.yt_target_lang.trace_add('write', update_lang_label)
-        
         # Action buttons
         action_frame = ttk.Frame(main_frame)
         action_frame.pack(fill=tk.X, pady=(0, 15))
@@ -161,6 +352,10 @@ class YapGUI:
                                            style="Accent.TButton")
         self.yt_download_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.yt_cancel_button = ttk.Button(action_frame, text="⏹ Cancel", 
+                                         command=self.cancel_online_video, state='disabled')
+        self.yt_cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(action_frame, text="🗑️ Clear Output", 
                   command=self.clear_online_video_output).pack(side=tk.LEFT)
         
@@ -169,7 +364,6 @@ class YapGUI:
         self.yt_progress.pack(fill=tk.X, pady=(0, 10))
         
         # Status
-        self.yt_status_var = tk.StringVar(value="Ready")
         status_label = ttk.Label(main_frame, textvariable=self.yt_status_var, 
                                 font=("Arial", 10))
         status_label.pack(pady=(0, 10))
@@ -181,80 +375,37 @@ class YapGUI:
         # Create notebook for output tabs
         self.yt_output_notebook = ttk.Notebook(output_frame)
         self.yt_output_notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Original transcription tab
-        yt_original_frame = ttk.Frame(self.yt_output_notebook)
-        self.yt_output_notebook.add(yt_original_frame, text="📝 Original")
-        
-        yt_orig_button_frame = ttk.Frame(yt_original_frame)
-        yt_orig_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(yt_orig_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.yt_original_text)).pack(side=tk.RIGHT)
-        
-        self.yt_original_text = scrolledtext.ScrolledText(yt_original_frame, wrap=tk.WORD, 
-                                                         height=12, font=("Consolas", 11))
-        self.yt_original_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Translation tab
-        yt_translation_frame = ttk.Frame(self.yt_output_notebook)
-        self.yt_output_notebook.add(yt_translation_frame, text="🌍 Translation")
-        
-        yt_trans_button_frame = ttk.Frame(yt_translation_frame)
-        yt_trans_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(yt_trans_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.yt_translation_text)).pack(side=tk.RIGHT)
-        
-        self.yt_translation_text = scrolledtext.ScrolledText(yt_translation_frame, wrap=tk.WORD, 
-                                                            height=12, font=("Consolas", 11))
-        self.yt_translation_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Original SRT tab
-        yt_orig_srt_frame = ttk.Frame(self.yt_output_notebook)
-        self.yt_output_notebook.add(yt_orig_srt_frame, text="🎬 Original SRT")
-        
-        yt_orig_srt_button_frame = ttk.Frame(yt_orig_srt_frame)
-        yt_orig_srt_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(yt_orig_srt_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.yt_orig_srt_text)).pack(side=tk.RIGHT, padx=(0, 5))
-        ttk.Button(yt_orig_srt_button_frame, text="💾 Save SRT", 
-                  command=lambda: self.save_srt_file(self.yt_orig_srt_text)).pack(side=tk.RIGHT)
-        
-        self.yt_orig_srt_text = scrolledtext.ScrolledText(yt_orig_srt_frame, wrap=tk.WORD, 
-                                                         height=12, font=("Monaco", 10))
-        self.yt_orig_srt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Translated SRT tab
-        yt_trans_srt_frame = ttk.Frame(self.yt_output_notebook)
-        self.yt_output_notebook.add(yt_trans_srt_frame, text="🌍 Translated SRT")
-        
-        yt_trans_srt_button_frame = ttk.Frame(yt_trans_srt_frame)
-        yt_trans_srt_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(yt_trans_srt_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.yt_trans_srt_text)).pack(side=tk.RIGHT, padx=(0, 5))
-        ttk.Button(yt_trans_srt_button_frame, text="💾 Save SRT", 
-                  command=lambda: self.save_srt_file(self.yt_trans_srt_text)).pack(side=tk.RIGHT)
-        
-        self.yt_trans_srt_text = scrolledtext.ScrolledText(yt_trans_srt_frame, wrap=tk.WORD, 
-                                                          height=12, font=("Monaco", 10))
-        self.yt_trans_srt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
+        self.setup_result_tabs(self.yt_output_notebook, 'yt')
+    
+    def setup_result_tabs(self, notebook, prefix):
+        """Result tabs of a video tab; outputs are named '<prefix>_original_text' and so on"""
+        self.add_lazy_tab(notebook, "📝 Original", lambda frame: self.setup_result_pane(
+            frame, f'{prefix}_original_text', ("Consolas", 11)))
+        self.add_lazy_tab(notebook, "🌍 Translation", lambda frame: self.setup_result_pane(
+            frame, f'{prefix}_translation_text', ("Consolas", 11)))
+        self.add_lazy_tab(notebook, "🎬 Original SRT", lambda frame: self.setup_result_pane(
+            frame, f'{prefix}_orig_srt_text', ("Monaco", 10), save_srt=True))
+        self.add_lazy_tab(notebook, "🌍 Translated SRT", lambda frame: self.setup_result_pane(
+            frame, f'{prefix}_trans_srt_text', ("Monaco", 10), save_srt=True))
         # Summary tab (when enabled)
-        yt_summary_frame = ttk.Frame(self.yt_output_notebook)
-        self.yt_output_notebook.add(yt_summary_frame, text="📋 Summary")
-        
-        yt_summ_button_frame = ttk.Frame(yt_summary_frame)
-        yt_summ_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(yt_summ_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.yt_summary_text)).pack(side=tk.RIGHT)
-        
-        self.yt_summary_text = scrolledtext.ScrolledText(yt_summary_frame, wrap=tk.WORD, 
-                                                        height=12, font=("Consolas", 11))
-        self.yt_summary_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-    def setup_text_translation_tab(self, notebook):
-        text_frame = ttk.Frame(notebook)
-        notebook.add(text_frame, text="📝 Text Translation")
-        
+        self.add_lazy_tab(notebook, "📋 Summary", lambda frame: self.setup_result_pane(
+            frame, f'{prefix}_summary_text', ("Consolas", 11)))
+        self.watch_lazy_tabs(notebook)
+    
+    def setup_result_pane(self, frame, output, font, save_srt=False):
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(button_frame, text="📋 Copy", 
+                  command=lambda: self.copy_to_clipboard(output)).pack(side=tk.RIGHT, padx=(0, 5) if save_srt else 0)
+        if save_srt:
+            ttk.Button(button_frame, text="💾 Save SRT", 
+                      command=lambda: self.save_srt_file(output)).pack(side=tk.RIGHT)
+        
+        text_widget = scrolledtext.ScrolledText(frame, wrap=tk.WORD, height=12, font=font)
+        text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        self.install_output_view(output, text_widget)
+        
+    def setup_text_translation_tab(self, text_frame):
         main_frame = ttk.Frame(text_frame, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -310,12 +461,10 @@ class YapGUI:
         
         ttk.Label(source_lang_frame, text="From:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.text_source_lang = tk.StringVar(value="en")
         source_lang_combo = ttk.Combobox(source_lang_frame, textvariable=self.text_source_lang, 
-                                        values=self.get_apple_language_list(), width=15, state="readonly")
+                                        values=self.language_codes, width=15, state="readonly")
         source_lang_combo.pack(side=tk.LEFT, padx=(0, 10))
         
-        self.text_source_lang_label = tk.StringVar(value="English")
         ttk.Label(source_lang_frame, textvariable=self.text_source_lang_label, 
                  font=("Arial", 9)).pack(side=tk.LEFT)
         
@@ -325,35 +474,20 @@ class YapGUI:
         
         ttk.Label(target_lang_frame, text="To:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.text_target_lang = tk.StringVar(value="es")
         target_lang_combo = ttk.Combobox(target_lang_frame, textvariable=self.text_target_lang, 
-                                        values=self.get_apple_language_list(), width=15, state="readonly")
+                                        values=self.language_codes, width=15, state="readonly")
         target_lang_combo.pack(side=tk.LEFT, padx=(0, 10))
         
-        self.text_target_lang_label = tk.StringVar(value="Spanish")
         ttk.Label(target_lang_frame, textvariable=self.text_target_lang_label, 
                  font=("Arial", 9)).pack(side=tk.LEFT)
         
-        # Update labels when languages change
-        def update_text_source_lang_label(*args):
-            self.text_source_lang_label.set(self.get_language_name(self.text_source_lang.get()))
-            self.save_language_preferences()  # Save preferences when changed
-        self.text_source_lang.trace_add('write', update_text_source_lang_label)
-        
-        def update_text_target_lang_label(*args):
-            self.text_target_lang_label.set(self.get_language_name(self.text_target_lang.get()))
-            self.save_language_preferences()  # Save preferences when changed
-        self.text_target_lang.trace_add('write', update_text_target_lang_label)
-        
         # Translation engine options
         engine_frame = ttk.Frame(options_frame)
         engine_frame.pack(fill=tk.X, pady=(5, 0))
         
-        self.text_use_apple_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(engine_frame, text="Use Apple Translation Engine", 
                        variable=self.text_use_apple_var).pack(side=tk.LEFT, padx=(0, 15))
         
-        self.text_enhance_paragraphs_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(engine_frame, text="Enhance Paragraphs with AI", 
                        variable=self.text_enhance_paragraphs_var).pack(side=tk.LEFT)
         
@@ -365,6 +499,10 @@ class YapGUI:
                                               command=self.translate_input_text)
         self.text_translate_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.text_cancel_button = ttk.Button(action_frame, text="⏹ Cancel", 
+                                           command=self.cancel_text_translation, state='disabled')
+        self.text_cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.text_clear_output_button = ttk.Button(action_frame, text="🗑️ Clear Output", 
                                                  command=self.clear_text_output)
         self.text_clear_output_button.pack(side=tk.LEFT)
@@ -378,85 +516,78 @@ class YapGUI:
         self.text_output_notebook.pack(fill=tk.BOTH, expand=True)
         
         # Normal translation tab
-        normal_translated_frame = ttk.Frame(self.text_output_notebook)
-        self.text_output_notebook.add(normal_translated_frame, text="Normal Translation")
-        
-        # Normal translated text widget with scrollbar
-        normal_text_frame = ttk.Frame(normal_translated_frame)
-        normal_text_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        self.text_normal_output = tk.Text(normal_text_frame, wrap=tk.WORD, 
-                                        height=10, font=("Arial", 11))
-        normal_scrollbar = ttk.Scrollbar(normal_text_frame, orient=tk.VERTICAL, 
-                                       command=self.text_normal_output.yview)
-        self.text_normal_output.configure(yscrollcommand=normal_scrollbar.set)
-        
-        self.text_normal_output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        normal_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Normal translation buttons (inside the tab)
-        normal_buttons_frame = ttk.Frame(normal_translated_frame)
-        normal_buttons_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        copy_normal_button = tk.Button(normal_buttons_frame, text="📋 Copy to Clipboard", 
-                                     command=lambda: self.copy_to_clipboard(self.text_normal_output),
-                                     bg="#4CAF50", fg="white", font=("Arial", 11, "bold"),
-                                     height=2, width=18)
-        copy_normal_button.pack(side=tk.LEFT, padx=(0, 10))
-        
-        save_normal_button = ttk.Button(normal_buttons_frame, text="💾 Save as File", 
-                                      command=lambda: self.save_text_file(self.text_normal_output))
-        save_normal_button.pack(side=tk.LEFT, padx=(0, 10))
-        
-        create_org_normal_button = ttk.Button(normal_buttons_frame, text="📝 Create Org File", 
-                                            command=lambda: self.create_org_file(self.text_normal_output))
-        create_org_normal_button.pack(side=tk.LEFT)
+        self.add_lazy_tab(self.text_output_notebook, "Normal Translation", lambda frame:
+                          self.setup_translation_pane(frame, 'text_normal_output', "#4CAF50"))
         
         # Enhanced translation tab (with title and emojis)
-        enhanced_translated_frame = ttk.Frame(self.text_output_notebook)
-        self.text_output_notebook.add(enhanced_translated_frame, text="Enhanced Translation")
-        
-        # Enhanced translated text widget with scrollbar
-        enhanced_text_frame = ttk.Frame(enhanced_translated_frame)
-        enhanced_text_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        self.text_enhanced_output = tk.Text(enhanced_text_frame, wrap=tk.WORD, 
-                                          height=10, font=("Arial", 11))
-        enhanced_scrollbar = ttk.Scrollbar(enhanced_text_frame, orient=tk.VERTICAL, 
-                                         command=self.text_enhanced_output.yview)
-        self.text_enhanced_output.configure(yscrollcommand=enhanced_scrollbar.set)
-        
-        self.text_enhanced_output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        enhanced_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Enhanced translation buttons (inside the tab)
-        enhanced_buttons_frame = ttk.Frame(enhanced_translated_frame)
-        enhanced_buttons_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        copy_enhanced_button = tk.Button(enhanced_buttons_frame, text="📋 Copy to Clipboard", 
-                                       command=lambda: self.copy_to_clipboard(self.text_enhanced_output),
-                                       bg="#2196F3", fg="white", font=("Arial", 11, "bold"),
-                                       height=2, width=18)
-        copy_enhanced_button.pack(side=tk.LEFT, padx=(0, 10))
-        
-        save_enhanced_button = ttk.Button(enhanced_buttons_frame, text="💾 Save as File", 
-                                        command=lambda: self.save_text_file(self.text_enhanced_output))
-        save_enhanced_button.pack(side=tk.LEFT, padx=(0, 10))
-        
-        create_org_enhanced_button = ttk.Button(enhanced_buttons_frame, text="📝 Create Org File", 
-                                              command=lambda: self.create_org_file(self.text_enhanced_output))
-        create_org_enhanced_button.pack(side=tk.LEFT)
+        self.add_lazy_tab(self.text_output_notebook, "Enhanced Translation", lambda frame:
+                          self.setup_translation_pane(frame, 'text_enhanced_output', "#2196F3"))
+        self.watch_lazy_tabs(self.text_output_notebook)
         
         # Status
-        self.text_status_var = tk.StringVar(value="Ready to translate")
         text_status_label = ttk.Label(main_frame, textvariable=self.text_status_var, 
                                      font=("Arial", 9), foreground="gray")
         text_status_label.pack(pady=(5, 0))
+    
+    def setup_translation_pane(self, frame, output, copy_color):
+        # Translated text widget with scrollbar
+        text_frame = ttk.Frame(frame)
+        text_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        text_widget = tk.Text(text_frame, wrap=tk.WORD, height=10, font=("Arial", 11))
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
+        text_widget.configure(yscrollcommand=scrollbar.set)
+        
+        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.install_output_view(output, text_widget)
+        
+        # Translation buttons (inside the tab)
+        buttons_frame = ttk.Frame(frame)
+        buttons_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        copy_button = tk.Button(buttons_frame, text="📋 Copy to Clipboard", 
+                                command=lambda: self.copy_to_clipboard(output),
+                                bg=copy_color, fg="white", font=("Arial", 11, "bold"),
+                                height=2, width=18)
+        copy_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        save_button = ttk.Button(buttons_frame, text="💾 Save as File", 
+                                 command=lambda: self.save_text_file(output))
+        save_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        create_org_button = ttk.Button(buttons_frame, text="📝 Create Org File", 
+                                       command=lambda: self.create_org_file(output))
+        create_org_button.pack(side=tk.LEFT)
 
-    def setup_local_video_tab(self, notebook):
-        local_frame = ttk.Frame(notebook)
-        notebook.add(local_frame, text="🎬 Local Video")
-        
+    def add_section_options(self, parent, start_var, end_var, preview_var):
+        """Time range and preview-first options of a video tab"""
+        section_frame = ttk.Frame(parent)
+        section_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Label(section_frame, text="From:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(section_frame, textvariable=start_var, width=9).pack(side=tk.LEFT)
+        ttk.Label(section_frame, text="to:").pack(side=tk.LEFT, padx=(5, 5))
+        ttk.Entry(section_frame, textvariable=end_var, width=9).pack(side=tk.LEFT)
+        ttk.Label(section_frame, text="(h:mm:ss, empty for all)", font=("Arial", 9)).pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Checkbutton(section_frame, text="Preview first", variable=preview_var).pack(side=tk.LEFT)
+        ttk.Spinbox(section_frame, from_=1, to=60, width=4,
+                    textvariable=self.preview_minutes_var).pack(side=tk.LEFT, padx=(5, 5))
+        ttk.Label(section_frame, text="min").pack(side=tk.LEFT)
+    
+    def section_settings(self, start_var, end_var, preview_var):
+        """Time range and preview minutes of a video job; raises ValueError for an unreadable time"""
+        start = parse_time(start_var.get())
+        end = parse_time(end_var.get())
+        if start is not None and end is not None and end <= start:
+            raise ValueError("The end of the time range must come after its start")
+        return {
+            'time_range': None if start is None and end is None else [start or 0.0, end],
+            'preview_minutes': self.settings.get('preview_minutes') if preview_var.get() else 0
+        }
+    
+    def setup_local_video_tab(self, local_frame):
         main_frame = ttk.Frame(local_frame, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -469,7 +600,6 @@ class YapGUI:
         
         ttk.Label(file_inner_frame, text="File:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.local_file_var = tk.StringVar()
         file_entry = ttk.Entry(file_inner_frame, textvariable=self.local_file_var, width=50)
         file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
         
@@ -494,35 +624,46 @@ class YapGUI:
         local_opts_frame = ttk.Frame(local_options_frame)
         local_opts_frame.pack(fill=tk.X)
         
-        self.local_summarize_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(local_opts_frame, text="Generate AI Summary", 
                        variable=self.local_summarize_var).pack(side=tk.LEFT, padx=(0, 15))
         
-        self.local_translate_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(local_opts_frame, text="Translate text", 
                        variable=self.local_translate_var).pack(side=tk.LEFT)
         
+        self.add_section_options(local_options_frame, self.local_range_start_var, self.local_range_end_var,
+                                 self.local_preview_var)
+        
         # Translation options for local video
         local_translate_frame = ttk.Frame(local_options_frame)
         local_translate_frame.pack(fill=tk.X, pady=(10, 0))
         
         ttk.Label(local_translate_frame, text="Translate to:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.local_target_lang = tk.StringVar(value="es")
         local_lang_combo = ttk.Combobox(local_translate_frame, textvariable=self.local_target_lang, 
-                                       values=self.get_apple_language_list(),
+                                       values=self.language_codes,
                                        width=8, state="readonly")
         local_lang_combo.pack(side=tk.LEFT, padx=(0, 10))
         
-        self.local_lang_label = tk.StringVar(value=self.get_language_name("es"))
         ttk.Label(local_translate_frame, textvariable=self.local_lang_label, 
                  font=("Arial", 9)).pack(side=tk.LEFT)
         
-        # Update label when language changes
-        def update_local_lang_label(*args):
-            self.local_lang_label.set(self.get_language_name(self.local_target_lang.get()))
-            self.save_language_preferences()  # Save preferences when changed
-        self.local_target_lang.trace_add('write', update_local_lang_label)
+        # Watch folder
+        watch_frame = ttk.LabelFrame(main_frame, text="👀 Watch Folder", padding="10")
+        watch_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        watch_inner_frame = ttk.Frame(watch_frame)
+        watch_inner_frame.pack(fill=tk.X)
+        
+        ttk.Label(watch_inner_frame, text="Folder:").pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Entry(watch_inner_frame, textvariable=self.watch_folder_var, width=50).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        
+        self.watch_button = ttk.Button(watch_inner_frame, text="▶ Start Watching", command=self.toggle_watch_folder)
+        self.watch_button.pack(side=tk.RIGHT)
+        ttk.Button(watch_inner_frame, text="Browse", command=self.browse_watch_folder).pack(side=tk.RIGHT, padx=(0, 10))
+        
+        ttk.Label(watch_frame, textvariable=self.watch_status_var, font=("Arial", 9)).pack(anchor=tk.W, pady=(5, 0))
         
         # Action buttons
         local_action_frame = ttk.Frame(main_frame)
@@ -533,6 +674,10 @@ class YapGUI:
                                                 style="Accent.TButton")
         self.local_transcribe_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.local_cancel_button = ttk.Button(local_action_frame, text="⏹ Cancel", 
+                                            command=self.cancel_local_video, state='disabled')
+        self.local_cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(local_action_frame, text="💾 Save Output", 
                   command=self.save_local_output).pack(side=tk.LEFT, padx=(0, 10))
         
@@ -544,7 +689,6 @@ class YapGUI:
         self.local_progress.pack(fill=tk.X, pady=(0, 10))
         
         # Status
-        self.local_status_var = tk.StringVar(value="Ready")
         local_status_label = ttk.Label(main_frame, textvariable=self.local_status_var, 
                                       font=("Arial", 10))
         local_status_label.pack(pady=(0, 10))
@@ -556,80 +700,117 @@ class YapGUI:
         # Create notebook for output tabs
         self.local_output_notebook = ttk.Notebook(local_output_frame)
         self.local_output_notebook.pack(fill=tk.BOTH, expand=True)
+        self.setup_result_tabs(self.local_output_notebook, 'local')
         
-        # Original transcription tab
-        local_original_frame = ttk.Frame(self.local_output_notebook)
-        self.local_output_notebook.add(local_original_frame, text="📝 Original")
-        
-        local_orig_button_frame = ttk.Frame(local_original_frame)
-        local_orig_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(local_orig_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.local_original_text)).pack(side=tk.RIGHT)
-        
-        self.local_original_text = scrolledtext.ScrolledText(local_original_frame, wrap=tk.WORD, 
-                                                            height=12, font=("Consolas", 11))
-        self.local_original_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Translation tab
-        local_translation_frame = ttk.Frame(self.local_output_notebook)
-        self.local_output_notebook.add(local_translation_frame, text="🌍 Translation")
-        
-        local_trans_button_frame = ttk.Frame(local_translation_frame)
-        local_trans_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(local_trans_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.local_translation_text)).pack(side=tk.RIGHT)
-        
-        self.local_translation_text = scrolledtext.ScrolledText(local_translation_frame, wrap=tk.WORD, 
-                                                               height=12, font=("Consolas", 11))
-        self.local_translation_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Original SRT tab
-        local_orig_srt_frame = ttk.Frame(self.local_output_notebook)
-        self.local_output_notebook.add(local_orig_srt_frame, text="🎬 Original SRT")
-        
-        local_orig_srt_button_frame = ttk.Frame(local_orig_srt_frame)
-        local_orig_srt_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(local_orig_srt_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.local_orig_srt_text)).pack(side=tk.RIGHT, padx=(0, 5))
-        ttk.Button(local_orig_srt_button_frame, text="💾 Save SRT", 
-                  command=lambda: self.save_srt_file(self.local_orig_srt_text)).pack(side=tk.RIGHT)
-        
-        self.local_orig_srt_text = scrolledtext.ScrolledText(local_orig_srt_frame, wrap=tk.WORD, 
-                                                            height=12, font=("Monaco", 10))
-        self.local_orig_srt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
-        
-        # Translated SRT tab
-        local_trans_srt_frame = ttk.Frame(self.local_output_notebook)
-        self.local_output_notebook.add(local_trans_srt_frame, text="🌍 Translated SRT")
-        
-        local_trans_srt_button_frame = ttk.Frame(local_trans_srt_frame)
-        local_trans_srt_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(local_trans_srt_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.local_trans_srt_text)).pack(side=tk.RIGHT, padx=(0, 5))
-        ttk.Button(local_trans_srt_button_frame, text="💾 Save SRT", 
-                  command=lambda: self.save_srt_file(self.local_trans_srt_text)).pack(side=tk.RIGHT)
-        
-        self.local_trans_srt_text = scrolledtext.ScrolledText(local_trans_srt_frame, wrap=tk.WORD, 
-                                                             height=12, font=("Monaco", 10))
-        self.local_trans_srt_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+    def setup_search_tab(self, search_frame):
+        from transcript_index import FIELDS, TranscriptIndex
+        self.transcript_index = TranscriptIndex()
         
-        # Summary tab (when enabled)
-        local_summary_frame = ttk.Frame(self.local_output_notebook)
-        self.local_output_notebook.add(local_summary_frame, text="📋 Summary")
-        
-        local_summ_button_frame = ttk.Frame(local_summary_frame)
-        local_summ_button_frame.pack(fill=tk.X, padx=5, pady=5)
-        ttk.Button(local_summ_button_frame, text="📋 Copy", 
-                  command=lambda: self.copy_to_clipboard(self.local_summary_text)).pack(side=tk.RIGHT)
+        main_frame = ttk.Frame(search_frame, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.local_summary_text = scrolledtext.ScrolledText(local_summary_frame, wrap=tk.WORD, 
-                                                           height=12, font=("Consolas", 11))
-        self.local_summary_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        # Query
+        query_frame = ttk.Frame(main_frame)
+        query_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        query_entry = ttk.Entry(query_frame, textvariable=self.search_query_var, font=("Arial", 12))
+        query_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        query_entry.bind('<Return>', lambda e: self.run_search())
+        query_entry.bind('<KeyRelease>', lambda e: self.schedule_search())
+        
+        ttk.Label(query_frame, text="In:").pack(side=tk.LEFT, padx=(0, 5))
+        field_combo = ttk.Combobox(query_frame, textvariable=self.search_field_var,
+                                   values=("all",) + FIELDS, width=12, state="readonly")
+        field_combo.pack(side=tk.LEFT, padx=(0, 10))
+        field_combo.bind('<<ComboboxSelected>>', lambda e: self.run_search())
+        
+        ttk.Button(query_frame, text="🔎 Search", command=self.run_search).pack(side=tk.LEFT)
+        
+        ttk.Label(main_frame, textvariable=self.search_status_var, font=("Arial", 9)).pack(anchor=tk.W, pady=(0, 5))
+        
+        # Matches: one row per matching segment
+        results_frame = ttk.Frame(main_frame)
+        results_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        self.search_results = ttk.Treeview(results_frame, columns=('time', 'field', 'title', 'match'),
+                                           show='headings', height=8)
+        for column, heading, width in (('time', "Time", 80), ('field', "In", 90),
+                                       ('title', "Job", 220), ('match', "Match", 500)):
+            self.search_results.heading(column, text=heading)
+            self.search_results.column(column, width=width, stretch=(column == 'match'))
+        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.search_results.yview)
+        self.search_results.configure(yscrollcommand=results_scrollbar.set)
+        self.search_results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.search_results.bind('<<TreeviewSelect>>', lambda e: self.show_search_hit())
+        
+        # The selected match in the context of its transcript, translation or summary
+        preview_frame = ttk.LabelFrame(main_frame, text="📄 Context", padding="5")
+        preview_frame.pack(fill=tk.BOTH, expand=True)
+        self.search_preview = scrolledtext.ScrolledText(preview_frame, wrap=tk.WORD, height=10,
+                                                        font=("Arial", 11), state='disabled')
+        self.search_preview.pack(fill=tk.BOTH, expand=True)
+        self.search_preview.tag_configure('match', background="#fff3a0")
+        self.search_preview.tag_configure('time', foreground="gray")
+    
+    def schedule_search(self):
+        """Search as the user types, once typing pauses"""
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(250, self.run_search)
+    
+    def run_search(self):
+        from transcript_index import format_timestamp
+        import time
+        
+        self.search_after = None
+        query = self.search_query_var.get().strip()
+        field = self.search_field_var.get()
+        start = time.perf_counter()
+        try:
+            hits = self.transcript_index.search(query, field=None if field == "all" else field) if query else []
+        except Exception as e:
+            self.search_status_var.set(f"Search failed: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        self.search_results.delete(*self.search_results.get_children())
+        self.search_hits = {}
+        for hit in hits:
+            title = hit.title or os.path.basename(hit.path)
+            item = self.search_results.insert('', tk.END, values=(
+                format_timestamp(hit.start), hit.field, title, hit.snippet.replace('\n', ' ')))
+            self.search_hits[item] = hit
+        if query:
+            self.search_status_var.set(f"{len(hits)} match(es) in {elapsed:.1f} ms")
+    
+    def show_search_hit(self):
+        """Show the selected match within its text and scroll to it"""
+        from transcript_index import format_timestamp
         
-    def setup_settings_tab(self, notebook):
-        settings_frame = ttk.Frame(notebook)
-        notebook.add(settings_frame, text="⚙️ Settings")
+        selection = self.search_results.selection()
+        hit = self.search_hits.get(selection[0]) if selection else None
+        if hit is None:
+            return
         
+        self.search_preview.config(state='normal')
+        self.search_preview.delete(1.0, tk.END)
+        match_index = None
+        for position, row in enumerate(self.transcript_index.field_rows(hit.document, hit.field)):
+            if row.start is not None:
+                self.search_preview.insert(tk.END, f"[{format_timestamp(row.start)}] ", 'time')
+            if position == hit.position:
+                match_index = self.search_preview.index(tk.END + '-1c')
+                self.search_preview.insert(tk.END, row.text, 'match')
+            else:
+                self.search_preview.insert(tk.END, row.text)
+            self.search_preview.insert(tk.END, "\n\n")
+        self.search_preview.config(state='disabled')
+        if match_index is not None:
+            self.search_preview.see(match_index)
+        self.search_status_var.set(f"{hit.path} at {format_timestamp(hit.start)}")
+    
+    def setup_settings_tab(self, settings_frame):
         main_frame = ttk.Frame(settings_frame, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -642,11 +823,6 @@ class YapGUI:
         
         ttk.Label(api_inner_frame, text="API Key:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.openrouter_api_key = tk.StringVar()
-        # Try to get from environment variable
-        import os
-        self.openrouter_api_key.set(os.environ.get('OPENROUTER_API_KEY', ''))
-        
         api_entry = ttk.Entry(api_inner_frame, textvariable=self.openrouter_api_key, 
                              show="*", width=50)
         api_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
@@ -660,7 +836,6 @@ class YapGUI:
         
         ttk.Label(model_frame, text="Model:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.translation_model = tk.StringVar(value="anthropic/claude-3-haiku")
         model_combo = ttk.Combobox(model_frame, textvariable=self.translation_model, 
                                   values=[
                                       "anthropic/claude-3-haiku",
@@ -698,13 +873,71 @@ class YapGUI:
         
         ttk.Label(dir_frame, text="Save files to:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.output_dir_var = tk.StringVar(value=self.output_dir)
         dir_entry = ttk.Entry(dir_frame, textvariable=self.output_dir_var, width=50)
         dir_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
         
         ttk.Button(dir_frame, text="Browse", command=self.browse_output_dir).pack(side=tk.RIGHT, padx=(0, 10))
         ttk.Button(dir_frame, text="Open", command=self.open_output_dir).pack(side=tk.RIGHT)
         
+        # Media cache
+        cache_frame = ttk.LabelFrame(main_frame, text="💾 Kept Audio Cache", padding="10")
+        cache_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        budget_frame = ttk.Frame(cache_frame)
+        budget_frame.pack(fill=tk.X)
+        
+        ttk.Label(budget_frame, text="Keep up to").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Spinbox(budget_frame, from_=0, to=1048576, increment=512, width=8,
+                    textvariable=self.media_cache_mb_var).pack(side=tk.LEFT)
+        ttk.Label(budget_frame, text="MB, compressed as:").pack(side=tk.LEFT, padx=(5, 5))
+        ttk.Combobox(budget_frame, textvariable=self.media_codec_var, values=["off", "aac", "opus"],
+                     width=6, state="readonly").pack(side=tk.LEFT)
+        ttk.Button(budget_frame, text="Clean Up Now", command=self.clean_media_cache).pack(side=tk.RIGHT)
+        
+        ttk.Label(cache_frame, textvariable=self.media_cache_usage_var, font=("Arial", 9)).pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(cache_frame, text="Least recently used audio is removed first; transcripts are always kept. "
+                                    "Pin a job with: python3 media_cache.py pin <job folder>",
+                  font=("Arial", 9), wraplength=600).pack(anchor=tk.W)
+        self.refresh_media_cache_usage()
+        
+        # Silence trimming
+        vad_frame = ttk.LabelFrame(main_frame, text="🔇 Silence Trimming", padding="10")
+        vad_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        ttk.Checkbutton(vad_frame, text="Skip silence before transcribing",
+                        variable=self.trim_silence_var).pack(anchor=tk.W)
+        ttk.Label(vad_frame, text="Pauses of a second or more are cut from the audio yap hears; subtitle times "
+                                  "still match the original recording. Needs NumPy (pip install numpy).",
+                  font=("Arial", 9), wraplength=600).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Speed profile
+        speed_frame = ttk.LabelFrame(main_frame, text="⚡ Transcription Speed", padding="10")
+        speed_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        profile_frame = ttk.Frame(speed_frame)
+        profile_frame.pack(fill=tk.X)
+        ttk.Label(profile_frame, text="Speed profile:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(profile_frame, textvariable=self.speed_profile_var, values=list(SPEED_PROFILES),
+                     width=10, state="readonly").pack(side=tk.LEFT)
+        ttk.Label(profile_frame, text="  ".join(f"{name}: {speed:g}x" for name, speed in SPEED_PROFILES.items()),
+                  font=("Arial", 9)).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Label(speed_frame, text="Faster profiles play the audio to yap sped up (pitch preserved): less CPU time "
+                                    "per hour of media for slightly more recognition errors. Needs ffmpeg.",
+                  font=("Arial", 9), wraplength=600).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Video length limit
+        length_frame = ttk.LabelFrame(main_frame, text="📏 Video Length Limit", padding="10")
+        length_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        limit_frame = ttk.Frame(length_frame)
+        limit_frame.pack(fill=tk.X)
+        ttk.Label(limit_frame, text="Longest online video (minutes, 0 for no limit):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Spinbox(limit_frame, from_=0, to=1440, increment=15, width=6,
+                    textvariable=self.max_video_minutes_var).pack(side=tk.LEFT)
+        ttk.Label(length_frame, text="Video details are read before downloading: longer videos are rejected "
+                                     "right away, and queued URLs run shortest first.",
+                  font=("Arial", 9), wraplength=600).pack(anchor=tk.W, pady=(5, 0))
+        
         # Dependencies status
         deps_frame = ttk.LabelFrame(main_frame, text="🔧 Dependencies Status", padding="10")
         deps_frame.pack(fill=tk.X, pady=(0, 15))
@@ -712,226 +945,88 @@ class YapGUI:
         self.deps_text = scrolledtext.ScrolledText(deps_frame, wrap=tk.WORD, height=8, 
                                                   font=("Consolas", 10))
         self.deps_text.pack(fill=tk.BOTH, expand=True)
+        self.deps_text.insert(tk.END, self.deps_report)
         
         # Refresh button
         ttk.Button(main_frame, text="🔄 Check Dependencies", 
-                  command=self.check_dependencies).pack(pady=10)
+                  command=lambda: self.check_dependencies(refresh=True)).pack(pady=10)
     
-    def check_dependencies(self):
-        """Check if required dependencies are installed"""
+    def check_dependencies(self, refresh=False):
+        """Check if required dependencies are installed (probes run concurrently and are cached)"""
         def check():
-            deps_status = []
-            
-            # Check yap
-            try:
-                result = subprocess.run(['yap', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    deps_status.append("✅ yap: Available")
-                else:
-                    deps_status.append("❌ yap: Not found or error")
-            except:
-                deps_status.append("❌ yap: Not installed")
-            
-            # Check yt-dlp
-            try:
-                result = subprocess.run(['yt-dlp', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    version = result.stdout.strip()
-                    deps_status.append(f"✅ yt-dlp: {version}")
-                else:
-                    deps_status.append("❌ yt-dlp: Error")
-            except:
-                deps_status.append("❌ yt-dlp: Not installed")
-                deps_status.append("   Install with: brew install yt-dlp")
-            
-            # Check llm
-            try:
-                result = subprocess.run(['llm', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    version = result.stdout.strip()
-                    deps_status.append(f"✅ llm: {version}")
-                else:
-                    deps_status.append("❌ llm: Error")
-            except:
-                deps_status.append("❌ llm: Not installed")
-                deps_status.append("   Install with: brew install llm")
-            
-            # Check uvx
-            try:
-                result = subprocess.run(['uvx', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    deps_status.append("✅ uvx: Available")
-                else:
-                    deps_status.append("❌ uvx: Error")
-            except:
-                deps_status.append("❌ uvx: Not installed")
-                deps_status.append("   Install with: brew install uv")
-            
-            # Check OpenRouter API key for translation
-            api_key = os.environ.get('OPENROUTER_API_KEY') or self.openrouter_api_key.get().strip()
-            if api_key:
-                deps_status.append("✅ OpenRouter API: Configured for translation")
-            else:
-                deps_status.append("⚠️  OpenRouter API: Not configured (for translation)")
-                deps_status.append("   Enter API key in Settings tab")
-            
-            # Check curl for API requests
-            try:
-                result = subprocess.run(['curl', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    deps_status.append("✅ curl: Available for API requests")
-                else:
-                    deps_status.append("❌ curl: Error")
-            except:
-                deps_status.append("❌ curl: Not available (needed for OpenRouter API)")
-                deps_status.append("   Install with: brew install curl")
-            
-            deps_status.append("")
-            deps_status.append("Installation commands:")
-            deps_status.append("brew install finnvoor/tools/yap")
-            deps_status.append("brew install yt-dlp")
-            deps_status.append("brew install llm")
-            deps_status.append("brew install uv")
-            deps_status.append("")
-            deps_status.append("For translation:")
-            deps_status.append("• Enter OpenAI API key in Settings tab (recommended)")
-            deps_status.append("• Ensure curl is available (usually pre-installed)")
+            results, spawned = probe_dependencies(refresh=refresh)
+            startup_timer = getattr(self, 'startup_timer', None)
+            if startup_timer is not None:
+                startup_timer.note(probes_spawned=spawned)
             
             # Update UI
-            self.root.after(0, lambda: self.update_deps_display("\n".join(deps_status)))
+            self.events.done(job, format_dependency_report(results, bool(self.get_api_key())))
         
+        job = self.start_job(None, self.update_deps_display, self.update_deps_display)
         threading.Thread(target=check, daemon=True).start()
     
     def update_deps_display(self, text):
-        self.deps_text.delete(1.0, tk.END)
-        self.deps_text.insert(tk.END, text)
+        # Until the Settings tab is built the report is only kept for it
+        self.deps_report = text
+        if getattr(self, 'deps_text', None) is not None:
+            self.deps_text.delete(1.0, tk.END)
+            self.deps_text.insert(tk.END, text)
+        
+        self.finish_startup("dependencies shown")
+    
+    def on_root_mapped(self, event):
+        # <Map> on the root also fires for every child widget as it is shown
+        if event.widget is self.root:
+            self.finish_startup("first window")
+    
+    def mark_startup(self, phase):
+        if getattr(self, 'startup_timer', None) is not None:
+            self.startup_timer.mark(phase)
+    
+    def finish_startup(self, phase):
+        """Mark a final startup phase; startup is reported once the window is up and dependencies are shown"""
+        startup_timer = getattr(self, 'startup_timer', None)
+        if startup_timer is None:
+            return
+        startup_timer.mark(phase)
+        phases = [name for name, _ in startup_timer.marks]
+        if "first window" in phases and "dependencies shown" in phases:
+            startup_timer.report()
+            self.startup_timer = None
     
     def generate_machine_key(self):
         """Generate a machine-specific encryption key"""
-        # Use machine-specific info that's consistent but unique
-        import platform
-        machine_info = f"{platform.node()}-{platform.system()}-{os.path.expanduser('~')}"
-        return hashlib.sha256(machine_info.encode()).hexdigest()[:32]
+        return machine_key()
     
     def encrypt_text(self, text):
         """Simple XOR encryption (sufficient for API key storage)"""
-        if not text:
-            return ""
-        
-        key = self.encryption_key
-        encrypted = []
-        
-        for i, char in enumerate(text):
-            key_char = key[i % len(key)]
-            encrypted_char = chr(ord(char) ^ ord(key_char))
-            encrypted.append(encrypted_char)
-        
-        # Base64 encode to make it safe for storage
-        encrypted_string = ''.join(encrypted)
-        return base64.b64encode(encrypted_string.encode()).decode()
+        return encrypt_text(text, self.encryption_key)
     
     def decrypt_text(self, encrypted_text):
         """Decrypt XOR encrypted text"""
-        if not encrypted_text:
-            return ""
-        
-        try:
-            # Base64 decode
-            encrypted_string = base64.b64decode(encrypted_text).decode()
-            
-            key = self.encryption_key
-            decrypted = []
-            
-            for i, char in enumerate(encrypted_string):
-                key_char = key[i % len(key)]
-                decrypted_char = chr(ord(char) ^ ord(key_char))
-                decrypted.append(decrypted_char)
-            
-            return ''.join(decrypted)
-        except:
-            return ""
+        return decrypt_text(encrypted_text, self.encryption_key)
     
     def save_encrypted_api_key(self, api_key):
-        """Save encrypted API key to a local file"""
+        """Save the encrypted API key in the settings store"""
         if not api_key:
             return
-        
-        encrypted_key = self.encrypt_text(api_key)
-        config_file = os.path.join(self.output_dir, '.yap_config')
-        
-        try:
-            with open(config_file, 'w') as f:
-                f.write(encrypted_key)
-        except:
-            pass
+        self.settings.update(encrypted_api_key=self.encrypt_text(api_key))
     
     def load_encrypted_api_key(self):
-        """Load and decrypt API key from local file"""
-        config_file = os.path.join(self.output_dir, '.yap_config')
-        
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as f:
-                    encrypted_key = f.read().strip()
-                
-                decrypted_key = self.decrypt_text(encrypted_key)
-                if decrypted_key:
-                    self.openrouter_api_key.set(decrypted_key)
-                    os.environ['OPENROUTER_API_KEY'] = decrypted_key
-            except:
-                pass
+        """Load and decrypt the API key from the settings snapshot"""
+        decrypted_key = self.decrypt_text(self.settings.get('encrypted_api_key'))
+        if decrypted_key:
+            self.openrouter_api_key.set(decrypted_key)
+            os.environ['OPENROUTER_API_KEY'] = decrypted_key
     
     def save_language_preferences(self):
-        """Save language preferences to local file"""
-        # Don't save if we're currently loading preferences
-        if hasattr(self, '_loading_preferences') and self._loading_preferences:
-            return
-            
-        try:
-            prefs_file = os.path.join(self.output_dir, '.yap_language_prefs')
-            prefs = {
-                'text_source_lang': self.text_source_lang.get(),
-                'text_target_lang': self.text_target_lang.get(),
-                'youtube_target_lang': self.yt_target_lang.get(),
-                'local_target_lang': self.local_target_lang.get()
-            }
-            
-            with open(prefs_file, 'w') as f:
-                json.dump(prefs, f)
-        except Exception as e:
-            print(f"Failed to save language preferences: {e}", file=sys.stderr)
-    
-    def load_language_preferences(self):
-        """Load language preferences from local file"""
-        try:
-            prefs_file = os.path.join(self.output_dir, '.yap_language_prefs')
-            if os.path.exists(prefs_file):
-                with open(prefs_file, 'r') as f:
-                    prefs = json.load(f)
-                    
-                    # Temporarily disable automatic saving
-                    self._loading_preferences = True
-                    
-                    # Set text translation preferences
-                    if 'text_source_lang' in prefs:
-                        self.text_source_lang.set(prefs['text_source_lang'])
-                    if 'text_target_lang' in prefs:
-                        self.text_target_lang.set(prefs['text_target_lang'])
-                    
-                    # Set YouTube translation preferences
-                    if 'youtube_target_lang' in prefs:
-                        self.yt_target_lang.set(prefs['youtube_target_lang'])
-                    
-                    # Set local video translation preferences
-                    if 'local_target_lang' in prefs:
-                        self.local_target_lang.set(prefs['local_target_lang'])
-                    
-                    # Re-enable automatic saving
-                    self._loading_preferences = False
-                        
-        except Exception as e:
-            print(f"Failed to load language preferences: {e}", file=sys.stderr)
-            self._loading_preferences = False
+        """Remember the selected languages; the settings store saves them in the background"""
+        self.settings.update(
+            text_source_lang=self.text_source_lang.get(),
+            text_target_lang=self.text_target_lang.get(),
+            youtube_target_lang=self.yt_target_lang.get(),
+            local_target_lang=self.local_target_lang.get()
+        )
     
     def paste_url(self):
         try:
@@ -956,20 +1051,27 @@ class YapGUI:
             title="Select Text File",
             filetypes=[
                 ("Text files", "*.txt"),
+                ("Transcripts", f"*{TRANSCRIPT_EXTENSION}"),
                 ("All files", "*.*")
             ]
         )
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.text_input.delete(1.0, tk.END)
-                    self.text_input.insert(1.0, content)
-                    self.text_status_var.set(f"Imported: {os.path.basename(file_path)}")
+                content = self.read_text_file(file_path)
+                self.text_input.delete(1.0, tk.END)
+                self.text_input.insert(1.0, content)
+                self.text_status_var.set(f"Imported: {os.path.basename(file_path)}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to import file: {str(e)}")
     
+    def read_text_file(self, file_path):
+        if file_path.endswith(TRANSCRIPT_EXTENSION):
+            with open_transcript(file_path) as transcript:
+                return '\n\n'.join(transcript.iter_paragraphs())
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.read()
+    
     def clear_text_input(self):
         """Clear the text input area"""
         self.text_input.delete(1.0, tk.END)
@@ -977,8 +1079,8 @@ class YapGUI:
     
     def clear_text_output(self):
         """Clear the text output areas"""
-        self.text_normal_output.delete(1.0, tk.END)
-        self.text_enhanced_output.delete(1.0, tk.END)
+        self.clear_output('text_normal_output')
+        self.clear_output('text_enhanced_output')
         self.text_status_var.set("Output cleared")
     
     def translate_input_text(self):
@@ -996,127 +1098,86 @@ class YapGUI:
         
         # Disable translate button during processing
         self.text_translate_button.config(state='disabled')
+        self.text_cancel_button.config(state='normal')
         self.text_status_var.set("Translating...")
         
-        # Run translation in a separate thread
-        def translate_thread():
-            try:
-                # Generate normal translation (without title/emojis)
-                if use_apple:
-                    # Use Apple Live Translation for normal translation
-                    normal_result = self.translate_with_apple_live_translation(text, source_lang, target_lang)
-                    if normal_result.startswith("⚠️"):
-                        normal_result = self.translate_with_local_tool_fallback(text, source_lang, target_lang)
-                else:
-                    # For AI-only, use the same translation method but without enhancement
-                    normal_result = self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
-                    # Remove title and formatting for normal translation
-                    if not normal_result.startswith("⚠️"):
-                        lines = normal_result.split('\n')
-                        if len(lines) > 2:
-                            # Skip the title (first line) and return only the content
-                            normal_result = '\n'.join(lines[2:]).strip()
-                
-                # Generate enhanced translation (with title and emojis)
-                if enhance_paragraphs:
-                    enhanced_result = self.translate_locally_then_enhance(text, source_lang, target_lang)
-                else:
-                    enhanced_result = self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
-                
-                # Update UI in main thread
-                self.root.after(0, lambda: self.on_text_translation_complete(normal_result, enhanced_result))
-                
-            except Exception as e:
-                error_msg = f"Translation error: {str(e)}"
-                self.root.after(0, lambda: self.on_text_translation_error(error_msg))
-        
-        threading.Thread(target=translate_thread, daemon=True).start()
+        # Run translation in a pipeline worker process
+        config = self.job_settings()
+        config.update({
+            'text': text,
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'use_apple': use_apple,
+            'enhance_paragraphs': enhance_paragraphs
+        })
+        job = self.start_job(self.text_status_var, self.on_text_translation_complete,
+                             self.on_text_translation_error)
+        self.tab_jobs['text'] = job
+        self.worker.submit(job, 'translate_text_versions', config, fallback=self.get_pipeline())
     
     def on_text_translation_complete(self, normal_result, enhanced_result):
         """Handle completion of text translation"""
         # Update normal translation output
-        self.text_normal_output.delete(1.0, tk.END)
-        self.text_normal_output.insert(1.0, normal_result)
+        self.clear_output('text_normal_output')
+        self.show_output('text_normal_output', normal_result)
         
         # Update enhanced translation output
-        self.text_enhanced_output.delete(1.0, tk.END)
-        self.text_enhanced_output.insert(1.0, enhanced_result)
+        self.clear_output('text_enhanced_output')
+        self.show_output('text_enhanced_output', enhanced_result)
         
         self.text_translate_button.config(state='normal')
+        self.text_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('text', None)
         self.text_status_var.set("Translation completed - Both versions ready")
+        self.run_pending_inputs()
     
     def on_text_translation_error(self, error_msg):
         """Handle text translation error"""
-        self.text_normal_output.delete(1.0, tk.END)
-        self.text_normal_output.insert(1.0, error_msg)
-        self.text_enhanced_output.delete(1.0, tk.END)
-        self.text_enhanced_output.insert(1.0, error_msg)
+        self.clear_output('text_normal_output')
+        self.show_output('text_normal_output', error_msg)
+        self.clear_output('text_enhanced_output')
+        self.show_output('text_enhanced_output', error_msg)
         self.text_translate_button.config(state='normal')
+        self.text_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('text', None)
         self.text_status_var.set("Translation failed")
+        self.run_pending_inputs()
+    
+    def cancel_text_translation(self):
+        """Stop the running text translation"""
+        if not self.cancel_tab_job('text'):
+            return
+        self.text_translate_button.config(state='normal')
+        self.text_cancel_button.config(state='disabled')
+        self.text_status_var.set("Translation cancelled")
+        self.run_pending_inputs()
+    
+    def cancel_tab_job(self, tab):
+        """Cancel a tab's running job; its handlers are dropped so late events are ignored"""
+        job = self.tab_jobs.pop(tab, None)
+        if job is None or self.job_handlers.pop(job, None) is None:
+            return False
+        # Stops the job's tools and frees its worker for the next queued job
+        self.worker.cancel(job)
+        return True
     
     def get_apple_language_list(self):
         """Get list of Apple Live Translation supported languages"""
-        return [
-            "en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh", "zh-TW", "ru", "ar",
-            "nl", "pl", "tr", "th", "vi", "hi", "id", "ms", "sv", "da", "no", "fi",
-            "cs", "sk", "hu", "ro", "bg", "hr", "sl", "et", "lv", "lt", "el", "he",
-            "fa", "ur", "bn", "ta", "te", "mr", "gu", "kn", "ml", "pa", "si", "my",
-            "km", "lo", "ka", "am", "sw", "zu", "af", "is", "mt", "cy", "ga", "eu",
-            "ca", "gl", "sq", "mk", "sr", "bs", "me", "mn", "ky", "uz", "kk", "tg",
-            "tk", "az", "hy", "ne", "dz", "bo", "ug", "ps", "sd", "ks"
-        ]
+        return list(APPLE_LANGUAGES)
     
     def get_language_name(self, code):
         """Get language name from code"""
-        lang_names = {
-            "en": "English", "es": "Spanish", "fr": "French", "de": "German", "it": "Italian",
-            "pt": "Portuguese", "ja": "Japanese", "ko": "Korean", "zh": "Chinese (Simplified)",
-            "zh-TW": "Chinese (Traditional)", "ru": "Russian", "ar": "Arabic", "nl": "Dutch",
-            "pl": "Polish", "tr": "Turkish", "th": "Thai", "vi": "Vietnamese", "hi": "Hindi",
-            "id": "Indonesian", "ms": "Malay", "sv": "Swedish", "da": "Danish", "no": "Norwegian",
-            "fi": "Finnish", "cs": "Czech", "sk": "Slovak", "hu": "Hungarian", "ro": "Romanian",
-            "bg": "Bulgarian", "hr": "Croatian", "sl": "Slovenian", "et": "Estonian", "lv": "Latvian",
-            "lt": "Lithuanian", "el": "Greek", "he": "Hebrew", "fa": "Persian", "ur": "Urdu",
-            "bn": "Bengali", "ta": "Tamil", "te": "Telugu", "mr": "Marathi", "gu": "Gujarati",
-            "kn": "Kannada", "ml": "Malayalam", "pa": "Punjabi", "si": "Sinhala", "my": "Burmese",
-            "km": "Khmer", "lo": "Lao", "ka": "Georgian", "am": "Amharic", "sw": "Swahili",
-            "zu": "Zulu", "af": "Afrikaans", "is": "Icelandic", "mt": "Maltese", "cy": "Welsh",
-            "ga": "Irish", "eu": "Basque", "ca": "Catalan", "gl": "Galician", "sq": "Albanian",
-            "mk": "Macedonian", "sr": "Serbian", "bs": "Bosnian", "me": "Montenegrin",
-            "mn": "Mongolian", "ky": "Kyrgyz", "uz": "Uzbek", "kk": "Kazakh", "tg": "Tajik",
-            "tk": "Turkmen", "az": "Azerbaijani", "hy": "Armenian", "ne": "Nepali", "dz": "Dzongkha",
-            "bo": "Tibetan", "ug": "Uyghur", "ps": "Pashto", "sd": "Sindhi", "ks": "Kashmiri"
-        }
-        return lang_names.get(code, code)
+        return get_language_name(code)
     
     def get_apple_lang_code(self, code):
         """Get Apple language code from short code"""
-        apple_codes = {
-            "en": "en-US", "es": "es-ES", "fr": "fr-FR", "de": "de-DE", "it": "it-IT",
-            "pt": "pt-PT", "ja": "ja-JP", "ko": "ko-KR", "zh": "zh-CN", "zh-TW": "zh-TW",
-            "ru": "ru-RU", "ar": "ar-SA", "nl": "nl-NL", "pl": "pl-PL", "tr": "tr-TR",
-            "th": "th-TH", "vi": "vi-VN", "hi": "hi-IN", "id": "id-ID", "ms": "ms-MY",
-            "sv": "sv-SE", "da": "da-DK", "no": "no-NO", "fi": "fi-FI", "cs": "cs-CZ",
-            "sk": "sk-SK", "hu": "hu-HU", "ro": "ro-RO", "bg": "bg-BG", "hr": "hr-HR",
-            "sl": "sl-SI", "et": "et-EE", "lv": "lv-LV", "lt": "lt-LT", "el": "el-GR",
-            "he": "he-IL", "fa": "fa-IR", "ur": "ur-PK", "bn": "bn-BD", "ta": "ta-IN",
-            "te": "te-IN", "mr": "mr-IN", "gu": "gu-IN", "kn": "kn-IN", "ml": "ml-IN",
-            "pa": "pa-IN", "si": "si-LK", "my": "my-MM", "km": "km-KH", "lo": "lo-LA",
-            "ka": "ka-GE", "am": "am-ET", "sw": "sw-TZ", "zu": "zu-ZA", "af": "af-ZA",
-            "is": "is-IS", "mt": "mt-MT", "cy": "cy-GB", "ga": "ga-IE", "eu": "eu-ES",
-            "ca": "ca-ES", "gl": "gl-ES", "sq": "sq-AL", "mk": "mk-MK", "sr": "sr-RS",
-            "bs": "bs-BA", "me": "me-ME", "mn": "mn-MN", "ky": "ky-KG", "uz": "uz-UZ",
-            "kk": "kk-KZ", "tg": "tg-TJ", "tk": "tk-TM", "az": "az-AZ", "hy": "hy-AM",
-            "ne": "ne-NP", "dz": "dz-BT", "bo": "bo-CN", "ug": "ug-CN", "ps": "ps-AF",
-            "sd": "sd-PK", "ks": "ks-IN"
-        }
-        return apple_codes.get(code, code)
+        return get_apple_lang_code(code)
     
-    def save_text_file(self, text_widget):
-        """Save text widget content to file"""
-        content = text_widget.get(1.0, tk.END).strip()
+    def save_text_file(self, output):
+        """Save the content of an output to file"""
+        document = self.get_output_document(output)
         
-        if not content:
+        if not document.text:
             messagebox.showwarning("Warning", "No content to save")
             return
         
@@ -1131,17 +1192,16 @@ class YapGUI:
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(content)
+                write_text_atomic(file_path, document.text)
                 messagebox.showinfo("Success", f"Translation saved to:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {str(e)}")
     
-    def create_org_file(self, text_widget):
-        """Create an Org mode file from text widget content"""
-        content = text_widget.get(1.0, tk.END).strip()
+    def create_org_file(self, output):
+        """Create an Org mode file from the content of an output"""
+        document = self.get_output_document(output)
         
-        if not content:
+        if not document.text:
             messagebox.showwarning("Warning", "No content to convert to Org file")
             return
         
@@ -1156,47 +1216,26 @@ class YapGUI:
         
         if file_path:
             try:
-                # Convert content to Org mode format
-                org_content = self.convert_to_org_format(content)
-                
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(org_content)
+                # Stream the content to the Org file line by line
+                with atomic_write(file_path) as file:
+                    self.write_org_format(document.text, file)
                 messagebox.showinfo("Success", f"Org file created at:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to create Org file: {str(e)}")
     
     def convert_to_org_format(self, content):
         """Convert plain text content to Org mode format"""
-        lines = content.split('\n')
-        org_lines = []
-        
-        # Add header
-        org_lines.append("#+TITLE: Translation")
-        org_lines.append(f"#+DATE: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        org_lines.append("")
-        
-        # Process content
-        for line in lines:
-            line = line.strip()
-            if not line:
-                org_lines.append("")
-                continue
-            
-            # Check if line looks like a title (starts with emoji or is short)
-            if (line.startswith(('🌟', '✨', '🎯', '📝', '🌍', '🔍', '✅', '⚠️', '🚀', '📋', '💾', '📝')) or 
-                len(line) < 100 and line.endswith((':', '!', '?'))):
-                # Convert to Org heading
-                org_lines.append(f"* {line}")
-            elif line.startswith('=') and line.endswith('='):
-                # This is already a separator line, convert to Org separator
-                org_lines.append("")
-                org_lines.append("---")
-                org_lines.append("")
-            else:
-                # Regular paragraph
-                org_lines.append(line)
-        
-        return '\n'.join(org_lines)
+        output = io.StringIO()
+        self.write_org_format(content, output)
+        return output.getvalue().rstrip('\n')
+    
+    def write_org_format(self, content, out):
+        """Write plain text content to a file object in Org mode format"""
+        exporter = OrgExporter(out, title="Translation")
+        exporter.begin()
+        for line in content.split('\n'):
+            exporter.line(line)
+        exporter.end()
     
     def browse_video_file(self):
         file_types = [
@@ -1212,6 +1251,87 @@ class YapGUI:
         if filename:
             self.local_file_var.set(filename)
     
+    def browse_watch_folder(self):
+        directory = filedialog.askdirectory(
+            title="Select a folder to watch for new recordings",
+            initialdir=self.watch_folder_var.get() or os.path.expanduser("~")
+        )
+        
+        if directory:
+            self.watch_folder_var.set(directory)
+    
+    def toggle_watch_folder(self):
+        """Start or stop transcribing the media files that appear in the watch folder"""
+        if self.folder_watcher is not None:
+            self.stop_watch_folder()
+            return
+        
+        directory = self.watch_folder_var.get().strip()
+        if not os.path.isdir(directory):
+            messagebox.showerror("Error", "Please select an existing folder to watch")
+            return
+        self.settings.update(watch_folder=directory)
+        
+        # One job per worker process at a time; the rest wait in the watch queue
+        done = DoneSet(os.path.join(self.output_dir, WATCH_DONE_FILE))
+        self.watch_ingest = WatchIngest(done, self.submit_watched_file, self.worker.process_count)
+        self.watch_counts = {'done': 0, 'failed': 0}
+        self.folder_watcher = FolderWatcher(directory)
+        
+        # The watcher thread reports ready files as partial results of the watch job
+        self.watch_job = job = self.start_job(None, None, None, on_partial=self.on_watched_file)
+        threading.Thread(target=self.folder_watcher.run,
+                         args=(lambda path: self.events.partial(job, path, path),), daemon=True).start()
+        self.watch_button.config(text="⏹ Stop Watching")
+        self.update_watch_status()
+    
+    def stop_watch_folder(self):
+        """Stop watching; running watch jobs are cancelled and picked up again next time"""
+        self.folder_watcher.stop()
+        self.folder_watcher = None
+        self.job_handlers.pop(self.watch_job, None)
+        for job in self.watch_ingest.abandon():
+            self.job_handlers.pop(job, None)
+            self.worker.cancel(job)
+        self.watch_button.config(text="▶ Start Watching")
+        self.watch_status_var.set(f"Stopped; {self.watch_counts['done']} transcribed, "
+                                  f"{self.watch_counts['failed']} failed")
+    
+    def on_watched_file(self, key, path):
+        if self.watch_ingest is not None and self.watch_ingest.add(path):
+            self.update_watch_status()
+    
+    def submit_watched_file(self, path):
+        """Start the transcription of a file from the watch folder with the tab's options"""
+        config = self.job_settings()
+        config.update({
+            'file_path': path,
+            'summarize': self.local_summarize_var.get(),
+            'translate': self.local_translate_var.get(),
+            'target_lang': self.local_target_lang.get(),
+            'output_dir': self.output_dir
+        })
+        job = self.start_job(None, lambda results, output_file: self.on_watched_job_end(job, 'done'),
+                             lambda error: self.on_watched_job_end(job, 'failed', error))
+        self.worker.submit(job, 'run_local_transcription', config, fallback=self.get_pipeline())
+        return job
+    
+    def on_watched_job_end(self, job, status, error=None):
+        if self.watch_ingest is None or job not in self.watch_ingest.running:
+            return
+        path = self.watch_ingest.finished(job, status, error)
+        self.watch_counts[status] += 1
+        if error:
+            print(f"Watch folder: {os.path.basename(path)} failed: {error}", file=sys.stderr)
+        self.update_watch_status()
+    
+    def update_watch_status(self):
+        ingest = self.watch_ingest
+        self.watch_status_var.set(
+            f"Watching ({self.folder_watcher.backend}): {len(ingest.running)} running, "
+            f"{len(ingest.queue)} queued, {self.watch_counts['done']} transcribed, "
+            f"{self.watch_counts['failed']} failed")
+    
     def browse_output_dir(self):
         directory = filedialog.askdirectory(
             title="Select output directory",
@@ -1221,9 +1341,31 @@ class YapGUI:
         if directory:
             self.output_dir = directory
             self.output_dir_var.set(directory)
+            self.settings.update(output_dir=directory)
+    
+    def refresh_media_cache_usage(self, evict=False):
+        """Show the media cache usage (after trimming it to its budget if asked), read off the main thread"""
+        cache = MediaCache(self.output_dir, self.settings.get('media_cache_mb'))
+        def measure():
+            try:
+                evicted = cache.evict() if evict else []
+                text = format_usage(cache.usage())
+                if evicted:
+                    text = f"Removed {len(evicted)} file(s). {text}"
+                self.events.done(job, text)
+            except (OSError, ValueError) as e:
+                self.events.error(job, f"Could not read the media cache: {e}")
+        
+        job = self.start_job(None, self.media_cache_usage_var.set, self.media_cache_usage_var.set)
+        threading.Thread(target=measure, daemon=True).start()
+    
+    def clean_media_cache(self):
+        self.media_cache_usage_var.set("Cleaning up...")
+        self.refresh_media_cache_usage(evict=True)
     
     def open_output_dir(self):
         if os.path.exists(self.output_dir):
+            import subprocess
             subprocess.run(['open', self.output_dir])
         else:
             messagebox.showerror("Error", f"Output directory does not exist: {self.output_dir}")
@@ -1257,7 +1399,7 @@ class YapGUI:
 
 ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
 
-# To use: Copy the .yap_config file from your output directory
+# To use: Copy settings.json from {os.path.dirname(self.settings.path)}
 # Machine info hash: {self.encryption_key[:8]}...
 """
         
@@ -1274,14 +1416,14 @@ ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
             messagebox.showinfo("Export Complete", 
                                f"Encrypted key info copied to clipboard and saved to:\n{export_file}\n\n" +
                                "🔒 This encrypted data is safe to share on GitHub!\n" +
-                               "📁 Also copy .yap_config file from output directory")
+                               f"📁 Also copy {self.settings.path}")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to save export file: {e}")
     
-    def copy_to_clipboard(self, text_widget):
-        """Copy content from text widget to clipboard"""
+    def copy_to_clipboard(self, output):
+        """Copy the content of an output to clipboard"""
         try:
-            content = text_widget.get(1.0, tk.END).strip()
+            content = self.get_output_document(output).text
             if content:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(content)
@@ -1292,11 +1434,11 @@ ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
         except Exception as e:
             messagebox.showerror("Error", f"Failed to copy: {e}")
     
-    def save_srt_file(self, text_widget):
+    def save_srt_file(self, output):
         """Save SRT content to file"""
         try:
-            content = text_widget.get(1.0, tk.END).strip()
-            if not content or content == "No content available for SRT generation":
+            document = self.get_output_document(output)
+            if not document.text or document.text.startswith("No content available"):
                 messagebox.showwarning("Warning", "No SRT content to save")
                 return
             
@@ -1308,8 +1450,7 @@ ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_text_atomic(filename, document.text)
                 messagebox.showinfo("Success", f"SRT file saved to {filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save SRT file: {e}")
@@ -1325,57 +1466,45 @@ ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
             messagebox.showerror("Error", "Please enter a valid URL from YouTube, Facebook, or Vimeo")
             return
         
+        try:
+            sections = self.section_settings(self.yt_range_start_var, self.yt_range_end_var, self.yt_preview_var)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid time range: {e}")
+            return
+        
         self.yt_download_button.config(state='disabled')
+        self.yt_cancel_button.config(state='normal')
         self.yt_progress.start()
         self.yt_status_var.set("Starting download...")
         # Clear all online video output tabs
-        self.yt_original_text.delete(1.0, tk.END)
-        self.yt_translation_text.delete(1.0, tk.END)
-        self.yt_orig_srt_text.delete(1.0, tk.END)
-        self.yt_trans_srt_text.delete(1.0, tk.END)
-        self.yt_summary_text.delete(1.0, tk.END)
-        
-        thread = threading.Thread(target=self.run_online_video_transcription, args=(url,))
-        thread.daemon = True
-        thread.start()
-    
-    def get_platform_from_url(self, url):
-        """Detect the platform from the URL"""
-        url_lower = url.lower()
-        if any(domain in url_lower for domain in ['youtube.com', 'youtu.be']):
-            return 'YouTube'
-        elif any(domain in url_lower for domain in ['facebook.com', 'fb.com']):
-            return 'Facebook'
-        elif any(domain in url_lower for domain in ['vimeo.com']):
-            return 'Vimeo'
-        else:
-            return 'Unknown'
+        self.clear_output('yt_original_text')
+        self.clear_output('yt_translation_text')
+        self.clear_output('yt_orig_srt_text')
+        self.clear_output('yt_trans_srt_text')
+        self.clear_output('yt_summary_text')
+        
+        # Snapshot the job configuration on the main thread
+        config = self.job_settings()
+        config.update({
+            'url': url,
+            'summarize': self.yt_summarize_var.get(),
+            'translate': self.yt_translate_var.get(),
+            'target_lang': self.yt_target_lang.get(),
+            'keep_audio': self.yt_keep_audio_var.get(),
+            'output_dir': self.output_dir,
+            **sections
+        })
+        if self.video_metadata.get(url):
+            config['metadata'] = self.video_metadata[url]
+        job = self.start_job(self.yt_status_var, self.on_online_video_success, self.on_online_video_error,
+                             on_partial=self.on_online_video_preview)
+        self.tab_jobs['yt'] = job
+        self.worker.submit(job, 'run_online_video_transcription', config, fallback=self.get_pipeline())
     
     def create_safe_filename(self, title, max_length=100):
         """Create a safe filename from video title"""
-        import re
-        
-        # Remove or replace problematic characters
-        safe_title = re.sub(r'[<>:"/\\|?*]', '', title)
-        
-        # Replace multiple spaces with single space
-        safe_title = re.sub(r'\s+', ' ', safe_title)
-        
-        # Remove leading/trailing spaces
-        safe_title = safe_title.strip()
-        
-        # Truncate if too long (leave room for extension)
-        if len(safe_title) > max_length:
-            safe_title = safe_title[:max_length].strip()
-            # Try to break at a word boundary
-            if ' ' in safe_title:
-                safe_title = safe_title.rsplit(' ', 1)[0]
-        
-        # If still empty or too short, use a default name
-        if not safe_title or len(safe_title) < 3:
-            safe_title = "video"
-        
-        return safe_title
+        from video_metadata import safe_filename
+        return safe_filename(title, max_length)
     
     def is_valid_video_url(self, url):
         parsed = urlparse(url)
@@ -1390,716 +1519,116 @@ ENCRYPTED_OPENROUTER_KEY = "{encrypted_key}"
         return (parsed.netloc in youtube_domains + facebook_domains + vimeo_domains or
                 any(domain in url for domain in ['youtube.com', 'youtu.be', 'facebook.com', 'fb.com', 'vimeo.com']))
     
-    def run_online_video_transcription(self, url):
-        try:
-            summarize = self.yt_summarize_var.get()
-            keep_audio = self.yt_keep_audio_var.get()
-            platform = self.get_platform_from_url(url)
-            
-            # Step 1: Download and transcribe with separate commands for cleaner output
-            self.root.after(0, lambda: self.yt_status_var.set(f"Downloading {platform} video and extracting audio..."))
-            
-            # First, download the audio with a safer filename approach
-            # Use only video ID to avoid "filename too long" errors
-            download_cmd = ['yt-dlp', url, '-x', '--audio-format', 'wav', 
-                           '--output', f'{self.output_dir}/%(id)s.%(ext)s']
-            
-            download_result = subprocess.run(download_cmd, capture_output=True, text=True, timeout=300)
-            
-            if download_result.returncode != 0:
-                self.root.after(0, self.on_online_video_error, f"{platform} download failed: {download_result.stderr}")
-                return
-            
-            # Find the downloaded audio file
-            audio_files = list(Path(self.output_dir).glob("*.wav"))
-            if not audio_files:
-                self.root.after(0, self.on_online_video_error, f"No audio file found after {platform} download")
-                return
-            
-            # Use the most recent audio file
-            audio_file = max(audio_files, key=os.path.getctime)
-            
-            # Step 2: Transcribe the audio
-            self.root.after(0, lambda: self.yt_status_var.set("Transcribing audio..."))
-            
-            yap_cmd = ['yap', str(audio_file)]
-            output_file = audio_file.with_suffix('.txt')
-            yap_cmd.extend(['-o', str(output_file)])
-            
-            yap_result = subprocess.run(yap_cmd, capture_output=True, text=True, timeout=300)
-            
-            if yap_result.returncode != 0:
-                self.root.after(0, self.on_online_video_error, f"{platform} transcription failed: {yap_result.stderr}")
-                return
-            
-            # Read the clean transcription from the output file
-            try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    transcription_text = f.read().strip()
-            except:
-                transcription_text = yap_result.stdout.strip()
-            
-            # Clean up audio file if not keeping it
-            if not keep_audio:
-                try:
-                    os.unlink(audio_file)
-                except:
-                    pass
-            
-            # Format transcription into paragraphs
-            formatted_transcription = self.format_text_in_paragraphs(transcription_text)
-            
-            # Prepare results dictionary
-            results = {
-                'original': formatted_transcription,
-                'original_srt': self.create_srt_from_text(formatted_transcription)
-            }
-            
-            # Generate translation if requested
-            if self.yt_translate_var.get() and transcription_text:
-                self.root.after(0, lambda: self.yt_status_var.set("Translating text..."))
-                target_lang = self.yt_target_lang.get()
-                # For online videos, assume source language is English (most common)
-                source_lang = "en"
-                translation = self.translate_text(formatted_transcription, source_lang, target_lang)
-                results['translation'] = translation
-                results['translated_srt'] = self.create_srt_from_text(translation, is_translation=True)
-            
-            # Generate summary if requested  
-            if summarize and transcription_text:
-                self.root.after(0, lambda: self.yt_status_var.set("Generating title and summary..."))
-                title, summary = self.generate_title_and_summary(transcription_text)
-                results['summary'] = f"{title}\n{summary}"
-            
-            self.root.after(0, self.on_online_video_success, results)
-            
-        except subprocess.TimeoutExpired:
-            self.root.after(0, self.on_online_video_error, f"{platform} operation timed out")
-        except Exception as e:
-            self.root.after(0, self.on_online_video_error, f"{platform} error: {str(e)}")
-    
-    def find_latest_transcription(self, format_type):
-        """Find the most recent transcription file in output directory"""
-        try:
-            pattern = "*.srt" if format_type == "srt" else "*.txt"
-            files = list(Path(self.output_dir).glob(pattern))
-            if files:
-                latest_file = max(files, key=os.path.getctime)
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            pass
-        return "Transcription completed. Check output directory for files."
+    def receive_launch(self, items):
+        """Queue the items of a later launch (none: just show the window); called on the server thread"""
+        job = self.start_job(None, self.queue_launch_items, None)
+        self.events.done(job, items)
+        return len(items)
     
-    def format_text_in_paragraphs(self, text):
-        """Format text into readable paragraphs"""
-        if not text or len(text.strip()) < 50:
-            return text
-        
-        # Split by sentences and group into paragraphs
-        sentences = text.replace('!', '.').replace('?', '.').split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        paragraphs = []
-        current_paragraph = []
-        sentence_count = 0
-        
-        for sentence in sentences:
-            current_paragraph.append(sentence)
-            sentence_count += 1
-            
-            # Create new paragraph every 3-4 sentences or if sentence is long
-            if sentence_count >= 3 or len(sentence) > 100:
-                if current_paragraph:
-                    paragraphs.append('. '.join(current_paragraph) + '.')
-                    current_paragraph = []
-                    sentence_count = 0
-        
-        # Add remaining sentences
-        if current_paragraph:
-            paragraphs.append('. '.join(current_paragraph) + '.')
-        
-        return '\n\n'.join(paragraphs)
+    def queue_launch_items(self, items):
+        self.pending_inputs.extend(tuple(item) for item in items)
+        
+        # Bring the window to the front for the new work
+        self.root.deiconify()
+        self.root.lift()
+        
+        # Several queued URLs are looked up together first, so that they start shortest first;
+        # until then only the other items start
+        queued = [value for kind, value in self.pending_inputs if kind == 'url']
+        urls = [url for url in queued if url not in self.video_metadata]
+        if urls and len(queued) > 1:
+            self.video_metadata.update(dict.fromkeys(urls))
+            self.metadata_lookups += 1
+            job = self.start_job(None, self.on_metadata_prefetched,
+                                 lambda error: self.on_metadata_prefetched({}))
+            self.worker.submit(job, 'prefetch_metadata', dict(self.job_settings(), urls=urls),
+                               fallback=self.get_pipeline())
+        self.run_pending_inputs()
     
-    def create_srt_from_text(self, text, is_translation=False):
-        """Convert text to SRT subtitle format"""
-        if not text or text.startswith("⚠️"):
-            return "No content available for SRT generation"
-        
-        # Clean text and split into sentences
-        clean_text = text
-        if is_translation and "TITLE:" in text:
-            # Extract just the translation part
-            lines = text.split('\n')
-            translation_lines = []
-            found_translation = False
-            for line in lines:
-                if line.startswith("TRANSLATION:"):
-                    found_translation = True
-                elif found_translation and line.strip() and not line.startswith("="):
-                    translation_lines.append(line.strip())
-            clean_text = ' '.join(translation_lines) if translation_lines else text
-        
-        # Split into sentences for SRT timing
-        sentences = []
-        for delimiter in ['. ', '! ', '? ']:
-            clean_text = clean_text.replace(delimiter, delimiter + '|SPLIT|')
-        
-        raw_sentences = clean_text.split('|SPLIT|')
-        for sentence in raw_sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10:  # Only include substantial sentences
-                sentences.append(sentence)
-        
-        if not sentences:
-            return "No suitable content for SRT generation"
-        
-        # Generate SRT format
-        srt_content = ""
-        duration_per_subtitle = 4  # 4 seconds per subtitle
-        
-        for i, sentence in enumerate(sentences):
-            start_time = i * duration_per_subtitle
-            end_time = (i + 1) * duration_per_subtitle
-            
-            # Format time as SRT timestamp (HH:MM:SS,mmm)
-            def format_time(seconds):
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                secs = seconds % 60
-                return f"{hours:02d}:{minutes:02d}:{secs:02d},000"
-            
-            start_srt = format_time(start_time)
-            end_srt = format_time(end_time)
-            
-            # Add subtitle entry
-            srt_content += f"{i+1}\n{start_srt} --> {end_srt}\n{sentence.strip()}\n\n"
-        
-        return srt_content.strip()
+    def on_metadata_prefetched(self, infos):
+        """Order the queued URLs shortest video first, now that their lengths are known"""
+        from video_metadata import shortest_first
+        
+        self.metadata_lookups = max(0, self.metadata_lookups - 1)
+        self.video_metadata.update(infos)
+        urls = iter(shortest_first([item for item in self.pending_inputs if item[0] == 'url'],
+                                   self.video_metadata, key=lambda item: item[1]))
+        self.pending_inputs = deque(next(urls) if item[0] == 'url' else item for item in self.pending_inputs)
+        self.run_pending_inputs()
     
-    def generate_title_and_summary(self, text):
-        """Generate title with emojis and article-style summary using OpenRouter API"""
-        try:
-            api_key = os.environ.get('OPENROUTER_API_KEY') or self.openrouter_api_key.get().strip()
-            
-            if not api_key:
-                return "⚠️ OpenRouter API key required for AI summaries.\n\nPlease enter your API key in Settings tab."
-            
-            model = self.translation_model.get()
-            
-            # Generate article-style summary with title and content
-            article_payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": """You are an expert content writer specializing in creating engaging article summaries. Create a concise article (maximum 200 words) with:
-
-1. Create a catchy, relevant title with 2-3 emojis based on the transcript content
-2. Write a concise summary in 2-3 clear paragraphs:
-   - Focus on the main points and key information
-   - Use engaging, natural prose
-   - Keep the total word count to a maximum of 200 words
-   - Make the content informative and easy to read
-   - Preserve important details and technical terms
-3. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "SUMMARY:", "ARTICLE:", etc.
-
-Return ONLY the content in this format:
-🌍 Your Actual Title Here 🌎
-
-[First paragraph - main topic or introduction]
-
-[Second paragraph - key points or details]
-
-[Third paragraph - additional information or conclusion if needed]
-
-IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]"""
-                    },
-                    {
-                        "role": "user", 
-                        "content": text
-                    }
-                ],
-                "max_tokens": 600,
-                "temperature": 0.2
-            }
-            
-            result = self.make_openrouter_request(article_payload)
-            
-            if result.startswith("⚠️"):
-                return "⚠️ API Error", result
-            
-            # Parse the result to extract title and summary (no labels expected)
-            lines = result.split('\n')
-            title = ""
-            summary_lines = []
-            
-            # First non-empty line is the title
-            for line in lines:
-                if line.strip():
-                    title = line.strip()
-                    break
-            
-            # All subsequent non-empty lines are the summary content
-            for line in lines[1:]:
-                if line.strip():
-                    summary_lines.append(line.strip())
+    def run_pending_inputs(self):
+        """Start queued launch items whose tab is free; the rest wait for the running job"""
+        tabs = {'url': self.youtube_tab, 'video': self.local_video_tab,
+                'text': self.text_translation_tab, 'text_file': self.text_translation_tab}
+        busy = set()
+        for item in list(self.pending_inputs):
+            kind, value = item
+            tab = tabs.get(kind)
+            if tab is None:
+                self.pending_inputs.remove(item)
+                continue
+            if str(tab) in busy or (kind == 'url' and self.metadata_lookups):
+                continue
             
-            if title and summary_lines:
-                summary_text = '\n\n'.join([line for line in summary_lines if line])
-                return title, summary_text
+            # The tab's widgets are needed to start (and to see) the job
+            self.build_tab(tab)
+            if self.start_launch_item(kind, value):
+                self.pending_inputs.remove(item)
+                self.notebook.select(tab)
             else:
-                # Fallback: just return the result as-is if parsing fails
-                return "Summary", result
-                
-        except Exception as e:
-            return "Summary Error", f"Summary error: {str(e)}"
+                busy.add(str(tab))
     
-    def make_openrouter_request(self, payload):
-        """Make a request to OpenRouter API"""
-        try:
-            api_key = os.environ.get('OPENROUTER_API_KEY') or self.openrouter_api_key.get().strip()
-            
-            import tempfile
-            import json
-            
-            # Write payload to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(payload, f)
-                payload_file = f.name
-            
+    def start_launch_item(self, kind, value):
+        """Start the job for one launch item; returns False while its tab is still busy"""
+        if kind == 'url':
+            if str(self.yt_download_button['state']) == 'disabled':
+                return False
+            self.youtube_url_var.set(value)
+            self.download_and_transcribe()
+        elif kind == 'video':
+            if str(self.local_transcribe_button['state']) == 'disabled':
+                return False
+            self.local_file_var.set(value)
+            self.transcribe_local_video()
+        else:
+            if str(self.text_translate_button['state']) == 'disabled':
+                return False
             try:
-                # Use curl to make the request to OpenRouter
-                curl_cmd = [
-                    'curl', '-s', '-X', 'POST',
-                    'https://openrouter.ai/api/v1/chat/completions',
-                    '-H', f'Authorization: Bearer {api_key}',
-                    '-H', 'Content-Type: application/json',
-                    '-H', 'HTTP-Referer: https://github.com/yap-gui',
-                    '-H', 'X-Title: Yap GUI AI Summary',
-                    '-d', f'@{payload_file}',
-                    '--max-time', '60'
-                ]
-                
-                result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=70)
-                
-                if result.returncode == 0:
-                    response_data = json.loads(result.stdout)
-                    
-                    if 'choices' in response_data and len(response_data['choices']) > 0:
-                        return response_data['choices'][0]['message']['content'].strip()
-                    elif 'error' in response_data:
-                        error_msg = response_data['error'].get('message', 'Unknown API error')
-                        return f"⚠️ OpenRouter API Error: {error_msg}"
-                    else:
-                        return "⚠️ Unexpected API response format"
-                else:
-                    return f"⚠️ API request failed: {result.stderr}"
-                    
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(payload_file)
-                except:
-                    pass
-                    
-        except json.JSONDecodeError as e:
-            return f"⚠️ Invalid API response: {str(e)}"
-        except subprocess.TimeoutExpired:
-            return "⚠️ API request timed out"
-        except Exception as e:
-            return f"⚠️ API error: {str(e)}"
-    
-    def has_good_paragraph_structure(self, text):
-        """Analyze if text already has good paragraph structure"""
-        paragraphs = text.split('\n\n')
-        
-        # Remove empty paragraphs
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        
-        # Check various indicators of good paragraph structure
-        if len(paragraphs) < 2:
-            return False  # Single block of text
-        
-        # Check if paragraphs have reasonable length (not too short or too long)
-        word_counts = [len(p.split()) for p in paragraphs]
-        avg_words = sum(word_counts) / len(word_counts)
-        
-        # Good paragraphs: 10-250 words on average (more flexible)
-        if avg_words < 10 or avg_words > 250:
-            return False
-        
-        # Check for variety in paragraph lengths (more lenient)
-        min_words, max_words = min(word_counts), max(word_counts)
-        variety_ratio = max_words / min_words if min_words > 0 else 1
-        
-        # Check for mixed structure (very short and very long paragraphs)
-        short_paragraphs = sum(1 for count in word_counts if count < 10)  # Reduced threshold
-        long_paragraphs = sum(1 for count in word_counts if count > 40)  # Back to 40 for better detection
-        
-        # If we have both very short and very long paragraphs, it's mixed structure
-        if short_paragraphs > 0 and long_paragraphs > 0:
-            return False
-        
-        # More flexible variety check - allow similar lengths for well-structured content
-        if variety_ratio < 1.1:  # Reduced from 1.3 to 1.1
-            # Additional check: if paragraphs are very similar in length but have good punctuation
-            proper_endings = sum(1 for p in paragraphs if p.rstrip().endswith(('.', '!', '?', ':')))
-            if proper_endings / len(paragraphs) >= 0.8:  # High punctuation quality
+                text = self.read_text_file(value) if kind == 'text_file' else value
+            except Exception as e:
+                self.text_status_var.set(f"Failed to import file: {str(e)}")
                 return True
-            return False
-        
-        # Check if paragraphs end with proper punctuation (more lenient)
-        proper_endings = sum(1 for p in paragraphs if p.rstrip().endswith(('.', '!', '?', ':')))
-        if proper_endings / len(paragraphs) < 0.5:  # Reduced from 0.6 to 0.5
-            return False
-        
+            self.text_input.delete(1.0, tk.END)
+            self.text_input.insert(1.0, text)
+            self.translate_input_text()
         return True
     
-    def translate_locally_then_enhance(self, text, source_lang, target_lang):
-        """Hybrid approach: Preserve good paragraphs or create smart ones with AI"""
-        try:
-            # Step 1: Analyze paragraph structure
-            has_good_paragraphs = self.has_good_paragraph_structure(text)
-            
-            if has_good_paragraphs:
-                # Good structure exists - use local translation + minimal enhancement
-                local_translation = self.translate_with_apple_live_translation(text, source_lang, target_lang)
-                
-                if local_translation.startswith("⚠️"):
-                    # If local translation fails, fallback to full OpenRouter translation
-                    return self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
-                
-                # Use OpenRouter only for title generation and formatting
-                return self.enhance_translation_with_openrouter(local_translation, target_lang)
-            
-            else:
-                # Poor structure - use full OpenRouter for smart paragraph creation
-                print("Poor paragraph structure detected, using AI for smart paragraphs", file=sys.stderr)
-                return self.translate_with_title_and_paragraphs(text, source_lang, target_lang)
-            
-        except Exception as e:
-            return f"⚠️ Translation error: {str(e)}"
-    
-    def translate_with_apple_live_translation(self, text, source_lang, target_lang):
-        """Use Apple's native Live Translation framework"""
+    def find_latest_transcription(self, format_type):
+        """Find the most recent transcription through the job catalog"""
+        from job_store import load_manifest, read_catalog
         try:
-            if not APPLE_TRANSLATION_AVAILABLE:
-                return self.translate_with_local_tool_fallback(text, source_lang, target_lang)
-            
-            # Try to use Apple's Translation framework
-            try:
-                # Import Translation framework classes
-                from Translation import _LTTranslator
-                
-                # Create translator instance
-                translator = _LTTranslator.alloc().init()
-                
-                # Get Apple language codes
-                source_code = self.get_apple_lang_code(source_lang)
-                target_code = self.get_apple_lang_code(target_lang)
-                
-                # Split text by paragraphs to preserve structure
-                paragraphs = text.split('\n\n')
-                translated_chunks = []
-                
-                for paragraph in paragraphs:
-                    if not paragraph.strip():
-                        continue
-                    
-                    # Translate with Apple's framework
-                    translated = translator.translateText_fromLocale_toLocale_(
-                        paragraph.strip(), source_code, target_code)
-                    
-                    if translated:
-                        translated_chunks.append(str(translated))
-                    else:
-                        translated_chunks.append(paragraph.strip())
-                
-                # Combine translated paragraphs
-                full_translation = '\n\n'.join(translated_chunks)
-                return full_translation
+            for entry in read_catalog(self.output_dir, limit=20):
+                if entry.get('status') != 'done':
+                    continue
+                job_dir = os.path.join(self.output_dir, entry['dir'])
+                artifacts = load_manifest(job_dir)['artifacts']
                 
-            except Exception as e:
-                print(f"Apple Translation error: {e}", file=sys.stderr)
-                return self.translate_with_local_tool_fallback(text, source_lang, target_lang)
+                # Prefer compact transcripts, streamed out in the requested format
+                if 'transcript' in artifacts:
+                    with open_transcript(os.path.join(job_dir, artifacts['transcript'])) as transcript:
+                        output = io.StringIO()
+                        export_to(transcript, "srt" if format_type == "srt" else "txt", output)
+                        return output.getvalue()
                 
-        except Exception as e:
-            return f"⚠️ Apple Translation error: {str(e)}"
-    
-    def translate_with_local_tool_fallback(self, text, source_lang, target_lang):
-        """Fallback to translate-shell when Apple Translation is not available"""
-        try:
-            # Check if translate-shell is available
-            try:
-                result = subprocess.run(['/opt/homebrew/bin/trans', '--version'], capture_output=True, text=True, timeout=5)
-                if result.returncode != 0:
-                    return "⚠️ translate-shell not available. Install with: brew install translate-shell"
-            except:
-                return "⚠️ Cannot check translate-shell availability."
-            
-            # Language mapping for translate-shell
-            translate_lang_codes = {
-                "en": "en", "es": "es", "fr": "fr", "de": "de", "it": "it",
-                "pt": "pt", "ja": "ja", "ko": "ko", 
-                "zh": "zh", "ru": "ru", "ar": "ar"
-            }
-            
-            target_code = translate_lang_codes.get(target_lang, target_lang)
-            
-            # Split text by paragraphs to preserve structure
-            paragraphs = text.split('\n\n')
-            max_chunk_size = 4000  # Conservative limit for command line
-            chunks = []
-            
-            for paragraph in paragraphs:
-                paragraph = paragraph.strip()
-                if not paragraph:
-                    continue
-                    
-                # If paragraph is too long, split it by sentences
-                if len(paragraph) > max_chunk_size:
-                    sentences = paragraph.replace('. ', '.\n').split('\n')
-                    current_chunk = []
-                    current_size = 0
-                    
-                    for sentence in sentences:
-                        sentence = sentence.strip()
-                        if not sentence:
-                            continue
-                            
-                        sentence_size = len(sentence) + 1
-                        if current_size + sentence_size > max_chunk_size and current_chunk:
-                            chunks.append(' '.join(current_chunk))
-                            current_chunk = [sentence]
-                            current_size = sentence_size
-                        else:
-                            current_chunk.append(sentence)
-                            current_size += sentence_size
-                    
-                    if current_chunk:
-                        chunks.append(' '.join(current_chunk))
-                else:
-                    chunks.append(paragraph)
-            
-            # Translate each chunk
-            translated_chunks = []
-            for i, chunk in enumerate(chunks):
-                try:
-                    # Use translate-shell command with auto-detection for source language
-                    if target_code == 'en':
-                        # When translating TO English, auto-detect source language
-                        cmd = ['/opt/homebrew/bin/trans', '-b', f':{target_code}']
-                    else:
-                        # When translating FROM English, specify English as source
-                        cmd = ['/opt/homebrew/bin/trans', '-b', f'en:{target_code}']
-                    result = subprocess.run(cmd, input=chunk, capture_output=True, text=True, timeout=30)
-                    
-                    if result.returncode == 0 and result.stdout.strip():
-                        translated_chunks.append(result.stdout.strip())
-                    else:
-                        return f"⚠️ Local translation failed for chunk {i+1}: {result.stderr}"
-                        
-                except subprocess.TimeoutExpired:
-                    return f"⚠️ Translation timeout for chunk {i+1}"
-                except Exception as e:
-                    return f"⚠️ Translation error for chunk {i+1}: {str(e)}"
-            
-            # Combine all translated chunks preserving paragraph structure
-            full_translation = '\n\n'.join(translated_chunks)
-            return full_translation
-            
-        except Exception as e:
-            return f"⚠️ Local translation error: {str(e)}"
+                name = artifacts.get("srt" if format_type == "srt" else "text")
+                if name:
+                    with open(os.path.join(job_dir, name), 'r', encoding='utf-8') as f:
+                        return f.read()
+        except (OSError, ValueError, KeyError):
+            pass
+        return "Transcription completed. Check output directory for files."
     
-    def enhance_translation_with_openrouter(self, translated_text, target_lang):
-        """Use OpenRouter only for title generation and paragraph formatting of already-translated text"""
-        try:
-            api_key = os.environ.get('OPENROUTER_API_KEY') or self.openrouter_api_key.get().strip()
-            
-            if not api_key:
-                # Return the translation without enhancement if no API key
-                return translated_text
-            
-            # Get language name
-            target_lang_name = self.get_language_name(target_lang)
-            model = self.translation_model.get()
-            
-            # Enhanced prompt for creating an article with title, emojis, and prose paragraphs (max 200 words)
-            enhancement_prompt = f"""You are an expert content writer and editor specializing in creating engaging articles. The text below is ALREADY translated to {target_lang_name}.
-
-Your task is to create a concise article (maximum 200 words) with:
-1. Create a catchy, relevant title with 2-3 emojis based on the content (in {target_lang_name})
-2. Write the content in clear, engaging prose with well-structured paragraphs:
-   - Break the content into 2-4 coherent paragraphs
-   - Each paragraph should focus on a specific aspect or theme
-   - Use smooth transitions between paragraphs
-   - Write in a natural, flowing style that's easy to read
-   - Maintain the key information and main points from the original
-3. DO NOT retranslate - only restructure and enhance the existing translation
-4. Keep the total word count to a maximum of 200 words
-5. Preserve important details, names, numbers, and technical terms
-6. Make the content engaging and informative while being concise
-7. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "ARTICLE:", "TRANSLATION:", "SUMMARY:", etc.
 
-Return ONLY the content in this format:
-🌍 Your Actual Title Here 🌎
-
-[First paragraph - introduction or main topic, engaging opening]
-
-[Second paragraph - supporting details or development of ideas]
-
-[Third paragraph - additional points or conclusion if needed]
-
-IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]".
-
-Here is the already-translated text to create an article from:"""
-            
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": enhancement_prompt
-                    },
-                    {
-                        "role": "user", 
-                        "content": translated_text
-                    }
-                ],
-                "max_tokens": 2500,
-                "temperature": 0.3
-            }
-            
-            result = self.make_openrouter_request(payload)
-            
-            # Parse the result to extract title and formatted text
-            if result.startswith("⚠️"):
-                # Return local translation if enhancement fails
-                return translated_text
-            
-            # Extract title and article content (no labels expected)
-            lines = result.split('\n')
-            title = ""
-            article_lines = []
-            
-            # First non-empty line is the title
-            for line in lines:
-                if line.strip():
-                    title = line.strip()
-                    break
-            
-            # All subsequent non-empty lines are the article content
-            for line in lines[1:]:
-                if line.strip():
-                    article_lines.append(line.strip())
-            
-            if title and article_lines:
-                article_text = '\n\n'.join([line for line in article_lines if line])
-                # Return just the title and content without any labels
-                return f"{title}\n\n{article_text}"
-            else:
-                # Fallback: return the local translation without any labels
-                return translated_text
-                
-        except Exception as e:
-            # Return local translation if enhancement fails
-            return translated_text
-
-    def translate_with_title_and_paragraphs(self, text, source_lang, target_lang):
-        """Translate text with title generation and paragraph formatting using OpenRouter API (fallback method)"""
-        try:
-            api_key = os.environ.get('OPENROUTER_API_KEY') or self.openrouter_api_key.get().strip()
-            
-            if not api_key:
-                return f"⚠️ OpenRouter API key required.\n\nPlease enter your API key in Settings tab or set OPENROUTER_API_KEY environment variable.\n\nGet a key at: https://openrouter.ai/keys"
-            
-            # Get language names
-            source_lang_name = self.get_language_name(source_lang)
-            target_lang_name = self.get_language_name(target_lang)
-            model = self.translation_model.get()
-            
-            # Enhanced prompt for creating an article with translation, title, and emojis (max 200 words)
-            enhanced_prompt = f"""You are a professional translator and expert content writer specializing in creating engaging articles. Please:
-
-1. Create a catchy, relevant title with 2-3 emojis based on the content (in {target_lang_name})
-2. Translate the entire text from {source_lang_name} to {target_lang_name} with high accuracy and natural flow
-3. Create a concise article (maximum 200 words) with clear, engaging prose:
-   - Break the content into 2-4 coherent paragraphs
-   - Each paragraph should focus on a specific aspect or theme
-   - Use smooth transitions between paragraphs
-   - Write in a natural, flowing style that's easy to read
-   - Maintain the key information and main points from the original
-4. Keep the total word count to a maximum of 200 words
-5. Preserve important details, names, numbers, and technical terms
-6. Make the content engaging and informative while being concise
-7. DO NOT include any labels, qualifiers, or prefixes like "TITLE:", "ARTICLE:", "TRANSLATION:", "SUMMARY:", etc.
-
-Return ONLY the content in this format:
-🌍 Your Actual Title Here 🌎
-
-[First paragraph - introduction or main topic, engaging opening]
-
-[Second paragraph - supporting details or development of ideas]
-
-[Third paragraph - additional points or conclusion if needed]
-
-IMPORTANT: Replace "Your Actual Title Here" with a real, catchy title related to the content. Do NOT use placeholder text like "[Title with emojis]" or "[Título con emojis]".
-
-Here is the text to translate and create an article from:"""
-            
-            payload = {
-                "model": model,
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": enhanced_prompt
-                    },
-                    {
-                        "role": "user", 
-                        "content": text
-                    }
-                ],
-                "max_tokens": 2500,
-                "temperature": 0.2  # Slightly higher for more creative titles
-            }
-            
-            result = self.make_openrouter_request(payload)
-            
-            # Parse the result to extract title and translation
-            if result.startswith("⚠️"):
-                return result
-            
-            # Extract title and article from formatted response (no labels expected)
-            lines = result.split('\n')
-            title = ""
-            article_lines = []
-            
-            # First non-empty line is the title
-            for line in lines:
-                if line.strip():
-                    title = line.strip()
-                    break
-            
-            # All subsequent non-empty lines are the article content
-            for line in lines[1:]:
-                if line.strip():
-                    article_lines.append(line.strip())
-            
-            if title and article_lines:
-                article_text = '\n\n'.join([line for line in article_lines if line])
-                return f"{title}\n\n{article_text}"
-            else:
-                # Fallback: just return the result as-is if parsing fails
-                return result
-                    
-        except Exception as e:
-            return f"⚠️ Translation error: {str(e)}"
-    
-    def translate_text(self, text, source_lang, target_lang):
-        """Main translation method - uses local macOS translation then OpenRouter for enhancement"""
-        return self.translate_locally_then_enhance(text, source_lang, target_lang)
-    
     def transcribe_local_video(self):
         file_path = self.local_file_var.get().strip()
         
@@ -2107,85 +1636,51 @@ Here is the text to translate and create an article from:"""
             messagebox.showerror("Error", "Please select a valid video file")
             return
         
+        try:
+            sections = self.section_settings(self.local_range_start_var, self.local_range_end_var,
+                                             self.local_preview_var)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid time range: {e}")
+            return
+        
         self.local_transcribe_button.config(state='disabled')
+        self.local_cancel_button.config(state='normal')
         self.local_progress.start()
         self.local_status_var.set("Transcribing video...")
         # Clear all local video output tabs
-        self.local_original_text.delete(1.0, tk.END)
-        self.local_translation_text.delete(1.0, tk.END)
-        self.local_orig_srt_text.delete(1.0, tk.END)
-        self.local_trans_srt_text.delete(1.0, tk.END)
-        self.local_summary_text.delete(1.0, tk.END)
-        
-        thread = threading.Thread(target=self.run_local_transcription, args=(file_path,))
-        thread.daemon = True
-        thread.start()
+        self.clear_output('local_original_text')
+        self.clear_output('local_translation_text')
+        self.clear_output('local_orig_srt_text')
+        self.clear_output('local_trans_srt_text')
+        self.clear_output('local_summary_text')
+        
+        # Snapshot the job configuration on the main thread
+        config = self.job_settings()
+        config.update({
+            'file_path': file_path,
+            'summarize': self.local_summarize_var.get(),
+            'translate': self.local_translate_var.get(),
+            'target_lang': self.local_target_lang.get(),
+            'output_dir': self.output_dir,
+            **sections
+        })
+        job = self.start_job(self.local_status_var, self.on_local_success, self.on_local_error,
+                             on_partial=self.on_local_preview)
+        self.tab_jobs['local'] = job
+        self.worker.submit(job, 'run_local_transcription', config, fallback=self.get_pipeline())
     
-    def run_local_transcription(self, file_path):
-        try:
-            summarize = self.local_summarize_var.get()
-            
-            # Build yap command with output to file for clean results  
-            output_file = os.path.join(self.output_dir, 
-                                     f"{Path(file_path).stem}_transcription.txt")
-            cmd = ['yap', file_path, '-o', output_file]
-            
-            # Run transcription
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-            
-            if result.returncode != 0:
-                # If output file wasn't created, try to get error from stderr
-                error_msg = result.stderr.strip() or result.stdout.strip() or "Unknown transcription error"
-                self.root.after(0, self.on_local_error, f"Transcription failed: {error_msg}")
-                return
-            
-            # Read the clean transcription from the output file
-            try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    transcription_text = f.read().strip()
-            except:
-                # Fallback to stdout if file reading fails
-                transcription_text = result.stdout.strip() or "Transcription completed. Check output directory."
-            
-            # Process additional features
-            if not transcription_text.startswith("Transcription completed"):
-                # Format transcription into paragraphs
-                formatted_transcription = self.format_text_in_paragraphs(transcription_text)
-                
-                # Prepare results dictionary
-                results = {
-                    'original': formatted_transcription,
-                    'original_srt': self.create_srt_from_text(formatted_transcription)
-                }
-                
-                # Generate translation if requested
-                if self.local_translate_var.get() and transcription_text:
-                    self.root.after(0, lambda: self.local_status_var.set("Translating text..."))
-                    target_lang = self.local_target_lang.get()
-                    # For local videos, assume source language is English (most common)
-                    source_lang = "en"
-                    translation = self.translate_text(formatted_transcription, source_lang, target_lang)
-                    results['translation'] = translation
-                    results['translated_srt'] = self.create_srt_from_text(translation, is_translation=True)
-                
-                # Generate summary if requested
-                if summarize and transcription_text:
-                    self.root.after(0, lambda: self.local_status_var.set("Generating title and summary..."))
-                    title, summary = self.generate_title_and_summary(transcription_text)
-                    results['summary'] = f"{title}\n{summary}"
-            else:
-                results = {'original': transcription_text}
-            
-            self.root.after(0, self.on_local_success, results, output_file)
-            
-        except subprocess.TimeoutExpired:
-            self.root.after(0, self.on_local_error, "Transcription timed out")
-        except Exception as e:
-            self.root.after(0, self.on_local_error, str(e))
+    def on_online_video_preview(self, key, preview):
+        """Show the transcript (and summary) of the first minutes while the rest is transcribed"""
+        self.show_output('yt_original_text', preview['original'])
+        self.show_output('yt_orig_srt_text', preview['original_srt'])
+        if 'summary' in preview:
+            self.show_output('yt_summary_text', preview['summary'])
     
     def on_online_video_success(self, results):
         self.yt_progress.stop()
         self.yt_download_button.config(state='normal')
+        self.yt_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('yt', None)
         self.yt_status_var.set("Download and transcription completed!")
         
         # Clear all tabs
@@ -2193,33 +1688,251 @@ Here is the text to translate and create an article from:"""
         
         # Populate tabs with results
         if 'original' in results:
-            self.yt_original_text.insert(tk.END, results['original'])
+            self.show_output('yt_original_text', results['original'])
         
         if 'translation' in results:
-            self.yt_translation_text.insert(tk.END, results['translation'])
+            self.show_output('yt_translation_text', results['translation'])
         
         if 'original_srt' in results:
-            self.yt_orig_srt_text.insert(tk.END, results['original_srt'])
+            self.show_output('yt_orig_srt_text', results['original_srt'])
         
         if 'translated_srt' in results:
-            self.yt_trans_srt_text.insert(tk.END, results['translated_srt'])
+            self.show_output('yt_trans_srt_text', results['translated_srt'])
         
         if 'summary' in results:
-            self.yt_summary_text.insert(tk.END, results['summary'])
+            self.show_output('yt_summary_text', results['summary'])
+        
+        self.run_pending_inputs()
+    
+    def start_job(self, status_var, on_done, on_error, on_progress=None, on_partial=None):
+        """Register the UI handlers for a new job and return its id"""
+        job = next(self.job_ids)
+        self.job_handlers[job] = {
+            STATUS: status_var.set if status_var is not None else None,
+            PROGRESS: on_progress,
+            PARTIAL: on_partial,
+            DONE: on_done,
+            ERROR: on_error
+        }
+        return job
+    
+    def drain_ui_events(self):
+        """Apply pending worker events on the main thread, then re-arm the tick"""
+        try:
+            for event in self.events.drain():
+                self.dispatch_ui_event(event)
+        finally:
+            try:
+                self.root.after(UI_TICK_MS, self.drain_ui_events)
+            except tk.TclError:
+                pass  # Window destroyed
+    
+    def dispatch_ui_event(self, event):
+        handlers = self.job_handlers.get(event.job)
+        if not handlers:
+            return
+        
+        # Finished jobs stop receiving events
+        if event.kind in (DONE, ERROR):
+            self.job_handlers.pop(event.job, None)
+        
+        handler = handlers.get(event.kind)
+        if handler is None:
+            return
+        try:
+            if event.kind in (DONE, PARTIAL):
+                handler(*event.payload)
+            else:
+                handler(event.payload)
+        except Exception:
+            traceback.print_exc()
+    
+    def get_api_key(self):
+        """OpenRouter API key; safe to call from worker threads"""
+        return os.environ.get('OPENROUTER_API_KEY') or getattr(self, 'api_key_value', '')
+    
+    def get_translation_model(self):
+        """Selected OpenRouter model; safe to call from worker threads"""
+        return getattr(self, 'model_value', DEFAULT_MODEL)
+    
+    def job_settings(self):
+        """Settings snapshot sent along with every pipeline job"""
+        return {
+            'api_key': self.get_api_key(),
+            'model': self.get_translation_model(),
+            'export_formats': list(self.export_formats),
+            'translation_workers': self.settings.get('translation_workers'),
+            'translation_memory_entries': self.settings.get('translation_memory_entries'),
+            'media_cache_mb': self.settings.get('media_cache_mb'),
+            'media_codec': self.settings.get('media_codec'),
+            'trim_silence': self.settings.get('trim_silence'),
+            'speed_profile': self.settings.get('speed_profile'),
+            'max_video_minutes': self.settings.get('max_video_minutes'),
+            'ytdlp_library': self.settings.get('ytdlp_library')
+        }
+    
+    def get_pipeline(self):
+        """In-process pipeline with the current settings (fallback and direct calls)"""
+        pipeline = self.__dict__.get('pipeline')
+        if pipeline is None:
+            pipeline = self.pipeline = Pipeline(getattr(self, 'events', None))
+        pipeline.api_key = self.get_api_key()
+        pipeline.model = self.get_translation_model()
+        return pipeline
+    
+    # Pipeline operations, run in-process
+    def get_platform_from_url(self, url):
+        return self.get_pipeline().get_platform_from_url(url)
+    
+    def format_text_in_paragraphs(self, text):
+        return self.get_pipeline().format_text_in_paragraphs(text)
+    
+    def create_srt_from_text(self, text, is_translation=False):
+        return self.get_pipeline().create_srt_from_text(text, is_translation)
+    
+    def has_good_paragraph_structure(self, text):
+        return self.get_pipeline().has_good_paragraph_structure(text)
+    
+    def generate_title_and_summary(self, text):
+        return self.get_pipeline().generate_title_and_summary(text)
+    
+    def translate_text(self, text, source_lang, target_lang):
+        return self.get_pipeline().translate_text(text, source_lang, target_lang)
+    
+    def translate_locally_then_enhance(self, text, source_lang, target_lang):
+        return self.get_pipeline().translate_locally_then_enhance(text, source_lang, target_lang)
+    
+    def translate_with_apple_live_translation(self, text, source_lang, target_lang):
+        return self.get_pipeline().translate_with_apple_live_translation(text, source_lang, target_lang)
+    
+    def translate_with_local_tool_fallback(self, text, source_lang, target_lang):
+        return self.get_pipeline().translate_with_local_tool_fallback(text, source_lang, target_lang)
+    
+    def translate_with_title_and_paragraphs(self, text, source_lang, target_lang):
+        return self.get_pipeline().translate_with_title_and_paragraphs(text, source_lang, target_lang)
+    
+    def enhance_translation_with_openrouter(self, translated_text, target_lang):
+        return self.get_pipeline().enhance_translation_with_openrouter(translated_text, target_lang)
+    
+    def show_output(self, output, content):
+        """Show a result in a named output and remember the document behind it
+        
+        Large results are inserted in chunks across event-loop ticks, outputs in tabs
+        that have not been opened (or built) are filled when they are first shown, and
+        huge documents only get their first page up front, with a page more loaded each
+        time the user scrolls near the end.
+        """
+        self.output_documents[output] = content
+        self.output_renders[output] = {
+            'content': content,
+            'rendered': 0,
+            'limit': min(len(content), OUTPUT_WINDOW_CHARS),
+            'scheduled': False,
+            # Set once the user has edited the widget; chunk inserts clear its modified flag
+            'edited': False
+        }
+        
+        text_widget = self.output_widgets.get(output)
+        if text_widget is not None and text_widget.winfo_ismapped():
+            self.schedule_output_render(output)
+    
+    def install_output_view(self, output, text_widget):
+        """Register the widget of a named output once its tab is built"""
+        self.output_widgets[output] = text_widget
+        
+        # Render pending content when the widget's tab is first shown
+        text_widget.bind('<Map>', lambda e: self.schedule_output_render(output), add='+')
+        
+        # Load the next page of a huge document when scrolling near its end
+        scroll_command = str(text_widget.cget('yscrollcommand'))
+        
+        def on_scroll(first, last):
+            if scroll_command:
+                text_widget.tk.eval(f"{scroll_command} {first} {last}")
+            self.on_output_scrolled(output, float(last))
+        
+        text_widget.configure(yscrollcommand=on_scroll)
+    
+    def schedule_output_render(self, output):
+        state = self.output_renders.get(output)
+        if not state or state['scheduled'] or state['rendered'] >= state['limit']:
+            return
+        state['scheduled'] = True
+        self.root.after(1, self.render_output_chunk, output, state)
+    
+    def render_output_chunk(self, output, state):
+        """Insert the next chunk of a result, then yield back to the event loop"""
+        if self.output_renders.get(output) is not state:
+            return  # Cleared or replaced since this chunk was scheduled
+        
+        text_widget = self.output_widgets[output]
+        start = state['rendered']
+        end = min(start + OUTPUT_CHUNK_CHARS, state['limit'])
+        # The modified flag only tracks the user's edits, so keep any made before this insert
+        if text_widget.edit_modified():
+            state['edited'] = True
+        text_widget.insert(tk.END, state['content'][start:end])
+        text_widget.edit_modified(False)
+        state['rendered'] = end
+        state['scheduled'] = False
+        
+        if end < state['limit']:
+            self.schedule_output_render(output)
+    
+    def on_output_scrolled(self, output, last):
+        """Load the next page of a huge document once its end is almost in view"""
+        state = self.output_renders.get(output)
+        if state and last >= 0.95 and state['limit'] < len(state['content']):
+            state['limit'] = min(len(state['content']), state['limit'] + OUTPUT_WINDOW_CHARS)
+            self.schedule_output_render(output)
+    
+    def clear_output(self, output):
+        self.output_documents.pop(output, None)
+        self.output_renders.pop(output, None)
+        # Outputs whose tab was never built have no widget to clear, and the
+        # delete is skipped entirely for widgets that are already empty
+        text_widget = self.output_widgets.get(output)
+        if text_widget is not None and text_widget.index('end-1c') != '1.0':
+            text_widget.delete(1.0, tk.END)
+            text_widget.edit_modified(False)
+    
+    def get_output_document(self, output):
+        """Document behind a named output; the widget contents are only read if edited"""
+        content = self.output_documents.get(output)
+        text_widget = self.output_widgets.get(output)
+        state = self.output_renders.get(output)
+        edited = text_widget is not None and (text_widget.edit_modified() or (state and state['edited']))
+        if text_widget is not None and (content is None or edited):
+            # An edited widget that is only partly rendered is followed by the part not inserted yet
+            tail = state['content'][state['rendered']:] if state else ""
+            content = text_widget.get(1.0, 'end-1c') + tail
+        return Transcript.coerce((content or "").strip())
     
     def on_online_video_error(self, error):
         self.yt_progress.stop()
         self.yt_download_button.config(state='normal')
+        self.yt_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('yt', None)
         self.yt_status_var.set("Error occurred")
         
         self.clear_online_video_output()
-        self.yt_original_text.insert(tk.END, f"Error: {error}")
+        self.show_output('yt_original_text', f"Error: {error}")
         
         messagebox.showerror("Error", f"Operation failed: {error}")
+        self.run_pending_inputs()
+    
+    def on_local_preview(self, key, preview):
+        """Show the transcript (and summary) of the first minutes while the rest is transcribed"""
+        self.show_output('local_original_text', preview['original'])
+        self.show_output('local_orig_srt_text', preview['original_srt'])
+        if 'summary' in preview:
+            self.show_output('local_summary_text', preview['summary'])
     
     def on_local_success(self, results, output_file):
         self.local_progress.stop()
         self.local_transcribe_button.config(state='normal')
+        self.local_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('local', None)
         self.local_status_var.set(f"Transcription saved to {os.path.basename(output_file)}")
         
         # Clear all tabs
@@ -2227,51 +1940,76 @@ Here is the text to translate and create an article from:"""
         
         # Populate tabs with results
         if 'original' in results:
-            self.local_original_text.insert(tk.END, results['original'])
+            self.show_output('local_original_text', results['original'])
         
         if 'translation' in results:
-            self.local_translation_text.insert(tk.END, results['translation'])
+            self.show_output('local_translation_text', results['translation'])
         
         if 'original_srt' in results:
-            self.local_orig_srt_text.insert(tk.END, results['original_srt'])
+            self.show_output('local_orig_srt_text', results['original_srt'])
         
         if 'translated_srt' in results:
-            self.local_trans_srt_text.insert(tk.END, results['translated_srt'])
+            self.show_output('local_trans_srt_text', results['translated_srt'])
         
         if 'summary' in results:
-            self.local_summary_text.insert(tk.END, results['summary'])
+            self.show_output('local_summary_text', results['summary'])
+        
+        self.run_pending_inputs()
     
     def on_local_error(self, error):
         self.local_progress.stop()
         self.local_transcribe_button.config(state='normal')
+        self.local_cancel_button.config(state='disabled')
+        self.tab_jobs.pop('local', None)
         self.local_status_var.set("Error occurred")
         
         self.clear_local_output()
-        self.local_original_text.insert(tk.END, f"Error: {error}")
+        self.show_output('local_original_text', f"Error: {error}")
         
         messagebox.showerror("Error", f"Transcription failed: {error}")
+        self.run_pending_inputs()
+    
+    def cancel_online_video(self):
+        """Stop the running download/transcription; partial files are removed by the pipeline"""
+        if not self.cancel_tab_job('yt'):
+            return
+        self.yt_progress.stop()
+        self.yt_download_button.config(state='normal')
+        self.yt_cancel_button.config(state='disabled')
+        self.yt_status_var.set("Cancelled")
+        self.run_pending_inputs()
+    
+    def cancel_local_video(self):
+        """Stop the running local transcription"""
+        if not self.cancel_tab_job('local'):
+            return
+        self.local_progress.stop()
+        self.local_transcribe_button.config(state='normal')
+        self.local_cancel_button.config(state='disabled')
+        self.local_status_var.set("Cancelled")
+        self.run_pending_inputs()
     
     def clear_online_video_output(self):
-        self.yt_original_text.delete(1.0, tk.END)
-        self.yt_translation_text.delete(1.0, tk.END)
-        self.yt_orig_srt_text.delete(1.0, tk.END)
-        self.yt_trans_srt_text.delete(1.0, tk.END)
-        self.yt_summary_text.delete(1.0, tk.END)
+        self.clear_output('yt_original_text')
+        self.clear_output('yt_translation_text')
+        self.clear_output('yt_orig_srt_text')
+        self.clear_output('yt_trans_srt_text')
+        self.clear_output('yt_summary_text')
         self.yt_status_var.set("Ready")
     
     def clear_local_output(self):
-        self.local_original_text.delete(1.0, tk.END)
-        self.local_translation_text.delete(1.0, tk.END)
-        self.local_orig_srt_text.delete(1.0, tk.END)
-        self.local_trans_srt_text.delete(1.0, tk.END)
-        self.local_summary_text.delete(1.0, tk.END)
+        self.clear_output('local_original_text')
+        self.clear_output('local_translation_text')
+        self.clear_output('local_orig_srt_text')
+        self.clear_output('local_trans_srt_text')
+        self.clear_output('local_summary_text')
         self.local_status_var.set("Ready")
     
     def save_local_output(self):
         # Get content from the original text tab (main output)
-        content = self.local_original_text.get(1.0, tk.END).strip()
+        document = self.get_output_document('local_original_text')
         
-        if not content:
+        if not document.text:
             messagebox.showwarning("Warning", "No output to save")
             return
         
@@ -2291,8 +2029,7 @@ Here is the text to translate and create an article from:"""
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_text_atomic(filename, document.text)
                 messagebox.showinfo("Success", f"Output saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {e}")
@@ -2320,10 +2057,23 @@ def main():
         # Set global exception handler
         sys.excepthook = handle_exception
         
+        startup_timer = StartupTimer()
+        startup_timer.mark("imports")
+        
+        # Launches with a running instance were handed over before the imports
+        items = launch_items(sys.argv[1:])
+        
         root = tk.Tk()
+        startup_timer.mark("window created")
         
         # Add protocol handler for window close
         def on_closing():
+            try:
+                instance_server.close()
+                app.settings.flush()
+                app.worker.close()
+            except Exception:
+                pass
             try:
                 root.quit()
                 root.destroy()
@@ -2339,7 +2089,14 @@ def main():
         except:
             pass
         
-        app = YapGUI(root)
+        app = YapGUI(root, startup_timer)
+        
+        # Later launches hand their URLs, files and text to this instance
+        instance_server = InstanceServer(app.receive_launch)
+        if not instance_server.start():
+            print("Another instance is listening for launches; this window will not receive them", file=sys.stderr)
+        if items:
+            app.queue_launch_items(items)
         
         # Keep the app responsive
         def keep_alive():
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# In-process yt-dlp
+#
+# Every metadata lookup and download used to start a yt-dlp process, which
+# imports its whole extractor set and sets up its HTTP session again. When the
+# yt_dlp package is installed, a worker process keeps its YoutubeDL instances
+# instead: the extractors they have loaded, their caches (e.g. YouTube's
+# player code) and their HTTP connections serve every job the process runs. A
+# download starts from the description a metadata lookup already fetched, so
+# the video page is not read twice, and runs on one of the same instances, so
+# the media is fetched with the session and cookies that read the page; only
+# its output template and sections are set for the download. Progress comes
+# from yt-dlp's hooks rather than from its output, and the same hooks run as
+# the conversion to WAV starts, so a cancelled job never starts ffmpeg.
+# Without the package, or when a call fails, the yt-dlp command is used as
+# before.
+
+import importlib.util
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Options every instance shares; yt-dlp's socket timeout stands in for the command's stall window
+BASE_PARAMS = {'quiet': True, 'no_warnings': True, 'noprogress': True, 'noplaylist': True, 'socket_timeout': 60,
+               'format': 'bestaudio/best'}
+
+# Video descriptions reused by downloads; their media URLs expire, so only for a while
+INFO_TTL = 600
+INFO_ENTRIES = 32
+
+
+def has_yt_dlp():
+    """Whether the yt_dlp package is installed; checked without importing it"""
+    return importlib.util.find_spec('yt_dlp') is not None
+
+
+def library_version():
+    """Version of the installed yt_dlp package (read from its metadata, not imported), or None"""
+    from importlib import metadata
+
+    try:
+        return metadata.version('yt-dlp')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+class LibraryError(Exception):
+    """yt-dlp failed in-process; the message is yt-dlp's"""
+
+
+class YtDlpLibrary:
+    """Long-lived YoutubeDL instances of one process, shared by all its jobs
+
+    Instances are not shared between threads at the same time: a lookup takes
+    an idle one (or creates one) and hands it back, so parallel lookups each
+    get their own and later jobs reuse them all.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = []
+        self.created = 0
+        # URL -> (time fetched, description)
+        self.infos = OrderedDict()
+        # Instance -> hook(stage, status) of the download it is running
+        self.hooks = {}
+
+    def create(self):
+        """A new instance; its hooks forward to the download it is running, if any"""
+        import yt_dlp
+        from yt_dlp.postprocessor import FFmpegExtractAudioPP
+
+        ydl = yt_dlp.YoutubeDL(dict(BASE_PARAMS))
+        ydl.add_progress_hook(lambda status: self.forward(ydl, 'download', status))
+        # Only runs after a download; metadata lookups never reach it
+        extract = FFmpegExtractAudioPP(ydl, preferredcodec='wav')
+        extract.add_progress_hook(lambda status: self.forward(ydl, 'convert', status))
+        ydl.add_post_processor(extract, when='post_process')
+        return ydl
+
+    def forward(self, ydl, stage, status):
+        hook = self.hooks.get(ydl)
+        if hook is not None:
+            hook(stage, status)
+
+    @contextmanager
+    def instance(self):
+        with self.lock:
+            ydl = self.idle.pop() if self.idle else None
+        if ydl is None:
+            ydl = self.create()
+            self.created += 1
+        try:
+            yield ydl
+        finally:
+            with self.lock:
+                self.idle.append(ydl)
+
+    def cached_info(self, url):
+        with self.lock:
+            entry = self.infos.get(url)
+            if entry is None or time.monotonic() - entry[0] > INFO_TTL:
+                return None
+            self.infos.move_to_end(url)
+            return entry[1]
+
+    def extract_info(self, url, fresh=False):
+        """yt-dlp's description of a video, as `yt-dlp -J` prints it; raises LibraryError"""
+        import yt_dlp
+
+        info = None if fresh else self.cached_info(url)
+        if info is not None:
+            return info
+        try:
+            with self.instance() as ydl:
+                info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+        except yt_dlp.utils.DownloadError as e:
+            raise LibraryError(str(e)) from e
+        with self.lock:
+            self.infos[url] = (time.monotonic(), info)
+            self.infos.move_to_end(url)
+            while len(self.infos) > INFO_ENTRIES:
+                self.infos.popitem(last=False)
+        return info
+
+    def download_audio(self, url, staging_dir, section=None, progress=None):
+        """Download a video's audio (or a section (start, end) of it) as WAV into staging_dir
+
+        Does what `yt-dlp -x --audio-format wav -o staging_dir/%(id)s.%(ext)s`
+        does, from the video's cached description. progress(downloaded bytes,
+        total bytes or None) is called from yt-dlp's progress hook, and again
+        as the conversion to WAV starts and ends; an exception it raises aborts
+        the download, before ffmpeg runs if it has not yet. Raises LibraryError.
+        """
+        import yt_dlp
+
+        reported = [0, None]
+
+        def hook(stage, status):
+            if progress is None:
+                return
+            if stage == 'download' and status.get('status') == 'downloading':
+                reported[:] = [status.get('downloaded_bytes') or 0,
+                               status.get('total_bytes') or status.get('total_bytes_estimate')]
+                progress(*reported)
+            elif stage == 'convert':
+                progress(*reported)
+
+        ranges = None
+        if section is not None:
+            start, end = section
+            ranges = yt_dlp.utils.download_range_func(None, [(start, math.inf if end is None else end)])
+
+        info = self.extract_info(url)
+        with self.instance() as ydl:
+            # Per-download options, put back once the instance is done with them
+            saved = {key: ydl.params.get(key) for key in ('outtmpl', 'download_ranges')}
+            outtmpl = f'{staging_dir}/%(id)s.%(ext)s'
+            if isinstance(saved['outtmpl'], dict):
+                outtmpl = dict(saved['outtmpl'], default=outtmpl)
+            ydl.params.update(outtmpl=outtmpl, download_ranges=ranges)
+            self.hooks[ydl] = hook
+            try:
+                ydl.process_ie_result(info, download=True)
+            except yt_dlp.utils.DownloadError as e:
+                raise LibraryError(str(e)) from e
+            finally:
+                del self.hooks[ydl]
+                ydl.params.update(saved)